@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Adaptive Rate - Controle AIMD da taxa de requisicoes por tribunal
+
+A taxa dos scrapers era uma constante conservadora (DEFAULT_RATE_LIMIT)
+e o unico ajuste era multiplicar o backoff apos erro. Este modulo aprende,
+por endpoint de tribunal, a maior taxa sustentavel:
+
+- Aumento aditivo enquanto latencia e erros estao saudaveis
+  (cerca de `incremento` req/s a cada segundo de trafego)
+- Reducao multiplicativa em 429, 5xx, timeout ou pico de latencia
+- Limites minimo e maximo por tribunal; o teto padrao e um multiplo da
+  taxa configurada (ROM_TAXA_FATOR_MAXIMO), ajustavel por `taxa_maxima`
+- Taxa aprendida persistida em SQLite por endpoint e limites, e
+  restaurada ao reiniciar
+
+A taxa resultante alimenta o RateLimiter/token bucket de cada scraper.
+
+Autor: ROM-Agent Integration System
+Data: 2026-01-12
+Versao: 1.0.0
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from cache_store import ConexoesSQLite
+from token_bucket import DEFAULT_DB_PATH
+
+
+# =============================================================================
+# CONSTANTES E CONFIGURACOES
+# =============================================================================
+
+DEFAULT_INCREMENTO = 0.05  # req/s somados a cada segundo saudavel
+DEFAULT_FATOR_REDUCAO = 0.5  # multiplicador da taxa em caso de erro
+DEFAULT_FATOR_MAXIMO = float(os.environ.get("ROM_TAXA_FATOR_MAXIMO", "3.0"))  # taxa maxima = taxa inicial * fator
+DEFAULT_FATOR_MINIMO = 0.1  # taxa minima = taxa inicial * fator
+DEFAULT_PICO_LATENCIA = 3.0  # latencia > media * fator conta como pico
+DEFAULT_LATENCIA_MAXIMA_MS = 10000.0  # latencia absoluta considerada pico
+DEFAULT_INTERVALO_REDUCAO = 2.0  # s minimos entre duas reducoes
+DEFAULT_INTERVALO_PERSISTENCIA = 5.0  # s minimos entre gravacoes
+AMOSTRAS_AQUECIMENTO = 10  # amostras antes de detectar pico relativo
+ALFA_EWMA = 0.2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS taxas_adaptativas (
+    chave         TEXT PRIMARY KEY,
+    taxa          REAL NOT NULL,
+    latencia_ms   REAL,
+    atualizado_em REAL NOT NULL
+);
+"""
+
+
+# =============================================================================
+# CONTROLADOR AIMD
+# =============================================================================
+
+class AdaptiveRateController:
+    """
+    Controlador AIMD (additive increase / multiplicative decrease) por chave
+
+    Taxas em requisicoes por segundo. Seguro para uso entre threads; a
+    persistencia e best-effort e nunca interrompe a requisicao.
+    """
+
+    def __init__(
+        self,
+        chave: str,
+        taxa_inicial: float,
+        taxa_minima: Optional[float] = None,
+        taxa_maxima: Optional[float] = None,
+        incremento: float = DEFAULT_INCREMENTO,
+        fator_reducao: float = DEFAULT_FATOR_REDUCAO,
+        latencia_maxima_ms: float = DEFAULT_LATENCIA_MAXIMA_MS,
+        db_path: Optional[str] = DEFAULT_DB_PATH
+    ):
+        """
+        Inicializa o controlador
+
+        Args:
+            chave: Endpoint do tribunal (normalmente o host)
+            taxa_inicial: Taxa usada sem historico (req/s)
+            taxa_minima: Piso da taxa (padrao taxa_inicial * 0.1)
+            taxa_maxima: Teto da taxa (padrao taxa_inicial * DEFAULT_FATOR_MAXIMO)
+            incremento: Aumento aditivo por segundo saudavel
+            fator_reducao: Multiplicador aplicado em erro
+            latencia_maxima_ms: Latencia absoluta tratada como pico
+            db_path: Arquivo SQLite para persistencia (None desabilita)
+        """
+        self.chave = chave
+        self.taxa_minima = taxa_minima or taxa_inicial * DEFAULT_FATOR_MINIMO
+        self.taxa_maxima = taxa_maxima or taxa_inicial * DEFAULT_FATOR_MAXIMO
+        self.incremento = incremento
+        self.fator_reducao = fator_reducao
+        self.latencia_maxima_ms = latencia_maxima_ms
+        self.db_path = Path(db_path) if db_path else None
+        # Linha persistida por endpoint e configuracao: controladores com
+        # limites diferentes para o mesmo host nao sobrescrevem um ao outro
+        self._chave_db = f"{chave}|{taxa_inicial:g}|{self.taxa_minima:g}|{self.taxa_maxima:g}"
+
+        self._taxa = self._limitar(taxa_inicial)
+        self._latencia_media: Optional[float] = None
+        self._amostras = 0
+        self._ultima_reducao = 0.0
+        self._ultima_persistencia = 0.0
+        self._reducoes = 0
+        self._lock = threading.Lock()
+        self._conexoes: Optional[ConexoesSQLite] = None
+
+        self._carregar()
+
+    # -------------------------------------------------------------------------
+    # Persistencia
+    # -------------------------------------------------------------------------
+
+    def _conn(self) -> sqlite3.Connection:
+        """Retorna conexao da thread atual, criando se necessario"""
+        return self._conexoes.obter()
+
+    def _carregar(self):
+        """Restaura a taxa aprendida em execucoes anteriores"""
+        if self.db_path is None:
+            return
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conexoes = ConexoesSQLite(self.db_path)
+            self._conn().executescript(_SCHEMA)
+            row = self._conn().execute(
+                "SELECT taxa, latencia_ms FROM taxas_adaptativas WHERE chave = ?",
+                (self._chave_db,)
+            ).fetchone()
+        except sqlite3.Error:
+            self.db_path = None
+            return
+
+        if row:
+            self._taxa = self._limitar(row[0])
+            self._latencia_media = row[1]
+
+    def _persistir(self, forcar: bool = False):
+        """Grava a taxa atual (no maximo a cada DEFAULT_INTERVALO_PERSISTENCIA)"""
+        if self.db_path is None:
+            return
+        agora = time.time()
+        if not forcar and agora - self._ultima_persistencia < DEFAULT_INTERVALO_PERSISTENCIA:
+            return
+        self._ultima_persistencia = agora
+        try:
+            self._conn().execute(
+                "INSERT OR REPLACE INTO taxas_adaptativas "
+                "(chave, taxa, latencia_ms, atualizado_em) VALUES (?, ?, ?, ?)",
+                (self._chave_db, self._taxa, self._latencia_media, agora)
+            )
+        except sqlite3.Error:
+            pass
+
+    # -------------------------------------------------------------------------
+    # Controle
+    # -------------------------------------------------------------------------
+
+    def _limitar(self, taxa: float) -> float:
+        return min(self.taxa_maxima, max(self.taxa_minima, taxa))
+
+    def _reduzir(self, agora: float) -> bool:
+        """Reducao multiplicativa, no maximo uma por DEFAULT_INTERVALO_REDUCAO"""
+        if agora - self._ultima_reducao < DEFAULT_INTERVALO_REDUCAO:
+            return False
+        self._ultima_reducao = agora
+        self._reducoes += 1
+        self._taxa = self._limitar(self._taxa * self.fator_reducao)
+        return True
+
+    def registrar_sucesso(self, latencia_ms: Optional[float] = None) -> float:
+        """
+        Registra resposta bem sucedida
+
+        Args:
+            latencia_ms: Latencia da requisicao; picos contam como erro
+
+        Returns:
+            Taxa atual (req/s)
+        """
+        with self._lock:
+            agora = time.time()
+            pico = False
+
+            if latencia_ms is not None:
+                media = self._latencia_media
+                pico = latencia_ms > self.latencia_maxima_ms or (
+                    media is not None
+                    and self._amostras >= AMOSTRAS_AQUECIMENTO
+                    and latencia_ms > media * DEFAULT_PICO_LATENCIA
+                )
+                if not pico:
+                    self._latencia_media = latencia_ms if media is None else (
+                        ALFA_EWMA * latencia_ms + (1 - ALFA_EWMA) * media
+                    )
+                self._amostras += 1
+
+            if pico:
+                reduziu = self._reduzir(agora)
+            else:
+                # Cerca de `incremento` req/s a cada segundo de trafego
+                self._taxa = self._limitar(self._taxa + self.incremento / self._taxa)
+                reduziu = False
+
+            self._persistir(forcar=reduziu)
+            return self._taxa
+
+    def registrar_erro(self) -> float:
+        """
+        Registra 429, 5xx ou falha de rede (timeout/conexao)
+
+        Returns:
+            Taxa atual (req/s)
+        """
+        with self._lock:
+            reduziu = self._reduzir(time.time())
+            self._persistir(forcar=reduziu)
+            return self._taxa
+
+    @property
+    def taxa(self) -> float:
+        """Taxa atual em requisicoes por segundo"""
+        return self._taxa
+
+    @property
+    def intervalo(self) -> float:
+        """Intervalo atual entre requisicoes em segundos"""
+        return 1.0 / self._taxa
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Estado do controlador"""
+        return {
+            "chave": self.chave,
+            "taxa": round(self._taxa, 4),
+            "taxa_minima": self.taxa_minima,
+            "taxa_maxima": self.taxa_maxima,
+            "latencia_media_ms": round(self._latencia_media, 2) if self._latencia_media else None,
+            "reducoes": self._reducoes,
+        }
+
+    def close(self):
+        """Grava estado final e fecha a conexao da thread atual"""
+        self._persistir(forcar=True)
+        if self._conexoes is not None:
+            self._conexoes.fechar()
+
+
+def segundos_retry_after(valor: Optional[str]) -> Optional[float]:
+    """
+    Converte o header Retry-After em segundos
+
+    Args:
+        valor: Valor do header (segundos ou data HTTP)
+
+    Returns:
+        Segundos de espera ou None se ausente/invalido
+    """
+    if not valor:
+        return None
+    valor = valor.strip()
+    if valor.isdigit():
+        return float(valor)
+    try:
+        from email.utils import parsedate_to_datetime
+        return max(0.0, parsedate_to_datetime(valor).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+# =============================================================================
+# INSTANCIAS COMPARTILHADAS
+# =============================================================================
+
+_controladores: Dict[Tuple[Any, ...], AdaptiveRateController] = {}
+_controladores_lock = threading.Lock()
+
+
+def obter_controlador(chave: str, taxa_inicial: float, **kwargs) -> AdaptiveRateController:
+    """
+    Retorna o controlador do processo para a chave e a taxa configurada
+
+    Todas as instancias de scraper do processo que falam com o mesmo
+    endpoint, com a mesma configuracao, compartilham o mesmo aprendizado.
+    Uma configuracao diferente (outro rate_limit ou taxa_maxima) ganha
+    controlador e taxa persistida proprios, com os limites dela.
+
+    Args:
+        chave: Endpoint do tribunal (host)
+        taxa_inicial: Taxa configurada em req/s
+        **kwargs: Demais argumentos de AdaptiveRateController
+            (taxa_minima/taxa_maxima None usam o padrao)
+
+    Returns:
+        AdaptiveRateController unico por (chave, configuracao)
+    """
+    for limite in ("taxa_minima", "taxa_maxima"):
+        if kwargs.get(limite) is None:
+            kwargs.pop(limite, None)
+    registro = (chave, taxa_inicial, tuple(sorted(kwargs.items())))
+    with _controladores_lock:
+        controlador = _controladores.get(registro)
+        if controlador is None:
+            controlador = AdaptiveRateController(chave, taxa_inicial, **kwargs)
+            _controladores[registro] = controlador
+        return controlador
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark - Cache JSON (legado) vs SQLite WAL
+
+Executa N operacoes set seguidas de N operacoes get contra:
+- LegacyJSONCache: copia do CacheManager antigo, que reescrevia o
+  arquivo cache.json inteiro a cada escrita
+- CacheManager do esaj_scraper, agora sobre SQLiteCacheStore
+
+Uso:
+    python benchmarks/bench_cache.py
+    python benchmarks/bench_cache.py --n 2000
+
+O custo do lado JSON cresce com o quadrado de N (cada set reescreve o
+arquivo inteiro): com N=2000 foram ~58 ms/op contra ~0.06 ms/op no
+SQLite. Com o N padrao de 10k a execucao do lado JSON leva dezenas de
+minutos.
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from esaj_scraper import CacheManager, gerar_hash_cache
+
+
+class LegacyJSONCache:
+    """Cache em arquivo JSON unico (implementacao anterior, para comparacao)"""
+
+    def __init__(self, cache_dir: str, ttl: int = 3600):
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self._cache_file = self.cache_dir / "cache.json"
+        self._cache: Dict[str, Dict] = {}
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _save_cache(self):
+        with open(self._cache_file, 'w', encoding='utf-8') as f:
+            json.dump(self._cache, f, ensure_ascii=False, indent=2)
+
+    def get(self, key: str) -> Optional[Dict]:
+        entry = self._cache.get(gerar_hash_cache(key))
+        if entry is None:
+            return None
+        if time.time() - entry.get('timestamp', 0) > self.ttl:
+            return None
+        return entry.get('data')
+
+    def set(self, key: str, value: Dict):
+        self._cache[gerar_hash_cache(key)] = {
+            'timestamp': time.time(),
+            'key': key,
+            'data': value
+        }
+        self._save_cache()
+
+
+def _valor(i: int) -> Dict:
+    """Valor com tamanho proximo ao de um processo resumido"""
+    return {
+        'numero_processo': f"{i:07d}-00.2024.8.26.0100",
+        'classe': 'Procedimento Comum Civel',
+        'partes': [{'tipo': 'Autor', 'nome': f'Parte {i}'}],
+        'movimentacoes': [{'data': '01/01/2024', 'descricao': 'Distribuido'}] * 5,
+    }
+
+
+def executar(nome: str, cache, n: int) -> Dict[str, float]:
+    """Mede N sets e N gets"""
+    inicio = time.perf_counter()
+    for i in range(n):
+        cache.set(f"processo:{i}:1", _valor(i))
+    tempo_set = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    for i in range(n):
+        assert cache.get(f"processo:{i}:1") is not None
+    tempo_get = time.perf_counter() - inicio
+
+    print(
+        f"{nome:<8} set: {tempo_set:8.2f}s ({tempo_set / n * 1000:.3f} ms/op) | "
+        f"get: {tempo_get:8.2f}s ({tempo_get / n * 1000:.3f} ms/op)"
+    )
+    return {'set': tempo_set, 'get': tempo_get}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de cache JSON vs SQLite')
+    parser.add_argument('--n', type=int, default=10000, help='Numero de operacoes')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_res = executar('json', LegacyJSONCache(f"{tmp}/json"), args.n)
+        sqlite_res = executar('sqlite', CacheManager(f"{tmp}/sqlite"), args.n)
+
+    print(f"\nSpeedup set: {json_res['set'] / sqlite_res['set']:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
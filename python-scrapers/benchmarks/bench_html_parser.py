@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark - Backends de parse HTML (html.parser vs lxml)
+
+Mede o parse + extracao completa de paginas de processo do ESAJ com
+cada backend do bs4 e confere que o ProcessoESAJ extraido e identico.
+Mede tambem o parse parcial (somente links) de paginas de resultado.
+
+Paginas reais salvas (ex.: "Salvar como" no navegador) podem ser
+passadas com --paginas; sem elas e gerada uma pagina sintetica no
+layout do ESAJ com --movimentacoes linhas.
+
+Uso:
+    python benchmarks/bench_html_parser.py
+    python benchmarks/bench_html_parser.py --movimentacoes 5000
+    python benchmarks/bench_html_parser.py --paginas ./paginas_salvas
+"""
+
+import argparse
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from esaj_scraper import ESAJScraper
+from html_backend import LXML_AVAILABLE, PARSER_LXML, PARSER_PYTHON, apenas_tags, criar_soup
+
+
+def pagina_sintetica(movimentacoes: int) -> str:
+    """Pagina de processo no layout do ESAJ com N movimentacoes"""
+    linhas = "\n".join(
+        f"""<tr><td>{(i % 28) + 1:02d}/{(i % 12) + 1:02d}/2023</td>
+        <td><a href="/cpopg/abrirDocumento.do?id={i}">Juntada de Peticao {i}</a>
+        <span>Documento protocolado pela parte autora sob o numero {i}</span></td></tr>"""
+        for i in range(movimentacoes)
+    )
+    return f"""
+    <html><body>
+    <table id="secaoFormBody">
+        <tr><td><span>Classe</span></td><td><span id="classeProcesso">Procedimento Comum Civel</span></td></tr>
+        <tr><td><span>Assunto</span></td><td><span id="assuntoProcesso">Indenizacao por Dano Moral</span></td></tr>
+        <tr><td><span>Foro</span></td><td><span id="foroProcesso">Foro Central Civel</span></td></tr>
+        <tr><td><span>Vara</span></td><td><span id="varaProcesso">1a Vara Civel</span></td></tr>
+        <tr><td><span>Valor da acao</span></td><td><span id="valorAcaoProcesso">R$ 50.000,00</span></td></tr>
+    </table>
+    <table id="tableTodasPartes">
+        <tr><td>Reqte:</td><td>Joao da Silva<br/>Advogado: Maria Souza OAB/SP 123456</td></tr>
+        <tr><td>Reqdo:</td><td>Empresa XYZ Ltda<br/>CNPJ 12.345.678/0001-90</td></tr>
+    </table>
+    <table id="tabelaTodasMovimentacoes">
+    {linhas}
+    </table>
+    </body></html>
+    """
+
+
+def pagina_resultados(resultados: int) -> str:
+    """Pagina de resultados de busca com N links de processo"""
+    links = "\n".join(
+        f'<tr><td><a href="/cpopg/show.do?processo.codigo={i}">'
+        f'{i:07d}-00.2024.8.26.0100</a></td><td>Classe {i}</td></tr>'
+        for i in range(resultados)
+    )
+    return f"<html><body><div id='cabecalho'>{'<p>x</p>' * 500}</div><table>{links}</table></body></html>"
+
+
+def medir(func: Callable[[], object], repeticoes: int) -> float:
+    """Tempo medio (ms) de uma chamada"""
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        func()
+    return (time.perf_counter() - inicio) / repeticoes * 1000
+
+
+def comparar_paginas(scraper: ESAJScraper, paginas: Dict[str, str], repeticoes: int):
+    """Mede extracao completa com cada backend e compara os resultados"""
+    backends = [PARSER_PYTHON] + ([PARSER_LXML] if LXML_AVAILABLE else [])
+
+    for nome, html in paginas.items():
+        tempos: Dict[str, float] = {}
+        tempos_parse: Dict[str, float] = {}
+        resultados: List[dict] = []
+
+        for backend in backends:
+            tempos_parse[backend] = medir(lambda: criar_soup(html, parser=backend), repeticoes)
+
+            def extrair():
+                soup = criar_soup(html, parser=backend)
+                return scraper._montar_processo(soup, "0000000-00.0000.8.26.0000", "1", "")
+
+            tempos[backend] = medir(extrair, repeticoes)
+            dados = extrair().to_dict()
+            dados.pop("timestamp_extracao", None)
+            resultados.append(dados)
+
+        identico = all(r == resultados[0] for r in resultados[1:])
+        print(f"{nome} (identico: {'sim' if identico else 'NAO'})")
+        for rotulo, medidas in (("parse", tempos_parse), ("parse+extracao", tempos)):
+            linha = " | ".join(f"{b}: {t:8.1f} ms" for b, t in medidas.items())
+            if PARSER_LXML in medidas:
+                linha += f" | speedup: {medidas[PARSER_PYTHON] / medidas[PARSER_LXML]:.1f}x"
+            print(f"  {rotulo:<16} {linha}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de backends de parse HTML')
+    parser.add_argument('--movimentacoes', type=int, default=3000, help='Linhas da pagina sintetica')
+    parser.add_argument('--paginas', help='Diretorio com paginas de processo salvas (*.html)')
+    parser.add_argument('--repeticoes', type=int, default=5, help='Repeticoes por medicao')
+    args = parser.parse_args()
+
+    if not LXML_AVAILABLE:
+        print("lxml nao instalado: medindo somente html.parser")
+
+    if args.paginas:
+        paginas = {
+            p.name: p.read_text(encoding='utf-8', errors='replace')
+            for p in sorted(Path(args.paginas).glob('*.htm*'))
+        }
+    else:
+        paginas = {f"sintetica_{args.movimentacoes}_movs": pagina_sintetica(args.movimentacoes)}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        scraper = ESAJScraper(
+            cache_dir=f"{tmp}/cache", log_dir=f"{tmp}/logs",
+            log_level=logging.ERROR, deduplicar_documentos=False
+        )
+        print("Extracao completa da pagina do processo:")
+        comparar_paginas(scraper, paginas, args.repeticoes)
+
+    html = pagina_resultados(500)
+    completo = medir(lambda: criar_soup(html).find_all('a'), args.repeticoes)
+    parcial = medir(lambda: criar_soup(html, parse_only=apenas_tags('a')).find_all('a'), args.repeticoes)
+    print(f"\nPagina de resultados (500 links): completo {completo:.1f} ms | "
+          f"somente links {parcial:.1f} ms | speedup {completo / parcial:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
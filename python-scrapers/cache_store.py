@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cache Store - Backend de cache persistente em SQLite (WAL)
+
+Substitui o cache em arquivo JSON unico usado pelos scrapers. O arquivo
+JSON era reescrito por inteiro a cada escrita, o que custava centenas de
+milissegundos com alguns milhares de processos e corrompia o arquivo
+quando dois workers gravavam ao mesmo tempo.
+
+Este modulo fornece:
+- Escrita O(1) por entrada (INSERT OR REPLACE de uma linha)
+- Expiracao por linha (cada entrada guarda seu proprio expires_at)
+- Acesso seguro entre threads e processos (SQLite em modo WAL)
+- Tamanho limitado com remocao das entradas mais antigas
+- Namespaces para separar tipos de dados no mesmo arquivo
+- ConexoesSQLite e RegistroPorCaminho: conexao por thread e instancia
+  unica por arquivo, reaproveitadas pelos demais stores SQLite do projeto
+
+Autor: ROM-Agent Integration System
+Data: 2026-01-12
+Versao: 1.0.0
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Generic, Optional, TypeVar
+
+
+# =============================================================================
+# CONSTANTES E CONFIGURACOES
+# =============================================================================
+
+DEFAULT_DB_NAME = "cache.db"
+DEFAULT_NAMESPACE = "default"
+DEFAULT_MAX_ENTRIES = 50000
+DEFAULT_BUSY_TIMEOUT_MS = 5000
+DEFAULT_EVICTION_INTERVAL = 500  # escritas entre verificacoes de tamanho
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    namespace  TEXT NOT NULL,
+    key        TEXT NOT NULL,
+    value      TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS idx_cache_expires ON cache_entries (expires_at);
+CREATE INDEX IF NOT EXISTS idx_cache_created ON cache_entries (created_at);
+"""
+
+
+T = TypeVar("T")
+
+
+# =============================================================================
+# CONEXOES E INSTANCIAS COMPARTILHADAS
+# =============================================================================
+
+class ConexoesSQLite:
+    """
+    Uma conexao SQLite por thread para o mesmo arquivo
+
+    Conexoes em modo WAL, autocommit (transacoes explicitas) e com
+    busy_timeout, para que threads e processos diferentes compartilhem o
+    arquivo com seguranca.
+    """
+
+    def __init__(self, db_path: str, busy_timeout_ms: int = DEFAULT_BUSY_TIMEOUT_MS):
+        """
+        Args:
+            db_path: Caminho do arquivo SQLite
+            busy_timeout_ms: Tempo de espera por lock de outro processo
+        """
+        self.db_path = Path(db_path)
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+
+    def obter(self) -> sqlite3.Connection:
+        """Retorna conexao da thread atual, criando se necessario"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                str(self.db_path),
+                timeout=self.busy_timeout_ms / 1000.0,
+                isolation_level=None,  # autocommit; transacoes explicitas
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+            self._local.conn = conn
+        return conn
+
+    def fechar(self):
+        """Fecha a conexao da thread atual"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+class RegistroPorCaminho(Generic[T]):
+    """
+    Instancia unica por arquivo ou diretorio no processo
+
+    Base das funcoes obter_*() dos stores: o caminho e normalizado
+    (absoluto) e a instancia e criada uma unica vez.
+    """
+
+    def __init__(self, fabrica: Callable[[str], T]):
+        """
+        Args:
+            fabrica: Cria a instancia a partir do caminho absoluto
+        """
+        self._fabrica = fabrica
+        self._instancias: Dict[str, T] = {}
+        self._lock = threading.Lock()
+
+    def obter(self, caminho: str) -> T:
+        """
+        Retorna a instancia do caminho, criando na primeira chamada
+
+        Args:
+            caminho: Arquivo ou diretorio
+
+        Returns:
+            Instancia compartilhada para o caminho
+        """
+        caminho = str(Path(caminho).resolve())
+        with self._lock:
+            instancia = self._instancias.get(caminho)
+            if instancia is None:
+                instancia = self._fabrica(caminho)
+                self._instancias[caminho] = instancia
+            return instancia
+
+
+# =============================================================================
+# STORE SQLITE
+# =============================================================================
+
+class SQLiteCacheStore:
+    """
+    Store chave/valor com TTL por linha sobre SQLite em modo WAL
+
+    Cada thread usa sua propria conexao; processos diferentes
+    compartilham o mesmo arquivo com seguranca via locks do SQLite.
+    Valores sao serializados em JSON.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        busy_timeout_ms: int = DEFAULT_BUSY_TIMEOUT_MS,
+        eviction_interval: int = DEFAULT_EVICTION_INTERVAL
+    ):
+        """
+        Inicializa o store
+
+        Args:
+            db_path: Caminho do arquivo SQLite
+            max_entries: Numero maximo de entradas (0 = ilimitado)
+            busy_timeout_ms: Tempo de espera por lock de outro processo
+            eviction_interval: Escritas entre verificacoes de tamanho
+        """
+        self.db_path = Path(db_path)
+        self.max_entries = max_entries
+        self.busy_timeout_ms = busy_timeout_ms
+        self.eviction_interval = max(1, eviction_interval)
+        self._conexoes = ConexoesSQLite(db_path, busy_timeout_ms)
+        self._write_count = 0
+        self._write_lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn().executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        """Retorna conexao da thread atual, criando se necessario"""
+        return self._conexoes.obter()
+
+    def get(self, key: str, namespace: str = DEFAULT_NAMESPACE) -> Optional[Any]:
+        """
+        Recupera valor do store
+
+        Args:
+            key: Chave da entrada
+            namespace: Namespace da entrada
+
+        Returns:
+            Valor armazenado ou None se nao encontrado/expirado
+        """
+        row = self._conn().execute(
+            "SELECT value, expires_at FROM cache_entries WHERE namespace = ? AND key = ?",
+            (namespace, key)
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        value, expires_at = row
+        if time.time() > expires_at:
+            self.delete(key, namespace)
+            return None
+
+        try:
+            return json.loads(value)
+        except ValueError:
+            self.delete(key, namespace)
+            return None
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: float,
+        namespace: str = DEFAULT_NAMESPACE
+    ):
+        """
+        Armazena valor com TTL proprio
+
+        Args:
+            key: Chave da entrada
+            value: Valor serializavel em JSON
+            ttl: Tempo de vida em segundos
+            namespace: Namespace da entrada
+        """
+        now = time.time()
+        payload = json.dumps(value, ensure_ascii=False, default=str)
+        self._conn().execute(
+            "INSERT OR REPLACE INTO cache_entries "
+            "(namespace, key, value, created_at, expires_at) VALUES (?, ?, ?, ?, ?)",
+            (namespace, key, payload, now, now + ttl)
+        )
+        self._maybe_evict()
+
+    def delete(self, key: str, namespace: str = DEFAULT_NAMESPACE):
+        """Remove uma entrada"""
+        self._conn().execute(
+            "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+            (namespace, key)
+        )
+
+    def clear(self, namespace: Optional[str] = None):
+        """
+        Remove todas as entradas
+
+        Args:
+            namespace: Se informado, limpa apenas este namespace
+        """
+        if namespace is None:
+            self._conn().execute("DELETE FROM cache_entries")
+        else:
+            self._conn().execute(
+                "DELETE FROM cache_entries WHERE namespace = ?", (namespace,)
+            )
+
+    def count(self, namespace: Optional[str] = None) -> int:
+        """Retorna numero de entradas validas (nao expiradas)"""
+        now = time.time()
+        if namespace is None:
+            row = self._conn().execute(
+                "SELECT COUNT(*) FROM cache_entries WHERE expires_at >= ?", (now,)
+            ).fetchone()
+        else:
+            row = self._conn().execute(
+                "SELECT COUNT(*) FROM cache_entries WHERE namespace = ? AND expires_at >= ?",
+                (namespace, now)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def purge_expired(self) -> int:
+        """
+        Remove entradas expiradas
+
+        Returns:
+            Numero de entradas removidas
+        """
+        cursor = self._conn().execute(
+            "DELETE FROM cache_entries WHERE expires_at < ?", (time.time(),)
+        )
+        return cursor.rowcount
+
+    def _maybe_evict(self):
+        """Aplica limite de tamanho a cada `eviction_interval` escritas"""
+        if not self.max_entries:
+            return
+
+        with self._write_lock:
+            self._write_count += 1
+            if self._write_count % self.eviction_interval != 0:
+                return
+
+        self.purge_expired()
+        total = self._conn().execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+        excesso = total - self.max_entries
+        if excesso > 0:
+            self._conn().execute(
+                "DELETE FROM cache_entries WHERE rowid IN ("
+                "SELECT rowid FROM cache_entries ORDER BY created_at ASC LIMIT ?)",
+                (excesso,)
+            )
+
+    def close(self):
+        """Fecha a conexao da thread atual"""
+        self._conexoes.fechar()
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Estatisticas do store"""
+        return {
+            "arquivo": str(self.db_path),
+            "entradas": self.count(),
+            "max_entradas": self.max_entries,
+        }
@@ -14,6 +14,9 @@ from typing import Dict, List, Optional, Any
 from datetime import datetime
 import base64
 
+from resilience import AdaptadorResiliente
+from response_cache import CacheRespostas, com_cache, obter_cache_respostas
+
 # Configuração da API
 CNJ_API_CONFIG = {
     'homologacao': {
@@ -30,6 +33,13 @@ CNJ_API_CONFIG = {
 }
 
 
+def _chave_cnj(client: 'CNJCertidoesAPI', params: Dict[str, Any]) -> Dict[str, Any]:
+    """Chave de cache: argumentos da consulta, número só com dígitos, mais o ambiente"""
+    if params.get('numero_processo'):
+        params['numero_processo'] = ''.join(filter(str.isdigit, params['numero_processo']))
+    return {**params, 'ambiente': client.ambiente}
+
+
 class CNJCertidoesAPI:
     """Cliente para API de Certidões e Comunicações Processuais do CNJ"""
 
@@ -37,7 +47,9 @@ class CNJCertidoesAPI:
         self,
         usuario: Optional[str] = None,
         senha: Optional[str] = None,
-        ambiente: str = 'homologacao'
+        ambiente: str = 'homologacao',
+        cache_respostas: Optional[CacheRespostas] = None,
+        cache_enabled: bool = True
     ):
         """
         Inicializa cliente da API CNJ
@@ -46,10 +58,14 @@ class CNJCertidoesAPI:
             usuario: Usuário do sistema Corporativo CNJ
             senha: Senha do sistema Corporativo CNJ
             ambiente: 'homologacao' ou 'producao' (padrão: homologacao)
+            cache_respostas: Cache de respostas (padrão: cache compartilhado)
+            cache_enabled: Se False, toda consulta vai à API
         """
         self.usuario = usuario or os.getenv('CNJ_USUARIO')
         self.senha = senha or os.getenv('CNJ_SENHA')
         self.ambiente = ambiente
+        self.cache_respostas = cache_respostas
+        self.cache_enabled = cache_enabled
 
         if ambiente not in CNJ_API_CONFIG:
             raise ValueError(f"Ambiente inválido. Use 'homologacao' ou 'producao'")
@@ -63,11 +79,21 @@ class CNJCertidoesAPI:
             'Accept': 'application/json',
             'User-Agent': 'IAROM-Extrator-Processual/1.0'
         })
+        # Circuit breaker e limite de concorrência por host
+        # (compartilhados no processo: chave "cnj:<host>")
+        self.session.mount('https://', AdaptadorResiliente('cnj'))
 
         # Token de autenticação (será obtido no login)
         self.token = None
         self.token_expiracao = None
 
+    @property
+    def _cache(self) -> Optional[CacheRespostas]:
+        """Cache de respostas em uso (None se desligado)"""
+        if not self.cache_enabled:
+            return None
+        return self.cache_respostas or obter_cache_respostas()
+
     def autenticar(self) -> Dict[str, Any]:
         """
         Autentica na API CNJ
@@ -135,6 +161,7 @@ class CNJCertidoesAPI:
                 'erro': str(e)
             }
 
+    @com_cache('cnj', 'publicacao', chave=_chave_cnj)
     def buscar_publicacao(
         self,
         numero_processo: str,
@@ -152,7 +179,8 @@ class CNJCertidoesAPI:
             tribunal: Código do tribunal (ex: 'TJSP', 'STJ') - opcional
 
         Returns:
-            Dict com publicações encontradas
+            Dict com publicações encontradas (respostas vêm do cache de
+            respostas quando possível, sem autenticar)
         """
         if not self.token:
             auth_result = self.autenticar()
@@ -291,6 +319,7 @@ class CNJCertidoesAPI:
                 'erro': str(e)
             }
 
+    @com_cache('cnj', 'comunicacao', chave=_chave_cnj)
     def consultar_comunicacao(
         self,
         id_comunicacao: str
@@ -338,6 +367,7 @@ class CNJCertidoesAPI:
                 'erro': str(e)
             }
 
+    @com_cache('cnj', 'tribunais', chave=_chave_cnj)
     def listar_tribunais(self) -> Dict[str, Any]:
         """
         Lista tribunais disponíveis no sistema
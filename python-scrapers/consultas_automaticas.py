@@ -154,14 +154,9 @@ class ConsultasAutomaticas:
         try:
             client = CNJCertidoesAPI(ambiente='homologacao')
 
-            # Tentar autenticar (se credenciais disponíveis)
-            auth_result = client.autenticar()
-
-            if not auth_result.get('sucesso'):
-                print(f"   ⚠ Autenticação CNJ falhou: {auth_result.get('erro')}")
-                return None
-
-            # Buscar publicações recentes (últimos 90 dias)
+            # Buscar publicações recentes (últimos 90 dias); a autenticação
+            # acontece em buscar_publicacao e só quando a resposta não
+            # está no cache de respostas
             data_fim = datetime.now().strftime('%Y-%m-%d')
             data_inicio = (datetime.now() - timedelta(days=90)).strftime('%Y-%m-%d')
 
@@ -175,6 +170,9 @@ class ConsultasAutomaticas:
             if resultado.get('sucesso'):
                 print(f"   ✓ {resultado.get('total_publicacoes', 0)} publicações encontradas")
                 return resultado
+            elif resultado.get('erro'):
+                print(f"   ⚠ Consulta CNJ falhou: {resultado.get('erro')}")
+                return None
             else:
                 print(f"   ⚠ Nenhuma publicação encontrada")
                 return None
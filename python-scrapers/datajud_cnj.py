@@ -7,15 +7,44 @@ Documentação: https://datajud-wiki.cnj.jus.br/api-publica/
 
 import requests
 import os
-from typing import Dict, List, Optional, Any
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Any
 from datetime import datetime
 
+from sync_cursors import CursorStore, obter_cursor_store
+from resilience import AdaptadorResiliente, RequisicaoRejeitadaError
+from response_cache import (
+    NEGATIVO, PARCIAL, POSITIVO, CacheRespostas, classificar_resultado, obter_cache_respostas
+)
+
 # Configuração da API DataJud
 DATAJUD_CONFIG = {
     'base_url': 'https://api-publica.datajud.cnj.jus.br',
     'version': 'v1',
     'api_key': os.getenv('DATAJUD_API_KEY', 'cDZHYzlZa0JadVREZDJCendQbXY6SkJlTzNjLV9TRENyQk1RdnFKZGRQdw=='),
-    'timeout': 30
+    'timeout': 30,
+    'tamanho_lote': 100,  # consultas por requisição _msearch
+    'lotes_paralelos': 4,  # requisições _msearch simultâneas
+    'indices_paralelos': 8,  # índices consultados ao mesmo tempo no fan-out
+    'quarentena_indice': 300,  # s em que um índice que falhou fica fora do fan-out
+    'conexoes': 8,  # conexões keep-alive mantidas no pool
+    'tamanho_pagina': 500,  # hits por página nas iterações search_after
+    # Ordenação estável para search_after: @timestamp (indicado na documentação
+    # da API) se repete entre processos atualizados no mesmo lote, então o `id`
+    # do documento (keyword, único no índice) desempata o cursor
+    'ordenacao': [{'@timestamp': {'order': 'asc'}}, {'id': {'order': 'asc'}}],
+    'tamanho_agregacao': 50,  # valores por dimensão nas agregações terms
+    # Dimensões das agregações -> campo do índice (o ano é date_histogram)
+    'agregacoes': {
+        'tribunal': 'tribunal',
+        'classe': 'classe.nome',
+        'assunto': 'assuntos.nome',
+        'orgao_julgador': 'orgaoJulgador.nome',
+        'ano_ajuizamento': 'dataAjuizamento'
+    }
 }
 
 # Mapeamento de tribunais
@@ -63,24 +92,91 @@ TRIBUNAIS = {
     'TJAM': 'tjam',
     'TJAP': 'tjap',
     'TJMA': 'tjma',
+
+    # Justiça do Trabalho
+    **{f'TRT{i}': f'trt{i}' for i in range(1, 25)},
+}
+
+# Segmento J.TR do número CNJ (NNNNNNN-DD.AAAA.J.TR.OOOO) -> sigla em TRIBUNAIS
+_UFS_JUSTICA_ESTADUAL = [
+    'AC', 'AL', 'AP', 'AM', 'BA', 'CE', 'DFT', 'ES', 'GO', 'MA', 'MT', 'MS', 'MG', 'PA',
+    'PB', 'PR', 'PE', 'PI', 'RJ', 'RN', 'RS', 'RO', 'RR', 'SC', 'SE', 'SP', 'TO'
+]
+CODIGOS_TRIBUNAIS = {
+    ('3', '00'): 'STJ',
+    ('5', '00'): 'TST',
+    ('6', '00'): 'TSE',
+    ('7', '00'): 'STM',
+    **{('4', f'{i:02d}'): f'TRF{i}' for i in range(1, 7)},
+    **{('5', f'{i:02d}'): f'TRT{i}' for i in range(1, 25)},
+    **{('8', f'{i:02d}'): f'TJ{uf}' for i, uf in enumerate(_UFS_JUSTICA_ESTADUAL, start=1)},
 }
 
 
+def tribunal_do_numero(numero_processo: str) -> Optional[str]:
+    """
+    Sigla do tribunal pelo segmento J.TR do número CNJ
+
+    Args:
+        numero_processo: Número do processo (formato CNJ ou só dígitos)
+
+    Returns:
+        Sigla em TRIBUNAIS (ex: 'TJSP', 'TRF1') ou None se o número não
+        tiver 20 dígitos ou o segmento não estiver mapeado
+    """
+    digitos = ''.join(filter(str.isdigit, numero_processo))
+    if len(digitos) != 20:
+        return None
+    return CODIGOS_TRIBUNAIS.get((digitos[13], digitos[14:16]))
+
+
+class DataJudError(Exception):
+    """Erro da API DataJud durante uma iteração (iterar_*)"""
+    pass
+
+
 class DataJudCNJ:
     """Cliente para API DataJud do CNJ"""
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        cursor_store: Optional[CursorStore] = None,
+        cache_respostas: Optional[CacheRespostas] = None,
+        cache_enabled: bool = True
+    ):
         """
         Inicializa cliente DataJud
 
         Args:
             api_key: Chave de API (se não fornecida, usa variável de ambiente)
+            cursor_store: Cursores de sincronizar_movimentacoes (padrão: store compartilhado)
+            cache_respostas: Cache de respostas (padrão: cache compartilhado)
+            cache_enabled: Se False, toda consulta vai à API
         """
         self.api_key = api_key or DATAJUD_CONFIG['api_key']
+        self.cursor_store = cursor_store
+        self.cache_respostas = cache_respostas
+        self.cache_enabled = cache_enabled
         self.base_url = DATAJUD_CONFIG['base_url']
         self.version = DATAJUD_CONFIG['version']
         self.timeout = DATAJUD_CONFIG['timeout']
 
+        # Índices que falharam num fan-out -> instante até o qual são pulados
+        self._quarentena: Dict[str, float] = {}
+        self._quarentena_lock = threading.Lock()
+
+        # Sessão keep-alive (pool de conexões reaproveitado entre consultas)
+        # com circuit breaker e limite de concorrência por host
+        # (compartilhados no processo: chave "datajud:<host>")
+        self.session = requests.Session()
+        self.session.headers.update({'Authorization': f'APIKey {self.api_key}'})
+        self.session.mount('https://', AdaptadorResiliente(
+            'datajud',
+            pool_connections=1,
+            pool_maxsize=DATAJUD_CONFIG['conexoes']
+        ))
+
         if not self.api_key or self.api_key == '':
             raise ValueError(
                 "Chave de API não configurada. "
@@ -88,39 +184,307 @@ class DataJudCNJ:
                 "https://datajud-wiki.cnj.jus.br/api-publica/"
             )
 
-    def _make_request(self, query: Dict[str, Any]) -> Dict[str, Any]:
+    def _make_request(self, query: Dict[str, Any], indice: Optional[str] = None) -> Dict[str, Any]:
         """
         Faz requisição à API DataJud
 
         Args:
             query: Query ElasticSearch para enviar
+            indice: Índice do tribunal (padrão: índice genérico da versão)
 
         Returns:
             Resposta da API (JSON)
         """
-        url = f"{self.base_url}/api_publica_{self.version}/_search"
-
-        headers = {
-            'Authorization': f'APIKey {self.api_key}',
-            'Content-Type': 'application/json'
-        }
+        url = f"{self.base_url}/{indice or self._indice_generico}/_search"
 
         try:
-            response = requests.post(
+            response = self.session.post(
                 url,
                 json=query,
-                headers=headers,
                 timeout=self.timeout
             )
             response.raise_for_status()
             return response.json()
 
-        except requests.exceptions.Timeout:
-            return {'erro': 'Timeout na requisição à API DataJud', 'sucesso': False}
-        except requests.exceptions.RequestException as e:
-            return {'erro': f'Erro na requisição: {str(e)}', 'sucesso': False}
         except Exception as e:
-            return {'erro': f'Erro inesperado: {str(e)}', 'sucesso': False}
+            return self._erro_requisicao(e)
+
+    def _make_msearch(self, queries: List[Dict[str, Any]], indice: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Envia várias queries numa única requisição _msearch
+
+        Args:
+            queries: Queries ElasticSearch (uma por consulta)
+            indice: Índice do tribunal (padrão: índice genérico da versão)
+
+        Returns:
+            Uma resposta por query, na mesma ordem. Falha de uma query
+            vira {'erro': ...} só na posição dela; falha da requisição
+            inteira vira o mesmo {'erro': ...} em todas as posições.
+        """
+        if not queries:
+            return []
+
+        url = f"{self.base_url}/{indice or self._indice_generico}/_msearch"
+
+        # NDJSON: cabeçalho (índice do caminho) + corpo de cada query
+        linhas = []
+        for query in queries:
+            linhas.append('{}')
+            linhas.append(json.dumps(query, ensure_ascii=False))
+        corpo = ('\n'.join(linhas) + '\n').encode('utf-8')
+
+        try:
+            response = self.session.post(
+                url,
+                data=corpo,
+                headers={'Content-Type': 'application/x-ndjson'},
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+            respostas = response.json().get('responses', [])
+        except Exception as e:
+            return [self._erro_requisicao(e) for _ in queries]
+
+        resultados = []
+        for i in range(len(queries)):
+            resposta = respostas[i] if i < len(respostas) else None
+            if resposta is None:
+                resultados.append({'erro': 'Resposta ausente no _msearch', 'sucesso': False})
+            elif 'error' in resposta:
+                erro = resposta['error']
+                motivo = (erro.get('reason') or erro.get('type')) if isinstance(erro, dict) else erro
+                resultados.append({
+                    'erro': f'Erro na consulta: {motivo}',
+                    'sucesso': False,
+                    'status': resposta.get('status')
+                })
+            else:
+                resultados.append(resposta)
+        return resultados
+
+    @staticmethod
+    def _erro_requisicao(erro: Exception) -> Dict[str, Any]:
+        """
+        Converte exceção de requisição no dict de erro da API
+
+        Args:
+            erro: Exceção levantada na requisição
+
+        Returns:
+            Dict com 'erro' e 'sucesso' False
+        """
+        if isinstance(erro, requests.exceptions.Timeout):
+            return {'erro': 'Timeout na requisição à API DataJud', 'sucesso': False}
+        if isinstance(erro, RequisicaoRejeitadaError):
+            return {'erro': f'API DataJud indisponível: {str(erro)}', 'sucesso': False}
+        if isinstance(erro, requests.exceptions.RequestException):
+            return {'erro': f'Erro na requisição: {str(erro)}', 'sucesso': False}
+        return {'erro': f'Erro inesperado: {str(erro)}', 'sucesso': False}
+
+    # =========================================================================
+    # ROTEAMENTO POR ÍNDICE
+    # =========================================================================
+
+    @property
+    def _indice_generico(self) -> str:
+        """Índice usado quando nenhum índice de tribunal é informado"""
+        return f"api_publica_{self.version}"
+
+    @staticmethod
+    def _indice(tribunal: Optional[str]) -> Optional[str]:
+        """
+        Índice DataJud de um tribunal
+
+        Args:
+            tribunal: Sigla do tribunal (ex: 'TJGO')
+
+        Returns:
+            Nome do índice (ex: 'api_publica_tjgo') ou None se a sigla não
+            estiver em TRIBUNAIS
+        """
+        sigla = (tribunal or '').upper()
+        return f"api_publica_{TRIBUNAIS[sigla]}" if sigla in TRIBUNAIS else None
+
+    @staticmethod
+    def _indices_todos() -> List[str]:
+        """
+        Índices do fan-out: tribunais com segmento J.TR no número CNJ
+
+        Tribunais fora do esquema (como o STF) só são consultados quando
+        informados explicitamente.
+        """
+        return list(dict.fromkeys(
+            f"api_publica_{TRIBUNAIS[sigla]}" for sigla in CODIGOS_TRIBUNAIS.values()
+        ))
+
+    def _indice_tribunal(self, tribunal: str) -> str:
+        """Índice de um tribunal obrigatório; siglas fora de TRIBUNAIS viram api_publica_<sigla>"""
+        return self._indice(tribunal) or f"api_publica_{tribunal.lower()}"
+
+    def _indices_consulta(self, tribunal: Optional[str] = None, numero_processo: Optional[str] = None) -> List[str]:
+        """
+        Índices a consultar: o do tribunal informado, senão o derivado do
+        número CNJ, senão todos (fan-out)
+
+        Args:
+            tribunal: Sigla do tribunal (opcional)
+            numero_processo: Número do processo (opcional)
+
+        Returns:
+            Lista de índices (um só quando o tribunal é conhecido)
+        """
+        indice = self._indice(tribunal)
+        if indice is None and numero_processo:
+            indice = self._indice(tribunal_do_numero(numero_processo))
+        return [indice] if indice else self._indices_todos()
+
+    # =========================================================================
+    # CACHE DE RESPOSTAS
+    # =========================================================================
+
+    @property
+    def _cache(self) -> Optional[CacheRespostas]:
+        """Cache de respostas em uso (None se desligado)"""
+        if not self.cache_enabled:
+            return None
+        return self.cache_respostas or obter_cache_respostas()
+
+    @staticmethod
+    def _classificar_resposta(resposta: Dict[str, Any]) -> Optional[str]:
+        """
+        Classificação de uma resposta bruta da API para o cache
+
+        Args:
+            resposta: Resposta da API (ou dict com 'erro')
+
+        Returns:
+            POSITIVO (com hits), NEGATIVO (sem hits), PARCIAL (fan-out com
+            algum índice em erro, guardado por pouco tempo) ou None para erros
+        """
+        if 'erro' in resposta:
+            return None
+        if resposta.get('parcial'):
+            return PARCIAL
+        return POSITIVO if resposta.get('hits', {}).get('hits') else NEGATIVO
+
+    @staticmethod
+    def _chave_busca(query: Dict[str, Any], indices: List[str]) -> Dict[str, Any]:
+        """Parâmetros da chave de cache de uma query"""
+        return {'query': query, 'indices': indices}
+
+    def _make_request_indices(
+        self,
+        query: Dict[str, Any],
+        indices: List[str],
+        usar_cache: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Executa a mesma query em vários índices, em paralelo
+
+        Respostas (inclusive sem hits, com TTL menor) ficam no cache de
+        respostas, pela query e pelos índices.
+
+        Args:
+            query: Query ElasticSearch
+            indices: Índices a consultar
+            usar_cache: Se False, ignora o cache (consulta sempre a API)
+
+        Returns:
+            Resposta única (hits de todos os índices, os de maior _score
+            primeiro, limitados ao `size` da query) ou dict com 'erro'
+            se todos os índices falharem
+        """
+        cache = self._cache if usar_cache else None
+        if cache is None:
+            return self._buscar_indices(query, indices)
+        return cache.consultar(
+            'datajud', 'search', self._chave_busca(query, indices),
+            lambda: self._buscar_indices(query, indices),
+            self._classificar_resposta
+        )
+
+    def _buscar_indices(self, query: Dict[str, Any], indices: List[str]) -> Dict[str, Any]:
+        """Executa a query nos índices e junta as respostas (sem cache)"""
+        if len(indices) == 1:
+            return self._make_request(query, indices[0])
+        return self._combinar_respostas(self._make_request_paralelo(query, indices), query.get('size', 10))
+
+    def _make_request_paralelo(self, query: Dict[str, Any], indices: List[str]) -> List[Dict[str, Any]]:
+        """
+        Executa a mesma query em cada índice, em paralelo
+
+        Args:
+            query: Query ElasticSearch
+            indices: Índices a consultar
+
+        Returns:
+            Uma resposta (ou dict com 'erro') por índice, na ordem de
+            `indices`; índices em quarentena (falharam há pouco num
+            fan-out) recebem o erro sem nova requisição
+        """
+        if len(indices) == 1:
+            return [self._make_request(query, indices[0])]
+
+        agora = time.monotonic()
+        with self._quarentena_lock:
+            pulados = {i for i in indices if self._quarentena.get(i, 0) > agora}
+        consultar = [i for i in indices if i not in pulados]
+
+        respostas: Dict[str, Dict[str, Any]] = {}
+        if consultar:
+            with ThreadPoolExecutor(
+                max_workers=min(DATAJUD_CONFIG['indices_paralelos'], len(consultar)),
+                thread_name_prefix="datajud-indice"
+            ) as executor:
+                respostas = dict(zip(
+                    consultar, executor.map(lambda indice: self._make_request(query, indice), consultar)
+                ))
+
+        # Um índice quebrado não deve custar uma requisição (e um timeout)
+        # a cada consulta sem tribunal conhecido
+        falhas = [i for i, r in respostas.items() if 'erro' in r]
+        if falhas and len(falhas) < len(respostas):
+            ate = time.monotonic() + DATAJUD_CONFIG['quarentena_indice']
+            with self._quarentena_lock:
+                for indice in falhas:
+                    self._quarentena[indice] = ate
+
+        return [
+            respostas.get(indice) or {'erro': 'Índice em quarentena após falha recente', 'sucesso': False}
+            for indice in indices
+        ]
+
+    @staticmethod
+    def _combinar_respostas(respostas: List[Dict[str, Any]], tamanho: int = 10) -> Dict[str, Any]:
+        """
+        Junta as respostas de uma query executada em vários índices
+
+        Args:
+            respostas: Respostas da API (ou dicts com 'erro'), uma por índice
+            tamanho: Máximo de hits na resposta combinada
+
+        Returns:
+            Resposta no formato da API (com 'parcial' se algum índice
+            falhou), ou o primeiro erro se nenhum índice respondeu
+        """
+        if len(respostas) == 1:
+            return respostas[0]
+
+        validas = [r for r in respostas if 'erro' not in r]
+        if not validas:
+            return respostas[0] if respostas else {'erro': 'Nenhum índice consultado', 'sucesso': False}
+
+        hits = [hit for r in validas for hit in r.get('hits', {}).get('hits', [])]
+        hits.sort(key=lambda hit: hit.get('_score') or 0, reverse=True)
+        total = sum(
+            r['hits']['total']['value'] if 'total' in r.get('hits', {}) else len(r.get('hits', {}).get('hits', []))
+            for r in validas
+        )
+        combinada = {'hits': {'total': {'value': total}, 'hits': hits[:tamanho]}}
+        if len(validas) < len(respostas):
+            combinada['parcial'] = True
+        return combinada
 
     def buscar_processo(self, numero_processo: str, tribunal: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -133,40 +497,136 @@ class DataJudCNJ:
         Returns:
             Dict com resultados da busca
         """
+        query = self._query_numero(numero_processo)
+        indices = self._indices_consulta(tribunal, numero_processo)
+        return self._formatar_busca_numero(self._make_request_indices(query, indices))
+
+    def buscar_processos(
+        self,
+        numeros_processo: Iterable[str],
+        tribunal: Optional[str] = None,
+        tamanho_lote: Optional[int] = None,
+        lotes_paralelos: Optional[int] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Busca vários processos por número em lotes _msearch
+
+        Cada lote leva até `tamanho_lote` números numa única requisição,
+        pela mesma sessão keep-alive: 5.000 números viram 50 requisições
+        em vez de 5.000. Os números são agrupados pelo índice do tribunal
+        (segmento J.TR do número CNJ), e cada lote vai ao índice do seu
+        tribunal; números sem tribunal reconhecível entram nos lotes de
+        todos os índices. Números já no cache de respostas (mesma chave
+        de buscar_processo) não são consultados.
+
+        Args:
+            numeros_processo: Números dos processos (formato CNJ ou só dígitos)
+            tribunal: Sigla do tribunal (ex: 'TJGO', 'STJ') - opcional; quando
+                informado, todos os números vão ao índice dele
+            tamanho_lote: Números por requisição (padrão: DATAJUD_CONFIG['tamanho_lote'])
+            lotes_paralelos: Requisições simultâneas (padrão: DATAJUD_CONFIG['lotes_paralelos'])
+
+        Returns:
+            Dict número informado -> resultado no formato de buscar_processo;
+            erros (de uma consulta ou do lote inteiro) ficam no resultado
+            de cada número afetado
+        """
+        tamanho_lote = max(1, tamanho_lote or DATAJUD_CONFIG['tamanho_lote'])
+        lotes_paralelos = max(1, lotes_paralelos or DATAJUD_CONFIG['lotes_paralelos'])
+
+        # Números repetidos (mesmos dígitos) são consultados uma vez
+        numeros = list(numeros_processo)
+        unicos = list(dict.fromkeys(''.join(filter(str.isdigit, n)) for n in numeros))
+
+        cache = self._cache
+        indices_numero = {numero: self._indices_consulta(tribunal, numero) for numero in unicos}
+        em_cache: Dict[str, Dict[str, Any]] = {}
+        if cache is not None:
+            for numero, indices in indices_numero.items():
+                resposta = cache.obter('datajud', 'search', self._chave_busca(self._query_numero(numero), indices))
+                if resposta is not None:
+                    em_cache[numero] = resposta
+
+        por_indice: Dict[str, List[str]] = {}
+        for numero in unicos:
+            if numero in em_cache:
+                continue
+            for indice in indices_numero[numero]:
+                por_indice.setdefault(indice, []).append(numero)
+
+        lotes = [
+            (indice, grupo[i:i + tamanho_lote])
+            for indice, grupo in por_indice.items()
+            for i in range(0, len(grupo), tamanho_lote)
+        ]
+
+        def consultar(lote: Tuple[str, List[str]]) -> List[Dict[str, Any]]:
+            indice, numeros_lote = lote
+            return self._make_msearch([self._query_numero(n) for n in numeros_lote], indice)
+
+        respostas: Dict[str, List[Dict[str, Any]]] = {numero: [] for numero in unicos if numero not in em_cache}
+        if len(lotes) > 1 and lotes_paralelos > 1:
+            with ThreadPoolExecutor(
+                max_workers=min(lotes_paralelos, len(lotes)),
+                thread_name_prefix="datajud-lote"
+            ) as executor:
+                for (_, numeros_lote), resultado in zip(lotes, executor.map(consultar, lotes)):
+                    for numero, resposta in zip(numeros_lote, resultado):
+                        respostas[numero].append(resposta)
+        else:
+            for lote in lotes:
+                for numero, resposta in zip(lote[1], consultar(lote)):
+                    respostas[numero].append(resposta)
+
+        for numero, lista in respostas.items():
+            em_cache[numero] = self._combinar_respostas(lista)
+            if cache is not None:
+                cache.gravar(
+                    'datajud', 'search',
+                    self._chave_busca(self._query_numero(numero), indices_numero[numero]),
+                    em_cache[numero], self._classificar_resposta
+                )
+
+        por_numero = {numero: self._formatar_busca_numero(resposta) for numero, resposta in em_cache.items()}
+        return {n: por_numero[''.join(filter(str.isdigit, n))] for n in numeros}
+
+    def _query_numero(self, numero_processo: str) -> Dict[str, Any]:
+        """
+        Query de busca por número de processo
+
+        O tribunal não entra na query: é o índice consultado que o define.
+
+        Args:
+            numero_processo: Número do processo (formato CNJ)
+
+        Returns:
+            Query ElasticSearch
+        """
         # Limpar número do processo (apenas dígitos)
         numero_limpo = ''.join(filter(str.isdigit, numero_processo))
 
-        # Construir query
-        if tribunal and tribunal.upper() in TRIBUNAIS:
-            # Busca com tribunal específico
-            query = {
-                "query": {
-                    "bool": {
-                        "must": [
-                            {"match": {"numeroProcesso": numero_limpo}},
-                            {"match": {"siglaTribunal": TRIBUNAIS[tribunal.upper()]}}
-                        ]
-                    }
-                },
-                "size": 10
-            }
-        else:
-            # Busca sem tribunal específico
-            query = {
-                "query": {
-                    "match": {
-                        "numeroProcesso": numero_limpo
-                    }
-                },
-                "size": 10
-            }
+        return {
+            "query": {
+                "match": {
+                    "numeroProcesso": numero_limpo
+                }
+            },
+            "size": 10
+        }
+
+    def _formatar_busca_numero(self, resultado: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Formata a resposta de uma busca por número
 
-        resultado = self._make_request(query)
+        Args:
+            resultado: Resposta da API (ou dict com 'erro')
 
+        Returns:
+            Dict com resultados da busca
+        """
         if 'erro' in resultado:
             return resultado
 
-        # Formatar resultados
         if 'hits' in resultado and 'hits' in resultado['hits']:
             processos = [self._formatar_resultado(hit) for hit in resultado['hits']['hits']]
             return {
@@ -193,9 +653,6 @@ class DataJudCNJ:
             {"match": {"partes.nome": nome_parte}}
         ]
 
-        if tribunal and tribunal.upper() in TRIBUNAIS:
-            must_clauses.append({"match": {"siglaTribunal": TRIBUNAIS[tribunal.upper()]}})
-
         query = {
             "query": {
                 "bool": {
@@ -205,7 +662,7 @@ class DataJudCNJ:
             "size": limite
         }
 
-        resultado = self._make_request(query)
+        resultado = self._make_request_indices(query, self._indices_consulta(tribunal))
 
         if 'erro' in resultado:
             return resultado
@@ -239,9 +696,6 @@ class DataJudCNJ:
             {"match": {"partes.documento": doc_limpo}}
         ]
 
-        if tribunal and tribunal.upper() in TRIBUNAIS:
-            must_clauses.append({"match": {"siglaTribunal": TRIBUNAIS[tribunal.upper()]}})
-
         query = {
             "query": {
                 "bool": {
@@ -251,7 +705,7 @@ class DataJudCNJ:
             "size": 50
         }
 
-        resultado = self._make_request(query)
+        resultado = self._make_request_indices(query, self._indices_consulta(tribunal))
 
         if 'erro' in resultado:
             return resultado
@@ -277,6 +731,62 @@ class DataJudCNJ:
         Returns:
             Dict com movimentações do processo
         """
+        processo = self._consultar_movimentos(numero_processo)
+
+        if 'erro' in processo:
+            return processo
+
+        return {
+            'sucesso': True,
+            'numero': processo.get('numeroProcesso'),
+            'classe': processo.get('classe'),
+            'assuntos': processo.get('assuntos', []),
+            'data_ajuizamento': processo.get('dataAjuizamento'),
+            'movimentos': processo.get('movimentos', [])[:50]  # Primeiras 50 movimentações
+        }
+
+    def sincronizar_movimentacoes(self, numero_processo: str) -> Dict[str, Any]:
+        """
+        Sincroniza movimentações de forma incremental
+
+        Mantém um cursor por processo (data do último movimento e hash do
+        conteúdo) e devolve apenas os movimentos posteriores à última
+        sincronização. Na primeira chamada todos os movimentos são novos.
+
+        Args:
+            numero_processo: Número do processo
+
+        Returns:
+            Dict com os movimentos novos ('novas') e a posição do cursor
+        """
+        processo = self._consultar_movimentos(numero_processo, usar_cache=False)
+
+        if 'erro' in processo:
+            return processo
+
+        store = self.cursor_store or obter_cursor_store()
+        delta = store.sincronizar(
+            'datajud',
+            ''.join(filter(str.isdigit, numero_processo)),
+            processo.get('movimentos', []),
+            lambda mov: mov.get('dataHora'),
+            lambda mov: mov,
+            lambda mov: (mov.get('dataHora', ''), f"{mov.get('codigo', '')} {mov.get('nome', '')}")
+        )
+
+        return {'sucesso': True, **delta.to_dict(), 'numero': processo.get('numeroProcesso')}
+
+    def _consultar_movimentos(self, numero_processo: str, usar_cache: bool = True) -> Dict[str, Any]:
+        """
+        Consulta os movimentos de um processo
+
+        Args:
+            numero_processo: Número do processo
+            usar_cache: Se False, consulta sempre a API (sincronização)
+
+        Returns:
+            _source do processo ou dict com 'erro'
+        """
         numero_limpo = ''.join(filter(str.isdigit, numero_processo))
 
         query = {
@@ -289,21 +799,15 @@ class DataJudCNJ:
             "size": 1
         }
 
-        resultado = self._make_request(query)
+        resultado = self._make_request_indices(
+            query, self._indices_consulta(numero_processo=numero_processo), usar_cache
+        )
 
         if 'erro' in resultado:
             return resultado
 
         if 'hits' in resultado and 'hits' in resultado['hits'] and len(resultado['hits']['hits']) > 0:
-            processo = resultado['hits']['hits'][0]['_source']
-            return {
-                'sucesso': True,
-                'numero': processo.get('numeroProcesso'),
-                'classe': processo.get('classe'),
-                'assuntos': processo.get('assuntos', []),
-                'data_ajuizamento': processo.get('dataAjuizamento'),
-                'movimentos': processo.get('movimentos', [])[:50]  # Primeiras 50 movimentações
-            }
+            return resultado['hits']['hits'][0]['_source']
 
         return {'sucesso': False, 'erro': 'Processo não encontrado'}
 
@@ -320,8 +824,7 @@ class DataJudCNJ:
             Dict com resultados da busca
         """
         must_clauses = [
-            {"match": {"classe": classe}},
-            {"match": {"siglaTribunal": TRIBUNAIS.get(tribunal.upper(), tribunal.lower())}}
+            {"match": {"classe": classe}}
         ]
 
         if assunto:
@@ -336,7 +839,7 @@ class DataJudCNJ:
             "size": 50
         }
 
-        resultado = self._make_request(query)
+        resultado = self._make_request_indices(query, [self._indice_tribunal(tribunal)])
 
         if 'erro' in resultado:
             return resultado
@@ -353,6 +856,356 @@ class DataJudCNJ:
 
         return {'sucesso': False, 'erro': 'Nenhum processo encontrado', 'processos': []}
 
+    def iterar_por_parte(
+        self,
+        nome_parte: str,
+        tribunal: Optional[str] = None,
+        campos: Optional[List[str]] = None,
+        tamanho_pagina: Optional[int] = None,
+        max_resultados: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Itera todos os processos de uma parte, página a página
+
+        Ao contrário de buscar_por_parte (uma página de `limite` hits),
+        percorre o resultado inteiro com cursores search_after; só uma
+        página fica em memória.
+
+        Args:
+            nome_parte: Nome da parte
+            tribunal: Sigla do tribunal (opcional)
+            campos: Campos de _source a transferir (padrão: todos)
+            tamanho_pagina: Hits por requisição (padrão: DATAJUD_CONFIG['tamanho_pagina'])
+            max_resultados: Para após este número de processos (padrão: todos)
+
+        Yields:
+            Processos no formato de _formatar_resultado
+
+        Raises:
+            DataJudError: Se uma página falhar
+        """
+        must_clauses = [{"match": {"partes.nome": nome_parte}}]
+
+        yield from self._iterar_query(
+            {"bool": {"must": must_clauses}}, campos, tamanho_pagina, max_resultados,
+            self._indices_consulta(tribunal)
+        )
+
+    def iterar_por_documento(
+        self,
+        documento: str,
+        tribunal: Optional[str] = None,
+        campos: Optional[List[str]] = None,
+        tamanho_pagina: Optional[int] = None,
+        max_resultados: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Itera todos os processos de um CPF/CNPJ, página a página
+
+        Args:
+            documento: CPF ou CNPJ
+            tribunal: Sigla do tribunal (opcional)
+            campos: Campos de _source a transferir (padrão: todos)
+            tamanho_pagina: Hits por requisição (padrão: DATAJUD_CONFIG['tamanho_pagina'])
+            max_resultados: Para após este número de processos (padrão: todos)
+
+        Yields:
+            Processos no formato de _formatar_resultado
+
+        Raises:
+            DataJudError: Se uma página falhar
+        """
+        doc_limpo = ''.join(filter(str.isdigit, documento))
+        must_clauses = [{"match": {"partes.documento": doc_limpo}}]
+
+        yield from self._iterar_query(
+            {"bool": {"must": must_clauses}}, campos, tamanho_pagina, max_resultados,
+            self._indices_consulta(tribunal)
+        )
+
+    def iterar_por_classe(
+        self,
+        classe: str,
+        tribunal: str,
+        assunto: Optional[str] = None,
+        campos: Optional[List[str]] = None,
+        tamanho_pagina: Optional[int] = None,
+        max_resultados: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Itera todos os processos de uma classe processual, página a página
+
+        Args:
+            classe: Classe processual (ex: "Recurso Especial")
+            tribunal: Sigla do tribunal
+            assunto: Assunto (opcional)
+            campos: Campos de _source a transferir (padrão: todos)
+            tamanho_pagina: Hits por requisição (padrão: DATAJUD_CONFIG['tamanho_pagina'])
+            max_resultados: Para após este número de processos (padrão: todos)
+
+        Yields:
+            Processos no formato de _formatar_resultado
+
+        Raises:
+            DataJudError: Se uma página falhar
+        """
+        must_clauses = [{"match": {"classe": classe}}]
+        if assunto:
+            must_clauses.append({"match": {"assunto": assunto}})
+
+        yield from self._iterar_query(
+            {"bool": {"must": must_clauses}}, campos, tamanho_pagina, max_resultados,
+            [self._indice_tribunal(tribunal)]
+        )
+
+    def _iterar_query(
+        self,
+        query: Dict[str, Any],
+        campos: Optional[List[str]] = None,
+        tamanho_pagina: Optional[int] = None,
+        max_resultados: Optional[int] = None,
+        indices: Optional[List[str]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Percorre todos os hits de uma query com search_after
+
+        Cada página é pedida com a ordenação estável de
+        DATAJUD_CONFIG['ordenacao'] e continua a partir do `sort` do
+        último hit da página anterior (sem o custo de from/size profundo
+        nem o limite de 10.000 hits). O total não é contado
+        (track_total_hits desligado). Com vários índices (tribunal não
+        informado), eles são percorridos um após o outro, dividindo o
+        mesmo `max_resultados`.
+
+        Args:
+            query: Cláusula "query" do ElasticSearch
+            campos: Campos de _source a transferir (padrão: todos)
+            tamanho_pagina: Hits por requisição
+            max_resultados: Para após este número de hits (padrão: todos)
+            indices: Índices a percorrer (padrão: índice genérico da versão)
+
+        Yields:
+            Hits formatados por _formatar_resultado
+
+        Raises:
+            DataJudError: Se uma página falhar
+        """
+        tamanho_pagina = max(1, tamanho_pagina or DATAJUD_CONFIG['tamanho_pagina'])
+        corpo: Dict[str, Any] = {
+            "query": query,
+            "sort": DATAJUD_CONFIG['ordenacao'],
+            "track_total_hits": False
+        }
+        if campos is not None:
+            corpo["_source"] = list(campos)
+
+        entregues = 0
+        for indice in indices or [None]:
+            corpo.pop("search_after", None)
+            while max_resultados is None or entregues < max_resultados:
+                restante = None if max_resultados is None else max_resultados - entregues
+                corpo["size"] = tamanho_pagina if restante is None else min(tamanho_pagina, restante)
+
+                resultado = self._make_request(dict(corpo), indice)
+                if 'erro' in resultado:
+                    raise DataJudError(resultado['erro'])
+
+                hits = resultado.get('hits', {}).get('hits', [])
+                for hit in hits:
+                    yield self._formatar_resultado(hit)
+                entregues += len(hits)
+
+                # Página incompleta (ou hit sem cursor): fim deste índice
+                if len(hits) < corpo["size"] or not hits[-1].get('sort'):
+                    break
+                corpo["search_after"] = hits[-1]['sort']
+
+    # =========================================================================
+    # AGREGAÇÕES
+    # =========================================================================
+
+    def agregar_por_parte(
+        self,
+        nome_parte: str,
+        tribunal: Optional[str] = None,
+        dimensoes: Optional[List[str]] = None,
+        tamanho: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Estatísticas dos processos de uma parte, sem transferir hits
+
+        Args:
+            nome_parte: Nome da parte
+            tribunal: Sigla do tribunal (opcional; sem ele, todos os índices)
+            dimensoes: Dimensões de DATAJUD_CONFIG['agregacoes'] (padrão: todas)
+            tamanho: Valores por dimensão (padrão: DATAJUD_CONFIG['tamanho_agregacao'])
+
+        Returns:
+            Dict no formato de _agregar, com 'nome_parte'
+        """
+        query = {"bool": {"must": [{"match": {"partes.nome": nome_parte}}]}}
+        resultado = self._agregar(query, self._indices_consulta(tribunal), dimensoes, tamanho)
+        return {**resultado, 'nome_parte': nome_parte} if resultado.get('sucesso') else resultado
+
+    def agregar_por_documento(
+        self,
+        documento: str,
+        tribunal: Optional[str] = None,
+        dimensoes: Optional[List[str]] = None,
+        tamanho: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Estatísticas dos processos de um CPF/CNPJ, sem transferir hits
+
+        Args:
+            documento: CPF ou CNPJ
+            tribunal: Sigla do tribunal (opcional; sem ele, todos os índices)
+            dimensoes: Dimensões de DATAJUD_CONFIG['agregacoes'] (padrão: todas)
+            tamanho: Valores por dimensão (padrão: DATAJUD_CONFIG['tamanho_agregacao'])
+
+        Returns:
+            Dict no formato de _agregar, com 'documento'
+        """
+        doc_limpo = ''.join(filter(str.isdigit, documento))
+        query = {"bool": {"must": [{"match": {"partes.documento": doc_limpo}}]}}
+        resultado = self._agregar(query, self._indices_consulta(tribunal), dimensoes, tamanho)
+        return {**resultado, 'documento': documento} if resultado.get('sucesso') else resultado
+
+    def agregar_por_classe(
+        self,
+        classe: str,
+        tribunal: Optional[str] = None,
+        assunto: Optional[str] = None,
+        dimensoes: Optional[List[str]] = None,
+        tamanho: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Estatísticas de uma classe processual, sem transferir hits
+
+        Args:
+            classe: Classe processual (ex: "Execução Fiscal")
+            tribunal: Sigla do tribunal (opcional; sem ele, todos os índices)
+            assunto: Assunto (opcional)
+            dimensoes: Dimensões de DATAJUD_CONFIG['agregacoes'] (padrão: todas)
+            tamanho: Valores por dimensão (padrão: DATAJUD_CONFIG['tamanho_agregacao'])
+
+        Returns:
+            Dict no formato de _agregar, com 'classe'
+        """
+        must_clauses = [{"match": {"classe": classe}}]
+        if assunto:
+            must_clauses.append({"match": {"assunto": assunto}})
+
+        indices = [self._indice_tribunal(tribunal)] if tribunal else self._indices_todos()
+        resultado = self._agregar({"bool": {"must": must_clauses}}, indices, dimensoes, tamanho)
+        return {**resultado, 'classe': classe} if resultado.get('sucesso') else resultado
+
+    def _agregar(
+        self,
+        query: Dict[str, Any],
+        indices: List[str],
+        dimensoes: Optional[List[str]] = None,
+        tamanho: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Conta os processos de uma query por dimensão (size: 0)
+
+        O ElasticSearch devolve só os buckets das agregações (terms e,
+        para o ano, date_histogram): milhões de processos cabem numa
+        resposta pequena. Com vários índices, cada um é consultado em
+        paralelo e as contagens são somadas por valor. Resultados completos
+        ficam no cache de respostas.
+
+        Args:
+            query: Cláusula "query" do ElasticSearch
+            indices: Índices a consultar
+            dimensoes: Dimensões de DATAJUD_CONFIG['agregacoes'] (padrão: todas)
+            tamanho: Valores por dimensão (padrão: DATAJUD_CONFIG['tamanho_agregacao'])
+
+        Returns:
+            Dict com 'total' e, em 'agregacoes', cada dimensão com
+            'valores' ([{'chave', 'total'}], do mais frequente; o ano em
+            ordem cronológica) e 'outros' (processos fora dos valores
+            listados); 'indices_com_erro' lista os índices que falharam.
+            Dict com 'erro' se todos falharem.
+        """
+        campos = DATAJUD_CONFIG['agregacoes']
+        dimensoes = list(dimensoes or campos)
+        desconhecidas = [d for d in dimensoes if d not in campos]
+        if desconhecidas:
+            raise ValueError(f"Dimensões desconhecidas: {', '.join(desconhecidas)}")
+        tamanho = max(1, tamanho or DATAJUD_CONFIG['tamanho_agregacao'])
+
+        aggs: Dict[str, Any] = {}
+        for dimensao in dimensoes:
+            if dimensao == 'ano_ajuizamento':
+                aggs[dimensao] = {"date_histogram": {
+                    "field": campos[dimensao], "calendar_interval": "year",
+                    "format": "yyyy", "min_doc_count": 1
+                }}
+            else:
+                aggs[dimensao] = {"terms": {"field": campos[dimensao], "size": tamanho}}
+
+        corpo = {"query": query, "size": 0, "track_total_hits": True, "aggs": aggs}
+
+        def somar() -> Dict[str, Any]:
+            return self._somar_agregacoes(self._make_request_paralelo(corpo, indices), indices, dimensoes, tamanho)
+
+        cache = self._cache
+        if cache is None:
+            return somar()
+        # Resultado parcial (algum índice falhou) fica pouco tempo no cache
+        return cache.consultar(
+            'datajud', 'agregacao', self._chave_busca(corpo, indices), somar,
+            lambda resultado: PARCIAL if resultado.get('indices_com_erro') and 'erro' not in resultado
+            else classificar_resultado(resultado)
+        )
+
+    def _somar_agregacoes(
+        self,
+        respostas: List[Dict[str, Any]],
+        indices: List[str],
+        dimensoes: List[str],
+        tamanho: int
+    ) -> Dict[str, Any]:
+        """Soma as agregações das respostas de cada índice (formato de _agregar)"""
+        validas = [r for r in respostas if 'erro' not in r]
+        if not validas:
+            return respostas[0] if respostas else {'erro': 'Nenhum índice consultado', 'sucesso': False}
+
+        total = 0
+        contagens: Dict[str, Dict[str, int]] = {d: {} for d in dimensoes}
+        outros: Dict[str, int] = {d: 0 for d in dimensoes}
+        for resposta in validas:
+            total += resposta.get('hits', {}).get('total', {}).get('value', 0)
+            for dimensao in dimensoes:
+                agregacao = resposta.get('aggregations', {}).get(dimensao, {})
+                outros[dimensao] += agregacao.get('sum_other_doc_count', 0)
+                for bucket in agregacao.get('buckets', []):
+                    chave = str(bucket.get('key_as_string', bucket.get('key')))
+                    contagens[dimensao][chave] = contagens[dimensao].get(chave, 0) + bucket.get('doc_count', 0)
+
+        agregacoes = {}
+        for dimensao, por_chave in contagens.items():
+            if dimensao == 'ano_ajuizamento':
+                valores = sorted(por_chave.items())
+            else:
+                # Somados vários índices, o que passar de `tamanho` vai para 'outros'
+                valores = sorted(por_chave.items(), key=lambda item: (-item[1], item[0]))
+                outros[dimensao] += sum(contagem for _, contagem in valores[tamanho:])
+                valores = valores[:tamanho]
+            agregacoes[dimensao] = {
+                'valores': [{'chave': chave, 'total': contagem} for chave, contagem in valores],
+                'outros': outros[dimensao]
+            }
+
+        return {
+            'sucesso': True,
+            'total': total,
+            'agregacoes': agregacoes,
+            'indices_com_erro': [i for i, r in zip(indices, respostas) if 'erro' in r]
+        }
+
     def _formatar_resultado(self, hit: Dict[str, Any]) -> Dict[str, Any]:
         """
         Formata resultado do ElasticSearch para formato mais legível
@@ -393,6 +1246,12 @@ def buscar_processo(numero_processo: str, tribunal: Optional[str] = None, api_ke
     return client.buscar_processo(numero_processo, tribunal)
 
 
+def buscar_processos(numeros_processo: Iterable[str], tribunal: Optional[str] = None, api_key: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """Busca vários processos por número em lotes _msearch (função de conveniência)"""
+    client = DataJudCNJ(api_key=api_key)
+    return client.buscar_processos(numeros_processo, tribunal)
+
+
 def buscar_por_parte(nome_parte: str, tribunal: Optional[str] = None, api_key: Optional[str] = None) -> Dict[str, Any]:
     """Busca processos por nome da parte (função de conveniência)"""
     client = DataJudCNJ(api_key=api_key)
@@ -405,12 +1264,30 @@ def buscar_por_documento(documento: str, tribunal: Optional[str] = None, api_key
     return client.buscar_por_documento(documento, tribunal)
 
 
+def agregar_por_parte(nome_parte: str, tribunal: Optional[str] = None, api_key: Optional[str] = None) -> Dict[str, Any]:
+    """Estatísticas dos processos de uma parte (função de conveniência)"""
+    client = DataJudCNJ(api_key=api_key)
+    return client.agregar_por_parte(nome_parte, tribunal)
+
+
+def agregar_por_documento(documento: str, tribunal: Optional[str] = None, api_key: Optional[str] = None) -> Dict[str, Any]:
+    """Estatísticas dos processos de um CPF/CNPJ (função de conveniência)"""
+    client = DataJudCNJ(api_key=api_key)
+    return client.agregar_por_documento(documento, tribunal)
+
+
 def buscar_movimentacoes(numero_processo: str, api_key: Optional[str] = None) -> Dict[str, Any]:
     """Busca movimentações de um processo (função de conveniência)"""
     client = DataJudCNJ(api_key=api_key)
     return client.buscar_movimentacoes(numero_processo)
 
 
+def sincronizar_movimentacoes(numero_processo: str, api_key: Optional[str] = None) -> Dict[str, Any]:
+    """Sincroniza movimentações novas de um processo (função de conveniência)"""
+    client = DataJudCNJ(api_key=api_key)
+    return client.sincronizar_movimentacoes(numero_processo)
+
+
 # =============================================================================
 # TESTE
 # =============================================================================
@@ -422,9 +1299,12 @@ if __name__ == '__main__':
     print("\nTribunais suportados:", ', '.join(TRIBUNAIS.keys()))
     print("\nExemplos de uso:")
     print("  - buscar_processo('0000000-00.0000.0.00.0000')")
+    print("  - buscar_processos(['0000000-00.0000.0.00.0000', ...])")
     print("  - buscar_por_parte('Nome da Parte', 'TJGO')")
     print("  - buscar_por_documento('000.000.000-00', 'TJSP')")
     print("  - buscar_movimentacoes('0000000-00.0000.0.00.0000')")
+    print("  - DataJudCNJ().iterar_por_parte('Nome da Parte', campos=['numeroProcesso'])")
+    print("  - agregar_por_documento('00.000.000/0001-00')  # contagens por tribunal/classe/ano")
     print("\nNOTA: Configure DATAJUD_API_KEY nas variáveis de ambiente")
     print("Solicite sua chave em: https://datajud-wiki.cnj.jus.br/api-publica/")
     print("="*80)
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Document Store - Armazenamento de documentos enderecado por conteudo
+
+Os scrapers gravavam cada anexo em um diretorio de saida por chamada
+(`{tipo}_{numero}_{data}.pdf`), baixando de novo a mesma peticao a cada
+extracao e a cada processo relacionado em que ela aparece. Este modulo
+fornece:
+
+- Objetos guardados uma unica vez, pelo SHA-256 do conteudo
+- Diretorios de saida com hard links para o objeto (copia se o
+  sistema de arquivos nao suportar links); objetos somente leitura, para
+  que editar um arquivo de saida nao corrompa o objeto compartilhado
+- Indice (tribunal, processo, documento) -> hash em SQLite (WAL),
+  compartilhado entre threads e processos
+- Consulta antes do download: documento ja presente nao e baixado
+
+Autor: ROM-Agent Integration System
+Data: 2026-01-12
+Versao: 1.0.0
+"""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+from cache_store import ConexoesSQLite, RegistroPorCaminho
+
+
+# =============================================================================
+# CONSTANTES E CONFIGURACOES
+# =============================================================================
+
+DEFAULT_STORE_DIR = os.environ.get(
+    "ROM_DOCUMENT_STORE",
+    str(Path.home() / ".rom_agent" / "documentos")
+)
+DEFAULT_BUSY_TIMEOUT_MS = 5000
+MODO_OBJETO = 0o444  # objetos publicados (e seus hard links) somente leitura
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS objetos (
+    sha256       TEXT PRIMARY KEY,
+    tamanho      INTEGER NOT NULL,
+    content_type TEXT NOT NULL DEFAULT '',
+    md5          TEXT,
+    criado_em    REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS documentos (
+    tribunal   TEXT NOT NULL,
+    processo   TEXT NOT NULL,
+    documento  TEXT NOT NULL,
+    sha256     TEXT NOT NULL,
+    criado_em  REAL NOT NULL,
+    PRIMARY KEY (tribunal, processo, documento)
+);
+CREATE INDEX IF NOT EXISTS idx_documentos_doc ON documentos (tribunal, documento);
+"""
+
+
+# =============================================================================
+# ESTRUTURAS
+# =============================================================================
+
+@dataclass
+class ObjetoArmazenado:
+    """Objeto do store referenciado por um documento"""
+    sha256: str
+    caminho: str
+    tamanho_bytes: int
+    content_type: str = ""
+    md5: Optional[str] = None
+
+
+# =============================================================================
+# STORE
+# =============================================================================
+
+class DocumentStore:
+    """
+    Store de documentos enderecado por SHA-256
+
+    Os objetos ficam em `raiz/objetos/ab/cd/<sha256>` e sao somente
+    leitura na pratica: o conteudo nunca muda para o mesmo hash. O indice
+    liga cada documento de um processo ao hash do seu conteudo.
+    """
+
+    def __init__(
+        self,
+        raiz: str = DEFAULT_STORE_DIR,
+        busy_timeout_ms: int = DEFAULT_BUSY_TIMEOUT_MS
+    ):
+        """
+        Inicializa o store
+
+        Args:
+            raiz: Diretorio raiz (objetos e indice.db)
+            busy_timeout_ms: Tempo de espera por lock de outro processo
+        """
+        self.raiz = Path(raiz)
+        self.dir_objetos = self.raiz / "objetos"
+        self.db_path = self.raiz / "indice.db"
+        self.busy_timeout_ms = busy_timeout_ms
+        self._conexoes = ConexoesSQLite(self.db_path, busy_timeout_ms)
+
+        self.dir_objetos.mkdir(parents=True, exist_ok=True)
+        self._conn().executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        """Retorna conexao da thread atual, criando se necessario"""
+        return self._conexoes.obter()
+
+    def caminho_objeto(self, sha256: str) -> Path:
+        """Caminho do objeto no store para um hash"""
+        return self.dir_objetos / sha256[:2] / sha256[2:4] / sha256
+
+    # -------------------------------------------------------------------------
+    # Consulta
+    # -------------------------------------------------------------------------
+
+    def obter_objeto(self, sha256: str) -> Optional[ObjetoArmazenado]:
+        """
+        Retorna o objeto se estiver registrado e presente em disco
+
+        Args:
+            sha256: Hash do conteudo
+
+        Returns:
+            ObjetoArmazenado ou None
+        """
+        row = self._conn().execute(
+            "SELECT tamanho, content_type, md5 FROM objetos WHERE sha256 = ?",
+            (sha256,)
+        ).fetchone()
+        caminho = self.caminho_objeto(sha256)
+        if row is None or not caminho.exists():
+            return None
+        return ObjetoArmazenado(
+            sha256=sha256,
+            caminho=str(caminho),
+            tamanho_bytes=row[0],
+            content_type=row[1],
+            md5=row[2],
+        )
+
+    def localizar(
+        self,
+        tribunal: str,
+        processo: str,
+        documento: str
+    ) -> Optional[ObjetoArmazenado]:
+        """
+        Procura o objeto de um documento
+
+        Se o documento nao estiver indexado para o processo, usa o mesmo
+        documento (id/url) ja visto em outro processo do tribunal e
+        registra a referencia para o processo atual.
+
+        Args:
+            tribunal: Sigla ou host do tribunal
+            processo: Numero do processo
+            documento: Id ou URL do documento no tribunal
+
+        Returns:
+            ObjetoArmazenado ou None se for preciso baixar
+        """
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT sha256 FROM documentos "
+            "WHERE tribunal = ? AND processo = ? AND documento = ?",
+            (tribunal, processo, documento)
+        ).fetchone()
+        if row is None:
+            row = conn.execute(
+                "SELECT sha256 FROM documentos WHERE tribunal = ? AND documento = ? LIMIT 1",
+                (tribunal, documento)
+            ).fetchone()
+            if row is None:
+                return None
+
+        objeto = self.obter_objeto(row[0])
+        if objeto is not None:
+            self.indexar(tribunal, processo, documento, objeto.sha256)
+        return objeto
+
+    # -------------------------------------------------------------------------
+    # Escrita
+    # -------------------------------------------------------------------------
+
+    def indexar(self, tribunal: str, processo: str, documento: str, sha256: str):
+        """Liga um documento de processo ao hash do conteudo"""
+        self._conn().execute(
+            "INSERT OR REPLACE INTO documentos "
+            "(tribunal, processo, documento, sha256, criado_em) VALUES (?, ?, ?, ?, ?)",
+            (tribunal, processo, documento, sha256, time.time())
+        )
+
+    def armazenar(
+        self,
+        arquivo: str,
+        sha256: str,
+        tribunal: str,
+        processo: str,
+        documento: str,
+        content_type: str = "",
+        md5: Optional[str] = None
+    ) -> ObjetoArmazenado:
+        """
+        Publica um arquivo recem-baixado no store e o liga ao objeto
+
+        Se outro processo ja armazenou o mesmo conteudo, o arquivo baixado
+        e descartado e o link aponta para o objeto existente.
+
+        Args:
+            arquivo: Arquivo baixado (passa a ser link para o objeto)
+            sha256: Hash SHA-256 do arquivo
+            tribunal: Sigla ou host do tribunal
+            processo: Numero do processo
+            documento: Id ou URL do documento no tribunal
+            content_type: Content-Type da resposta
+            md5: Hash MD5, se calculado
+
+        Returns:
+            ObjetoArmazenado
+        """
+        origem = Path(arquivo)
+        destino = self.caminho_objeto(sha256)
+        tamanho = origem.stat().st_size
+
+        if not destino.exists():
+            destino.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                # Link atomico: falha se outro processo publicou antes
+                os.link(origem, destino)
+            except FileExistsError:
+                pass
+            except OSError:
+                # Sem hard link: copia para temporario no proprio store e
+                # publica com rename, leitores nunca veem objeto incompleto
+                fd, temporario = tempfile.mkstemp(dir=str(destino.parent), suffix=".tmp")
+                os.close(fd)
+                try:
+                    shutil.copyfile(origem, temporario)
+                    os.chmod(temporario, MODO_OBJETO)
+                    os.replace(temporario, destino)
+                except BaseException:
+                    Path(temporario).unlink(missing_ok=True)
+                    raise
+        self._proteger(destino)
+
+        self._conn().execute(
+            "INSERT OR IGNORE INTO objetos (sha256, tamanho, content_type, md5, criado_em) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (sha256, tamanho, content_type or "", md5, time.time())
+        )
+        self.indexar(tribunal, processo, documento, sha256)
+        if not os.path.samefile(origem, destino):
+            self.materializar(sha256, str(origem))
+
+        return ObjetoArmazenado(
+            sha256=sha256,
+            caminho=str(destino),
+            tamanho_bytes=tamanho,
+            content_type=content_type or "",
+            md5=md5,
+        )
+
+    @staticmethod
+    def _proteger(objeto: Path):
+        """
+        Deixa o objeto somente leitura
+
+        Os arquivos de saida sao hard links para o mesmo inode: um
+        consumidor que editasse um deles alteraria o objeto (e todas as
+        outras copias). Substituir o arquivo (novo inode) continua possivel.
+        """
+        try:
+            if objeto.stat().st_mode & 0o777 != MODO_OBJETO:
+                os.chmod(objeto, MODO_OBJETO)
+        except OSError:
+            pass
+
+    def materializar(self, sha256: str, destino: str) -> str:
+        """
+        Cria `destino` como hard link somente leitura para o objeto (ou copia)
+
+        Args:
+            sha256: Hash do objeto
+            destino: Caminho no diretorio de saida
+
+        Returns:
+            Caminho criado
+        """
+        objeto = self.caminho_objeto(sha256)
+        self._proteger(objeto)
+        destino_path = Path(destino)
+        destino_path.parent.mkdir(parents=True, exist_ok=True)
+
+        temporario = destino_path.with_name(f".{destino_path.name}.{os.getpid()}.link")
+        temporario.unlink(missing_ok=True)
+        try:
+            os.link(objeto, temporario)
+        except OSError:
+            # Outro sistema de arquivos ou sem suporte a hard link
+            shutil.copyfile(objeto, temporario)
+        os.replace(temporario, destino_path)
+        return str(destino_path)
+
+    # -------------------------------------------------------------------------
+    # Manutencao
+    # -------------------------------------------------------------------------
+
+    def close(self):
+        """Fecha a conexao da thread atual"""
+        self._conexoes.fechar()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Estatisticas do store"""
+        conn = self._conn()
+        objetos, total = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(tamanho), 0) FROM objetos"
+        ).fetchone()
+        documentos = conn.execute("SELECT COUNT(*) FROM documentos").fetchone()[0]
+        return {
+            "objetos": objetos,
+            "bytes": total,
+            "documentos": documentos,
+        }
+
+
+# =============================================================================
+# INSTANCIA COMPARTILHADA
+# =============================================================================
+
+_stores: RegistroPorCaminho[DocumentStore] = RegistroPorCaminho(DocumentStore)
+
+
+def obter_document_store(raiz: Optional[str] = None) -> DocumentStore:
+    """
+    Retorna o store do processo para o diretorio informado
+
+    Args:
+        raiz: Diretorio do store (padrao ROM_DOCUMENT_STORE ou ~/.rom_agent)
+
+    Returns:
+        DocumentStore unico por diretorio no processo
+    """
+    return _stores.obter(raiz or DEFAULT_STORE_DIR)
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Downloads - Download de documentos em streaming para os scrapers
+
+Os scrapers carregavam o PDF inteiro em memoria (response.content) antes
+de gravar e depois reliam o arquivo para cada hash. Este modulo fornece:
+
+- Gravacao em disco por blocos (memoria constante)
+- MD5 e SHA-256 calculados na mesma passada do download
+- Retomada de arquivos parciais (.part) via HTTP Range
+- Deteccao de content-type binario (para pular inspecao de texto)
+- Versoes sincrona (requests) e assincrona (httpx)
+
+O helper nao faz a requisicao diretamente: recebe uma funcao do scraper
+que executa o GET com os headers informados, de modo que rate limit,
+retry e circuit breaker de cada scraper continuam valendo.
+
+Autor: ROM-Agent Integration System
+Data: 2026-01-12
+Versao: 1.0.0
+"""
+
+import hashlib
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+
+
+# =============================================================================
+# CONSTANTES E CONFIGURACOES
+# =============================================================================
+
+DEFAULT_CHUNK_SIZE = 64 * 1024  # 64 KB por bloco
+DEFAULT_HASHES = ("md5", "sha256")
+SUFIXO_PARCIAL = ".part"
+
+# Content-types que nunca precisam ser decodificados como texto
+_PREFIXOS_BINARIOS = (
+    "application/pdf",
+    "application/octet-stream",
+    "application/zip",
+    "application/msword",
+    "application/vnd.",
+    "image/",
+    "audio/",
+    "video/",
+)
+
+_CONTENT_RANGE = re.compile(r"bytes\s+(\d+)-(\d+)?/(\d+|\*)")
+_CONTENT_RANGE_INSATISFEITO = re.compile(r"bytes\s+\*/(\d+)")
+
+
+# =============================================================================
+# ESTRUTURAS
+# =============================================================================
+
+@dataclass
+class ResultadoDownload:
+    """Resultado de um download em streaming"""
+    caminho: str
+    tamanho_bytes: int
+    hashes: Dict[str, str] = field(default_factory=dict)
+    content_type: str = ""
+    retomado: bool = False
+
+    @property
+    def md5(self) -> Optional[str]:
+        return self.hashes.get("md5")
+
+    @property
+    def sha256(self) -> Optional[str]:
+        return self.hashes.get("sha256")
+
+
+class HashMultiplo:
+    """Calcula varios hashes alimentando todos com os mesmos blocos"""
+
+    def __init__(self, algoritmos: Iterable[str] = DEFAULT_HASHES):
+        self._hashes = {nome: hashlib.new(nome) for nome in algoritmos}
+
+    def update(self, dados: bytes):
+        for h in self._hashes.values():
+            h.update(dados)
+
+    def hexdigests(self) -> Dict[str, str]:
+        return {nome: h.hexdigest() for nome, h in self._hashes.items()}
+
+
+def eh_conteudo_binario(content_type: Optional[str]) -> bool:
+    """
+    Verifica se o content-type indica conteudo binario
+
+    Args:
+        content_type: Valor do header Content-Type
+
+    Returns:
+        True para PDF, imagens, octet-stream etc.
+    """
+    if not content_type:
+        return False
+    tipo = content_type.split(";")[0].strip().lower()
+    return tipo.startswith(_PREFIXOS_BINARIOS)
+
+
+def hashes_arquivo(
+    caminho: str,
+    algoritmos: Iterable[str] = DEFAULT_HASHES,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Dict[str, str]:
+    """Calcula varios hashes de um arquivo em uma unica leitura"""
+    hasher = HashMultiplo(algoritmos)
+    with open(caminho, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            hasher.update(chunk)
+    return hasher.hexdigests()
+
+
+# =============================================================================
+# RETOMADA (RANGE)
+# =============================================================================
+
+def _preparar_parcial(parcial: Path, retomar: bool, algoritmos: Iterable[str]):
+    """
+    Prepara retomada a partir de arquivo .part existente
+
+    Returns:
+        Tupla (bytes ja baixados, hasher ja alimentado, headers da requisicao)
+    """
+    hasher = HashMultiplo(algoritmos)
+    headers: Dict[str, str] = {}
+    inicio = 0
+
+    if retomar and parcial.exists() and parcial.stat().st_size > 0:
+        inicio = parcial.stat().st_size
+        with open(parcial, "rb") as f:
+            for chunk in iter(lambda: f.read(DEFAULT_CHUNK_SIZE), b""):
+                hasher.update(chunk)
+        headers["Range"] = f"bytes={inicio}-"
+        # Range vale sobre a representacao codificada: pede o corpo sem gzip
+        headers["Accept-Encoding"] = "identity"
+
+    return inicio, hasher, headers
+
+
+def _aceita_retomada(status_code: int, headers: Any, inicio: int) -> bool:
+    """Verifica se o servidor respondeu 206 a partir do byte pedido"""
+    if inicio == 0 or status_code != 206:
+        return False
+    match = _CONTENT_RANGE.match(headers.get("content-range", "") or "")
+    return bool(match) and int(match.group(1)) == inicio
+
+
+def _parcial_completo(headers: Any, inicio: int) -> bool:
+    """
+    Verifica, numa resposta 416, se o .part ja tem o documento inteiro
+
+    O servidor informa o tamanho total em `Content-Range: bytes */total`.
+    """
+    match = _CONTENT_RANGE_INSATISFEITO.match(headers.get("content-range", "") or "")
+    return bool(match) and int(match.group(1)) == inicio
+
+
+def _finalizar(
+    parcial: Path,
+    destino: Path,
+    response: Any,
+    nomear: Optional[Callable[[Any], Optional[str]]]
+) -> Path:
+    """Move o arquivo parcial para o nome definitivo"""
+    if nomear is not None:
+        nome = nomear(response)
+        if nome:
+            destino = destino.with_name(Path(nome).name)
+    os.replace(parcial, destino)
+    return destino
+
+
+# =============================================================================
+# DOWNLOAD SINCRONO (requests)
+# =============================================================================
+
+def baixar_stream(
+    requisitar: Callable[[Dict[str, str]], Any],
+    destino: str,
+    retomar: bool = True,
+    algoritmos: Iterable[str] = DEFAULT_HASHES,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    nomear: Optional[Callable[[Any], Optional[str]]] = None
+) -> ResultadoDownload:
+    """
+    Baixa um documento em streaming para `destino`
+
+    Args:
+        requisitar: Funcao que recebe headers extras e retorna um
+            requests.Response aberto com stream=True
+        destino: Caminho final do arquivo
+        retomar: Se deve retomar um .part existente via Range
+        algoritmos: Hashes a calcular
+        chunk_size: Tamanho do bloco de leitura
+        nomear: Funcao opcional que recebe a resposta e devolve o nome
+            definitivo do arquivo (ex.: a partir do Content-Disposition);
+            `destino` continua sendo a chave estavel do .part
+
+    Returns:
+        ResultadoDownload com tamanho e hashes
+
+    Raises:
+        IOError: Se o servidor responder com status diferente de 200/206
+            (416 sobre um .part e tratado: o arquivo e finalizado se ja
+            estiver completo, ou baixado de novo do zero; 206 a partir de
+            outro byte tambem recomeca do zero)
+    """
+    destino_path = Path(destino)
+    destino_path.parent.mkdir(parents=True, exist_ok=True)
+    parcial = destino_path.with_name(destino_path.name + SUFIXO_PARCIAL)
+
+    inicio, hasher, headers = _preparar_parcial(parcial, retomar, algoritmos)
+    response = requisitar(headers)
+
+    if response.status_code == 416 and inicio:
+        response.close()
+        if _parcial_completo(response.headers, inicio):
+            # Download anterior terminou antes de ser renomeado
+            return ResultadoDownload(
+                caminho=str(_finalizar(parcial, destino_path, response, nomear)),
+                tamanho_bytes=inicio,
+                hashes=hasher.hexdigests(),
+                retomado=True,
+            )
+        # .part nao corresponde ao documento atual: recomeca do zero
+        parcial.unlink()
+        return baixar_stream(requisitar, destino, False, algoritmos, chunk_size, nomear)
+
+    if response.status_code == 206 and not _aceita_retomada(response.status_code, response.headers, inicio):
+        response.close()
+        if not inicio:
+            raise IOError("HTTP 206 sem Range pedido ao baixar documento")
+        # Content-Range fora do byte pedido: o corpo e so um fragmento,
+        # baixa o documento inteiro sem Range
+        parcial.unlink(missing_ok=True)
+        return baixar_stream(requisitar, destino, False, algoritmos, chunk_size, nomear)
+
+    try:
+        if response.status_code not in (200, 206):
+            raise IOError(f"HTTP {response.status_code} ao baixar documento")
+
+        retomado = _aceita_retomada(response.status_code, response.headers, inicio)
+        if not retomado:
+            # Servidor ignorou o Range: recomeca do zero
+            inicio, hasher = 0, HashMultiplo(algoritmos)
+
+        tamanho = inicio
+        with open(parcial, "ab" if retomado else "wb") as f:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                if not chunk:
+                    continue
+                f.write(chunk)
+                hasher.update(chunk)
+                tamanho += len(chunk)
+    finally:
+        response.close()
+
+    destino_path = _finalizar(parcial, destino_path, response, nomear)
+
+    return ResultadoDownload(
+        caminho=str(destino_path),
+        tamanho_bytes=tamanho,
+        hashes=hasher.hexdigests(),
+        content_type=response.headers.get("content-type", ""),
+        retomado=retomado,
+    )
+
+
+# =============================================================================
+# DOWNLOAD ASSINCRONO (httpx)
+# =============================================================================
+
+async def baixar_stream_async(
+    requisitar: Callable[[Dict[str, str]], Awaitable[Any]],
+    destino: str,
+    retomar: bool = True,
+    algoritmos: Iterable[str] = DEFAULT_HASHES,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    nomear: Optional[Callable[[Any], Optional[str]]] = None
+) -> ResultadoDownload:
+    """
+    Versao assincrona de baixar_stream
+
+    Args:
+        requisitar: Corrotina que recebe headers extras e retorna um
+            httpx.Response aberto em modo stream (client.send(..., stream=True))
+        destino: Caminho final do arquivo
+        retomar: Se deve retomar um .part existente via Range
+        algoritmos: Hashes a calcular
+        chunk_size: Tamanho do bloco de leitura
+        nomear: Funcao opcional que recebe a resposta e devolve o nome
+            definitivo do arquivo (ex.: a partir do Content-Disposition);
+            `destino` continua sendo a chave estavel do .part
+
+    Returns:
+        ResultadoDownload com tamanho e hashes
+    """
+    destino_path = Path(destino)
+    destino_path.parent.mkdir(parents=True, exist_ok=True)
+    parcial = destino_path.with_name(destino_path.name + SUFIXO_PARCIAL)
+
+    inicio, hasher, headers = _preparar_parcial(parcial, retomar, algoritmos)
+    response = await requisitar(headers)
+
+    if response.status_code == 416 and inicio:
+        await response.aclose()
+        if _parcial_completo(response.headers, inicio):
+            return ResultadoDownload(
+                caminho=str(_finalizar(parcial, destino_path, response, nomear)),
+                tamanho_bytes=inicio,
+                hashes=hasher.hexdigests(),
+                retomado=True,
+            )
+        parcial.unlink()
+        return await baixar_stream_async(requisitar, destino, False, algoritmos, chunk_size, nomear)
+
+    if response.status_code == 206 and not _aceita_retomada(response.status_code, response.headers, inicio):
+        await response.aclose()
+        if not inicio:
+            raise IOError("HTTP 206 sem Range pedido ao baixar documento")
+        parcial.unlink(missing_ok=True)
+        return await baixar_stream_async(requisitar, destino, False, algoritmos, chunk_size, nomear)
+
+    try:
+        if response.status_code not in (200, 206):
+            raise IOError(f"HTTP {response.status_code} ao baixar documento")
+
+        retomado = _aceita_retomada(response.status_code, response.headers, inicio)
+        if not retomado:
+            inicio, hasher = 0, HashMultiplo(algoritmos)
+
+        tamanho = inicio
+        with open(parcial, "ab" if retomado else "wb") as f:
+            async for chunk in response.aiter_bytes(chunk_size):
+                if not chunk:
+                    continue
+                f.write(chunk)
+                hasher.update(chunk)
+                tamanho += len(chunk)
+    finally:
+        await response.aclose()
+
+    destino_path = _finalizar(parcial, destino_path, response, nomear)
+
+    return ResultadoDownload(
+        caminho=str(destino_path),
+        tamanho_bytes=tamanho,
+        hashes=hasher.hexdigests(),
+        content_type=response.headers.get("content-type", ""),
+        retomado=retomado,
+    )
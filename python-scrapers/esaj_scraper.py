@@ -32,15 +32,18 @@ import json
 import logging
 import os
 import re
+import sqlite3
 import sys
+import threading
 import time
 import unicodedata
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timedelta, timezone
 from enum import Enum
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Set, Tuple, Union
 from urllib.parse import urljoin, urlencode, parse_qs, urlparse, quote
 
 # Dependencias externas
@@ -54,7 +57,6 @@ except ImportError:
 try:
     import requests
     from requests.adapters import HTTPAdapter
-    from urllib3.util.retry import Retry
     REQUESTS_AVAILABLE = True
 except ImportError:
     REQUESTS_AVAILABLE = False
@@ -85,6 +87,34 @@ except ImportError:
     TESSERACT_AVAILABLE = False
     pytesseract = None
 
+from cache_store import SQLiteCacheStore
+from token_bucket import TokenBucketLimiter, obter_token_bucket
+from adaptive_rate import AdaptiveRateController, obter_controlador, segundos_retry_after
+from downloads import baixar_stream
+from document_store import DocumentStore, obter_document_store
+from html_backend import PaginaHTML, apenas_tags, como_pagina, criar_soup, textos_links
+from scraper_registry import fechar_no_loop_dono, obter_loop_scrapers, obter_registro_scrapers
+from sync_cursors import CursorStore, DeltaMovimentacoes, obter_cursor_store
+from html_archive import TIPO_CONSULTA, TIPO_PROCESSO, ArquivoHTML, obter_arquivo_html
+from retry_policy import PoliticaRetry
+from resilience import (
+    CircuitoAbertoError,
+    LimiteConcorrenciaError,
+    Resiliencia,
+    estado_resiliencia,
+    obter_resiliencia,
+)
+from page_validators import (
+    DEFAULT_VALIDADORES_TTL,
+    ValidadoresPagina,
+    avaliar_resposta,
+    cabecalhos_condicionais,
+    validadores_da_url,
+)
+from layouts import (
+    LayoutCompilado, LayoutSpec, extrair_rotulados, linhas_tabela, obter_layout, registrar_layout
+)
+
 
 # =============================================================================
 # CONSTANTES E CONFIGURACOES
@@ -116,9 +146,17 @@ ENDPOINTS_2G = {
 # Configuracoes padrao
 DEFAULT_TIMEOUT = 30  # segundos
 DEFAULT_MAX_RETRIES = 3
+DEFAULT_MAX_CONCORRENCIA = 4  # processos simultaneos na extracao em lote
+DEFAULT_MAX_DOWNLOADS = 4  # documentos baixados simultaneamente por processo
+DEFAULT_MAX_PROCESSOS_FAMILIA = 50  # processos visitados por extrair_familia
+DEFAULT_PROFUNDIDADE_FAMILIA = 3  # saltos a partir do processo inicial
 DEFAULT_RATE_LIMIT = 1.0  # segundos entre requisicoes (RIGOROSO)
 DEFAULT_CACHE_TTL = 3600  # 1 hora em segundos
+DEFAULT_CACHE_MAX_ENTRIES = 50000  # limite de entradas no cache
+CACHE_DB_NAME = "cache.db"
 DEFAULT_BACKOFF_FACTOR = 2.0  # fator de backoff exponencial
+DEFAULT_RATE_BURST = 1  # requisicoes em rajada permitidas pelo token bucket
+DEFAULT_BLOQUEIO_RATE_LIMIT = 60.0  # pausa apos 429 sem Retry-After (segundos)
 DEFAULT_LOG_MAX_SIZE = 10 * 1024 * 1024  # 10 MB
 DEFAULT_LOG_BACKUP_COUNT = 5
 
@@ -419,6 +457,60 @@ class ProcessoESAJ:
         return self.numero_processo
 
 
+@dataclass
+class ResumoProcessoESAJ:
+    """
+    Linha da lista de resultados de uma busca (sem abrir o processo)
+
+    Os dados completos vem de extrair_1g(numero_processo).
+    """
+    numero_processo: str
+    url: Optional[str] = None
+    classe: Optional[str] = None
+    assunto: Optional[str] = None
+    distribuicao: Optional[str] = None  # data e local, como exibidos na lista
+
+    def to_dict(self) -> Dict:
+        """Converte para dicionario"""
+        return asdict(self)
+
+
+@dataclass
+class FamiliaProcessual:
+    """
+    Grafo de processos relacionados a partir de um processo inicial
+
+    Os nos sao os processos encontrados (por numero e instancia); as
+    arestas ligam cada processo a sua origem e a seus dependentes
+    (recursos, incidentes, execucoes e apensos).
+    """
+    numero_inicial: str
+    processos: Dict[str, Dict[str, ProcessoESAJ]] = field(default_factory=dict)
+    vinculos: List[Dict[str, str]] = field(default_factory=list)
+    erros: List[Dict[str, str]] = field(default_factory=list)
+    truncada: bool = False  # limite de processos ou profundidade atingido
+
+    def adicionar_vinculo(self, de: str, para: str, tipo: str):
+        """Registra a aresta de -> para ("origem" ou "dependente") uma vez"""
+        vinculo = {"de": de, "para": para, "tipo": tipo}
+        if vinculo not in self.vinculos:
+            self.vinculos.append(vinculo)
+
+    def to_dict(self) -> Dict:
+        """Converte para dicionario"""
+        return {
+            "numero_inicial": self.numero_inicial,
+            "total_processos": len(self.processos),
+            "processos": {
+                numero: {instancia: p.to_dict() for instancia, p in instancias.items()}
+                for numero, instancias in self.processos.items()
+            },
+            "vinculos": self.vinculos,
+            "erros": self.erros,
+            "truncada": self.truncada,
+        }
+
+
 # =============================================================================
 # EXCECOES CUSTOMIZADAS
 # =============================================================================
@@ -433,6 +525,11 @@ class ESAJConnectionError(ESAJError):
     pass
 
 
+class ESAJCircuitBreakerOpenError(ESAJConnectionError):
+    """Circuit breaker aberto para o host (requisicao rejeitada sem ir ao portal)"""
+    pass
+
+
 class ESAJCaptchaError(ESAJError):
     """Erro relacionado a CAPTCHA"""
     pass
@@ -458,6 +555,104 @@ class ESAJValidationError(ESAJError):
     pass
 
 
+# =============================================================================
+# LAYOUT DE EXTRACAO
+# =============================================================================
+
+# Layout do ESAJ (TJSP e demais tribunais no mesmo sistema). Um tribunal
+# com ids ou rotulos diferentes registra um LayoutSpec derivado deste
+# (dataclasses.replace) e o informa em ESAJScraper(layout=...).
+ESAJ_LAYOUT_SPEC = LayoutSpec(
+    sistema="esaj",
+    rotulos=(
+        ("Classe", "classe"),
+        ("Assunto", "assunto"),
+        ("Foro", "foro"),
+        ("Vara", "vara"),
+        ("Juiz", "juiz"),
+        ("Distribuicao", "data_distribuicao"),
+        ("Distribuição", "data_distribuicao"),
+        ("Area", "area"),
+        ("Área", "area"),
+        ("Valor da acao", "valor_causa"),
+        ("Valor da ação", "valor_causa"),
+        ("Outros assuntos", "assuntos_secundarios"),
+        ("Situacao", "situacao"),
+        ("Situação", "situacao"),
+        # 2o grau
+        ("Orgao julgador", "orgao_julgador"),
+        ("Órgão julgador", "orgao_julgador"),
+        ("Relator", "relator"),
+        ("Relator(a)", "relator"),
+    ),
+    seletores={
+        "partes": ("table#tableTodasPartes", "table#tablePartesPrincipais"),
+        # Layout antigo, sem tabela de partes
+        "partes_ativas": ('div[id*="autores" i]', 'div[id*="reqtes" i]'),
+        "partes_passivas": (
+            'div[id*="reus" i]', 'div[id*="reqdos" i]',
+            'div[id*="apelantes" i]', 'div[id*="apelados" i]',
+        ),
+        "movimentacoes": ("table#tabelaTodasMovimentacoes", "table#tabelaUltimasMovimentacoes"),
+        "documentos": ('a[href*="abrirDocumento"], a[href*="baixarArquivo"]',),
+        "audiencias": ("div#audienciasPlaceholder", "table#tabelaAudiencias"),
+        "captcha": ('img[id*="captcha" i]', 'img[class*="captcha" i]', 'img[src*="captcha" i]'),
+        "link_processo": ('a[href*="processo.codigo="]',),
+        # Lista de resultados da busca por parte/documento
+        "resumo_classe": (".classeProcesso",),
+        "resumo_assunto": (".assuntoPrincipalProcesso",),
+        "resumo_distribuicao": (".dataLocalDistribuicaoProcesso",),
+        # Recursos, incidentes, execucoes e apensos (processos dependentes)
+        "processos_relacionados": (
+            "table#incidentes", "table#tabelaIncidentes", "div#incidentesRecursos",
+            "table#dadosApensos", "table#apensamentos", "table#processosApensados",
+        ),
+        "processo_origem": ("#dadosDaOrigem", "#processoOrigem", "#numeroProcessoOrigem"),
+    },
+    padroes={
+        "numero_cnj": r'\d{7}-\d{2}\.\d{4}\.\d\.\d{2}\.\d{4}',
+        "proxima_pagina": r'proxim|>>',
+        "hora": r'(\d{2}):(\d{2})',
+    },
+    classificacoes={
+        "tipo_parte": (
+            ('autor', TipoParte.AUTOR.value),
+            ('autora', TipoParte.AUTOR.value),
+            ('requerente', TipoParte.REQUERENTE.value),
+            ('reu', TipoParte.REU.value),
+            ('re', TipoParte.REU.value),
+            ('requerido', TipoParte.REQUERIDO.value),
+            ('requerida', TipoParte.REQUERIDO.value),
+            ('apelante', TipoParte.APELANTE.value),
+            ('apelado', TipoParte.APELADO.value),
+            ('agravante', TipoParte.AGRAVANTE.value),
+            ('agravado', TipoParte.AGRAVADO.value),
+            ('recorrente', TipoParte.RECORRENTE.value),
+            ('recorrido', TipoParte.RECORRIDO.value),
+            ('terceiro', TipoParte.TERCEIRO.value),
+            ('interessado', TipoParte.INTERESSADO.value),
+        ),
+        "tipo_documento": (
+            ('peticao inicial', TipoDocumento.PETICAO_INICIAL.value),
+            ('petição inicial', TipoDocumento.PETICAO_INICIAL.value),
+            ('contestacao', TipoDocumento.CONTESTACAO.value),
+            ('contestação', TipoDocumento.CONTESTACAO.value),
+            ('sentenca', TipoDocumento.SENTENCA.value),
+            ('sentença', TipoDocumento.SENTENCA.value),
+            ('acordao', TipoDocumento.ACORDAO.value),
+            ('acórdão', TipoDocumento.ACORDAO.value),
+            ('despacho', TipoDocumento.DESPACHO.value),
+            ('decisao', TipoDocumento.DECISAO.value),
+            ('decisão', TipoDocumento.DECISAO.value),
+            ('certidao', TipoDocumento.CERTIDAO.value),
+            ('certidão', TipoDocumento.CERTIDAO.value),
+        ),
+    },
+)
+
+LAYOUT_ESAJ = registrar_layout(ESAJ_LAYOUT_SPEC)
+
+
 # =============================================================================
 # UTILITARIOS
 # =============================================================================
@@ -619,15 +814,21 @@ class CacheManager:
     """
     Gerenciador de cache para consultas do ESAJ
 
-    Implementa cache em arquivo JSON com TTL configuravel.
-    Evita requisicoes duplicadas e melhora performance.
+    Implementa cache persistente em SQLite (modo WAL) com TTL por entrada.
+    Cada escrita grava apenas a propria linha, e varios workers podem
+    compartilhar o mesmo arquivo sem corromper o cache.
     """
 
+    NAMESPACE = "esaj"
+    NAMESPACE_VALIDADORES = "esaj_validadores"
+
     def __init__(
         self,
         cache_dir: str = "./cache/esaj",
         ttl: int = DEFAULT_CACHE_TTL,
-        enabled: bool = True
+        enabled: bool = True,
+        max_entries: int = DEFAULT_CACHE_MAX_ENTRIES,
+        ttl_validadores: int = DEFAULT_VALIDADORES_TTL
     ):
         """
         Inicializa o gerenciador de cache
@@ -636,53 +837,27 @@ class CacheManager:
             cache_dir: Diretorio para armazenar cache
             ttl: Tempo de vida do cache em segundos
             enabled: Se o cache esta habilitado
+            max_entries: Numero maximo de entradas mantidas
+            ttl_validadores: Tempo de vida dos validadores de pagina (e do
+                resultado guardado com eles) em segundos
         """
         self.cache_dir = Path(cache_dir)
         self.ttl = ttl
+        self.ttl_validadores = ttl_validadores
         self.enabled = enabled
-        self._cache_file = self.cache_dir / "cache.json"
-        self._cache: Dict[str, Dict] = {}
-        self._load_cache()
-
-    def _load_cache(self):
-        """Carrega cache do arquivo"""
-        if not self.enabled:
-            return
-
-        try:
-            self.cache_dir.mkdir(parents=True, exist_ok=True)
-            if self._cache_file.exists():
-                with open(self._cache_file, 'r', encoding='utf-8') as f:
-                    self._cache = json.load(f)
-                # Limpa entradas expiradas ao carregar
-                self._cleanup()
-        except Exception:
-            self._cache = {}
-
-    def _save_cache(self):
-        """Salva cache no arquivo"""
-        if not self.enabled:
-            return
+        self._store: Optional[SQLiteCacheStore] = None
 
-        try:
-            self.cache_dir.mkdir(parents=True, exist_ok=True)
-            with open(self._cache_file, 'w', encoding='utf-8') as f:
-                json.dump(self._cache, f, ensure_ascii=False, indent=2)
-        except Exception:
-            pass
-
-    def _cleanup(self):
-        """Remove entradas expiradas do cache"""
-        now = time.time()
-        expired_keys = [
-            key for key, value in self._cache.items()
-            if now - value.get('timestamp', 0) > self.ttl
-        ]
-        for key in expired_keys:
-            del self._cache[key]
-
-        if expired_keys:
-            self._save_cache()
+        if self.enabled:
+            try:
+                self._store = SQLiteCacheStore(
+                    str(self.cache_dir / CACHE_DB_NAME),
+                    max_entries=max_entries
+                )
+            except sqlite3.Error as e:
+                logging.getLogger("esaj_scraper").warning(
+                    f"Cache desabilitado - falha ao abrir banco: {e}"
+                )
+                self.enabled = False
 
     def get(self, key: str) -> Optional[Dict]:
         """
@@ -697,20 +872,12 @@ class CacheManager:
         if not self.enabled:
             return None
 
-        hash_key = gerar_hash_cache(key)
-        entry = self._cache.get(hash_key)
-
-        if entry is None:
-            return None
-
-        # Verifica se expirou
-        if time.time() - entry.get('timestamp', 0) > self.ttl:
-            del self._cache[hash_key]
-            self._save_cache()
+        try:
+            return self._store.get(key, self.NAMESPACE)
+        except sqlite3.Error as e:
+            logging.getLogger("esaj_scraper").warning(f"Falha ao ler cache: {e}")
             return None
 
-        return entry.get('data')
-
     def set(self, key: str, value: Dict):
         """
         Armazena valor no cache
@@ -722,13 +889,51 @@ class CacheManager:
         if not self.enabled:
             return
 
-        hash_key = gerar_hash_cache(key)
-        self._cache[hash_key] = {
-            'timestamp': time.time(),
-            'key': key,
-            'data': value
-        }
-        self._save_cache()
+        try:
+            self._store.set(key, value, self.ttl, self.NAMESPACE)
+        except sqlite3.Error as e:
+            logging.getLogger("esaj_scraper").warning(f"Falha ao gravar cache: {e}")
+
+    def get_validadores(self, key: str) -> Optional[ValidadoresPagina]:
+        """
+        Recupera os validadores da pagina do processo
+
+        Sobrevivem ao TTL do resultado: com eles a pagina e revalidada
+        (GET condicional ou hash do corpo) em vez de parseada de novo.
+
+        Args:
+            key: Chave do processo
+
+        Returns:
+            ValidadoresPagina ou None
+        """
+        if not self.enabled:
+            return None
+
+        try:
+            dados = self._store.get(key, self.NAMESPACE_VALIDADORES)
+        except sqlite3.Error as e:
+            logging.getLogger("esaj_scraper").warning(f"Falha ao ler validadores: {e}")
+            return None
+        return ValidadoresPagina.from_dict(dados) if dados else None
+
+    def set_validadores(self, key: str, validadores: ValidadoresPagina):
+        """
+        Armazena os validadores (com o resultado) da pagina do processo
+
+        Args:
+            key: Chave do processo
+            validadores: Validadores da ultima resposta
+        """
+        if not self.enabled:
+            return
+
+        try:
+            self._store.set(
+                key, validadores.to_dict(), self.ttl_validadores, self.NAMESPACE_VALIDADORES
+            )
+        except sqlite3.Error as e:
+            logging.getLogger("esaj_scraper").warning(f"Falha ao gravar validadores: {e}")
 
     def invalidate(self, key: str):
         """
@@ -737,20 +942,36 @@ class CacheManager:
         Args:
             key: Chave a invalidar
         """
-        hash_key = gerar_hash_cache(key)
-        if hash_key in self._cache:
-            del self._cache[hash_key]
-            self._save_cache()
+        if not self.enabled:
+            return
+
+        try:
+            self._store.delete(key, self.NAMESPACE)
+            self._store.delete(key, self.NAMESPACE_VALIDADORES)
+        except sqlite3.Error as e:
+            logging.getLogger("esaj_scraper").warning(f"Falha ao invalidar cache: {e}")
 
     def clear(self):
         """Limpa todo o cache"""
-        self._cache = {}
-        self._save_cache()
+        if not self.enabled:
+            return
+
+        try:
+            self._store.clear(self.NAMESPACE)
+            self._store.clear(self.NAMESPACE_VALIDADORES)
+        except sqlite3.Error as e:
+            logging.getLogger("esaj_scraper").warning(f"Falha ao limpar cache: {e}")
 
     @property
     def size(self) -> int:
         """Retorna numero de entradas no cache"""
-        return len(self._cache)
+        if not self.enabled:
+            return 0
+        try:
+            return self._store.count(self.NAMESPACE)
+        except sqlite3.Error as e:
+            logging.getLogger("esaj_scraper").warning(f"Falha ao contar cache: {e}")
+            return 0
 
 
 # =============================================================================
@@ -873,7 +1094,12 @@ class RateLimiter:
         self,
         rate: float = DEFAULT_RATE_LIMIT,
         backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
-        max_backoff: float = 60.0
+        max_backoff: float = 60.0,
+        chave: Optional[str] = None,
+        burst: int = DEFAULT_RATE_BURST,
+        bucket: Optional[TokenBucketLimiter] = None,
+        controlador: Optional[AdaptiveRateController] = None,
+        bloqueio: float = DEFAULT_BLOQUEIO_RATE_LIMIT
     ):
         """
         Inicializa o rate limiter
@@ -882,55 +1108,125 @@ class RateLimiter:
             rate: Intervalo minimo entre requisicoes (segundos)
             backoff_factor: Fator de multiplicacao para backoff
             max_backoff: Tempo maximo de backoff (segundos)
+            chave: Host do tribunal; se informado, o limite e dividido
+                com os demais processos da maquina via token bucket
+            burst: Requisicoes permitidas em rajada (token bucket)
+            bucket: Token bucket a usar (padrao: compartilhado do processo)
+            controlador: Controle AIMD; se informado, `rate` passa a
+                acompanhar a taxa aprendida para o tribunal
+            bloqueio: Pausa apos 429 quando nao ha Retry-After (segundos)
         """
+        self.controlador = controlador
+        if controlador is not None:
+            rate = controlador.intervalo
         self.rate = rate
         self.backoff_factor = backoff_factor
         self.max_backoff = max_backoff
+        self.chave = chave
+        self.burst = burst
+        self.bloqueio = bloqueio
         self._last_request: float = 0.0
         self._request_count: int = 0
         self._error_count: int = 0
         self._current_backoff: float = rate
         self._blocked_until: float = 0.0
+        self._lock = threading.Lock()
+        self._bucket: Optional[TokenBucketLimiter] = None
 
-    def wait(self):
-        """Aguarda tempo necessario antes da proxima requisicao"""
-        now = time.time()
+        if chave:
+            try:
+                self._bucket = bucket or obter_token_bucket()
+            except sqlite3.Error:
+                self._bucket = None
 
-        # Verifica se esta bloqueado
-        if now < self._blocked_until:
-            wait_time = self._blocked_until - now
-            time.sleep(wait_time)
+    def _reservar(self) -> float:
+        """
+        Reserva o proximo horario livre e retorna quanto falta para ele
+
+        A reserva e feita sob lock e sem I/O, de modo que varias threads ou
+        corrotinas compartilhando o mesmo limiter recebem horarios
+        sucessivos em vez de disparar juntas. Com token bucket, o
+        espacamento base vem do bucket compartilhado e o controle local
+        cuida apenas de backoff e bloqueio.
+        """
+        compartilhado = self._bucket is not None and self.rate > 0
+
+        with self._lock:
             now = time.time()
+            intervalo = self._current_backoff
+            if compartilhado and self._current_backoff <= self.rate:
+                intervalo = 0.0
+            inicio = max(
+                now,
+                self._blocked_until,
+                self._last_request + intervalo
+            )
+            self._last_request = inicio
+            self._request_count += 1
+            wait_time = inicio - now
+
+        if compartilhado:
+            try:
+                wait_time = max(
+                    wait_time,
+                    self._bucket.reservar(self.chave, 1.0 / self.rate, self.burst)
+                )
+            except sqlite3.Error:
+                # Sem o arquivo compartilhado, volta ao limite local
+                self._bucket = None
+                wait_time = max(wait_time, self.rate)
 
-        # Calcula tempo desde ultima requisicao
-        elapsed = now - self._last_request
+        return wait_time
 
-        # Aguarda se necessario
-        if elapsed < self._current_backoff:
-            wait_time = self._current_backoff - elapsed
+    def wait(self):
+        """Aguarda tempo necessario antes da proxima requisicao"""
+        wait_time = self._reservar()
+        if wait_time > 0:
             time.sleep(wait_time)
 
-        self._last_request = time.time()
-        self._request_count += 1
+    async def wait_async(self):
+        """Versao assincrona de wait (nao bloqueia o event loop)"""
+        wait_time = self._reservar()
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
 
-    def success(self):
-        """Registra requisicao bem sucedida"""
+    def success(self, latencia_ms: Optional[float] = None):
+        """
+        Registra requisicao bem sucedida
+
+        Args:
+            latencia_ms: Latencia da resposta (alimenta o controle AIMD)
+        """
         self._error_count = 0
+        if self.controlador is not None:
+            self.controlador.registrar_sucesso(latencia_ms)
+            self.rate = self.controlador.intervalo
         self._current_backoff = self.rate
 
-    def error(self, blocked: bool = False):
+    def error(self, blocked: bool = False, retry_after: Optional[float] = None):
         """
         Registra erro e aplica backoff
 
         Args:
             blocked: Se detectou bloqueio temporario
+            retry_after: Espera pedida pelo servidor (header Retry-After)
         """
         self._error_count += 1
 
+        if self.controlador is not None:
+            self.controlador.registrar_erro()
+            self.rate = self.controlador.intervalo
+
         if blocked:
-            # Bloqueio temporario: aguarda mais tempo
-            self._blocked_until = time.time() + 60.0
+            # Bloqueio temporario: aguarda mais tempo (em todos os processos)
+            duracao = retry_after if retry_after is not None else self.bloqueio
+            self._blocked_until = time.time() + duracao
             self._current_backoff = min(self._current_backoff * 2, self.max_backoff)
+            if self._bucket is not None:
+                try:
+                    self._bucket.bloquear(self.chave, duracao)
+                except sqlite3.Error:
+                    pass
         else:
             # Erro normal: aplica backoff exponencial
             self._current_backoff = min(
@@ -953,6 +1249,47 @@ class RateLimiter:
         """Verifica se esta bloqueado"""
         return time.time() < self._blocked_until
 
+    @property
+    def tempo_espera(self) -> float:
+        """Espera atual (segundos) ate a proxima requisicao ser liberada"""
+        now = time.time()
+        espera = max(0.0, self._blocked_until - now, self._last_request + self._current_backoff - now)
+        if self._bucket is not None and self.rate > 0:
+            try:
+                espera = max(espera, self._bucket.tempo_espera(self.chave, 1.0 / self.rate, self.burst))
+            except sqlite3.Error:
+                pass
+        return espera
+
+
+def criar_rate_limiter_host(
+    url: str,
+    rate: float = DEFAULT_RATE_LIMIT,
+    adaptativa: bool = True,
+    taxa_maxima: Optional[float] = None
+) -> RateLimiter:
+    """
+    Cria rate limiter para o host da URL
+
+    O limite e dividido entre processos (token bucket) e, se `adaptativa`,
+    a taxa parte de `rate` e segue o controle AIMD aprendido para o host.
+
+    Args:
+        url: URL (ou host) de destino
+        rate: Intervalo inicial entre requisicoes (segundos)
+        adaptativa: Se deve usar controle AIMD
+        taxa_maxima: Teto do AIMD em req/s (padrao: multiplo da taxa
+            inicial, ver adaptive_rate.DEFAULT_FATOR_MAXIMO)
+
+    Returns:
+        RateLimiter configurado
+    """
+    host = urlparse(url).netloc or url
+    controlador = None
+    if adaptativa and rate > 0:
+        controlador = obter_controlador(host, taxa_inicial=1.0 / rate, taxa_maxima=taxa_maxima)
+    return RateLimiter(rate=rate, chave=host, controlador=controlador)
+
 
 # =============================================================================
 # CAPTCHA HANDLER
@@ -968,24 +1305,30 @@ class CaptchaHandler:
     - Fallback para resolucao manual
     """
 
-    def __init__(self, logger: Optional[LogManager] = None):
+    def __init__(
+        self,
+        logger: Optional[LogManager] = None,
+        layout: Optional[LayoutCompilado] = None
+    ):
         """
         Inicializa o handler de CAPTCHA
 
         Args:
             logger: Logger para registrar eventos
+            layout: Layout de extracao (padrao LAYOUT_ESAJ)
         """
         self.logger = logger or LogManager()
+        self.layout = layout or LAYOUT_ESAJ
         self._ocr_available = PIL_AVAILABLE and TESSERACT_AVAILABLE
         self._attempts: int = 0
         self._successes: int = 0
 
-    def detectar_captcha(self, html: str) -> bool:
+    def detectar_captcha(self, html: Union[str, PaginaHTML]) -> bool:
         """
         Detecta presenca de CAPTCHA na pagina
 
         Args:
-            html: HTML da pagina
+            html: HTML da pagina (ou PaginaHTML ja decodificada)
 
         Returns:
             True se CAPTCHA detectado
@@ -1002,10 +1345,9 @@ class CaptchaHandler:
             'Verificacao de seguranca',
         ]
 
-        for indicador in indicadores:
-            if indicador in html:
-                self.logger.warning("CAPTCHA detectado na pagina")
-                return True
+        if como_pagina(html).contem(indicadores):
+            self.logger.warning("CAPTCHA detectado na pagina")
+            return True
 
         return False
 
@@ -1022,14 +1364,11 @@ class CaptchaHandler:
         if not BS4_AVAILABLE:
             return None
 
-        soup = BeautifulSoup(html, 'html.parser')
+        # So as imagens interessam
+        soup = criar_soup(html, parse_only=apenas_tags('img'))
 
-        # Procura imagem de CAPTCHA
-        captcha_img = soup.find('img', {'id': re.compile(r'captcha', re.I)})
-        if not captcha_img:
-            captcha_img = soup.find('img', {'class': re.compile(r'captcha', re.I)})
-        if not captcha_img:
-            captcha_img = soup.find('img', {'src': re.compile(r'captcha', re.I)})
+        # Procura imagem de CAPTCHA (por id, classe e src, nessa ordem)
+        captcha_img = self.layout.primeiro('captcha', soup)
 
         if captcha_img and captcha_img.get('src'):
             return captcha_img['src']
@@ -1140,7 +1479,16 @@ class ESAJScraper:
         timeout: int = DEFAULT_TIMEOUT,
         max_retries: int = DEFAULT_MAX_RETRIES,
         log_level: int = logging.INFO,
-        verificar_ssl: bool = True
+        verificar_ssl: bool = True,
+        taxa_adaptativa: bool = True,
+        taxa_maxima: Optional[float] = None,
+        max_downloads: int = DEFAULT_MAX_DOWNLOADS,
+        deduplicar_documentos: bool = False,
+        layout: Union[str, LayoutCompilado, None] = None,
+        cursor_store: Optional[CursorStore] = None,
+        arquivar_html: bool = False,
+        arquivo_html: Optional[ArquivoHTML] = None,
+        politica_retry: Optional[PoliticaRetry] = None
     ):
         """
         Inicializa o scraper
@@ -1155,7 +1503,29 @@ class ESAJScraper:
             max_retries: Numero maximo de tentativas
             log_level: Nivel de log
             verificar_ssl: Se deve verificar certificados SSL
+            taxa_adaptativa: Se a taxa deve se ajustar (AIMD) a partir de
+                rate_limit conforme latencia e erros do tribunal
+            taxa_maxima: Teto da taxa adaptativa em req/s (padrao: multiplo
+                de 1 / rate_limit, ver adaptive_rate.DEFAULT_FATOR_MAXIMO)
+            max_downloads: Documentos baixados simultaneamente
+            deduplicar_documentos: Se documentos ja presentes no store
+                compartilhado (ROM_DOCUMENT_STORE) nao sao baixados de novo
+                (mesmo processo/documento ou mesmo conteudo); desligado por
+                padrao para nao gravar fora dos diretorios do scraper
+            layout: Layout de extracao registrado (nome) ou compilado
+                (padrao LAYOUT_ESAJ)
+            cursor_store: Cursores de sincronizar() (padrao: store
+                compartilhado do processo)
+            arquivar_html: Se as paginas de processo recebidas sao
+                guardadas no arquivo compartilhado (ver reprocessar_arquivo)
+            arquivo_html: Arquivo de paginas proprio (implica arquivar)
+            politica_retry: Tentativas, prazo total e backoff das requisicoes
+                (padrao: max_retries tentativas com DEFAULT_PRAZO_TOTAL)
         """
+        self.layout = obter_layout(layout) if isinstance(layout, str) else (layout or LAYOUT_ESAJ)
+        self.cursor_store = cursor_store
+        self.arquivo_html = arquivo_html or (obter_arquivo_html() if arquivar_html else None)
+
         # Componentes
         self.logger = LogManager(
             name="esaj_scraper",
@@ -1167,13 +1537,31 @@ class ESAJScraper:
             ttl=cache_ttl,
             enabled=cache_enabled
         )
-        self.rate_limiter = RateLimiter(rate=rate_limit)
-        self.captcha_handler = CaptchaHandler(logger=self.logger)
+        self.rate_limit = rate_limit
+        self.taxa_adaptativa = taxa_adaptativa
+        self.taxa_maxima = taxa_maxima
+        self.rate_limiter = criar_rate_limiter_host(
+            BASE_URL_ESAJ,
+            rate=rate_limit,
+            adaptativa=taxa_adaptativa,
+            taxa_maxima=taxa_maxima
+        )
+        self.captcha_handler = CaptchaHandler(logger=self.logger, layout=self.layout)
 
         # Configuracoes
         self.timeout = timeout
         self.max_retries = max_retries
+        self.politica_retry = politica_retry or PoliticaRetry(max_tentativas=max_retries)
         self.verificar_ssl = verificar_ssl
+        self.max_downloads = max_downloads
+
+        # Store de documentos compartilhado (deduplicacao por SHA-256)
+        self.document_store: Optional[DocumentStore] = None
+        if deduplicar_documentos:
+            try:
+                self.document_store = obter_document_store()
+            except (sqlite3.Error, OSError) as e:
+                self.logger.warning(f"Store de documentos indisponivel: {e}")
 
         # Sessao HTTP
         self._session: Optional[requests.Session] = None
@@ -1194,13 +1582,9 @@ class ESAJScraper:
         self._session = requests.Session()
         self._session.headers.update(DEFAULT_HEADERS)
 
-        # Configura retry
-        retry_strategy = Retry(
-            total=self.max_retries,
-            backoff_factor=0.5,
-            status_forcelist=[500, 502, 503, 504],
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # Sem retry no adapter: as tentativas ficam com a politica_retry
+        # (antes o Retry do urllib3 multiplicava as tentativas do laco)
+        adapter = HTTPAdapter(max_retries=0)
         self._session.mount("https://", adapter)
         self._session.mount("http://", adapter)
 
@@ -1211,10 +1595,11 @@ class ESAJScraper:
         params: Optional[Dict] = None,
         data: Optional[Dict] = None,
         headers: Optional[Dict] = None,
-        allow_redirects: bool = True
+        allow_redirects: bool = True,
+        stream: bool = False
     ) -> requests.Response:
         """
-        Faz requisicao HTTP com rate limiting
+        Faz requisicao HTTP com rate limiting e retry (ver retry_policy)
 
         Args:
             url: URL da requisicao
@@ -1223,17 +1608,16 @@ class ESAJScraper:
             data: Dados para POST
             headers: Headers adicionais
             allow_redirects: Se permite redirects
+            stream: Se o corpo deve ser lido sob demanda (downloads)
 
         Returns:
             Response da requisicao
 
         Raises:
             ESAJConnectionError: Se falhar apos todas as tentativas
+            ESAJCircuitBreakerOpenError: Se o circuito do host estiver aberto
             ESAJRateLimitError: Se bloqueado por rate limit
         """
-        # Aplica rate limit
-        self.rate_limiter.wait()
-
         # Merge headers
         req_headers = DEFAULT_HEADERS.copy()
         if headers:
@@ -1241,126 +1625,147 @@ class ESAJScraper:
 
         self.logger.debug(f"Requisicao: {method} {url}", params=params)
 
-        tentativas = 0
+        execucao = self.politica_retry.iniciar(urlparse(url).netloc)
+        protecao = self._protecao(url)
         ultimo_erro = None
 
-        while tentativas < self.max_retries:
-            tentativas += 1
+        while execucao.nova_tentativa():
+            # Circuito aberto: falha na hora, antes de esperar o rate limit
+            self._verificar_circuito(protecao)
+
+            # Aplica rate limit (a cada tentativa, inclusive retries)
+            self.rate_limiter.wait()
 
             try:
-                if method.upper() == "GET":
-                    response = self._session.get(
-                        url,
-                        params=params,
-                        headers=req_headers,
-                        timeout=self.timeout,
-                        allow_redirects=allow_redirects,
-                        verify=self.verificar_ssl
-                    )
-                else:
-                    response = self._session.post(
-                        url,
-                        params=params,
-                        data=data,
-                        headers=req_headers,
-                        timeout=self.timeout,
-                        allow_redirects=allow_redirects,
-                        verify=self.verificar_ssl
-                    )
+                inicio = time.time()
+                with protecao.limite.vaga():
+                    if method.upper() == "GET":
+                        response = self._session.get(
+                            url,
+                            params=params,
+                            headers=req_headers,
+                            timeout=execucao.timeout(self.timeout),
+                            allow_redirects=allow_redirects,
+                            verify=self.verificar_ssl,
+                            stream=stream
+                        )
+                    else:
+                        response = self._session.post(
+                            url,
+                            params=params,
+                            data=data,
+                            headers=req_headers,
+                            timeout=execucao.timeout(self.timeout),
+                            allow_redirects=allow_redirects,
+                            verify=self.verificar_ssl,
+                            stream=stream
+                        )
 
-                # Verifica status
-                if response.status_code == 429:
-                    # Rate limit
-                    self.rate_limiter.error(blocked=True)
-                    self.logger.warning("Rate limit detectado - aguardando...")
-                    continue
-
-                if response.status_code >= 500:
-                    # Erro do servidor
-                    self.rate_limiter.error()
-                    self.logger.warning(f"Erro do servidor: {response.status_code}")
-                    continue
-
-                # Sucesso
-                self.rate_limiter.success()
-                return response
-
-            except requests.exceptions.Timeout as e:
-                self.logger.warning(f"Timeout na tentativa {tentativas}: {e}")
-                ultimo_erro = e
-                self.rate_limiter.error()
+            except LimiteConcorrenciaError as e:
+                raise ESAJConnectionError(str(e)) from e
 
-            except requests.exceptions.ConnectionError as e:
-                self.logger.warning(f"Erro de conexao na tentativa {tentativas}: {e}")
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                self.logger.warning(f"Erro de conexao na tentativa {execucao.tentativas}: {e}")
                 ultimo_erro = e
                 self.rate_limiter.error()
+                protecao.registrar(erro=e)
+                espera = execucao.espera(erro=e)
 
             except Exception as e:
                 self.logger.error(f"Erro inesperado: {e}")
                 ultimo_erro = e
+                protecao.registrar(erro=e)
                 break
 
-        raise ESAJConnectionError(f"Falha apos {tentativas} tentativas: {ultimo_erro}")
+            else:
+                protecao.registrar(status_code=response.status_code)
+                if response.status_code < 500 and response.status_code != 429:
+                    # Sucesso
+                    self.rate_limiter.success(latencia_ms=(time.time() - inicio) * 1000)
+                    return response
+
+                response.close()
+                ultimo_erro = f"HTTP {response.status_code}"
+                espera = execucao.espera(
+                    status_code=response.status_code,
+                    retry_after=self._registrar_erro_http(response)
+                )
+
+            if espera is None:
+                break
+            time.sleep(espera)
+
+        if execucao.motivo:
+            self.logger.warning(f"Sem novo retry ({execucao.motivo}) para {url}")
+        raise ESAJConnectionError(f"Falha apos {execucao.tentativas} tentativas: {ultimo_erro}")
+
+    def _protecao(self, url: str) -> Resiliencia:
+        """
+        Circuit breaker e limite de concorrencia do host da URL
+
+        Args:
+            url: URL da requisicao
+
+        Returns:
+            Resiliencia compartilhada no processo (chave "esaj:<host>")
+        """
+        return obter_resiliencia(
+            f"esaj:{urlparse(url).netloc}",
+            logger=logging.getLogger("esaj_scraper")
+        )
+
+    def _verificar_circuito(self, protecao: Resiliencia):
+        """
+        Rejeita a requisicao se o circuito do host estiver aberto
+
+        Raises:
+            ESAJCircuitBreakerOpenError: Se o circuito estiver aberto
+        """
+        try:
+            protecao.verificar()
+        except CircuitoAbertoError as e:
+            raise ESAJCircuitBreakerOpenError(str(e)) from e
+
+    def _registrar_erro_http(self, response: Any) -> Optional[float]:
+        """
+        Registra 429/5xx no rate limiter
+
+        Args:
+            response: Resposta com status 429 ou 5xx (requests ou httpx)
 
-    def _extrair_dados_basicos(self, soup: BeautifulSoup, instancia: str) -> Dict:
+        Returns:
+            Espera minima antes do retry (bloqueio do 429), ou None
+        """
+        if response.status_code == 429:
+            # Rate limit
+            retry_after = segundos_retry_after(response.headers.get("Retry-After"))
+            self.rate_limiter.error(blocked=True, retry_after=retry_after)
+            self.logger.warning("Rate limit detectado - aguardando...")
+            return retry_after if retry_after is not None else self.rate_limiter.bloqueio
+
+        # Erro do servidor
+        self.rate_limiter.error()
+        self.logger.warning(f"Erro do servidor: {response.status_code}")
+        return None
+
+    def _extrair_dados_basicos(
+        self,
+        soup: Union[BeautifulSoup, PaginaHTML],
+        instancia: str
+    ) -> Dict:
         """
         Extrai dados basicos do processo
 
         Args:
-            soup: BeautifulSoup do HTML
+            soup: BeautifulSoup do HTML (ou PaginaHTML, que reaproveita o
+                indice de textos e ids entre os campos)
             instancia: "1" ou "2"
 
         Returns:
             Dict com dados basicos
         """
-        dados = {}
-
-        # Mapeamento de labels para campos
-        mapeamento = {
-            "Classe": "classe",
-            "Assunto": "assunto",
-            "Foro": "foro",
-            "Vara": "vara",
-            "Juiz": "juiz",
-            "Distribuicao": "data_distribuicao",
-            "Distribuição": "data_distribuicao",
-            "Area": "area",
-            "Área": "area",
-            "Valor da acao": "valor_causa",
-            "Valor da ação": "valor_causa",
-            "Outros assuntos": "assuntos_secundarios",
-            "Situacao": "situacao",
-            "Situação": "situacao",
-            # 2o grau
-            "Orgao julgador": "orgao_julgador",
-            "Órgão julgador": "orgao_julgador",
-            "Relator": "relator",
-            "Relator(a)": "relator",
-        }
-
-        # Extrai dados da tabela de informacoes
-        tabela = soup.find('table', {'id': 'tableTodasPartes'})
-        if not tabela:
-            tabela = soup.find('table', {'class': 'secaoFormBody'})
-
-        # Procura em divs e spans
-        for label_text, campo in mapeamento.items():
-            # Tenta encontrar label
-            label = soup.find(string=re.compile(f'^{re.escape(label_text)}', re.I))
-            if label:
-                parent = label.parent
-                if parent:
-                    # Procura valor proximo
-                    value_elem = parent.find_next_sibling() or parent.find_next()
-                    if value_elem:
-                        valor = limpar_html(value_elem.get_text())
-                        if valor:
-                            dados[campo] = valor
-
-            # Tenta tambem em format de span/td
-            span = soup.find('span', {'id': re.compile(campo, re.I)})
-            if span:
-                dados[campo] = limpar_html(span.get_text())
+        # Rotulos do layout, com span de id do campo prevalecendo
+        dados = extrair_rotulados(soup, self.layout, limpar=limpar_html, tag_id='span')
 
         # Processa campos especificos
         if 'valor_causa' in dados:
@@ -1383,99 +1788,71 @@ class ESAJScraper:
         """
         partes = []
 
-        # Procura tabela de partes
-        tabela_partes = soup.find('table', {'id': 'tableTodasPartes'})
-        if not tabela_partes:
-            tabela_partes = soup.find('table', {'id': 'tablePartesPrincipais'})
+        # Procura tabela de partes (completa, depois principais)
+        tabela_partes = self.layout.primeiro('partes', soup)
 
         if tabela_partes:
-            rows = tabela_partes.find_all('tr')
-
             tipo_atual = None
 
-            for row in rows:
-                cols = row.find_all('td')
-                if len(cols) >= 2:
-                    # Primeira coluna: tipo da parte
-                    tipo_text = limpar_html(cols[0].get_text()).lower()
-                    if tipo_text:
-                        # Mapeia tipos de parte
-                        tipo_map = {
-                            'autor': TipoParte.AUTOR.value,
-                            'autora': TipoParte.AUTOR.value,
-                            'requerente': TipoParte.REQUERENTE.value,
-                            'reu': TipoParte.REU.value,
-                            're': TipoParte.REU.value,
-                            'requerido': TipoParte.REQUERIDO.value,
-                            'requerida': TipoParte.REQUERIDO.value,
-                            'apelante': TipoParte.APELANTE.value,
-                            'apelado': TipoParte.APELADO.value,
-                            'agravante': TipoParte.AGRAVANTE.value,
-                            'agravado': TipoParte.AGRAVADO.value,
-                            'recorrente': TipoParte.RECORRENTE.value,
-                            'recorrido': TipoParte.RECORRIDO.value,
-                            'terceiro': TipoParte.TERCEIRO.value,
-                            'interessado': TipoParte.INTERESSADO.value,
-                        }
-                        for key, value in tipo_map.items():
-                            if key in tipo_text:
-                                tipo_atual = value
-                                break
-                        else:
-                            tipo_atual = TipoParte.OUTRO.value
-
-                    # Segunda coluna: nome e advogados
-                    info_text = cols[1].get_text('\n', strip=True)
-                    linhas = info_text.split('\n')
-
-                    if linhas:
-                        nome = limpar_html(linhas[0])
-                        advogados = []
-
-                        # Procura advogados
-                        for linha in linhas[1:]:
-                            linha = limpar_html(linha)
-                            if 'advogad' in linha.lower() or OAB_PATTERN.search(linha):
-                                advogados.append(linha)
-
-                        # Procura CPF/CNPJ
-                        documento = None
-                        tipo_doc = None
-                        cpf_match = CPF_PATTERN.search(info_text)
-                        if cpf_match:
-                            documento = formatar_cpf(cpf_match.group())
-                            tipo_doc = "CPF"
-                        else:
-                            cnpj_match = CNPJ_PATTERN.search(info_text)
-                            if cnpj_match:
-                                documento = formatar_cnpj(cnpj_match.group())
-                                tipo_doc = "CNPJ"
-
-                        parte = Parte(
-                            tipo=tipo_atual or TipoParte.OUTRO.value,
-                            nome=nome,
-                            documento=documento,
-                            tipo_documento=tipo_doc,
-                            advogados=advogados
-                        )
-                        partes.append(parte.to_dict())
+            for _, cols in linhas_tabela(tabela_partes):
+                # Primeira coluna: tipo da parte
+                tipo_text = limpar_html(cols[0].get_text()).lower()
+                if tipo_text:
+                    tipo_atual = self.layout.classificar(
+                        'tipo_parte', tipo_text, TipoParte.OUTRO.value
+                    )
+
+                # Segunda coluna: nome e advogados
+                info_text = cols[1].get_text('\n', strip=True)
+                linhas = info_text.split('\n')
+
+                if linhas:
+                    nome = limpar_html(linhas[0])
+                    advogados = []
+
+                    # Procura advogados
+                    for linha in linhas[1:]:
+                        linha = limpar_html(linha)
+                        if 'advogad' in linha.lower() or OAB_PATTERN.search(linha):
+                            advogados.append(linha)
+
+                    # Procura CPF/CNPJ
+                    documento = None
+                    tipo_doc = None
+                    cpf_match = CPF_PATTERN.search(info_text)
+                    if cpf_match:
+                        documento = formatar_cpf(cpf_match.group())
+                        tipo_doc = "CPF"
+                    else:
+                        cnpj_match = CNPJ_PATTERN.search(info_text)
+                        if cnpj_match:
+                            documento = formatar_cnpj(cnpj_match.group())
+                            tipo_doc = "CNPJ"
+
+                    parte = Parte(
+                        tipo=tipo_atual or TipoParte.OUTRO.value,
+                        nome=nome,
+                        documento=documento,
+                        tipo_documento=tipo_doc,
+                        advogados=advogados
+                    )
+                    partes.append(parte.to_dict())
 
         # Se nao encontrou tabela, tenta outros seletores
         if not partes:
             # Tenta encontrar partes em divs
-            for tipo_id in ['autores', 'reqtes', 'reus', 'reqdos', 'apelantes', 'apelados']:
-                div = soup.find('div', {'id': re.compile(tipo_id, re.I)})
-                if div:
-                    tipo = 'autor' if 'autor' in tipo_id or 'reqte' in tipo_id else 'reu'
-                    nome = limpar_html(div.get_text())
-                    if nome:
-                        partes.append({
-                            'tipo': tipo,
-                            'nome': nome,
-                            'documento': None,
-                            'tipo_documento': None,
-                            'advogados': []
-                        })
+            divs = [('autor', div) for div in self.layout.cada('partes_ativas', soup)]
+            divs += [('reu', div) for div in self.layout.cada('partes_passivas', soup)]
+            for tipo, div in divs:
+                nome = limpar_html(div.get_text())
+                if nome:
+                    partes.append({
+                        'tipo': tipo,
+                        'nome': nome,
+                        'documento': None,
+                        'tipo_documento': None,
+                        'advogados': []
+                    })
 
         return partes
 
@@ -1489,47 +1866,72 @@ class ESAJScraper:
         Returns:
             Lista de movimentacoes ordenadas por data
         """
-        movimentacoes = []
-
-        # Procura tabela de movimentacoes
-        tabela_mov = soup.find('table', {'id': 'tabelaTodasMovimentacoes'})
-        if not tabela_mov:
-            tabela_mov = soup.find('table', {'id': 'tabelaUltimasMovimentacoes'})
-
-        if tabela_mov:
-            rows = tabela_mov.find_all('tr')
-
-            for row in rows:
-                cols = row.find_all('td')
-                if len(cols) >= 2:
-                    # Primeira coluna: data
-                    data_text = limpar_html(cols[0].get_text())
-                    data = parsear_data(data_text)
-
-                    # Segunda coluna: descricao
-                    descricao = limpar_html(cols[1].get_text())
-
-                    # Verifica se tem documento vinculado
-                    doc_link = cols[1].find('a', href=True)
-                    doc_url = None
-                    if doc_link:
-                        href = doc_link.get('href', '')
-                        if href and 'abrirDocumento' in href:
-                            doc_url = urljoin(BASE_URL_ESAJ, href)
-
-                    if data and descricao:
-                        mov = Movimentacao(
-                            data=data,
-                            descricao=descricao,
-                            documento_vinculado=doc_url
-                        )
-                        movimentacoes.append(mov.to_dict())
+        movimentacoes = [
+            mov for mov in map(self._montar_movimentacao, self._linhas_movimentacoes(soup))
+            if mov
+        ]
 
         # Ordena por data (mais recente primeiro)
         movimentacoes.sort(key=lambda x: x.get('data', ''), reverse=True)
 
         return movimentacoes
 
+    def _linhas_movimentacoes(self, soup: BeautifulSoup) -> List[List[Any]]:
+        """Celulas de cada linha da tabela de movimentacoes (todas, depois ultimas)"""
+        tabela_mov = self.layout.primeiro('movimentacoes', soup)
+        if not tabela_mov:
+            return []
+        return [cols for _, cols in linhas_tabela(tabela_mov)]
+
+    @staticmethod
+    def _data_movimentacao(cols: List[Any]) -> Optional[str]:
+        """Data ISO da linha de movimentacao (le apenas a primeira coluna)"""
+        data = parsear_data(limpar_html(cols[0].get_text()))
+        return data if data and DATA_ISO_PATTERN.match(data) else None
+
+    def _montar_movimentacao(self, cols: List[Any]) -> Optional[Dict]:
+        """Movimentacao de uma linha da tabela, ou None se incompleta"""
+        # Primeira coluna: data
+        data_text = limpar_html(cols[0].get_text())
+        data = parsear_data(data_text)
+
+        # Segunda coluna: descricao
+        descricao = limpar_html(cols[1].get_text())
+
+        # Verifica se tem documento vinculado
+        doc_link = cols[1].find('a', href=True)
+        doc_url = None
+        if doc_link:
+            href = doc_link.get('href', '')
+            if href and 'abrirDocumento' in href:
+                doc_url = urljoin(BASE_URL_ESAJ, href)
+
+        if data and descricao:
+            mov = Movimentacao(
+                data=data,
+                descricao=descricao,
+                documento_vinculado=doc_url
+            )
+            return mov.to_dict()
+        return None
+
+    def _sincronizar_pagina(
+        self,
+        pagina: Union[BeautifulSoup, PaginaHTML],
+        numero_formatado: str,
+        instancia: str
+    ) -> DeltaMovimentacoes:
+        """Delta de movimentacoes da pagina do processo em relacao ao cursor"""
+        store = self.cursor_store or obter_cursor_store()
+        return store.sincronizar(
+            "esaj",
+            f"{numero_formatado}:{instancia}",
+            self._linhas_movimentacoes(como_pagina(pagina).soup),
+            self._data_movimentacao,
+            self._montar_movimentacao,
+            lambda mov: (mov['data'], mov['descricao'])
+        )
+
     def _extrair_documentos(self, soup: BeautifulSoup) -> List[Dict]:
         """
         Extrai lista de documentos do processo
@@ -1542,49 +1944,25 @@ class ESAJScraper:
         """
         documentos = []
 
-        # Procura links para documentos
-        for link in soup.find_all('a', href=True):
+        # Procura links para documentos (abrirDocumento/baixarArquivo)
+        for link in self.layout.todos('documentos', soup):
             href = link.get('href', '')
+            texto = limpar_html(link.get_text())
 
-            # Identifica links de documentos
-            if 'abrirDocumento' in href or 'baixarArquivo' in href:
-                texto = limpar_html(link.get_text())
-
-                # Tenta identificar tipo do documento
-                tipo = TipoDocumento.OUTRO.value
-                texto_lower = texto.lower()
-
-                tipo_map = {
-                    'peticao inicial': TipoDocumento.PETICAO_INICIAL.value,
-                    'petição inicial': TipoDocumento.PETICAO_INICIAL.value,
-                    'contestacao': TipoDocumento.CONTESTACAO.value,
-                    'contestação': TipoDocumento.CONTESTACAO.value,
-                    'sentenca': TipoDocumento.SENTENCA.value,
-                    'sentença': TipoDocumento.SENTENCA.value,
-                    'acordao': TipoDocumento.ACORDAO.value,
-                    'acórdão': TipoDocumento.ACORDAO.value,
-                    'despacho': TipoDocumento.DESPACHO.value,
-                    'decisao': TipoDocumento.DECISAO.value,
-                    'decisão': TipoDocumento.DECISAO.value,
-                    'certidao': TipoDocumento.CERTIDAO.value,
-                    'certidão': TipoDocumento.CERTIDAO.value,
-                }
-
-                for key, value in tipo_map.items():
-                    if key in texto_lower:
-                        tipo = value
-                        break
+            # Tenta identificar tipo do documento
+            texto_lower = texto.lower()
+            tipo = self.layout.classificar('tipo_documento', texto_lower, TipoDocumento.OUTRO.value)
 
-                # Verifica se e sigiloso
-                sigiloso = 'sigilo' in texto_lower or 'restrito' in texto_lower
+            # Verifica se e sigiloso
+            sigiloso = 'sigilo' in texto_lower or 'restrito' in texto_lower
 
-                doc = Documento(
-                    tipo=tipo,
-                    descricao=texto,
-                    url=urljoin(BASE_URL_ESAJ, href),
-                    sigiloso=sigiloso
-                )
-                documentos.append(doc.to_dict())
+            doc = Documento(
+                tipo=tipo,
+                descricao=texto,
+                url=urljoin(BASE_URL_ESAJ, href),
+                sigiloso=sigiloso
+            )
+            documentos.append(doc.to_dict())
 
         return documentos
 
@@ -1601,42 +1979,72 @@ class ESAJScraper:
         audiencias = []
 
         # Procura secao de audiencias
-        secao_aud = soup.find('div', {'id': 'audienciasPlaceholder'})
-        if not secao_aud:
-            secao_aud = soup.find('table', {'id': 'tabelaAudiencias'})
+        secao_aud = self.layout.primeiro('audiencias', soup)
+        padrao_hora = self.layout.padrao('hora')
 
         if secao_aud:
-            rows = secao_aud.find_all('tr')
+            for _, cols in linhas_tabela(secao_aud):
+                texto = limpar_html(' '.join(col.get_text() for col in cols))
 
-            for row in rows:
-                cols = row.find_all('td')
-                if len(cols) >= 2:
-                    texto = limpar_html(' '.join(col.get_text() for col in cols))
+                # Extrai data
+                data_match = DATA_PATTERN.search(texto)
+                if data_match:
+                    data = f"{data_match.group(3)}-{data_match.group(2)}-{data_match.group(1)}"
 
-                    # Extrai data
-                    data_match = DATA_PATTERN.search(texto)
-                    if data_match:
-                        data = f"{data_match.group(3)}-{data_match.group(2)}-{data_match.group(1)}"
+                    # Extrai hora
+                    hora_match = padrao_hora.search(texto)
+                    hora = f"{hora_match.group(1)}:{hora_match.group(2)}" if hora_match else None
 
-                        # Extrai hora
-                        hora_match = re.search(r'(\d{2}):(\d{2})', texto)
-                        hora = f"{hora_match.group(1)}:{hora_match.group(2)}" if hora_match else None
-
-                        aud = Audiencia(
-                            data=data,
-                            hora=hora,
-                            tipo=texto,
-                        )
-                        audiencias.append(aud.to_dict())
+                    aud = Audiencia(
+                        data=data,
+                        hora=hora,
+                        tipo=texto,
+                    )
+                    audiencias.append(aud.to_dict())
 
         return audiencias
 
-    def detectar_segredo_justica(self, html: str) -> bool:
+    def _extrair_processos_relacionados(
+        self,
+        soup: BeautifulSoup,
+        numero_formatado: str
+    ) -> Tuple[Optional[str], List[str]]:
+        """
+        Extrai o processo de origem e os processos dependentes
+
+        Dependentes sao recursos, incidentes, execucoes e apensos listados
+        na pagina; o proprio processo e ignorado.
+
+        Args:
+            soup: BeautifulSoup do HTML
+            numero_formatado: Numero CNJ do processo da pagina
+
+        Returns:
+            (numero de origem ou None, numeros dependentes sem repeticao)
+        """
+        padrao = self.layout.padrao('numero_cnj')
+
+        origem = None
+        secao_origem = self.layout.primeiro('processo_origem', soup)
+        if secao_origem:
+            match = padrao.search(secao_origem.get_text(" "))
+            if match and match.group(0) != numero_formatado:
+                origem = match.group(0)
+
+        dependentes: Dict[str, None] = {}
+        for secao in self.layout.todos('processos_relacionados', soup):
+            for numero in padrao.findall(secao.get_text(" ")):
+                if numero not in (numero_formatado, origem):
+                    dependentes[numero] = None
+
+        return origem, list(dependentes)
+
+    def detectar_segredo_justica(self, html: Union[str, PaginaHTML]) -> bool:
         """
         Detecta se processo tem segredo de justica
 
         Args:
-            html: HTML da pagina
+            html: HTML da pagina (ou PaginaHTML ja decodificada)
 
         Returns:
             True se processo em segredo de justica
@@ -1660,11 +2068,7 @@ class ESAJScraper:
             'identificação necessária',
         ]
 
-        for indicador in indicadores:
-            if indicador in html:
-                return True
-
-        return False
+        return como_pagina(html).contem(indicadores)
 
     def _parsear_numero_processo(self, numero: str) -> Dict[str, str]:
         """
@@ -1747,7 +2151,8 @@ class ESAJScraper:
         self,
         cpf: str,
         comarca: Optional[str] = None,
-        max_resultados: int = 100
+        max_resultados: int = 100,
+        max_concorrencia: int = DEFAULT_MAX_CONCORRENCIA
     ) -> List[ProcessoESAJ]:
         """
         Busca processos por CPF da parte
@@ -1756,6 +2161,7 @@ class ESAJScraper:
             cpf: CPF da parte
             comarca: Codigo da comarca (opcional)
             max_resultados: Numero maximo de resultados
+            max_concorrencia: Processos extraidos simultaneamente
 
         Returns:
             Lista de ProcessoESAJ encontrados
@@ -1769,13 +2175,16 @@ class ESAJScraper:
         if not validar_cpf(cpf):
             raise ESAJValidationError(f"CPF invalido: {cpf}")
 
-        return self._buscar_por_documento(cpf, "CPF", comarca, max_resultados)
+        return self._buscar_por_documento(
+            cpf, "CPF", comarca, max_resultados, max_concorrencia
+        )
 
     def buscar_por_cnpj(
         self,
         cnpj: str,
         comarca: Optional[str] = None,
-        max_resultados: int = 100
+        max_resultados: int = 100,
+        max_concorrencia: int = DEFAULT_MAX_CONCORRENCIA
     ) -> List[ProcessoESAJ]:
         """
         Busca processos por CNPJ da parte
@@ -1784,6 +2193,7 @@ class ESAJScraper:
             cnpj: CNPJ da parte
             comarca: Codigo da comarca (opcional)
             max_resultados: Numero maximo de resultados
+            max_concorrencia: Processos extraidos simultaneamente
 
         Returns:
             Lista de ProcessoESAJ encontrados
@@ -1797,28 +2207,80 @@ class ESAJScraper:
         if not validar_cnpj(cnpj):
             raise ESAJValidationError(f"CNPJ invalido: {cnpj}")
 
-        return self._buscar_por_documento(cnpj, "CNPJ", comarca, max_resultados)
+        return self._buscar_por_documento(
+            cnpj, "CNPJ", comarca, max_resultados, max_concorrencia
+        )
 
     def _buscar_por_documento(
         self,
         documento: str,
         tipo_doc: str,
         comarca: Optional[str],
-        max_resultados: int
+        max_resultados: int,
+        max_concorrencia: int = DEFAULT_MAX_CONCORRENCIA
     ) -> List[ProcessoESAJ]:
         """
         Busca processos por documento (CPF ou CNPJ)
 
+        As paginas de resultados sao percorridas por iterar_busca_documento
+        enquanto os processos ja listados sao extraidos em paralelo; o rate
+        limiter compartilhado continua espacando todas as requisicoes.
+
         Args:
             documento: Numero do documento
             tipo_doc: "CPF" ou "CNPJ"
             comarca: Codigo da comarca
             max_resultados: Limite de resultados
+            max_concorrencia: Processos extraidos simultaneamente
 
         Returns:
-            Lista de ProcessoESAJ
+            Lista de ProcessoESAJ, na ordem da busca
+        """
+        pendentes = []
+
+        with ThreadPoolExecutor(
+            max_workers=max(1, max_concorrencia),
+            thread_name_prefix="esaj-detalhe"
+        ) as executor:
+            for resumo in self.iterar_busca_documento(documento, tipo_doc, comarca, max_resultados):
+                numero = resumo.numero_processo
+                pendentes.append((numero, executor.submit(self.extrair_1g, numero)))
+
+            processos = []
+            for numero, future in pendentes:
+                try:
+                    processos.append(future.result())
+                except Exception as e:
+                    self.logger.warning(f"Erro ao extrair processo {numero}: {e}")
+
+        self.logger.info(f"Busca concluida: {len(processos)} processos encontrados")
+        return processos
+
+    def iterar_busca_documento(
+        self,
+        documento: str,
+        tipo_doc: str,
+        comarca: Optional[str] = None,
+        max_resultados: int = 100
+    ) -> Iterator[ResumoProcessoESAJ]:
+        """
+        Percorre as paginas da busca por documento, entregando resumos
+
+        Quando a pagina N tem link para a proxima, a pagina N+1 e
+        requisitada (especulativamente) em segundo plano antes de a pagina
+        N ser parseada, e cada resumo e entregue assim que sua pagina e
+        lida, sem abrir o processo. A requisicao especulativa e descartada
+        ao atingir o limite ou quando o consumidor para de iterar.
+
+        Args:
+            documento: Numero do documento
+            tipo_doc: "CPF" ou "CNPJ"
+            comarca: Codigo da comarca
+            max_resultados: Limite de resultados
+
+        Yields:
+            ResumoProcessoESAJ, na ordem das paginas
         """
-        processos = []
         doc_limpo = re.sub(r'\D', '', documento)
 
         # Monta parametros de busca
@@ -1826,24 +2288,30 @@ class ESAJScraper:
             "conversationId": "",
             "cbPesquisa": "DOCPARTE",
             "dadosConsulta.valorConsulta": doc_limpo,
-            "paginaConsulta": "1",
         }
 
         if comarca:
             params["dadosConsulta.localPesquisa.cdLocal"] = comarca
 
+        def requisitar(pagina: int) -> "requests.Response":
+            return self._fazer_requisicao(
+                ENDPOINTS_1G["search"],
+                params={**params, "paginaConsulta": str(pagina)}
+            )
+
         pagina = 1
-        total_encontrado = 0
+        entregues = 0
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="esaj-pagina")
+        proxima: Optional[Future] = executor.submit(requisitar, pagina)
 
-        while total_encontrado < max_resultados:
-            params["paginaConsulta"] = str(pagina)
-
-            try:
-                # Faz requisicao de busca
-                response = self._fazer_requisicao(
-                    ENDPOINTS_1G["search"],
-                    params=params
-                )
+        try:
+            while entregues < max_resultados:
+                try:
+                    response = proxima.result()
+                except ESAJConnectionError as e:
+                    self.logger.error(f"Erro de conexao na busca: {e}")
+                    break
+                proxima = None
 
                 if response.status_code != 200:
                     break
@@ -1853,258 +2321,472 @@ class ESAJScraper:
                 # Verifica CAPTCHA
                 if self.captcha_handler.detectar_captcha(html):
                     self.logger.warning("CAPTCHA detectado na busca por documento")
-                    # Tentar resolver ou pular
                     break
 
-                # Parseia resultados
-                soup = BeautifulSoup(html, 'html.parser')
-
-                # Procura links de processos
-                links_processos = soup.find_all('a', href=re.compile(r'processo\.codigo='))
-
-                if not links_processos:
-                    break
+                # Especulativa: baixa a proxima pagina enquanto esta e
+                # parseada, se o HTML bruto tiver link para ela
+                if self._tem_link_proxima(html):
+                    proxima = executor.submit(requisitar, pagina + 1)
 
-                for link in links_processos:
-                    if total_encontrado >= max_resultados:
-                        break
+                resumos, tem_proxima = self._ler_pagina_busca(html)
 
-                    # Extrai numero do processo
-                    href = link.get('href', '')
-                    texto = limpar_html(link.get_text())
+                for resumo in resumos[:max_resultados - entregues]:
+                    entregues += 1
+                    yield resumo
 
-                    # Procura numero CNJ no texto
-                    match = re.search(r'\d{7}-\d{2}\.\d{4}\.\d\.\d{2}\.\d{4}', texto)
-                    if match:
-                        numero = match.group()
-                        try:
-                            processo = self.extrair_1g(numero)
-                            processos.append(processo)
-                            total_encontrado += 1
-                        except Exception as e:
-                            self.logger.warning(f"Erro ao extrair processo {numero}: {e}")
-
-                # Verifica se ha proxima pagina
-                link_prox = soup.find('a', string=re.compile('proxim|>>'))
-                if not link_prox:
+                if not resumos or not tem_proxima:
                     break
 
+                if proxima is None:
+                    proxima = executor.submit(requisitar, pagina + 1)
                 pagina += 1
+        finally:
+            # Nao espera a pagina especulativa descartada
+            if proxima is not None:
+                proxima.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _tem_link_proxima(self, html: str) -> bool:
+        """Se o HTML bruto tem link para a proxima pagina (sem parse)"""
+        padrao = self.layout.padrao('proxima_pagina')
+        return any(padrao.search(texto) for texto in textos_links(html))
+
+    def _ler_pagina_busca(self, html: str) -> Tuple[List[ResumoProcessoESAJ], bool]:
+        """
+        Resumos de uma pagina de resultados e se ha proxima pagina
 
-            except ESAJConnectionError as e:
-                self.logger.error(f"Erro de conexao na busca: {e}")
-                break
+        Args:
+            html: HTML da pagina de resultados
 
-        self.logger.info(f"Busca concluida: {len(processos)} processos encontrados")
-        return processos
+        Returns:
+            (resumos da pagina, se existe link para a proxima)
+        """
+        # So os links e os itens da lista sao parseados
+        soup = criar_soup(html, parse_only=apenas_tags('a', 'li', 'tr'))
+        padrao_cnj = self.layout.padrao('numero_cnj')
+
+        resumos = []
+        vistos = set()
+        for link in self.layout.todos('link_processo', soup):
+            # Procura numero CNJ no texto
+            match = padrao_cnj.search(limpar_html(link.get_text()))
+            if not match or match.group() in vistos:
+                continue
+            vistos.add(match.group())
+
+            item = link.find_parent(['li', 'tr']) or link.parent
+            resumos.append(ResumoProcessoESAJ(
+                numero_processo=match.group(),
+                url=urljoin(ENDPOINTS_1G["search"], link.get('href', '')),
+                classe=self._texto_resumo('resumo_classe', item),
+                assunto=self._texto_resumo('resumo_assunto', item),
+                distribuicao=self._texto_resumo('resumo_distribuicao', item),
+            ))
+
+        # Verifica se ha proxima pagina
+        tem_proxima = soup.find('a', string=self.layout.padrao('proxima_pagina')) is not None
+        return resumos, tem_proxima
+
+    def _texto_resumo(self, nome: str, item: Tag) -> Optional[str]:
+        """Texto do campo `nome` do layout dentro de um item da lista"""
+        elemento = self.layout.primeiro(nome, item)
+        if elemento is None:
+            return None
+        return limpar_html(elemento.get_text()) or None
 
-    def extrair_1g(self, numero_processo: str) -> ProcessoESAJ:
+    # =========================================================================
+    # ETAPAS DE EXTRACAO (compartilhadas entre versao sincrona e assincrona)
+    # =========================================================================
+
+    def _params_consulta(self, componentes: Dict[str, str], instancia: str) -> Tuple[str, Dict]:
         """
-        Extrai dados completos de processo de 1o grau
+        Monta endpoint e parametros da consulta por numero
 
         Args:
-            numero_processo: Numero do processo
+            componentes: Componentes do numero (ver _parsear_numero_processo)
+            instancia: "1" ou "2"
 
         Returns:
-            ProcessoESAJ com todos os dados
+            Tupla (url, params)
         """
-        self.logger.info(f"Extraindo dados de 1o grau", numero=numero_processo)
-
-        # Parseia numero
-        componentes = self._parsear_numero_processo(numero_processo)
         numero_formatado = componentes["numero_formatado"]
 
-        # Verifica cache
-        cache_key = f"processo:{numero_formatado}:1"
-        cached = self.cache.get(cache_key)
-        if cached:
-            self.logger.info("Retornando resultado do cache")
-            return ProcessoESAJ(**cached)
+        if instancia == "1":
+            return ENDPOINTS_1G["search"], {
+                "conversationId": "",
+                "dadosConsulta.localPesquisa.cdLocal": "-1",
+                "cbPesquisa": "NUMPROC",
+                "dadosConsulta.valorConsulta": numero_formatado,
+                "dadosConsulta.tipoNuProcesso": "UNIFICADO",
+            }
 
-        # Monta URL de consulta
-        params = {
+        return ENDPOINTS_2G["search"], {
             "conversationId": "",
-            "dadosConsulta.localPesquisa.cdLocal": "-1",
+            "paginaConsulta": "1",
+            "localPesquisa.cdLocal": "-1",
             "cbPesquisa": "NUMPROC",
-            "dadosConsulta.valorConsulta": numero_formatado,
-            "dadosConsulta.tipoNuProcesso": "UNIFICADO",
+            "tipoNuProcesso": "UNIFICADO",
+            "numeroDigitoAnoUnificado": numero_formatado.split('.')[0],
+            "foroNumeroUnificado": componentes["foro_origem"],
+            "dePesquisaNuUnificado": numero_formatado,
+            "dePesquisa": "",
         }
 
-        # Primeira requisicao: busca
-        response = self._fazer_requisicao(
-            ENDPOINTS_1G["search"],
-            params=params
-        )
-
-        html = response.text
+    def _validar_pagina_consulta(
+        self,
+        pagina: PaginaHTML,
+        numero_formatado: str,
+        instancia: str
+    ):
+        """
+        Verifica CAPTCHA, segredo de justica e processo inexistente
 
+        Raises:
+            ESAJCaptchaError, ESAJSegredoJustica, ESAJProcessoNaoEncontrado
+        """
         # Verifica CAPTCHA
-        if self.captcha_handler.detectar_captcha(html):
+        if self.captcha_handler.detectar_captcha(pagina):
             raise ESAJCaptchaError("CAPTCHA detectado - resolucao manual necessaria")
 
         # Verifica segredo de justica
-        if self.detectar_segredo_justica(html):
+        if self.detectar_segredo_justica(pagina):
             raise ESAJSegredoJustica(f"Processo {numero_formatado} em segredo de justica")
 
         # Verifica se encontrou processo
-        if "Nao existem informacoes" in html or "Não existem informações" in html:
-            raise ESAJProcessoNaoEncontrado(f"Processo {numero_formatado} nao encontrado")
-
-        # Parseia HTML
-        soup = BeautifulSoup(html, 'html.parser')
+        if pagina.contem(("Nao existem informacoes", "Não existem informações")):
+            if instancia == "1":
+                raise ESAJProcessoNaoEncontrado(f"Processo {numero_formatado} nao encontrado")
+            raise ESAJProcessoNaoEncontrado(f"Processo {numero_formatado} nao encontrado no 2o grau")
 
-        # Se redirecionou para pagina de selecao, pega primeiro resultado
-        link_processo = soup.find('a', href=re.compile(r'processo\.codigo='))
+    def _link_processo(self, soup: BeautifulSoup) -> Optional[str]:
+        """Retorna URL do primeiro resultado se a busca caiu na pagina de selecao"""
+        # Na pagina do processo, os links sao de recursos/incidentes
+        if self.layout.primeiro('movimentacoes', soup):
+            return None
+        link_processo = self.layout.primeiro('link_processo', soup)
         if link_processo:
-            href = link_processo.get('href', '')
-            response = self._fazer_requisicao(urljoin(BASE_URL_ESAJ, href))
-            html = response.text
-            soup = BeautifulSoup(html, 'html.parser')
-
-        # Extrai dados
-        dados_basicos = self._extrair_dados_basicos(soup, "1")
-        partes = self._extrair_partes(soup)
-        movimentacoes = self._extrair_movimentacoes(soup)
-        documentos = self._extrair_documentos(soup)
-        audiencias = self._extrair_audiencias(soup)
-
-        # Cria objeto do processo
-        processo = ProcessoESAJ(
-            numero_processo=numero_formatado,
-            tribunal="TJSP",
-            sistema="ESAJ",
-            instancia="1",
-            comarca=dados_basicos.get("foro"),
-            foro=dados_basicos.get("foro"),
-            vara=dados_basicos.get("vara"),
-            classe=dados_basicos.get("classe"),
-            assunto=dados_basicos.get("assunto"),
-            area=dados_basicos.get("area"),
-            data_distribuicao=dados_basicos.get("data_distribuicao"),
-            valor_causa=dados_basicos.get("valor_causa"),
-            partes=partes,
-            movimentacoes=movimentacoes,
-            documentos=documentos,
-            audiencias=audiencias,
-            situacao=dados_basicos.get("situacao"),
-            segredo_justica=False,
-            url_consulta=response.url,
-        )
-
-        # Salva no cache
-        self.cache.set(cache_key, processo.to_dict())
-
-        self.logger.info(
-            f"Extracao concluida",
-            numero=numero_formatado,
-            partes=len(partes),
-            movimentacoes=len(movimentacoes),
-            documentos=len(documentos)
-        )
-
-        return processo
+            return urljoin(BASE_URL_ESAJ, link_processo.get('href', ''))
+        return None
 
-    def extrair_2g(self, numero_processo: str) -> ProcessoESAJ:
+    def _montar_processo(
+        self,
+        pagina: Union[BeautifulSoup, PaginaHTML],
+        numero_formatado: str,
+        instancia: str,
+        url_consulta: str
+    ) -> ProcessoESAJ:
         """
-        Extrai dados completos de processo de 2o grau (recurso)
+        Extrai dados da pagina do processo e monta o ProcessoESAJ
 
         Args:
-            numero_processo: Numero do processo/recurso
+            pagina: Pagina do processo (PaginaHTML ou arvore ja parseada)
+            numero_formatado: Numero CNJ formatado
+            instancia: "1" ou "2"
+            url_consulta: URL final da consulta
 
         Returns:
             ProcessoESAJ com todos os dados
         """
-        self.logger.info(f"Extraindo dados de 2o grau", numero=numero_processo)
+        pagina = como_pagina(pagina)
+        soup = pagina.soup
+
+        dados_basicos = self._extrair_dados_basicos(pagina, instancia)
+        partes = self._extrair_partes(soup)
+        movimentacoes = self._extrair_movimentacoes(soup)
+        documentos = self._extrair_documentos(soup)
+        origem, dependentes = self._extrair_processos_relacionados(soup, numero_formatado)
 
+        if instancia == "1":
+            audiencias = self._extrair_audiencias(soup)
+
+            processo = ProcessoESAJ(
+                numero_processo=numero_formatado,
+                tribunal="TJSP",
+                sistema="ESAJ",
+                instancia="1",
+                comarca=dados_basicos.get("foro"),
+                foro=dados_basicos.get("foro"),
+                vara=dados_basicos.get("vara"),
+                classe=dados_basicos.get("classe"),
+                assunto=dados_basicos.get("assunto"),
+                area=dados_basicos.get("area"),
+                data_distribuicao=dados_basicos.get("data_distribuicao"),
+                valor_causa=dados_basicos.get("valor_causa"),
+                partes=partes,
+                movimentacoes=movimentacoes,
+                documentos=documentos,
+                audiencias=audiencias,
+                situacao=dados_basicos.get("situacao"),
+                processo_origem=origem,
+                processos_dependentes=dependentes,
+                segredo_justica=False,
+                url_consulta=url_consulta,
+            )
+
+            self.logger.info(
+                f"Extracao concluida",
+                numero=numero_formatado,
+                partes=len(partes),
+                movimentacoes=len(movimentacoes),
+                documentos=len(documentos)
+            )
+        else:
+            processo = ProcessoESAJ(
+                numero_processo=numero_formatado,
+                tribunal="TJSP",
+                sistema="ESAJ",
+                instancia="2",
+                classe=dados_basicos.get("classe"),
+                assunto=dados_basicos.get("assunto"),
+                orgao_julgador=dados_basicos.get("orgao_julgador"),
+                relator=dados_basicos.get("relator"),
+                partes=partes,
+                movimentacoes=movimentacoes,
+                documentos=documentos,
+                processo_origem=origem,
+                processos_dependentes=dependentes,
+                segredo_justica=False,
+                url_consulta=url_consulta,
+            )
+
+            self.logger.info(
+                f"Extracao de 2o grau concluida",
+                numero=numero_formatado,
+                orgao=dados_basicos.get("orgao_julgador"),
+                relator=dados_basicos.get("relator")
+            )
+
+        return processo
+
+    def _extrair(self, numero_processo: str, instancia: str) -> ProcessoESAJ:
+        """Fluxo sincrono comum a extrair_1g e extrair_2g"""
         # Parseia numero
         componentes = self._parsear_numero_processo(numero_processo)
         numero_formatado = componentes["numero_formatado"]
 
         # Verifica cache
-        cache_key = f"processo:{numero_formatado}:2"
+        cache_key = f"processo:{numero_formatado}:{instancia}"
         cached = self.cache.get(cache_key)
         if cached:
             self.logger.info("Retornando resultado do cache")
             return ProcessoESAJ(**cached)
 
-        # Monta URL de consulta
-        params = {
-            "conversationId": "",
-            "paginaConsulta": "1",
-            "localPesquisa.cdLocal": "-1",
-            "cbPesquisa": "NUMPROC",
-            "tipoNuProcesso": "UNIFICADO",
-            "numeroDigitoAnoUnificado": numero_formatado.split('.')[0],
-            "foroNumeroUnificado": componentes["foro_origem"],
-            "dePesquisaNuUnificado": numero_formatado,
-            "dePesquisa": "",
-        }
-
-        # Requisicao de busca
-        response = self._fazer_requisicao(
-            ENDPOINTS_2G["search"],
-            params=params
+        # Pagina inalterada desde a ultima extracao: sem parse
+        anteriores = self.cache.get_validadores(cache_key)
+        pagina, url_final, validadores = self._obter_pagina_condicional(
+            componentes, instancia, anteriores
         )
+        if pagina is None:
+            processo = self._reaproveitar_resultado(cache_key, anteriores, validadores)
+            dados = validadores.resultado
+        else:
+            processo = self._montar_processo(pagina, numero_formatado, instancia, url_final)
+            dados = processo.to_dict()
+            validadores.resultado = dados
+            self.cache.set_validadores(cache_key, validadores)
+
+        # Salva no cache
+        self.cache.set(cache_key, dados)
 
-        html = response.text
+        return processo
 
-        # Verifica CAPTCHA
-        if self.captcha_handler.detectar_captcha(html):
-            raise ESAJCaptchaError("CAPTCHA detectado - resolucao manual necessaria")
+    def _reaproveitar_resultado(
+        self,
+        cache_key: str,
+        anteriores: ValidadoresPagina,
+        validadores: ValidadoresPagina
+    ) -> ProcessoESAJ:
+        """Resultado guardado de uma pagina que nao mudou"""
+        self.logger.info("Pagina inalterada - resultado anterior reaproveitado", chave=cache_key)
+        if validadores != anteriores:
+            # 304 com novo ETag/Last-Modified
+            self.cache.set_validadores(cache_key, validadores)
+        return ProcessoESAJ(**validadores.resultado)
+
+    def _obter_pagina_processo(
+        self,
+        componentes: Dict[str, str],
+        instancia: str
+    ) -> Tuple[PaginaHTML, str]:
+        """Baixa a pagina do processo (sem cache) e devolve (pagina, url final)"""
+        pagina, url_final, _ = self._obter_pagina_condicional(componentes, instancia)
+        return pagina, url_final
+
+    def _obter_pagina_condicional(
+        self,
+        componentes: Dict[str, str],
+        instancia: str,
+        anteriores: Optional[ValidadoresPagina] = None
+    ) -> Tuple[Optional[PaginaHTML], str, ValidadoresPagina]:
+        """
+        Baixa a pagina do processo revalidando-a contra `anteriores`
 
-        # Verifica segredo de justica
-        if self.detectar_segredo_justica(html):
-            raise ESAJSegredoJustica(f"Processo {numero_formatado} em segredo de justica")
+        Args:
+            componentes: Componentes do numero (_parsear_numero_processo)
+            instancia: "1" ou "2"
+            anteriores: Validadores da ultima extracao do processo
 
-        # Verifica se encontrou processo
-        if "Nao existem informacoes" in html or "Não existem informações" in html:
-            raise ESAJProcessoNaoEncontrado(f"Processo {numero_formatado} nao encontrado no 2o grau")
+        Returns:
+            (pagina, url final, validadores da resposta); pagina e None
+            quando o portal responde 304 ou o corpo normalizado nao mudou
+        """
+        numero_formatado = componentes["numero_formatado"]
 
-        # Parseia HTML
-        soup = BeautifulSoup(html, 'html.parser')
+        # Requisicao de busca (condicional so se os validadores forem dela)
+        url, params = self._params_consulta(componentes, instancia)
+        da_busca = validadores_da_url(anteriores, url)
+        response = self._fazer_requisicao(url, params=params, headers=cabecalhos_condicionais(da_busca))
+        pagina, validadores = avaliar_resposta(response, url, da_busca)
+        if pagina is None:
+            return None, response.url, validadores
+
+        self._validar_pagina_consulta(pagina, numero_formatado, instancia)
 
         # Se redirecionou para pagina de selecao, pega primeiro resultado
-        link_processo = soup.find('a', href=re.compile(r'processo\.codigo='))
-        if link_processo:
-            href = link_processo.get('href', '')
-            response = self._fazer_requisicao(urljoin(BASE_URL_ESAJ, href))
-            html = response.text
-            soup = BeautifulSoup(html, 'html.parser')
+        url_processo = self._link_processo(pagina.soup)
+        if url_processo:
+            self._arquivar(numero_formatado, instancia, url, params, pagina, response.url, TIPO_CONSULTA)
+            url, params = url_processo, None
+            do_processo = validadores_da_url(anteriores, url)
+            response = self._fazer_requisicao(url, headers=cabecalhos_condicionais(do_processo))
+            pagina, validadores = avaliar_resposta(response, url, do_processo)
+            if pagina is None:
+                return None, response.url, validadores
+
+        self._arquivar(numero_formatado, instancia, url, params, pagina, response.url)
+        return pagina, response.url, validadores
+
+    def _arquivar(
+        self,
+        numero_formatado: str,
+        instancia: str,
+        url: str,
+        params: Optional[Dict],
+        pagina: PaginaHTML,
+        url_final: str,
+        tipo: str = TIPO_PROCESSO
+    ):
+        """Guarda a pagina recebida no arquivo HTML, se habilitado"""
+        if self.arquivo_html is None:
+            return
+        try:
+            self.arquivo_html.gravar(
+                "esaj",
+                f"{numero_formatado}:{instancia}",
+                url,
+                pagina.html,
+                params=params,
+                contexto={"instancia": instancia, "url_final": str(url_final)},
+                tipo=tipo
+            )
+        except sqlite3.Error as e:
+            self.logger.warning(f"Falha ao arquivar pagina: {e}")
 
-        # Extrai dados
-        dados_basicos = self._extrair_dados_basicos(soup, "2")
-        partes = self._extrair_partes(soup)
-        movimentacoes = self._extrair_movimentacoes(soup)
-        documentos = self._extrair_documentos(soup)
+    def reprocessar_arquivo(
+        self,
+        processos: Optional[List[str]] = None,
+        atualizar_cache: bool = True
+    ) -> Iterator[ProcessoESAJ]:
+        """
+        Reconstroi processos a partir das paginas arquivadas, sem rede
 
-        # Cria objeto do processo
-        processo = ProcessoESAJ(
-            numero_processo=numero_formatado,
-            tribunal="TJSP",
-            sistema="ESAJ",
-            instancia="2",
-            classe=dados_basicos.get("classe"),
-            assunto=dados_basicos.get("assunto"),
-            orgao_julgador=dados_basicos.get("orgao_julgador"),
-            relator=dados_basicos.get("relator"),
-            partes=partes,
-            movimentacoes=movimentacoes,
-            documentos=documentos,
-            segredo_justica=False,
-            url_consulta=response.url,
-        )
+        Usado apos corrigir um extrator: a pagina mais recente de cada
+        processo no arquivo e extraida de novo com o codigo atual.
 
-        # Salva no cache
-        self.cache.set(cache_key, processo.to_dict())
+        Args:
+            processos: Numeros CNJ formatados a reprocessar (None = todos)
+            atualizar_cache: Se o cache de resultados recebe os processos
+                reconstruidos
+
+        Yields:
+            ProcessoESAJ reconstruido de cada pagina arquivada
+        """
+        arquivo = self.arquivo_html or obter_arquivo_html()
+        filtro = set(processos) if processos else None
+
+        for resposta in arquivo.ultimas("esaj"):
+            numero_formatado, _, instancia = resposta.processo.rpartition(":")
+            if filtro is not None and numero_formatado not in filtro:
+                continue
+            try:
+                processo = self._montar_processo(
+                    PaginaHTML(html=resposta.html),
+                    numero_formatado,
+                    instancia,
+                    resposta.contexto.get("url_final", resposta.url)
+                )
+            except Exception as e:
+                self.logger.warning(f"Falha ao reprocessar {resposta.processo}: {e}")
+                continue
+
+            if atualizar_cache:
+                self.cache.set(f"processo:{numero_formatado}:{instancia}", processo.to_dict())
+            yield processo
+
+    def extrair_1g(self, numero_processo: str) -> ProcessoESAJ:
+        """
+        Extrai dados completos de processo de 1o grau
+
+        Args:
+            numero_processo: Numero do processo
+
+        Returns:
+            ProcessoESAJ com todos os dados
+        """
+        self.logger.info(f"Extraindo dados de 1o grau", numero=numero_processo)
+        return self._extrair(numero_processo, "1")
+
+    def extrair_2g(self, numero_processo: str) -> ProcessoESAJ:
+        """
+        Extrai dados completos de processo de 2o grau (recurso)
+
+        Args:
+            numero_processo: Numero do processo/recurso
+
+        Returns:
+            ProcessoESAJ com todos os dados
+        """
+        self.logger.info(f"Extraindo dados de 2o grau", numero=numero_processo)
+        return self._extrair(numero_processo, "2")
+
+    def sincronizar(
+        self,
+        numero_processo: str,
+        instancia: str = "1"
+    ) -> DeltaMovimentacoes:
+        """
+        Sincroniza as movimentacoes do processo de forma incremental
+
+        Baixa a pagina do processo (ignorando o cache de resultados) e
+        monta apenas as movimentacoes posteriores ao cursor da ultima
+        sincronizacao. Na primeira chamada todas as movimentacoes sao
+        novas.
+
+        Args:
+            numero_processo: Numero do processo (formato CNJ)
+            instancia: "1" para 1o grau, "2" para 2o grau
+
+        Returns:
+            DeltaMovimentacoes com as movimentacoes novas
+
+        Raises:
+            ESAJValidationError: Se numero invalido
+            (demais excecoes iguais a buscar_por_numero)
+        """
+        if not validar_numero_cnj(numero_processo):
+            raise ESAJValidationError(f"Numero de processo invalido: {numero_processo}")
+
+        componentes = self._parsear_numero_processo(numero_processo)
+        pagina, _ = self._obter_pagina_processo(componentes, instancia)
+        delta = self._sincronizar_pagina(pagina, componentes["numero_formatado"], instancia)
 
         self.logger.info(
-            f"Extracao de 2o grau concluida",
-            numero=numero_formatado,
-            orgao=dados_basicos.get("orgao_julgador"),
-            relator=dados_basicos.get("relator")
+            "Movimentacoes sincronizadas",
+            numero=componentes["numero_formatado"],
+            novas=len(delta.novas),
+            linhas_lidas=delta.linhas_lidas
         )
-
-        return processo
+        return delta
 
     def baixar_documentos(
         self,
@@ -2127,12 +2809,13 @@ class ESAJScraper:
             self.logger.warning("Processo em segredo de justica - nao e possivel baixar documentos")
             return []
 
-        arquivos_baixados = []
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
 
         numero_limpo = re.sub(r'\D', '', processo.numero_processo)
 
+        pendentes = []
+        nomes_usados = set()
         for doc in processo.documentos:
             # Verifica tipo
             if tipos and doc.get('tipo') not in tipos:
@@ -2143,34 +2826,102 @@ class ESAJScraper:
                 self.logger.info(f"Pulando documento sigiloso: {doc.get('descricao')}")
                 continue
 
-            url = doc.get('url')
-            if not url:
+            if not doc.get('url'):
                 continue
 
-            self.logger.info(f"Baixando documento: {doc.get('descricao')}")
+            # Determina nome do arquivo
+            tipo = doc.get('tipo', 'documento')
+            data = doc.get('data', datetime.now().strftime('%Y%m%d'))
+            nome_arquivo = f"{tipo}_{numero_limpo}_{data}.pdf"
+            nome_arquivo = re.sub(r'[^\w\-_\.]', '_', nome_arquivo)
+
+            # Downloads paralelos nao podem gravar no mesmo arquivo; o
+            # sufixo vem da URL para que o nome nao dependa dos filtros
+            # nem da ordem dos documentos
+            if nome_arquivo in nomes_usados:
+                sufixo = hashlib.md5(doc['url'].encode('utf-8')).hexdigest()[:8]
+                nome_arquivo = f"{Path(nome_arquivo).stem}_{sufixo}.pdf"
+                if nome_arquivo in nomes_usados:
+                    continue  # mesma URL listada duas vezes
+            nomes_usados.add(nome_arquivo)
+
+            pendentes.append((doc, output_path / nome_arquivo))
+
+        # Varios downloads ao mesmo tempo; o rate limiter compartilhado
+        # continua espacando o inicio de cada requisicao
+        with ThreadPoolExecutor(max_workers=max(1, self.max_downloads)) as executor:
+            resultados = list(executor.map(
+                lambda item: self._baixar_documento(*item, processo), pendentes
+            ))
+
+        return [caminho for caminho in resultados if caminho]
+
+    def _baixar_documento(
+        self,
+        doc: Dict,
+        caminho: Path,
+        processo: ProcessoESAJ
+    ) -> Optional[str]:
+        """
+        Baixa um documento em streaming, com hashes e retomada
+
+        Documentos ja presentes no store sao apenas ligados ao destino.
 
-            try:
-                response = self._fazer_requisicao(url)
+        Args:
+            doc: Dict do documento (recebe tamanho_bytes e hashes)
+            caminho: Arquivo de destino
+            processo: Processo dono do documento (chave do store)
 
-                if response.status_code == 200:
-                    # Determina nome do arquivo
-                    tipo = doc.get('tipo', 'documento')
-                    data = doc.get('data', datetime.now().strftime('%Y%m%d'))
-                    nome_arquivo = f"{tipo}_{numero_limpo}_{data}.pdf"
-                    nome_arquivo = re.sub(r'[^\w\-_\.]', '_', nome_arquivo)
+        Returns:
+            Caminho do arquivo ou None em caso de erro
+        """
+        url = doc.get('url')
+        store = self.document_store
 
-                    caminho = output_path / nome_arquivo
+        if store is not None:
+            try:
+                objeto = store.localizar(processo.tribunal, processo.numero_processo, url)
+                if objeto is not None:
+                    store.materializar(objeto.sha256, str(caminho))
+                    doc['tamanho_bytes'] = objeto.tamanho_bytes
+                    doc['hash_md5'] = objeto.md5
+                    doc['hash_sha256'] = objeto.sha256
+                    self.logger.info(f"Documento reutilizado do store: {caminho}")
+                    return str(caminho)
+            except (sqlite3.Error, OSError) as e:
+                self.logger.warning(f"Store de documentos indisponivel: {e}")
+
+        self.logger.info(f"Baixando documento: {doc.get('descricao')}")
 
-                    with open(caminho, 'wb') as f:
-                        f.write(response.content)
+        try:
+            resultado = baixar_stream(
+                lambda headers: self._fazer_requisicao(url, headers=headers, stream=True),
+                str(caminho)
+            )
+        except Exception as e:
+            self.logger.error(f"Erro ao baixar documento: {e}")
+            return None
 
-                    arquivos_baixados.append(str(caminho))
-                    self.logger.info(f"Documento salvo: {caminho}")
+        doc['tamanho_bytes'] = resultado.tamanho_bytes
+        doc['hash_md5'] = resultado.md5
+        doc['hash_sha256'] = resultado.sha256
 
-            except Exception as e:
-                self.logger.error(f"Erro ao baixar documento: {e}")
+        if store is not None:
+            try:
+                store.armazenar(
+                    resultado.caminho, resultado.sha256,
+                    processo.tribunal, processo.numero_processo, url,
+                    content_type=resultado.content_type, md5=resultado.md5
+                )
+            except (sqlite3.Error, OSError) as e:
+                self.logger.warning(f"Documento nao registrado no store: {e}")
 
-        return arquivos_baixados
+        self.logger.info(
+            f"Documento salvo: {caminho}",
+            tamanho=resultado.tamanho_bytes,
+            retomado=resultado.retomado
+        )
+        return resultado.caminho
 
     def obter_movimentacoes_completas(
         self,
@@ -2204,12 +2955,15 @@ class ESAJScraper:
                 "requisicoes": self.rate_limiter.request_count,
                 "erros": self.rate_limiter.error_count,
                 "bloqueado": self.rate_limiter.is_blocked,
+                "espera_atual": round(self.rate_limiter.tempo_espera, 3),
+                "intervalo_atual": round(self.rate_limiter.rate, 3),
             },
             "cache": {
                 "habilitado": self.cache.enabled,
                 "entradas": self.cache.size,
             },
             "captcha": self.captcha_handler.stats,
+            "resiliencia": estado_resiliencia("esaj:"),
         }
 
         # Testa conectividade
@@ -2291,6 +3045,508 @@ class ESAJScraper:
             }
 
 
+# =============================================================================
+# SCRAPER ASSINCRONO E EXTRACAO EM LOTE
+# =============================================================================
+
+# Rate limiters compartilhados por host: todas as instancias do processo que
+# falam com o mesmo host dividem o mesmo orcamento de requisicoes
+_host_rate_limiters: Dict[str, RateLimiter] = {}
+_host_rate_limiters_lock = threading.Lock()
+
+
+def obter_rate_limiter_host(
+    url: str,
+    rate: float = DEFAULT_RATE_LIMIT,
+    adaptativa: bool = True,
+    taxa_maxima: Optional[float] = None
+) -> RateLimiter:
+    """
+    Retorna o rate limiter compartilhado do host da URL
+
+    Args:
+        url: URL (ou host) de destino
+        rate: Intervalo minimo entre requisicoes, usado na criacao
+        adaptativa: Se deve usar controle AIMD (na criacao)
+        taxa_maxima: Teto do AIMD em req/s (na criacao)
+
+    Returns:
+        RateLimiter unico por host no processo
+    """
+    host = urlparse(url).netloc or url
+    with _host_rate_limiters_lock:
+        limiter = _host_rate_limiters.get(host)
+        if limiter is None:
+            limiter = criar_rate_limiter_host(url, rate, adaptativa, taxa_maxima)
+            _host_rate_limiters[host] = limiter
+        return limiter
+
+
+class AsyncESAJScraper(ESAJScraper):
+    """
+    Variante assincrona do ESAJScraper
+
+    Usa httpx.AsyncClient para as consultas e reaproveita as mesmas rotinas
+    de parsing da versao sincrona (_montar_processo), que rodam em thread
+    para nao bloquear o event loop. O intervalo entre requisicoes e
+    controlado pelo rate limiter compartilhado do host, entao a vazao do
+    lote fica limitada pela taxa permitida pelo tribunal e nao pela
+    latencia de cada requisicao.
+
+    Uso:
+        async with AsyncESAJScraper() as scraper:
+            async for item in scraper.extrair_lote(numeros):
+                ...
+    """
+
+    def __init__(
+        self,
+        *args,
+        max_concorrencia: int = DEFAULT_MAX_CONCORRENCIA,
+        **kwargs
+    ):
+        """
+        Inicializa o scraper assincrono
+
+        Args:
+            max_concorrencia: Numero maximo de processos extraidos ao mesmo tempo
+            *args, **kwargs: Mesmos argumentos do ESAJScraper
+        """
+        if not HTTPX_AVAILABLE:
+            raise ImportError("httpx nao esta instalado. Execute: pip install httpx")
+
+        super().__init__(*args, **kwargs)
+
+        self.max_concorrencia = max(1, max_concorrencia)
+        self.rate_limiter = obter_rate_limiter_host(
+            BASE_URL_ESAJ,
+            rate=self.rate_limit,
+            adaptativa=self.taxa_adaptativa,
+            taxa_maxima=self.taxa_maxima
+        )
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Retorna cliente HTTP assincrono, criando se necessario"""
+        loop = asyncio.get_running_loop()
+        if self._client is not None and self._client_loop not in (None, loop):
+            # Cliente criado em outro event loop (scraper reaproveitado fora
+            # do loop dos scrapers): suas conexoes nao servem aqui e ele so
+            # pode ser fechado no loop dono
+            fechar_no_loop_dono(self._client.aclose(), self._client_loop)
+            self._client = None
+        if self._client is not None and self._client_loop is None:
+            # Cliente injetado de fora: adotado pelo loop atual
+            self._client_loop = loop
+        if self._client is None or self._client.is_closed:
+            self._client_loop = loop
+            self._client = httpx.AsyncClient(
+                headers=DEFAULT_HEADERS,
+                timeout=self.timeout,
+                follow_redirects=True,
+                verify=self.verificar_ssl,
+                limits=httpx.Limits(
+                    max_connections=self.max_concorrencia,
+                    max_keepalive_connections=self.max_concorrencia
+                )
+            )
+        return self._client
+
+    async def fechar(self):
+        """Fecha o cliente HTTP assincrono (no loop que o criou)"""
+        if self._client is not None and not self._client.is_closed:
+            if self._client_loop in (None, asyncio.get_running_loop()):
+                await self._client.aclose()
+            else:
+                fechar_no_loop_dono(self._client.aclose(), self._client_loop)
+        self._client = None
+        self._client_loop = None
+
+    async def __aenter__(self):
+        """Suporte a context manager async"""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Fecha recursos ao sair do context"""
+        await self.fechar()
+
+    async def _fazer_requisicao_async(
+        self,
+        url: str,
+        method: str = "GET",
+        params: Optional[Dict] = None,
+        data: Optional[Dict] = None,
+        headers: Optional[Dict] = None
+    ) -> "httpx.Response":
+        """
+        Versao assincrona de _fazer_requisicao
+
+        Raises:
+            ESAJConnectionError: Se falhar apos todas as tentativas
+            ESAJCircuitBreakerOpenError: Se o circuito do host estiver aberto
+        """
+        client = await self._get_client()
+
+        execucao = self.politica_retry.iniciar(urlparse(url).netloc)
+        protecao = self._protecao(url)
+        ultimo_erro = None
+
+        while execucao.nova_tentativa():
+            # Circuito aberto: falha na hora, antes de esperar o rate limit
+            self._verificar_circuito(protecao)
+
+            # Aplica rate limit (a cada tentativa, inclusive retries)
+            await self.rate_limiter.wait_async()
+
+            try:
+                inicio = time.time()
+                async with protecao.limite.vaga_async():
+                    response = await client.request(
+                        method.upper(),
+                        url,
+                        params=params,
+                        data=data,
+                        headers=headers,
+                        timeout=execucao.timeout(self.timeout)
+                    )
+
+            except LimiteConcorrenciaError as e:
+                raise ESAJConnectionError(str(e)) from e
+
+            except httpx.TimeoutException as e:
+                self.logger.warning(f"Timeout na tentativa {execucao.tentativas}: {e}")
+                ultimo_erro = e
+                self.rate_limiter.error()
+                protecao.registrar(erro=e)
+                espera = execucao.espera(erro=e)
+
+            except httpx.TransportError as e:
+                self.logger.warning(f"Erro de conexao na tentativa {execucao.tentativas}: {e}")
+                ultimo_erro = e
+                self.rate_limiter.error()
+                protecao.registrar(erro=e)
+                espera = execucao.espera(erro=e)
+
+            else:
+                protecao.registrar(status_code=response.status_code)
+                if response.status_code < 500 and response.status_code != 429:
+                    self.rate_limiter.success(latencia_ms=(time.time() - inicio) * 1000)
+                    return response
+
+                ultimo_erro = f"HTTP {response.status_code}"
+                espera = execucao.espera(
+                    status_code=response.status_code,
+                    retry_after=self._registrar_erro_http(response)
+                )
+
+            if espera is None:
+                break
+            await asyncio.sleep(espera)
+
+        if execucao.motivo:
+            self.logger.warning(f"Sem novo retry ({execucao.motivo}) para {url}")
+        raise ESAJConnectionError(f"Falha apos {execucao.tentativas} tentativas: {ultimo_erro}")
+
+    async def _extrair_async(self, numero_processo: str, instancia: str) -> ProcessoESAJ:
+        """Fluxo assincrono equivalente a _extrair"""
+        componentes = self._parsear_numero_processo(numero_processo)
+        numero_formatado = componentes["numero_formatado"]
+
+        cache_key = f"processo:{numero_formatado}:{instancia}"
+        cached = self.cache.get(cache_key)
+        if cached:
+            self.logger.info("Retornando resultado do cache")
+            return ProcessoESAJ(**cached)
+
+        anteriores = self.cache.get_validadores(cache_key)
+        pagina, url_final, validadores = await self._obter_pagina_condicional_async(
+            componentes, instancia, anteriores
+        )
+        if pagina is None:
+            processo = self._reaproveitar_resultado(cache_key, anteriores, validadores)
+            dados = validadores.resultado
+        else:
+            processo = await asyncio.to_thread(
+                self._montar_processo, pagina, numero_formatado, instancia, url_final
+            )
+            dados = processo.to_dict()
+            validadores.resultado = dados
+            self.cache.set_validadores(cache_key, validadores)
+
+        self.cache.set(cache_key, dados)
+
+        return processo
+
+    async def _obter_pagina_processo_async(
+        self,
+        componentes: Dict[str, str],
+        instancia: str
+    ) -> Tuple[PaginaHTML, str]:
+        """Versao assincrona de _obter_pagina_processo"""
+        pagina, url_final, _ = await self._obter_pagina_condicional_async(componentes, instancia)
+        return pagina, url_final
+
+    async def _obter_pagina_condicional_async(
+        self,
+        componentes: Dict[str, str],
+        instancia: str,
+        anteriores: Optional[ValidadoresPagina] = None
+    ) -> Tuple[Optional[PaginaHTML], str, ValidadoresPagina]:
+        """Versao assincrona de _obter_pagina_condicional"""
+        numero_formatado = componentes["numero_formatado"]
+
+        url, params = self._params_consulta(componentes, instancia)
+        da_busca = validadores_da_url(anteriores, url)
+        response = await self._fazer_requisicao_async(
+            url, params=params, headers=cabecalhos_condicionais(da_busca)
+        )
+        pagina, validadores = avaliar_resposta(response, url, da_busca)
+        if pagina is None:
+            return None, str(response.url), validadores
+
+        self._validar_pagina_consulta(pagina, numero_formatado, instancia)
+
+        soup = await asyncio.to_thread(lambda: pagina.soup)
+
+        url_processo = self._link_processo(soup)
+        if url_processo:
+            await asyncio.to_thread(
+                self._arquivar, numero_formatado, instancia, url, params, pagina,
+                str(response.url), TIPO_CONSULTA
+            )
+            url, params = url_processo, None
+            do_processo = validadores_da_url(anteriores, url)
+            response = await self._fazer_requisicao_async(
+                url, headers=cabecalhos_condicionais(do_processo)
+            )
+            pagina, validadores = avaliar_resposta(response, url, do_processo)
+            if pagina is None:
+                return None, str(response.url), validadores
+
+        if self.arquivo_html is not None:
+            await asyncio.to_thread(
+                self._arquivar, numero_formatado, instancia, url, params, pagina, str(response.url)
+            )
+        return pagina, str(response.url), validadores
+
+    async def extrair_1g_async(self, numero_processo: str) -> ProcessoESAJ:
+        """Versao assincrona de extrair_1g"""
+        self.logger.info(f"Extraindo dados de 1o grau", numero=numero_processo)
+        return await self._extrair_async(numero_processo, "1")
+
+    async def extrair_2g_async(self, numero_processo: str) -> ProcessoESAJ:
+        """Versao assincrona de extrair_2g"""
+        self.logger.info(f"Extraindo dados de 2o grau", numero=numero_processo)
+        return await self._extrair_async(numero_processo, "2")
+
+    async def buscar_por_numero_async(
+        self,
+        numero_processo: str,
+        instancia: str = "1"
+    ) -> ProcessoESAJ:
+        """
+        Versao assincrona de buscar_por_numero
+
+        Raises:
+            ESAJValidationError: Se numero invalido
+            (demais excecoes iguais a extrair_1g/extrair_2g)
+        """
+        if not validar_numero_cnj(numero_processo):
+            raise ESAJValidationError(f"Numero de processo invalido: {numero_processo}")
+
+        if instancia == "1":
+            return await self.extrair_1g_async(numero_processo)
+        return await self.extrair_2g_async(numero_processo)
+
+    async def sincronizar_async(
+        self,
+        numero_processo: str,
+        instancia: str = "1"
+    ) -> DeltaMovimentacoes:
+        """Versao assincrona de sincronizar"""
+        if not validar_numero_cnj(numero_processo):
+            raise ESAJValidationError(f"Numero de processo invalido: {numero_processo}")
+
+        componentes = self._parsear_numero_processo(numero_processo)
+        pagina, _ = await self._obter_pagina_processo_async(componentes, instancia)
+        delta = await asyncio.to_thread(
+            self._sincronizar_pagina, pagina, componentes["numero_formatado"], instancia
+        )
+
+        self.logger.info(
+            "Movimentacoes sincronizadas",
+            numero=componentes["numero_formatado"],
+            novas=len(delta.novas),
+            linhas_lidas=delta.linhas_lidas
+        )
+        return delta
+
+    async def extrair_lote(
+        self,
+        numeros: List[str],
+        instancia: str = "1",
+        max_concorrencia: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Extrai uma lista de processos com concorrencia limitada
+
+        Os resultados sao entregues a medida que cada processo termina (nao
+        na ordem de entrada). Falhas individuais nao interrompem o lote.
+
+        Args:
+            numeros: Numeros CNJ dos processos
+            instancia: "1" para 1o grau, "2" para 2o grau
+            max_concorrencia: Sobrescreve o limite do scraper para este lote
+
+        Yields:
+            Dict com numero_processo, sucesso e processo (dict) ou erro/tipo_erro
+        """
+        limite = max(1, max_concorrencia or self.max_concorrencia)
+        semaforo = asyncio.Semaphore(limite)
+
+        self.logger.info(
+            "Iniciando extracao em lote",
+            total=len(numeros),
+            instancia=instancia,
+            concorrencia=limite
+        )
+
+        async def _extrair_um(numero: str) -> Dict[str, Any]:
+            async with semaforo:
+                try:
+                    processo = await self.buscar_por_numero_async(numero, instancia)
+                    return {
+                        "numero_processo": numero,
+                        "sucesso": True,
+                        "processo": processo.to_dict()
+                    }
+                except Exception as e:
+                    self.logger.warning(
+                        f"Falha na extracao do lote: {e}",
+                        numero=numero
+                    )
+                    return {
+                        "numero_processo": numero,
+                        "sucesso": False,
+                        "erro": str(e),
+                        "tipo_erro": type(e).__name__,
+                        "segredo_justica": isinstance(e, ESAJSegredoJustica)
+                    }
+
+        tarefas = [asyncio.ensure_future(_extrair_um(numero)) for numero in numeros]
+        try:
+            for proxima in asyncio.as_completed(tarefas):
+                yield await proxima
+        finally:
+            for tarefa in tarefas:
+                tarefa.cancel()
+
+    async def extrair_familia(
+        self,
+        numero_processo: str,
+        max_processos: int = DEFAULT_MAX_PROCESSOS_FAMILIA,
+        profundidade: int = DEFAULT_PROFUNDIDADE_FAMILIA,
+        max_concorrencia: Optional[int] = None
+    ) -> FamiliaProcessual:
+        """
+        Extrai o processo e seus relacionados (recursos, incidentes, apensos)
+
+        Busca em largura a partir do numero informado: cada processo e
+        consultado no 1o e no 2o grau ao mesmo tempo, e os numeros de
+        origem e dependentes encontrados nas paginas entram na fila sem
+        repeticao. As consultas dividem o limite de concorrencia e o rate
+        limiter do host; processos inexistentes em uma instancia sao
+        ignorados e demais falhas vao para `erros`.
+
+        Args:
+            numero_processo: Numero CNJ do processo inicial
+            max_processos: Numeros distintos visitados no maximo
+            profundidade: Saltos maximos a partir do processo inicial
+            max_concorrencia: Sobrescreve o limite do scraper
+
+        Returns:
+            FamiliaProcessual com processos e vinculos
+
+        Raises:
+            ESAJValidationError: Se o numero inicial for invalido
+        """
+        inicial = self._parsear_numero_processo(numero_processo)["numero_formatado"]
+        familia = FamiliaProcessual(numero_inicial=inicial)
+        semaforo = asyncio.Semaphore(max(1, max_concorrencia or self.max_concorrencia))
+        visitados = {inicial}
+        pendentes: Set[asyncio.Future] = set()
+
+        async def consultar(numero: str, instancia: str, nivel: int):
+            async with semaforo:
+                try:
+                    processo = await self.buscar_por_numero_async(numero, instancia)
+                    return numero, instancia, nivel, processo, None
+                except ESAJProcessoNaoEncontrado:
+                    return numero, instancia, nivel, None, None
+                except Exception as e:
+                    return numero, instancia, nivel, None, e
+
+        def agendar(numero: str, nivel: int):
+            for instancia in ("1", "2"):
+                pendentes.add(asyncio.ensure_future(consultar(numero, instancia, nivel)))
+
+        agendar(inicial, 0)
+        try:
+            while pendentes:
+                concluidas, pendentes = await asyncio.wait(
+                    pendentes, return_when=asyncio.FIRST_COMPLETED
+                )
+                for tarefa in concluidas:
+                    numero, instancia, nivel, processo, erro = tarefa.result()
+                    if erro is not None:
+                        self.logger.warning(
+                            f"Falha na extracao da familia: {erro}",
+                            numero=numero,
+                            instancia=instancia
+                        )
+                        familia.erros.append({
+                            "numero_processo": numero,
+                            "instancia": instancia,
+                            "erro": str(erro),
+                            "tipo_erro": type(erro).__name__,
+                        })
+                        continue
+                    if processo is None:
+                        continue
+
+                    familia.processos.setdefault(numero, {})[instancia] = processo
+                    relacionados = [(d, "dependente") for d in processo.processos_dependentes]
+                    if processo.processo_origem:
+                        relacionados.insert(0, (processo.processo_origem, "origem"))
+
+                    for relacionado, tipo in relacionados:
+                        try:
+                            normalizado = self._parsear_numero_processo(relacionado)["numero_formatado"]
+                        except ESAJValidationError:
+                            continue
+                        familia.adicionar_vinculo(numero, normalizado, tipo)
+                        if normalizado in visitados:
+                            continue
+                        if nivel >= profundidade or len(visitados) >= max_processos:
+                            familia.truncada = True
+                            continue
+                        visitados.add(normalizado)
+                        agendar(normalizado, nivel + 1)
+        finally:
+            for tarefa in pendentes:
+                tarefa.cancel()
+
+        self.logger.info(
+            "Familia processual extraida",
+            numero=inicial,
+            processos=len(familia.processos),
+            vinculos=len(familia.vinculos),
+            truncada=familia.truncada
+        )
+        return familia
+
+
 # =============================================================================
 # FUNCAO PRINCIPAL PARA USO VIA API
 # =============================================================================
@@ -2300,13 +3556,15 @@ async def extrair_processo_esaj(
     instancia: str = "1",
     baixar_docs: bool = False,
     output_dir: str = "./output",
-    cache_enabled: bool = True
+    cache_enabled: bool = True,
+    reutilizar: bool = True
 ) -> Dict:
     """
     Funcao principal para extracao de processo do ESAJ
 
     Esta funcao pode ser chamada de forma assincrona para integracao
-    com APIs e sistemas externos.
+    com APIs e sistemas externos. O scraper (conexoes, cache e logger) e
+    reaproveitado entre chamadas pelo registro de scrapers do processo.
 
     Args:
         numero_processo: Numero do processo (formato CNJ)
@@ -2314,6 +3572,7 @@ async def extrair_processo_esaj(
         baixar_docs: Se deve baixar documentos
         output_dir: Diretorio para salvar documentos
         cache_enabled: Se deve usar cache
+        reutilizar: Se False, usa um scraper proprio fechado ao final
 
     Returns:
         Dict com todos os dados do processo
@@ -2325,13 +3584,40 @@ async def extrair_processo_esaj(
         ESAJCaptchaError: Se CAPTCHA nao resolvido
         ESAJConnectionError: Se erro de conexao
     """
-    scraper = ESAJScraper(cache_enabled=cache_enabled)
+    if not reutilizar:
+        scraper = AsyncESAJScraper(cache_enabled=cache_enabled)
+        try:
+            return await _extrair_processo_esaj(
+                scraper, numero_processo, instancia, baixar_docs, output_dir
+            )
+        finally:
+            await scraper.fechar()
+
+    with obter_registro_scrapers().emprestar(
+        ("esaj", BASE_URL_ESAJ, cache_enabled),
+        lambda: AsyncESAJScraper(cache_enabled=cache_enabled),
+        fechar=lambda scraper: scraper.fechar()
+    ) as scraper:
+        return await _extrair_processo_esaj(
+            scraper, numero_processo, instancia, baixar_docs, output_dir
+        )
 
+
+async def _extrair_processo_esaj(
+    scraper: AsyncESAJScraper,
+    numero_processo: str,
+    instancia: str,
+    baixar_docs: bool,
+    output_dir: str
+) -> Dict:
+    """Corpo de extrair_processo_esaj com o scraper ja obtido"""
     try:
-        processo = scraper.buscar_por_numero(numero_processo, instancia)
+        processo = await scraper.buscar_por_numero_async(numero_processo, instancia)
 
         if baixar_docs and not processo.segredo_justica:
-            documentos_baixados = scraper.baixar_documentos(processo, output_dir)
+            documentos_baixados = await asyncio.to_thread(
+                scraper.baixar_documentos, processo, output_dir
+            )
             # Atualiza lista de documentos com caminhos locais
             for i, doc in enumerate(processo.documentos):
                 if i < len(documentos_baixados):
@@ -2359,6 +3645,64 @@ async def extrair_processo_esaj(
         raise
 
 
+async def extrair_lote_esaj(
+    numeros: List[str],
+    instancia: str = "1",
+    max_concorrencia: int = DEFAULT_MAX_CONCORRENCIA,
+    cache_enabled: bool = True
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Extrai varios processos do ESAJ, entregando cada resultado ao terminar
+
+    Args:
+        numeros: Numeros dos processos (formato CNJ)
+        instancia: "1" para 1o grau, "2" para 2o grau
+        max_concorrencia: Processos extraidos simultaneamente
+        cache_enabled: Se deve usar cache
+
+    Yields:
+        Dict por processo (ver AsyncESAJScraper.extrair_lote)
+    """
+    async with AsyncESAJScraper(
+        cache_enabled=cache_enabled,
+        max_concorrencia=max_concorrencia
+    ) as scraper:
+        async for resultado in scraper.extrair_lote(numeros, instancia):
+            yield resultado
+
+
+async def extrair_familia_esaj(
+    numero_processo: str,
+    max_processos: int = DEFAULT_MAX_PROCESSOS_FAMILIA,
+    profundidade: int = DEFAULT_PROFUNDIDADE_FAMILIA,
+    max_concorrencia: int = DEFAULT_MAX_CONCORRENCIA,
+    cache_enabled: bool = True
+) -> Dict:
+    """
+    Extrai um processo do ESAJ e seus recursos, incidentes e apensos
+
+    Args:
+        numero_processo: Numero do processo inicial (formato CNJ)
+        max_processos: Numeros distintos visitados no maximo
+        profundidade: Saltos maximos a partir do processo inicial
+        max_concorrencia: Consultas simultaneas
+        cache_enabled: Se deve usar cache
+
+    Returns:
+        Dict da FamiliaProcessual
+    """
+    async with AsyncESAJScraper(
+        cache_enabled=cache_enabled,
+        max_concorrencia=max_concorrencia
+    ) as scraper:
+        familia = await scraper.extrair_familia(
+            numero_processo,
+            max_processos=max_processos,
+            profundidade=profundidade
+        )
+        return familia.to_dict()
+
+
 def extrair_processo_esaj_sync(
     numero_processo: str,
     instancia: str = "1",
@@ -2369,6 +3713,9 @@ def extrair_processo_esaj_sync(
     """
     Versao sincrona da funcao de extracao
 
+    Roda no loop compartilhado dos scrapers: chamadas de qualquer thread
+    reaproveitam o mesmo scraper e o mesmo cliente HTTP.
+
     Args:
         numero_processo: Numero do processo (formato CNJ)
         instancia: "1" para 1o grau, "2" para 2o grau
@@ -2379,7 +3726,7 @@ def extrair_processo_esaj_sync(
     Returns:
         Dict com todos os dados do processo
     """
-    return asyncio.run(extrair_processo_esaj(
+    return obter_loop_scrapers().executar(extrair_processo_esaj(
         numero_processo,
         instancia,
         baixar_docs,
@@ -2408,6 +3755,12 @@ Exemplos de uso:
   # Buscar processo de 2o grau
   python esaj_scraper.py --numero 2000000-00.2024.8.26.0000 --instancia 2
 
+  # Extrair lote de processos (um numero por linha, saida JSON por linha)
+  python esaj_scraper.py --lote numeros.txt --concorrencia 4
+
+  # Extrair processo com recursos, incidentes e apensos (1o e 2o grau)
+  python esaj_scraper.py --numero 1000000-00.2024.8.26.0100 --familia
+
   # Buscar processos por CPF
   python esaj_scraper.py --cpf 123.456.789-00
 
@@ -2448,6 +3801,21 @@ Exemplos de uso:
         "--comarca",
         help="Codigo da comarca para filtrar busca"
     )
+    parser.add_argument(
+        "--lote",
+        help="Arquivo com numeros de processo (um por linha) para extracao em lote"
+    )
+    parser.add_argument(
+        "--concorrencia",
+        type=int,
+        default=DEFAULT_MAX_CONCORRENCIA,
+        help="Processos simultaneos na extracao em lote"
+    )
+    parser.add_argument(
+        "--familia",
+        action="store_true",
+        help="Com --numero: segue recursos, incidentes e apensos nas duas instancias"
+    )
 
     # Opcoes de download
     parser.add_argument(
@@ -2524,6 +3892,33 @@ Exemplos de uso:
 
         resultado = None
 
+        # Extracao em lote: um JSON por linha, na ordem de conclusao
+        if args.lote:
+            with open(args.lote, 'r', encoding='utf-8') as f:
+                numeros = [linha.strip() for linha in f if linha.strip()]
+
+            async def _executar_lote():
+                async for item in extrair_lote_esaj(
+                    numeros,
+                    instancia=args.instancia,
+                    max_concorrencia=args.concorrencia,
+                    cache_enabled=not args.sem_cache
+                ):
+                    print(json.dumps(item, ensure_ascii=False), flush=True)
+
+            asyncio.run(_executar_lote())
+            return
+
+        # Familia processual: um JSON com todos os processos e vinculos
+        if args.numero and args.familia:
+            familia = asyncio.run(extrair_familia_esaj(
+                args.numero,
+                max_concorrencia=args.concorrencia,
+                cache_enabled=not args.sem_cache
+            ))
+            print(json.dumps(familia, indent=2, ensure_ascii=False))
+            return
+
         # Busca por numero
         if args.numero:
             processo = scraper.buscar_por_numero(args.numero, args.instancia)
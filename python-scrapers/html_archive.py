@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HTML Archive - Arquivo comprimido das paginas brutas dos tribunais
+
+Corrigir um bug de extracao (_extrair_partes, _extrair_documentos...)
+exigia raspar de novo todos os processos para refazer os resultados,
+gastando horas e a cota de requisicoes dos tribunais. Este modulo guarda
+as paginas de processo exatamente como foram recebidas:
+
+- Corpo comprimido com zstd (zstandard) quando instalado, zlib caso
+  contrario; o codec fica gravado em cada linha
+- Indexado por sistema, processo, requisicao (metodo, URL e parametros)
+  e instante da captura, em SQLite (WAL) compartilhado entre processos
+- Modo de reprocessamento: os scrapers reconstroem ProcessoESAJ,
+  ProcessoPJe e DadosProcesso a partir do arquivo, sem rede
+- Fonte de fixtures de replay para testes e benchmarks (buscar() e
+  transporte_replay() para clientes httpx)
+
+Autor: ROM-Agent Integration System
+Data: 2026-01-12
+Versao: 1.0.0
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit, urlunsplit
+
+from cache_store import ConexoesSQLite, RegistroPorCaminho
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+    zstandard = None
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+    httpx = None
+
+
+# =============================================================================
+# CONSTANTES E CONFIGURACOES
+# =============================================================================
+
+DEFAULT_ARCHIVE_DIR = os.environ.get(
+    "ROM_ARQUIVO_HTML",
+    str(Path.home() / ".rom_agent" / "arquivo_html")
+)
+DEFAULT_ARCHIVE_DB = "arquivo.db"
+DEFAULT_ZSTD_LEVEL = 9
+DEFAULT_ZLIB_LEVEL = 6
+DEFAULT_BUSY_TIMEOUT_MS = 5000
+
+CODEC_ZSTD = "zstd"
+CODEC_ZLIB = "zlib"
+
+TIPO_PROCESSO = "processo"  # pagina de onde o processo e extraido
+TIPO_CONSULTA = "consulta"  # paginas intermediarias (busca, selecao)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS respostas (
+    id            INTEGER PRIMARY KEY AUTOINCREMENT,
+    sistema       TEXT NOT NULL,
+    processo      TEXT NOT NULL,
+    tipo          TEXT NOT NULL,
+    requisicao    TEXT NOT NULL,
+    metodo        TEXT NOT NULL,
+    url           TEXT NOT NULL,
+    params        TEXT NOT NULL,
+    status        INTEGER NOT NULL,
+    contexto      TEXT NOT NULL,
+    codec         TEXT NOT NULL,
+    tamanho       INTEGER NOT NULL,
+    corpo         BLOB NOT NULL,
+    capturado_em  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_respostas_processo
+    ON respostas (sistema, tipo, processo, capturado_em);
+CREATE INDEX IF NOT EXISTS idx_respostas_requisicao
+    ON respostas (requisicao, capturado_em);
+"""
+
+
+# =============================================================================
+# ESTRUTURAS
+# =============================================================================
+
+def normalizar_requisicao(
+    url: str,
+    params: Optional[Dict[str, Any]] = None
+) -> Tuple[str, Dict[str, str]]:
+    """
+    Separa a query string da URL e junta aos parametros
+
+    Args:
+        url: URL, com ou sem query string
+        params: Parametros da query string ou do formulario
+
+    Returns:
+        (URL sem query string nem fragmento, parametros como texto)
+    """
+    partes = urlsplit(url)
+    todos = dict(parse_qsl(partes.query, keep_blank_values=True))
+    todos.update({str(k): str(v) for k, v in (params or {}).items()})
+    return urlunsplit((partes.scheme, partes.netloc, partes.path, "", "")), todos
+
+
+def chave_requisicao(metodo: str, url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Identificador de uma requisicao (metodo, URL e parametros ordenados)
+
+    Args:
+        metodo: Metodo HTTP
+        url: URL, com ou sem query string
+        params: Parametros da query string ou do formulario
+
+    Returns:
+        Hash SHA-256 hexadecimal
+    """
+    base, todos = normalizar_requisicao(url, params)
+    texto = json.dumps([metodo.upper(), base, sorted(todos.items())], ensure_ascii=False)
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class RespostaArquivada:
+    """Pagina arquivada e os metadados da captura"""
+    id: int
+    sistema: str
+    processo: str
+    tipo: str
+    metodo: str
+    url: str
+    params: Dict[str, Any]
+    status: int
+    contexto: Dict[str, Any]
+    capturado_em: float
+    tamanho: int
+    codec: str
+    corpo: bytes = field(repr=False, default=b"")
+
+    @property
+    def html(self) -> str:
+        """Pagina descomprimida"""
+        return _descomprimir(self.codec, self.corpo).decode("utf-8")
+
+
+def _comprimir(dados: bytes) -> Tuple[str, bytes]:
+    if ZSTD_AVAILABLE:
+        return CODEC_ZSTD, zstandard.ZstdCompressor(level=DEFAULT_ZSTD_LEVEL).compress(dados)
+    return CODEC_ZLIB, zlib.compress(dados, DEFAULT_ZLIB_LEVEL)
+
+
+def _descomprimir(codec: str, dados: bytes) -> bytes:
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(dados)
+    if codec == CODEC_ZSTD:
+        if not ZSTD_AVAILABLE:
+            raise ImportError("zstandard nao esta instalado (necessario para ler este arquivo)")
+        return zstandard.ZstdDecompressor().decompress(dados)
+    raise ValueError(f"Codec desconhecido: {codec}")
+
+
+# =============================================================================
+# ARQUIVO
+# =============================================================================
+
+class ArquivoHTML:
+    """
+    Arquivo de paginas brutas em SQLite (WAL)
+
+    Cada thread usa sua propria conexao; processos diferentes
+    compartilham o mesmo arquivo.
+    """
+
+    def __init__(self, raiz: str = DEFAULT_ARCHIVE_DIR, busy_timeout_ms: int = DEFAULT_BUSY_TIMEOUT_MS):
+        """
+        Inicializa o arquivo
+
+        Args:
+            raiz: Diretorio do arquivo
+            busy_timeout_ms: Tempo de espera por lock de outro processo
+        """
+        self.raiz = Path(raiz)
+        self.db_path = self.raiz / DEFAULT_ARCHIVE_DB
+        self.busy_timeout_ms = busy_timeout_ms
+        self._conexoes = ConexoesSQLite(self.db_path, busy_timeout_ms)
+
+        self.raiz.mkdir(parents=True, exist_ok=True)
+        self._conn().executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        """Retorna conexao da thread atual, criando se necessario"""
+        return self._conexoes.obter()
+
+    # -------------------------------------------------------------------------
+    # Gravacao
+    # -------------------------------------------------------------------------
+
+    def gravar(
+        self,
+        sistema: str,
+        processo: str,
+        url: str,
+        html: str,
+        params: Optional[Dict[str, Any]] = None,
+        metodo: str = "GET",
+        status: int = 200,
+        contexto: Optional[Dict[str, Any]] = None,
+        tipo: str = TIPO_PROCESSO
+    ) -> int:
+        """
+        Arquiva uma pagina
+
+        Args:
+            sistema: Sistema de origem (ex.: "esaj", "pje", "projudi")
+            processo: Numero do processo a que a pagina pertence
+            url: URL requisitada (a query string vira parametro)
+            html: Corpo ja decodificado
+            params: Parametros da requisicao
+            metodo: Metodo HTTP
+            status: Status HTTP
+            contexto: Dados necessarios para reprocessar (instancia, trf,
+                url final...)
+            tipo: TIPO_PROCESSO para a pagina extraida, TIPO_CONSULTA
+                para paginas intermediarias (usadas so no replay)
+
+        Returns:
+            Id da resposta arquivada
+        """
+        base, todos = normalizar_requisicao(url, params)
+        dados = html.encode("utf-8")
+        codec, corpo = _comprimir(dados)
+        cursor = self._conn().execute(
+            "INSERT INTO respostas (sistema, processo, tipo, requisicao, metodo, url, params, "
+            "status, contexto, codec, tamanho, corpo, capturado_em) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                sistema, processo, tipo, chave_requisicao(metodo, base, todos), metodo.upper(),
+                base, json.dumps(todos, ensure_ascii=False), status,
+                json.dumps(contexto or {}, ensure_ascii=False, default=str),
+                codec, len(dados), sqlite3.Binary(corpo), time.time()
+            )
+        )
+        return cursor.lastrowid
+
+    # -------------------------------------------------------------------------
+    # Leitura
+    # -------------------------------------------------------------------------
+
+    _COLUNAS = (
+        "id, sistema, processo, tipo, metodo, url, params, status, contexto, "
+        "capturado_em, tamanho, codec, corpo"
+    )
+
+    @staticmethod
+    def _resposta(row: tuple) -> RespostaArquivada:
+        (id_, sistema, processo, tipo, metodo, url, params, status, contexto,
+         capturado_em, tamanho, codec, corpo) = row
+        return RespostaArquivada(
+            id=id_, sistema=sistema, processo=processo, tipo=tipo, metodo=metodo, url=url,
+            params=json.loads(params), status=status, contexto=json.loads(contexto),
+            capturado_em=capturado_em, tamanho=tamanho, codec=codec, corpo=bytes(corpo)
+        )
+
+    def buscar(
+        self,
+        metodo: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        ate: Optional[float] = None
+    ) -> Optional[RespostaArquivada]:
+        """
+        Captura mais recente de uma requisicao (para replay)
+
+        Args:
+            metodo: Metodo HTTP
+            url: URL, com ou sem query string
+            params: Parametros da requisicao
+            ate: Considera apenas capturas ate este instante (epoch)
+
+        Returns:
+            RespostaArquivada ou None
+        """
+        row = self._conn().execute(
+            f"SELECT {self._COLUNAS} FROM respostas WHERE requisicao = ? AND capturado_em <= ? "
+            "ORDER BY capturado_em DESC, id DESC LIMIT 1",
+            (chave_requisicao(metodo, url, params), ate if ate is not None else float("inf"))
+        ).fetchone()
+        return self._resposta(row) if row else None
+
+    def ultimas(
+        self,
+        sistema: str,
+        processo: Optional[str] = None,
+        ate: Optional[float] = None
+    ) -> Iterator[RespostaArquivada]:
+        """
+        Pagina de processo mais recente de cada processo do sistema
+
+        Args:
+            sistema: Sistema de origem
+            processo: Restringe a um processo
+            ate: Considera apenas capturas ate este instante (epoch)
+
+        Yields:
+            RespostaArquivada, uma por processo, em ordem de processo
+        """
+        filtro_processo = "AND processo = ?" if processo else ""
+        args = [sistema, ate if ate is not None else float("inf")]
+        if processo:
+            args.append(processo)
+        consulta = (
+            f"SELECT {self._COLUNAS} FROM respostas WHERE id IN ("
+            "  SELECT MAX(id) FROM respostas"
+            f"  WHERE sistema = ? AND tipo = '{TIPO_PROCESSO}' AND capturado_em <= ? {filtro_processo}"
+            "  GROUP BY processo"
+            ") ORDER BY processo"
+        )
+        for row in self._conn().execute(consulta, args):
+            yield self._resposta(row)
+
+    def count(self, sistema: Optional[str] = None) -> int:
+        """Numero de paginas arquivadas"""
+        if sistema is None:
+            row = self._conn().execute("SELECT COUNT(*) FROM respostas").fetchone()
+        else:
+            row = self._conn().execute(
+                "SELECT COUNT(*) FROM respostas WHERE sistema = ?", (sistema,)
+            ).fetchone()
+        return row[0] if row else 0
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Tamanho do arquivo e taxa de compressao"""
+        total, original, comprimido = self._conn().execute(
+            "SELECT COUNT(*), COALESCE(SUM(tamanho), 0), COALESCE(SUM(LENGTH(corpo)), 0) "
+            "FROM respostas"
+        ).fetchone()
+        return {
+            "arquivo": str(self.db_path),
+            "paginas": total,
+            "bytes_originais": original,
+            "bytes_comprimidos": comprimido,
+            "taxa_compressao": (original / comprimido) if comprimido else 0.0,
+            "codec": CODEC_ZSTD if ZSTD_AVAILABLE else CODEC_ZLIB,
+        }
+
+    def transporte_replay(self, ate: Optional[float] = None) -> "httpx.MockTransport":
+        """
+        Transporte httpx que responde com as paginas arquivadas
+
+        Requisicoes sem captura recebem 404. Parametros de formulario
+        (POST) sao lidos do corpo urlencoded.
+
+        Args:
+            ate: Considera apenas capturas ate este instante (epoch)
+
+        Returns:
+            httpx.MockTransport para httpx.Client/AsyncClient(transport=...)
+        """
+        if not HTTPX_AVAILABLE:
+            raise ImportError("httpx nao esta instalado")
+
+        def responder(request: "httpx.Request") -> "httpx.Response":
+            params = {}
+            if request.method != "GET" and request.content:
+                params = dict(parse_qsl(request.content.decode("utf-8"), keep_blank_values=True))
+            resposta = self.buscar(request.method, str(request.url), params, ate=ate)
+            if resposta is None:
+                return httpx.Response(404, text="Requisicao nao arquivada")
+            return httpx.Response(
+                resposta.status,
+                text=resposta.html,
+                headers={"Content-Type": "text/html; charset=utf-8"}
+            )
+
+        return httpx.MockTransport(responder)
+
+    def close(self):
+        """Fecha a conexao da thread atual"""
+        self._conexoes.fechar()
+
+
+# =============================================================================
+# INSTANCIA COMPARTILHADA
+# =============================================================================
+
+_arquivos: RegistroPorCaminho[ArquivoHTML] = RegistroPorCaminho(ArquivoHTML)
+
+
+def obter_arquivo_html(raiz: Optional[str] = None) -> ArquivoHTML:
+    """
+    Retorna o arquivo de paginas do processo para o diretorio informado
+
+    Args:
+        raiz: Diretorio do arquivo (padrao ROM_ARQUIVO_HTML ou ~/.rom_agent)
+
+    Returns:
+        ArquivoHTML unico por diretorio no processo
+    """
+    return _arquivos.obter(raiz or DEFAULT_ARCHIVE_DIR)
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HTML Backend - Construcao de arvores HTML para os scrapers
+
+Todos os parsers usavam BeautifulSoup(html, 'html.parser'), o backend
+mais lento do bs4, e montavam o DOM inteiro mesmo quando so alguns
+elementos eram lidos. Este modulo centraliza a escolha do backend:
+
+- lxml quando instalado (varias vezes mais rapido), html.parser caso contrario
+- Backend configuravel por ROM_HTML_PARSER ou por chamada
+- Parse parcial (SoupStrainer) para paginas em que o extrator so le
+  tags conhecidas, como links de resultados ou a imagem do CAPTCHA
+- PaginaHTML: texto decodificado, texto em minusculas e arvore criados
+  no maximo uma vez por resposta e compartilhados entre as deteccoes
+  (CAPTCHA, segredo de justica, rate limit) e os extratores, com indice
+  de ids, classes, textos, labels e celulas para busca de campos
+
+Autor: ROM-Agent Integration System
+Data: 2026-01-12
+Versao: 1.0.0
+"""
+
+import os
+import re
+import weakref
+from html import unescape
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    from bs4 import BeautifulSoup, SoupStrainer
+    BS4_AVAILABLE = True
+except ImportError:
+    BS4_AVAILABLE = False
+    BeautifulSoup = None
+    SoupStrainer = None
+
+try:
+    import lxml  # noqa: F401
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+
+# =============================================================================
+# CONSTANTES E CONFIGURACOES
+# =============================================================================
+
+PARSER_LXML = "lxml"
+PARSER_PYTHON = "html.parser"
+
+DEFAULT_PARSER = os.environ.get("ROM_HTML_PARSER") or (
+    PARSER_LXML if LXML_AVAILABLE else PARSER_PYTHON
+)
+
+_LINK_BRUTO = re.compile(r"<a\b[^>]*>(.*?)</a\s*>", re.IGNORECASE | re.DOTALL)
+_TAG_BRUTA = re.compile(r"<[^>]+>")
+
+
+# =============================================================================
+# CONSTRUCAO DA ARVORE
+# =============================================================================
+
+def criar_soup(
+    html: str,
+    parse_only: Optional[Any] = None,
+    parser: Optional[str] = None
+) -> "BeautifulSoup":
+    """
+    Cria a arvore BeautifulSoup com o backend configurado
+
+    Args:
+        html: Conteudo HTML
+        parse_only: SoupStrainer para manter apenas parte do documento
+        parser: Backend do bs4 (padrao DEFAULT_PARSER)
+
+    Returns:
+        BeautifulSoup do documento (ou apenas das partes selecionadas)
+    """
+    if not BS4_AVAILABLE:
+        raise ImportError("beautifulsoup4 nao esta instalado")
+    return BeautifulSoup(html, parser or DEFAULT_PARSER, parse_only=parse_only)
+
+
+def apenas_tags(*nomes: str) -> "SoupStrainer":
+    """
+    SoupStrainer que mantem somente as tags informadas (e seus filhos)
+
+    Args:
+        nomes: Nomes das tags, ex.: "a", "img"
+
+    Returns:
+        SoupStrainer para usar em criar_soup(parse_only=...)
+    """
+    if not BS4_AVAILABLE:
+        raise ImportError("beautifulsoup4 nao esta instalado")
+    return SoupStrainer(list(nomes))
+
+
+def textos_links(html: str) -> Iterator[str]:
+    """
+    Textos dos links (<a>) do HTML bruto, sem montar a arvore
+
+    Checagem barata para decisoes que antecedem o parse (ex.: se vale
+    requisitar a proxima pagina); o resultado do parse continua sendo a
+    resposta definitiva.
+
+    Args:
+        html: Conteudo HTML
+
+    Returns:
+        Iterador com o texto de cada link, sem tags internas e entidades
+    """
+    for conteudo in _LINK_BRUTO.findall(html):
+        yield unescape(_TAG_BRUTA.sub("", conteudo)).strip()
+
+
+# =============================================================================
+# PAGINA PARSEADA UMA UNICA VEZ
+# =============================================================================
+
+class PaginaHTML:
+    """
+    Pagina HTML decodificada e parseada sob demanda, no maximo uma vez
+
+    Deteccoes por substring usam `html`/`texto_lower`; extratores usam
+    `soup` e as buscas de campo (`buscar_id`, `buscar_classe`,
+    `buscar_texto`, `buscar_label`, `celulas_com`), que percorrem indices
+    montados uma vez em vez de varrer a arvore a cada nome de campo.
+    As buscas reproduzem o primeiro resultado em ordem de documento de
+    find()/select_one() com os mesmos criterios.
+    """
+
+    def __init__(
+        self,
+        html: Optional[str] = None,
+        soup: Optional["BeautifulSoup"] = None,
+        parser: Optional[str] = None,
+        parse_only: Optional[Any] = None
+    ):
+        """
+        Inicializa a pagina
+
+        Args:
+            html: Conteudo HTML (opcional se `soup` for informado)
+            soup: Arvore ja construida
+            parser: Backend do bs4 (padrao DEFAULT_PARSER)
+            parse_only: SoupStrainer para parse parcial
+        """
+        self._html = html
+        self._soup = soup
+        self._parser = parser
+        self._parse_only = parse_only
+        self._texto_lower: Optional[str] = None
+        self._texto_visivel_lower: Optional[str] = None
+        self._tags: Optional[List[Any]] = None
+        self._ids: Optional[List[Tuple[str, str, Any]]] = None
+        self._classes: Optional[List[Tuple[str, str, Any]]] = None
+        self._textos: Optional[List[Tuple[str, Any]]] = None
+        self._labels: Optional[List[Tuple[str, Any]]] = None
+        self._celulas: Optional[List[Tuple[str, Any]]] = None
+        self._buscas: Dict[Tuple, Any] = {}
+
+    # -------------------------------------------------------------------------
+    # Texto
+    # -------------------------------------------------------------------------
+
+    @property
+    def html(self) -> str:
+        """HTML da pagina"""
+        if self._html is None:
+            self._html = str(self._soup) if self._soup is not None else ""
+        return self._html
+
+    @property
+    def texto_lower(self) -> str:
+        """HTML em minusculas (para deteccoes sem diferenciar caixa)"""
+        if self._texto_lower is None:
+            self._texto_lower = self.html.lower()
+        return self._texto_lower
+
+    @property
+    def texto_visivel_lower(self) -> str:
+        """Texto da arvore (soup.text) em minusculas"""
+        if self._texto_visivel_lower is None:
+            self._texto_visivel_lower = self.soup.text.lower()
+        return self._texto_visivel_lower
+
+    def contem(self, indicadores: Iterable[str], caixa_baixa: bool = False) -> bool:
+        """
+        Verifica se algum indicador aparece na pagina
+
+        Args:
+            indicadores: Substrings procuradas
+            caixa_baixa: Procura em texto_lower (indicadores em minusculas)
+
+        Returns:
+            True se algum indicador estiver presente
+        """
+        texto = self.texto_lower if caixa_baixa else self.html
+        return any(ind in texto for ind in indicadores)
+
+    # -------------------------------------------------------------------------
+    # Arvore
+    # -------------------------------------------------------------------------
+
+    @property
+    def soup(self) -> "BeautifulSoup":
+        """Arvore da pagina (criada no primeiro acesso)"""
+        if self._soup is None:
+            self._soup = criar_soup(self.html, parse_only=self._parse_only, parser=self._parser)
+        return self._soup
+
+    def _todas_tags(self) -> List[Any]:
+        if self._tags is None:
+            self._tags = self.soup.find_all(True)
+        return self._tags
+
+    def _indice_ids(self) -> List[Tuple[str, str, Any]]:
+        if self._ids is None:
+            self._ids = [
+                (tag['id'], tag['id'].lower(), tag)
+                for tag in self._todas_tags() if isinstance(tag.get('id'), str)
+            ]
+        return self._ids
+
+    def _indice_classes(self) -> List[Tuple[str, str, Any]]:
+        if self._classes is None:
+            self._classes = []
+            for tag in self._todas_tags():
+                classes = tag.get('class')
+                if classes:
+                    valor = classes if isinstance(classes, str) else " ".join(classes)
+                    self._classes.append((valor, valor.lower(), tag))
+        return self._classes
+
+    def _indice_textos(self) -> List[Tuple[str, Any]]:
+        if self._textos is None:
+            self._textos = [(str(s).lower(), s) for s in self.soup.find_all(string=True)]
+        return self._textos
+
+    def _indice_labels(self) -> List[Tuple[str, Any]]:
+        if self._labels is None:
+            self._labels = [
+                (tag.string.lower(), tag)
+                for tag in self._todas_tags()
+                if tag.name == 'label' and tag.string is not None
+            ]
+        return self._labels
+
+    def _indice_celulas(self) -> List[Tuple[str, Any]]:
+        if self._celulas is None:
+            self._celulas = [
+                (tag.text.lower(), tag)
+                for tag in self._todas_tags() if tag.name in ('td', 'th')
+            ]
+        return self._celulas
+
+    # -------------------------------------------------------------------------
+    # Busca de campos
+    # -------------------------------------------------------------------------
+
+    def buscar_id(self, nome: str, ignorar_caixa: bool = False, tag: Optional[str] = None):
+        """
+        Primeiro elemento cujo id contem `nome`
+
+        Equivale a find(tag, id=re.compile(nome, re.I)) com ignorar_caixa
+        e a select_one('[id*="nome"]') sem.
+        """
+        chave = ('id', nome, ignorar_caixa, tag)
+        if chave not in self._buscas:
+            alvo = nome.lower() if ignorar_caixa else nome
+            self._buscas[chave] = next((
+                elem for valor, valor_lower, elem in self._indice_ids()
+                if alvo in (valor_lower if ignorar_caixa else valor)
+                and (tag is None or elem.name == tag)
+            ), None)
+        return self._buscas[chave]
+
+    def buscar_classe(self, nome: str, ignorar_caixa: bool = False):
+        """
+        Primeiro elemento cujo atributo class contem `nome`
+
+        Equivale a find(class_=re.compile(nome, re.I)) com ignorar_caixa
+        e a select_one('[class*="nome"]') sem.
+        """
+        chave = ('class', nome, ignorar_caixa)
+        if chave not in self._buscas:
+            alvo = nome.lower() if ignorar_caixa else nome
+            self._buscas[chave] = next((
+                elem for valor, valor_lower, elem in self._indice_classes()
+                if alvo in (valor_lower if ignorar_caixa else valor)
+            ), None)
+        return self._buscas[chave]
+
+    def buscar_texto(self, nome: str, inicio: bool = False):
+        """
+        Primeiro texto da pagina que contem `nome` (sem diferenciar caixa)
+
+        Equivale a find(string=re.compile(nome, re.I)), ou com `^nome`
+        quando inicio=True.
+        """
+        chave = ('texto', nome, inicio)
+        if chave not in self._buscas:
+            alvo = nome.lower()
+            if inicio:
+                achado = next((s for t, s in self._indice_textos() if t.startswith(alvo)), None)
+            else:
+                achado = next((s for t, s in self._indice_textos() if alvo in t), None)
+            self._buscas[chave] = achado
+        return self._buscas[chave]
+
+    def buscar_label(self, nome: str):
+        """Primeira <label> cujo texto contem `nome` (sem diferenciar caixa)"""
+        chave = ('label', nome)
+        if chave not in self._buscas:
+            alvo = nome.lower()
+            self._buscas[chave] = next(
+                (elem for texto, elem in self._indice_labels() if alvo in texto), None
+            )
+        return self._buscas[chave]
+
+    def celulas_com(self, nome: str) -> Iterator[Any]:
+        """Celulas td/th, em ordem, cujo texto contem `nome` (sem diferenciar caixa)"""
+        alvo = nome.lower()
+        return (elem for texto, elem in self._indice_celulas() if alvo in texto)
+
+
+def como_pagina(origem: Any) -> PaginaHTML:
+    """
+    Normaliza HTML, BeautifulSoup ou PaginaHTML para PaginaHTML
+
+    Args:
+        origem: str com HTML, arvore ja parseada ou PaginaHTML
+
+    Returns:
+        PaginaHTML (a mesma instancia se ja for uma)
+    """
+    if isinstance(origem, PaginaHTML):
+        return origem
+    if isinstance(origem, str):
+        return PaginaHTML(html=origem)
+    return PaginaHTML(soup=origem)
+
+
+_paginas_resposta: "weakref.WeakKeyDictionary[Any, PaginaHTML]" = weakref.WeakKeyDictionary()
+
+
+def pagina_da_resposta(response: Any) -> PaginaHTML:
+    """
+    PaginaHTML associada a uma resposta HTTP (requests ou httpx)
+
+    A mesma resposta sempre devolve a mesma pagina, de modo que o corpo e
+    decodificado (response.text) e parseado uma unica vez mesmo quando a
+    verificacao de erros e o extrator rodam em pontos diferentes.
+
+    Args:
+        response: Resposta com o corpo ja lido
+
+    Returns:
+        PaginaHTML da resposta
+    """
+    pagina = _paginas_resposta.get(response)
+    if pagina is None:
+        pagina = PaginaHTML(html=response.text)
+        _paginas_resposta[response] = pagina
+    return pagina
@@ -13,6 +13,8 @@ from typing import Dict, List, Optional, Any
 from datetime import datetime
 from pathlib import Path
 
+from response_cache import CacheRespostas, com_cache, obter_cache_respostas
+
 # Configuração
 CONFIG = {
     'base_url': 'https://www.jusbrasil.com.br',
@@ -24,22 +26,37 @@ CONFIG = {
 }
 
 
+def _chave_jusbrasil(client: 'JusBrasilAPI', params: Dict[str, Any]) -> Dict[str, Any]:
+    """Chave de cache: argumentos da consulta e se a sessão está logada (sem login o acesso é limitado)"""
+    return {**params, 'logado': client.logado}
+
+
 class JusBrasilAPI:
     """Cliente para JusBrasil com autenticação via cookies"""
 
-    def __init__(self, email: Optional[str] = None, senha: Optional[str] = None):
+    def __init__(
+        self,
+        email: Optional[str] = None,
+        senha: Optional[str] = None,
+        cache_respostas: Optional[CacheRespostas] = None,
+        cache_enabled: bool = True
+    ):
         """
         Inicializa cliente JusBrasil
 
         Args:
             email: Email da conta JusBrasil (armazenado para referência)
             senha: Senha da conta (não armazenada, apenas para referência)
+            cache_respostas: Cache de respostas (padrão: cache compartilhado)
+            cache_enabled: Se False, toda consulta vai ao JusBrasil
 
         Note:
             A autenticação real é feita via cookies salvos.
             Para gerar cookies, execute loginManual() do agente ROM em JavaScript.
         """
         self.email = email or os.getenv('JUSBRASIL_EMAIL')
+        self.cache_respostas = cache_respostas
+        self.cache_enabled = cache_enabled
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': CONFIG['user_agent'],
@@ -54,6 +71,13 @@ class JusBrasilAPI:
         # Carregar cookies se existirem
         self.logado = self._carregar_cookies()
 
+    @property
+    def _cache(self) -> Optional[CacheRespostas]:
+        """Cache de respostas em uso (None se desligado)"""
+        if not self.cache_enabled:
+            return None
+        return self.cache_respostas or obter_cache_respostas()
+
     def _carregar_cookies(self) -> bool:
         """
         Carrega cookies salvos do arquivo
@@ -133,6 +157,7 @@ class JusBrasilAPI:
                 'logado': False
             }
 
+    @com_cache('jusbrasil', 'jurisprudencia', chave=_chave_jusbrasil)
     def pesquisar_jurisprudencia(
         self,
         termo: str,
@@ -190,6 +215,13 @@ class JusBrasilAPI:
                 'dica': 'Para extração automática de resultados, implemente parser HTML ou use API interna do JusBrasil'
             }
 
+        except requests.exceptions.HTTPError as e:
+            return {
+                'sucesso': False,
+                'erro': str(e),
+                'termo': termo,
+                'status_code': e.response.status_code
+            }
         except Exception as e:
             return {
                 'sucesso': False,
@@ -197,6 +229,7 @@ class JusBrasilAPI:
                 'termo': termo
             }
 
+    @com_cache('jusbrasil', 'inteiro_teor', chave=_chave_jusbrasil)
     def obter_inteiro_teor(self, url: str) -> Dict[str, Any]:
         """
         Obtém o inteiro teor de uma decisão
@@ -224,6 +257,13 @@ class JusBrasilAPI:
                 'mensagem': 'HTML obtido. Implemente parser para extrair conteúdo específico'
             }
 
+        except requests.exceptions.HTTPError as e:
+            return {
+                'sucesso': False,
+                'erro': str(e),
+                'url': url,
+                'status_code': e.response.status_code
+            }
         except Exception as e:
             return {
                 'sucesso': False,
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Layouts - Especificacoes declarativas de extracao por tribunal
+
+Seletores, ids de tabela, listas de rotulos, mapas de classificacao e
+regexes ficavam como literais dentro dos metodos de extracao, e parte
+deles era recriada a cada linha de tabela ou link (dicts de tipo de
+parte, re.search com padrao literal). Este modulo separa:
+
+- LayoutSpec: o layout de um sistema/tribunal como dados puros
+  (rotulos, campos, seletores CSS, regexes, classificacoes)
+- LayoutCompilado: a mesma especificacao compilada uma unica vez
+  (seletores soupsieve, re.Pattern, tuplas de classificacao)
+- Extratores genericos reaproveitados pelos scrapers
+- Registro de layouts por nome: um novo TJ com layout proprio e apenas
+  um LayoutSpec registrado (geralmente derivado com dataclasses.replace
+  do layout do sistema que ele usa)
+
+Autor: ROM-Agent Integration System
+Data: 2026-01-12
+Versao: 1.0.0
+"""
+
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Pattern, Tuple
+
+try:
+    import soupsieve
+    SOUPSIEVE_AVAILABLE = True
+except ImportError:
+    SOUPSIEVE_AVAILABLE = False
+    soupsieve = None
+
+from html_backend import como_pagina
+
+
+# =============================================================================
+# ESPECIFICACAO
+# =============================================================================
+
+@dataclass(frozen=True)
+class LayoutSpec:
+    """
+    Layout de extracao de um sistema/tribunal, somente dados
+
+    Attributes:
+        sistema: Nome do layout no registro (ex.: "esaj", "pje")
+        rotulos: Pares (texto do rotulo, campo), na ordem de busca
+        campos: Campo -> nomes/ids candidatos, na ordem de busca
+        seletores: Secao -> seletores CSS alternativos; o primeiro que
+            encontrar algo e usado (ex.: tabela completa, depois resumida)
+        padroes: Nome -> regex (flags inline, ex.: "(?i)")
+        classificacoes: Nome -> pares (palavra-chave, valor); vence a
+            primeira palavra contida no texto
+    """
+    sistema: str
+    rotulos: Tuple[Tuple[str, str], ...] = ()
+    campos: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+    seletores: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+    padroes: Dict[str, str] = field(default_factory=dict)
+    classificacoes: Dict[str, Tuple[Tuple[str, Any], ...]] = field(default_factory=dict)
+
+
+# =============================================================================
+# LAYOUT COMPILADO
+# =============================================================================
+
+class LayoutCompilado:
+    """
+    LayoutSpec com seletores e regexes compilados
+
+    Criado uma vez por layout (na importacao do scraper) e compartilhado
+    entre instancias e threads: nada e alterado depois da compilacao.
+    """
+
+    def __init__(self, spec: LayoutSpec):
+        """
+        Compila a especificacao
+
+        Args:
+            spec: Layout declarativo
+        """
+        self.spec = spec
+        self.sistema = spec.sistema
+        self.rotulos = tuple(spec.rotulos)
+        self.campos = {campo: tuple(nomes) for campo, nomes in spec.campos.items()}
+        self._seletores: Dict[str, Tuple[Any, ...]] = {
+            secao: tuple(self._compilar_seletor(s) for s in alternativas)
+            for secao, alternativas in spec.seletores.items()
+        }
+        self._padroes: Dict[str, Pattern] = {
+            nome: re.compile(padrao) for nome, padrao in spec.padroes.items()
+        }
+        self._classificacoes: Dict[str, Tuple[Tuple[str, Any], ...]] = {
+            nome: tuple(pares) for nome, pares in spec.classificacoes.items()
+        }
+
+    @staticmethod
+    def _compilar_seletor(seletor: str) -> Any:
+        # Sem soupsieve (bs4 antigo) o seletor fica como texto para select()
+        return soupsieve.compile(seletor) if SOUPSIEVE_AVAILABLE else seletor
+
+    def padrao(self, nome: str) -> Pattern:
+        """Regex compilada do layout"""
+        return self._padroes[nome]
+
+    def primeiro(self, secao: str, raiz: Any) -> Optional[Any]:
+        """
+        Primeiro elemento da secao, tentando as alternativas em ordem
+
+        Args:
+            secao: Nome da secao em `seletores`
+            raiz: Tag ou BeautifulSoup onde procurar
+
+        Returns:
+            Elemento encontrado ou None
+        """
+        for seletor in self._seletores[secao]:
+            elem = seletor.select_one(raiz) if SOUPSIEVE_AVAILABLE else raiz.select_one(seletor)
+            if elem is not None:
+                return elem
+        return None
+
+    def cada(self, secao: str, raiz: Any) -> List[Any]:
+        """Primeiro elemento de cada alternativa da secao (as que existirem)"""
+        encontrados = []
+        for seletor in self._seletores[secao]:
+            elem = seletor.select_one(raiz) if SOUPSIEVE_AVAILABLE else raiz.select_one(seletor)
+            if elem is not None:
+                encontrados.append(elem)
+        return encontrados
+
+    def todos(self, secao: str, raiz: Any) -> List[Any]:
+        """Todos os elementos das alternativas da secao"""
+        encontrados = []
+        for seletor in self._seletores[secao]:
+            encontrados.extend(seletor.select(raiz) if SOUPSIEVE_AVAILABLE else raiz.select(seletor))
+        return encontrados
+
+    def classificacao(self, nome: str) -> Tuple[Tuple[str, Any], ...]:
+        """Pares (palavra-chave, valor) de uma classificacao"""
+        return self._classificacoes[nome]
+
+    def classificar(self, nome: str, texto: str, padrao: Any = None) -> Any:
+        """
+        Valor da primeira palavra-chave contida no texto
+
+        Args:
+            nome: Nome da classificacao
+            texto: Texto ja em minusculas
+            padrao: Valor se nenhuma palavra-chave for encontrada
+
+        Returns:
+            Valor classificado
+        """
+        for chave, valor in self._classificacoes[nome]:
+            if chave in texto:
+                return valor
+        return padrao
+
+
+def compilar_layout(spec: LayoutSpec) -> LayoutCompilado:
+    """
+    Compila um LayoutSpec
+
+    Args:
+        spec: Layout declarativo
+
+    Returns:
+        LayoutCompilado
+    """
+    return LayoutCompilado(spec)
+
+
+# =============================================================================
+# EXTRATORES GENERICOS
+# =============================================================================
+
+def linhas_tabela(
+    tabela: Any,
+    min_colunas: int = 2,
+    celula: str = 'td'
+) -> Iterator[Tuple[Any, List[Any]]]:
+    """
+    Linhas de uma tabela com pelo menos `min_colunas` celulas
+
+    Args:
+        tabela: Tag da tabela
+        min_colunas: Minimo de celulas para a linha ser considerada
+        celula: Tag das celulas
+
+    Yields:
+        (linha, celulas)
+    """
+    for linha in tabela.find_all('tr'):
+        colunas = linha.find_all(celula)
+        if len(colunas) >= min_colunas:
+            yield linha, colunas
+
+
+def extrair_rotulados(
+    pagina: Any,
+    layout: LayoutCompilado,
+    limpar: Any = str.strip,
+    tag_id: Optional[str] = 'span'
+) -> Dict[str, str]:
+    """
+    Extrai campos pelos rotulos do layout
+
+    Para cada (rotulo, campo), o valor e o elemento seguinte ao texto que
+    comeca com o rotulo; se houver elemento `tag_id` com id contendo o
+    nome do campo, ele prevalece.
+
+    Args:
+        pagina: HTML, BeautifulSoup ou PaginaHTML
+        layout: Layout com `rotulos`
+        limpar: Funcao de limpeza do texto extraido
+        tag_id: Tag procurada pelo id do campo (None desativa)
+
+    Returns:
+        Dict campo -> texto
+    """
+    pagina = como_pagina(pagina)
+    dados: Dict[str, str] = {}
+
+    for rotulo, campo in layout.rotulos:
+        label = pagina.buscar_texto(rotulo, inicio=True)
+        if label:
+            parent = label.parent
+            if parent:
+                # Procura valor proximo
+                value_elem = parent.find_next_sibling() or parent.find_next()
+                if value_elem:
+                    valor = limpar(value_elem.get_text())
+                    if valor:
+                        dados[campo] = valor
+
+        if tag_id:
+            elem = pagina.buscar_id(campo, ignorar_caixa=True, tag=tag_id)
+            if elem:
+                dados[campo] = limpar(elem.get_text())
+
+    return dados
+
+
+# =============================================================================
+# REGISTRO
+# =============================================================================
+
+_layouts: Dict[str, LayoutCompilado] = {}
+_layouts_lock = threading.Lock()
+
+
+def registrar_layout(spec: LayoutSpec) -> LayoutCompilado:
+    """
+    Compila e registra um layout (substitui outro de mesmo nome)
+
+    Args:
+        spec: Layout declarativo
+
+    Returns:
+        LayoutCompilado registrado
+    """
+    layout = compilar_layout(spec)
+    with _layouts_lock:
+        _layouts[spec.sistema] = layout
+    return layout
+
+
+def obter_layout(sistema: str) -> LayoutCompilado:
+    """
+    Retorna um layout registrado
+
+    Args:
+        sistema: Nome do layout
+
+    Returns:
+        LayoutCompilado
+
+    Raises:
+        KeyError: Se o layout nao estiver registrado
+    """
+    with _layouts_lock:
+        try:
+            return _layouts[sistema]
+        except KeyError:
+            raise KeyError(
+                f"Layout nao registrado: {sistema}. Disponiveis: {', '.join(sorted(_layouts))}"
+            ) from None
+
+
+def layouts_registrados() -> List[str]:
+    """Nomes dos layouts registrados"""
+    with _layouts_lock:
+        return sorted(_layouts)
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Page Validators - GET condicional e impressao digital de paginas
+
+A maioria das paginas de processo nao muda entre duas consultas, mas cada
+consulta baixava, decodificava, parseava e regravava o resultado. Este
+modulo guarda, por pagina, os validadores da ultima resposta:
+
+- ETag / Last-Modified, quando o portal os envia, reenviados como
+  If-None-Match / If-Modified-Since (resposta 304 sem corpo)
+- Hash do corpo normalizado (espacos, scripts, campos ocultos e
+  jsessionid removidos), para portais sem validadores HTTP
+
+Com a pagina inalterada o scraper devolve o resultado estruturado
+guardado junto dos validadores, sem parsear a pagina.
+
+Autor: ROM-Agent Integration System
+Data: 2026-01-12
+Versao: 1.0.0
+"""
+
+import dataclasses
+import hashlib
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from html_backend import PaginaHTML, pagina_da_resposta
+
+
+# =============================================================================
+# CONSTANTES E CONFIGURACOES
+# =============================================================================
+
+DEFAULT_VALIDADORES_TTL = 30 * 24 * 3600  # segundos que os validadores sao mantidos
+
+# Trechos que mudam a cada resposta sem mudar o processo
+_VOLATEIS = re.compile(
+    r"<script\b.*?</script>"
+    r"|<input\b[^>]*\btype\s*=\s*[\"']?hidden\b[^>]*>"
+    r"|;jsessionid=[\w.\-]+",
+    re.IGNORECASE | re.DOTALL
+)
+_ENTRE_TAGS = re.compile(r">\s+<")
+_ESPACOS = re.compile(r"\s+")
+
+
+# =============================================================================
+# ESTRUTURAS
+# =============================================================================
+
+@dataclass
+class ValidadoresPagina:
+    """Validadores da ultima resposta de uma pagina e o resultado extraido dela"""
+    url: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    hash_corpo: Optional[str] = None
+    resultado: Optional[Any] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Converte para dicionario"""
+        return dataclasses.asdict(self)
+
+    @classmethod
+    def from_dict(cls, dados: Dict[str, Any]) -> "ValidadoresPagina":
+        """Reconstroi a partir de to_dict()"""
+        return cls(**dados)
+
+
+# =============================================================================
+# FUNCOES
+# =============================================================================
+
+def hash_corpo(html: str) -> str:
+    """
+    Impressao digital do corpo normalizado da pagina
+
+    Args:
+        html: Corpo decodificado
+
+    Returns:
+        Hash hexadecimal (BLAKE2b de 128 bits)
+    """
+    normalizado = _ENTRE_TAGS.sub("><", _VOLATEIS.sub("", html or ""))
+    normalizado = _ESPACOS.sub(" ", normalizado).strip()
+    return hashlib.blake2b(normalizado.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def cabecalhos_condicionais(validadores: Optional[ValidadoresPagina]) -> Dict[str, str]:
+    """
+    Cabecalhos If-None-Match / If-Modified-Since para revalidar a pagina
+
+    Args:
+        validadores: Validadores da ultima resposta (None = sem cabecalhos)
+
+    Returns:
+        Dict de cabecalhos (vazio sem validadores HTTP ou sem resultado
+        guardado para reaproveitar)
+    """
+    if validadores is None or validadores.resultado is None:
+        return {}
+    cabecalhos = {}
+    if validadores.etag:
+        cabecalhos["If-None-Match"] = validadores.etag
+    if validadores.last_modified:
+        cabecalhos["If-Modified-Since"] = validadores.last_modified
+    return cabecalhos
+
+
+def validadores_da_url(
+    validadores: Optional[ValidadoresPagina],
+    url: str
+) -> Optional[ValidadoresPagina]:
+    """
+    Validadores guardados, se vierem da requisicao para `url`
+
+    Paginas obtidas em duas etapas (busca -> pagina do processo) guardam
+    os validadores da ultima resposta; eles nao valem para a outra URL.
+
+    Args:
+        validadores: Validadores guardados da pagina
+        url: URL que sera requisitada
+
+    Returns:
+        Os validadores ou None se forem de outra URL
+    """
+    if validadores is None or validadores.url != url:
+        return None
+    return validadores
+
+
+def validadores_da_resposta(
+    response: Any,
+    url: str,
+    html: Optional[str],
+    anteriores: Optional[ValidadoresPagina] = None
+) -> ValidadoresPagina:
+    """
+    Validadores de uma resposta (requests ou httpx)
+
+    Args:
+        response: Resposta HTTP
+        url: URL requisitada
+        html: Corpo decodificado (ignorado em 304)
+        anteriores: Validadores enviados na requisicao
+
+    Returns:
+        ValidadoresPagina sem resultado; em 304 herda hash e resultado
+    """
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if response.status_code == 304 and anteriores is not None:
+        return dataclasses.replace(
+            anteriores,
+            etag=etag or anteriores.etag,
+            last_modified=last_modified or anteriores.last_modified
+        )
+    return ValidadoresPagina(
+        url=url,
+        etag=etag,
+        last_modified=last_modified,
+        hash_corpo=hash_corpo(html) if html is not None else None
+    )
+
+
+def pagina_inalterada(
+    anteriores: Optional[ValidadoresPagina],
+    atuais: ValidadoresPagina,
+    status_code: int = 200
+) -> bool:
+    """
+    Se a resposta confirma que a pagina nao mudou desde `anteriores`
+
+    Args:
+        anteriores: Validadores guardados (com resultado)
+        atuais: Validadores da resposta
+        status_code: Status HTTP da resposta
+
+    Returns:
+        True em 304 ou com o mesmo hash de corpo
+    """
+    if anteriores is None or anteriores.resultado is None:
+        return False
+    if status_code == 304:
+        return True
+    return bool(atuais.hash_corpo) and atuais.hash_corpo == anteriores.hash_corpo
+
+
+def avaliar_resposta(
+    response: Any,
+    url: str,
+    anteriores: Optional[ValidadoresPagina] = None
+) -> Tuple[Optional[PaginaHTML], ValidadoresPagina]:
+    """
+    Pagina da resposta, ou None se ela nao mudou desde `anteriores`
+
+    A pagina inalterada e apenas decodificada para o hash (ou nem isso,
+    em 304); o parse nunca acontece.
+
+    Args:
+        response: Resposta HTTP (requests ou httpx)
+        url: URL requisitada
+        anteriores: Validadores guardados da pagina
+
+    Returns:
+        (PaginaHTML ou None, validadores da resposta); com a pagina
+        inalterada os validadores trazem o resultado anterior
+    """
+    nao_modificada = response.status_code == 304 and anteriores is not None
+    html = None if nao_modificada else pagina_da_resposta(response).html
+    validadores = validadores_da_resposta(response, url, html, anteriores)
+    if pagina_inalterada(anteriores, validadores, response.status_code):
+        return None, dataclasses.replace(validadores, resultado=anteriores.resultado)
+    return pagina_da_resposta(response), validadores
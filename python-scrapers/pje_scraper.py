@@ -36,23 +36,26 @@ import json
 import logging
 import os
 import re
+import sqlite3
 import ssl
 import sys
+import threading
 import time
 import unicodedata
+from concurrent.futures import ThreadPoolExecutor, wait as aguardar_futures
+from contextlib import nullcontext
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timedelta, timezone
 from enum import Enum
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 from urllib.parse import urljoin, urlencode, parse_qs, urlparse, quote
 
 # Dependencias externas
 try:
     import requests
     from requests.adapters import HTTPAdapter
-    from urllib3.util.retry import Retry
     REQUESTS_AVAILABLE = True
 except ImportError:
     REQUESTS_AVAILABLE = False
@@ -83,6 +86,32 @@ except ImportError:
     OPENSSL_AVAILABLE = False
     OpenSSL = None
 
+from cache_store import SQLiteCacheStore
+from token_bucket import TokenBucketLimiter, obter_token_bucket
+from adaptive_rate import AdaptiveRateController, obter_controlador, segundos_retry_after
+from downloads import baixar_stream
+from document_store import DocumentStore, obter_document_store
+from html_backend import PaginaHTML, apenas_tags, como_pagina, criar_soup
+from scraper_registry import obter_registro_scrapers
+from sync_cursors import CursorStore, DeltaMovimentacoes, obter_cursor_store
+from html_archive import ArquivoHTML, obter_arquivo_html
+from retry_policy import PoliticaRetry
+from resilience import (
+    CircuitBreaker,
+    CircuitBreakerState,
+    CircuitoAbertoError,
+    LimiteConcorrenciaError,
+    Resiliencia,
+    obter_resiliencia,
+)
+from page_validators import (
+    DEFAULT_VALIDADORES_TTL,
+    ValidadoresPagina,
+    avaliar_resposta,
+    cabecalhos_condicionais,
+)
+from layouts import LayoutCompilado, LayoutSpec, linhas_tabela, obter_layout, registrar_layout
+
 
 # =============================================================================
 # CONSTANTES E CONFIGURACOES
@@ -134,7 +163,13 @@ DEFAULT_MAX_RETRIES = 3
 DEFAULT_RATE_LIMIT = 1.0  # segundos entre requisicoes
 DEFAULT_CACHE_TTL_SESSION = 3600  # 1 hora para sessao
 DEFAULT_CACHE_TTL_CONSULTA = 1800  # 30 minutos para consultas
+DEFAULT_PRAZO_BUSCA_TRFS = 90  # prazo total (s) das buscas em todos os TRFs
+DEFAULT_MAX_DOWNLOADS = 4  # documentos baixados simultaneamente por processo
+DEFAULT_CACHE_MAX_ENTRIES = 50000  # limite de entradas no cache
+CACHE_DB_NAME = "cache.db"
 DEFAULT_BACKOFF_BASE = 2  # base do backoff exponencial (2^n)
+DEFAULT_RATE_BURST = 1  # requisicoes em rajada permitidas pelo token bucket
+DEFAULT_BLOQUEIO_RATE_LIMIT = 60.0  # pausa apos 429 sem Retry-After (segundos)
 DEFAULT_CIRCUIT_BREAKER_THRESHOLD = 5  # erros consecutivos para abrir circuito
 DEFAULT_CIRCUIT_BREAKER_TIMEOUT = 60  # segundos para tentar reabrir circuito
 DEFAULT_LOG_MAX_SIZE = 10 * 1024 * 1024  # 10 MB
@@ -267,13 +302,6 @@ class TipoDocumento(str, Enum):
     OUTRO = "outro"
 
 
-class CircuitBreakerState(str, Enum):
-    """Estados do circuit breaker"""
-    CLOSED = "closed"
-    OPEN = "open"
-    HALF_OPEN = "half_open"
-
-
 # =============================================================================
 # DATACLASSES
 # =============================================================================
@@ -542,6 +570,76 @@ class PJeCircuitBreakerOpenError(PJeError):
     pass
 
 
+class PJePrazoEsgotadoError(PJeConnectionError):
+    """Prazo da busca em varios TRFs esgotado antes da requisicao"""
+    pass
+
+
+# =============================================================================
+# LAYOUT DE EXTRACAO
+# =============================================================================
+
+# Layout das consultas publicas do PJe nos TRFs. Um tribunal com ids ou
+# nomes de campo diferentes registra um LayoutSpec derivado deste
+# (dataclasses.replace) e o informa em PJeScraper(layout=...).
+PJE_LAYOUT_SPEC = LayoutSpec(
+    sistema="pje",
+    campos={
+        "classe": ("classe", "classeProcessual"),
+        "assunto": ("assunto", "assuntoPrincipal"),
+        "orgao_julgador": ("orgaoJulgador", "vara", "unidade"),
+        "vara": ("vara", "unidadeJudicial"),
+        "data_distribuicao": ("dataDistribuicao", "distribuicao"),
+        "valor_causa": ("valorCausa", "valor"),
+    },
+    seletores={
+        "partes": ('table[id*="parte" i], table[id*="polo" i]',),
+        "movimentacoes": (
+            'table[id*="moviment" i], table[id*="andamento" i]',
+            'div[id*="moviment" i], div[id*="andamento" i]',
+        ),
+        "linhas_movimentacao": ('div[class*="linha" i], div[class*="item" i]',),
+        "intimacoes": ('table[id*="intimac" i]',),
+        "link_processo": ('a[href*="processo"], a[href*="numero"]',),
+    },
+    padroes={
+        "numero_cnj": r'\d{7}-?\d{2}\.?\d{4}\.?\d\.?\d{2}\.?\d{4}',
+        "id_documento": r'idDoc=(\d+)',
+        "nome_antes_oab": r'^([^(OAB)]+)',
+        "prazo_dias": r'(\d+)\s*dias?',
+    },
+    classificacoes={
+        "tipo_parte": (
+            ('autor', TipoParte.AUTOR.value),
+            ('requerente', TipoParte.REQUERENTE.value),
+            ('exequente', TipoParte.EXEQUENTE.value),
+            ('embargante', TipoParte.EMBARGANTE.value),
+            ('reu', TipoParte.REU.value),
+            ('re', TipoParte.REU.value),
+            ('requerido', TipoParte.REQUERIDO.value),
+            ('executado', TipoParte.EXECUTADO.value),
+            ('embargado', TipoParte.EMBARGADO.value),
+        ),
+        "tipo_documento": (
+            ('peticao inicial', TipoDocumento.PETICAO_INICIAL.value),
+            ('contestacao', TipoDocumento.CONTESTACAO.value),
+            ('sentenca', TipoDocumento.SENTENCA.value),
+            ('acordao', TipoDocumento.ACORDAO.value),
+            ('despacho', TipoDocumento.DESPACHO.value),
+            ('decisao', TipoDocumento.DECISAO.value),
+            ('certidao', TipoDocumento.CERTIDAO.value),
+        ),
+        "tipo_intimacao": (
+            ('carga', TipoIntimacao.CARGA.value),
+            ('vista', TipoIntimacao.VISTA.value),
+            ('citacao', TipoIntimacao.CITACAO.value),
+        ),
+    },
+)
+
+LAYOUT_PJE = registrar_layout(PJE_LAYOUT_SPEC)
+
+
 # =============================================================================
 # UTILITARIOS
 # =============================================================================
@@ -738,171 +836,125 @@ class CacheManager:
     Implementa:
     - Cache de sessao autenticada (1 hora)
     - Cache de consultas (30 minutos)
-    - Invalidacao automatica por TTL
-    - Persistencia em arquivo JSON
+    - Invalidacao automatica por TTL (por entrada)
+    - Persistencia em SQLite (modo WAL), seguro entre processos
     """
 
+    NAMESPACE_CONSULTA = "pje"
+    NAMESPACE_SESSAO = "pje_sessao"
+    NAMESPACE_VALIDADORES = "pje_validadores"
+
     def __init__(
         self,
         cache_dir: str = "./cache/pje",
         ttl_session: int = DEFAULT_CACHE_TTL_SESSION,
         ttl_consulta: int = DEFAULT_CACHE_TTL_CONSULTA,
-        enabled: bool = True
+        enabled: bool = True,
+        max_entries: int = DEFAULT_CACHE_MAX_ENTRIES,
+        ttl_validadores: int = DEFAULT_VALIDADORES_TTL
     ):
         self.cache_dir = Path(cache_dir)
         self.ttl_session = ttl_session
         self.ttl_consulta = ttl_consulta
+        self.ttl_validadores = ttl_validadores
         self.enabled = enabled
-        self._cache_file = self.cache_dir / "cache.json"
-        self._session_file = self.cache_dir / "session.json"
-        self._cache: Dict[str, Dict] = {}
-        self._session_cache: Dict[str, Dict] = {}
-        self._load_cache()
-
-    def _load_cache(self):
-        """Carrega cache dos arquivos"""
-        if not self.enabled:
-            return
+        self._store: Optional[SQLiteCacheStore] = None
 
-        try:
-            self.cache_dir.mkdir(parents=True, exist_ok=True)
-
-            # Cache de consultas
-            if self._cache_file.exists():
-                with open(self._cache_file, 'r', encoding='utf-8') as f:
-                    self._cache = json.load(f)
-                self._cleanup()
-
-            # Cache de sessao
-            if self._session_file.exists():
-                with open(self._session_file, 'r', encoding='utf-8') as f:
-                    self._session_cache = json.load(f)
-                self._cleanup_session()
-
-        except Exception:
-            self._cache = {}
-            self._session_cache = {}
+        if self.enabled:
+            try:
+                self._store = SQLiteCacheStore(
+                    str(self.cache_dir / CACHE_DB_NAME),
+                    max_entries=max_entries
+                )
+            except sqlite3.Error as e:
+                logging.getLogger("pje_scraper").warning(
+                    f"Cache desabilitado - falha ao abrir banco: {e}"
+                )
+                self.enabled = False
 
-    def _save_cache(self):
-        """Salva cache no arquivo"""
+    def _get(self, key: str, namespace: str) -> Optional[Dict]:
+        """Leitura tolerante a falhas do banco"""
         if not self.enabled:
-            return
+            return None
         try:
-            self.cache_dir.mkdir(parents=True, exist_ok=True)
-            with open(self._cache_file, 'w', encoding='utf-8') as f:
-                json.dump(self._cache, f, ensure_ascii=False, indent=2)
-        except Exception:
-            pass
+            return self._store.get(key, namespace)
+        except sqlite3.Error as e:
+            logging.getLogger("pje_scraper").warning(f"Falha ao ler cache: {e}")
+            return None
 
-    def _save_session(self):
-        """Salva cache de sessao no arquivo"""
+    def _set(self, key: str, value: Dict, ttl: int, namespace: str):
+        """Escrita tolerante a falhas do banco"""
         if not self.enabled:
             return
         try:
-            self.cache_dir.mkdir(parents=True, exist_ok=True)
-            with open(self._session_file, 'w', encoding='utf-8') as f:
-                json.dump(self._session_cache, f, ensure_ascii=False, indent=2)
-        except Exception:
-            pass
-
-    def _cleanup(self):
-        """Remove entradas expiradas do cache de consultas"""
-        now = time.time()
-        expired_keys = [
-            key for key, value in self._cache.items()
-            if now - value.get('timestamp', 0) > self.ttl_consulta
-        ]
-        for key in expired_keys:
-            del self._cache[key]
-        if expired_keys:
-            self._save_cache()
-
-    def _cleanup_session(self):
-        """Remove sessoes expiradas"""
-        now = time.time()
-        expired_keys = [
-            key for key, value in self._session_cache.items()
-            if now - value.get('timestamp', 0) > self.ttl_session
-        ]
-        for key in expired_keys:
-            del self._session_cache[key]
-        if expired_keys:
-            self._save_session()
+            self._store.set(key, value, ttl, namespace)
+        except sqlite3.Error as e:
+            logging.getLogger("pje_scraper").warning(f"Falha ao gravar cache: {e}")
 
     def get(self, key: str) -> Optional[Dict]:
         """Recupera valor do cache"""
-        if not self.enabled:
-            return None
-        hash_key = gerar_hash_cache(key)
-        entry = self._cache.get(hash_key)
-        if entry is None:
-            return None
-        if time.time() - entry.get('timestamp', 0) > self.ttl_consulta:
-            del self._cache[hash_key]
-            self._save_cache()
-            return None
-        return entry.get('data')
+        return self._get(key, self.NAMESPACE_CONSULTA)
 
     def set(self, key: str, value: Dict):
         """Armazena valor no cache"""
-        if not self.enabled:
-            return
-        hash_key = gerar_hash_cache(key)
-        self._cache[hash_key] = {
-            'timestamp': time.time(),
-            'key': key,
-            'data': value
-        }
-        self._save_cache()
+        self._set(key, value, self.ttl_consulta, self.NAMESPACE_CONSULTA)
 
     def get_session(self, trf: str) -> Optional[Dict]:
         """Recupera sessao do cache"""
-        if not self.enabled:
-            return None
-        entry = self._session_cache.get(trf)
-        if entry is None:
-            return None
-        if time.time() - entry.get('timestamp', 0) > self.ttl_session:
-            del self._session_cache[trf]
-            self._save_session()
-            return None
-        return entry.get('data')
+        return self._get(trf, self.NAMESPACE_SESSAO)
 
     def set_session(self, trf: str, session_data: Dict):
         """Armazena sessao no cache"""
+        self._set(trf, session_data, self.ttl_session, self.NAMESPACE_SESSAO)
+
+    def get_validadores(self, key: str) -> Optional[ValidadoresPagina]:
+        """Recupera os validadores (e o resultado) da pagina do processo"""
+        dados = self._get(key, self.NAMESPACE_VALIDADORES)
+        return ValidadoresPagina.from_dict(dados) if dados else None
+
+    def set_validadores(self, key: str, validadores: ValidadoresPagina):
+        """Armazena os validadores (com o resultado) da pagina do processo"""
+        self._set(key, validadores.to_dict(), self.ttl_validadores, self.NAMESPACE_VALIDADORES)
+
+    def _delete(self, key: str, *namespaces: str):
+        """Remocao tolerante a falhas do banco"""
         if not self.enabled:
             return
-        self._session_cache[trf] = {
-            'timestamp': time.time(),
-            'trf': trf,
-            'data': session_data
-        }
-        self._save_session()
+        try:
+            for namespace in namespaces:
+                self._store.delete(key, namespace)
+        except sqlite3.Error as e:
+            logging.getLogger("pje_scraper").warning(f"Falha ao invalidar cache: {e}")
 
     def invalidate(self, key: str):
         """Invalida entrada do cache"""
-        hash_key = gerar_hash_cache(key)
-        if hash_key in self._cache:
-            del self._cache[hash_key]
-            self._save_cache()
+        self._delete(key, self.NAMESPACE_CONSULTA, self.NAMESPACE_VALIDADORES)
 
     def invalidate_session(self, trf: str):
         """Invalida sessao de um TRF"""
-        if trf in self._session_cache:
-            del self._session_cache[trf]
-            self._save_session()
+        self._delete(trf, self.NAMESPACE_SESSAO)
 
     def clear(self):
         """Limpa todo o cache"""
-        self._cache = {}
-        self._session_cache = {}
-        self._save_cache()
-        self._save_session()
+        if not self.enabled:
+            return
+        try:
+            self._store.clear(self.NAMESPACE_CONSULTA)
+            self._store.clear(self.NAMESPACE_SESSAO)
+            self._store.clear(self.NAMESPACE_VALIDADORES)
+        except sqlite3.Error as e:
+            logging.getLogger("pje_scraper").warning(f"Falha ao limpar cache: {e}")
 
     @property
     def size(self) -> int:
         """Retorna numero de entradas no cache"""
-        return len(self._cache)
+        if not self.enabled:
+            return 0
+        try:
+            return self._store.count(self.NAMESPACE_CONSULTA)
+        except sqlite3.Error as e:
+            logging.getLogger("pje_scraper").warning(f"Falha ao contar cache: {e}")
+            return 0
 
 
 # =============================================================================
@@ -1015,53 +1067,110 @@ class RateLimiter:
         self,
         rate: float = DEFAULT_RATE_LIMIT,
         backoff_base: int = DEFAULT_BACKOFF_BASE,
-        max_backoff: float = 60.0
+        max_backoff: float = 60.0,
+        chave: Optional[str] = None,
+        burst: int = DEFAULT_RATE_BURST,
+        bucket: Optional[TokenBucketLimiter] = None,
+        controlador: Optional[AdaptiveRateController] = None,
+        bloqueio: float = DEFAULT_BLOQUEIO_RATE_LIMIT
     ):
+        # Com controlador AIMD, `rate` acompanha a taxa aprendida do TRF
+        self.controlador = controlador
+        if controlador is not None:
+            rate = controlador.intervalo
         self.rate = rate
         self.backoff_base = backoff_base
         self.max_backoff = max_backoff
+        self.chave = chave  # host do TRF: limite dividido entre processos
+        self.burst = burst
+        self.bloqueio = bloqueio  # pausa apos 429 sem Retry-After
         self._last_request: float = 0.0
         self._request_count: int = 0
         self._error_count: int = 0
         self._consecutive_errors: int = 0
         self._current_backoff: float = rate
         self._blocked_until: float = 0.0
+        self._lock = threading.Lock()
+        self._bucket: Optional[TokenBucketLimiter] = None
 
-    def wait(self):
-        """Aguarda tempo necessario antes da proxima requisicao"""
-        now = time.time()
+        if chave:
+            try:
+                self._bucket = bucket or obter_token_bucket()
+            except sqlite3.Error:
+                self._bucket = None
 
-        if now < self._blocked_until:
-            wait_time = self._blocked_until - now
-            time.sleep(wait_time)
+    def _reservar(self) -> float:
+        """Reserva o proximo horario livre e retorna quanto falta para ele"""
+        compartilhado = self._bucket is not None and self.rate > 0
+
+        with self._lock:
             now = time.time()
+            intervalo = self._current_backoff
+            if compartilhado and self._current_backoff <= self.rate:
+                intervalo = 0.0  # espacamento base vem do token bucket
+            inicio = max(now, self._blocked_until, self._last_request + intervalo)
+            self._last_request = inicio
+            self._request_count += 1
+            wait_time = inicio - now
+
+        if compartilhado:
+            try:
+                wait_time = max(
+                    wait_time,
+                    self._bucket.reservar(self.chave, 1.0 / self.rate, self.burst)
+                )
+            except sqlite3.Error:
+                self._bucket = None
+                wait_time = max(wait_time, self.rate)
 
-        elapsed = now - self._last_request
-        if elapsed < self._current_backoff:
-            wait_time = self._current_backoff - elapsed
+        return wait_time
+
+    def wait(self):
+        """Aguarda tempo necessario antes da proxima requisicao"""
+        wait_time = self._reservar()
+        if wait_time > 0:
             time.sleep(wait_time)
 
-        self._last_request = time.time()
-        self._request_count += 1
+    async def wait_async(self):
+        """Versao assincrona de wait"""
+        wait_time = self._reservar()
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
 
-    def success(self):
+    def success(self, latencia_ms: Optional[float] = None):
         """Registra requisicao bem sucedida"""
         self._consecutive_errors = 0
+        if self.controlador is not None:
+            self.controlador.registrar_sucesso(latencia_ms)
+            self.rate = self.controlador.intervalo
         self._current_backoff = self.rate
 
-    def error(self, blocked: bool = False) -> float:
+    def error(self, blocked: bool = False, retry_after: Optional[float] = None) -> float:
         """
         Registra erro e calcula backoff
 
+        Args:
+            blocked: Se detectou bloqueio (HTTP 429)
+            retry_after: Espera pedida pelo servidor (header Retry-After)
+
         Returns:
             Tempo de espera em segundos
         """
         self._error_count += 1
         self._consecutive_errors += 1
 
+        if self.controlador is not None:
+            self.controlador.registrar_erro()
+            self.rate = self.controlador.intervalo
+
         if blocked:
-            self._blocked_until = time.time() + 60.0
-            wait_time = 60.0
+            wait_time = retry_after if retry_after is not None else self.bloqueio
+            self._blocked_until = time.time() + wait_time
+            if self._bucket is not None:
+                try:
+                    self._bucket.bloquear(self.chave, wait_time)
+                except sqlite3.Error:
+                    pass
         else:
             # Backoff exponencial: 2^n segundos
             wait_time = min(
@@ -1088,89 +1197,17 @@ class RateLimiter:
     def is_blocked(self) -> bool:
         return time.time() < self._blocked_until
 
-
-# =============================================================================
-# CIRCUIT BREAKER
-# =============================================================================
-
-class CircuitBreaker:
-    """
-    Circuit breaker para protecao contra falhas
-
-    Estados:
-    - CLOSED: Normal, requisicoes passam
-    - OPEN: Bloqueado apos muitos erros
-    - HALF_OPEN: Tentando reabrir
-    """
-
-    def __init__(
-        self,
-        threshold: int = DEFAULT_CIRCUIT_BREAKER_THRESHOLD,
-        timeout: int = DEFAULT_CIRCUIT_BREAKER_TIMEOUT,
-        logger: Optional[LogManager] = None
-    ):
-        self.threshold = threshold
-        self.timeout = timeout
-        self.logger = logger
-        self._state = CircuitBreakerState.CLOSED
-        self._failure_count = 0
-        self._last_failure_time: Optional[float] = None
-        self._success_count = 0
-
     @property
-    def state(self) -> CircuitBreakerState:
-        """Retorna estado atual do circuit breaker"""
-        if self._state == CircuitBreakerState.OPEN:
-            # Verifica se deve tentar reabrir
-            if self._last_failure_time and time.time() - self._last_failure_time > self.timeout:
-                self._state = CircuitBreakerState.HALF_OPEN
-                if self.logger:
-                    self.logger.info("Circuit breaker mudou para HALF_OPEN")
-        return self._state
-
-    def allow_request(self) -> bool:
-        """Verifica se pode fazer requisicao"""
-        state = self.state
-        if state == CircuitBreakerState.CLOSED:
-            return True
-        if state == CircuitBreakerState.HALF_OPEN:
-            return True
-        return False
-
-    def record_success(self):
-        """Registra sucesso"""
-        if self._state == CircuitBreakerState.HALF_OPEN:
-            self._success_count += 1
-            if self._success_count >= 2:  # Duas requisicoes bem-sucedidas para fechar
-                self._state = CircuitBreakerState.CLOSED
-                self._failure_count = 0
-                self._success_count = 0
-                if self.logger:
-                    self.logger.info("Circuit breaker fechado")
-        else:
-            self._failure_count = 0
-
-    def record_failure(self):
-        """Registra falha"""
-        self._failure_count += 1
-        self._last_failure_time = time.time()
-        self._success_count = 0
-
-        if self._state == CircuitBreakerState.HALF_OPEN:
-            self._state = CircuitBreakerState.OPEN
-            if self.logger:
-                self.logger.warning("Circuit breaker reaberto para OPEN")
-        elif self._failure_count >= self.threshold:
-            self._state = CircuitBreakerState.OPEN
-            if self.logger:
-                self.logger.warning(f"Circuit breaker aberto apos {self._failure_count} falhas")
-
-    def reset(self):
-        """Reseta o circuit breaker"""
-        self._state = CircuitBreakerState.CLOSED
-        self._failure_count = 0
-        self._success_count = 0
-        self._last_failure_time = None
+    def tempo_espera(self) -> float:
+        """Espera atual (segundos) ate a proxima requisicao ser liberada"""
+        now = time.time()
+        espera = max(0.0, self._blocked_until - now, self._last_request + self._current_backoff - now)
+        if self._bucket is not None and self.rate > 0:
+            try:
+                espera = max(espera, self._bucket.tempo_espera(self.chave, 1.0 / self.rate, self.burst))
+            except sqlite3.Error:
+                pass
+        return espera
 
 
 # =============================================================================
@@ -1279,7 +1316,7 @@ class PJeScraper:
     Suporta:
     - Login com certificado digital A1/A3
     - Login com usuario/senha (quando disponivel)
-    - Busca unificada across TRF1-5
+    - Busca unificada across TRF1-5 (em paralelo, com prazo total)
     - Auto-deteccao do TRF pelo numero do processo
     - Extracao de dados completos
     - Download de documentos com validacao
@@ -1301,7 +1338,16 @@ class PJeScraper:
         timeout: int = DEFAULT_TIMEOUT,
         max_retries: int = DEFAULT_MAX_RETRIES,
         log_level: int = logging.INFO,
-        verificar_ssl: bool = True
+        verificar_ssl: bool = True,
+        taxa_adaptativa: bool = True,
+        taxa_maxima: Optional[float] = None,
+        max_downloads: int = DEFAULT_MAX_DOWNLOADS,
+        deduplicar_documentos: bool = False,
+        layout: Union[str, LayoutCompilado, None] = None,
+        cursor_store: Optional[CursorStore] = None,
+        arquivar_html: bool = False,
+        arquivo_html: Optional[ArquivoHTML] = None,
+        politica_retry: Optional[PoliticaRetry] = None
     ):
         """
         Inicializa o scraper
@@ -1317,7 +1363,30 @@ class PJeScraper:
             max_retries: Numero maximo de tentativas
             log_level: Nivel de log
             verificar_ssl: Se deve verificar certificados SSL
+            taxa_adaptativa: Se a taxa de cada TRF deve se ajustar (AIMD)
+                a partir de rate_limit conforme latencia e erros
+            taxa_maxima: Teto da taxa adaptativa de cada TRF em req/s
+                (padrao: multiplo de 1 / rate_limit, ver
+                adaptive_rate.DEFAULT_FATOR_MAXIMO)
+            max_downloads: Documentos baixados simultaneamente
+            deduplicar_documentos: Se documentos ja presentes no store
+                compartilhado (ROM_DOCUMENT_STORE) nao sao baixados de novo
+                (mesmo processo/documento ou mesmo conteudo); desligado por
+                padrao para nao gravar fora dos diretorios do scraper
+            layout: Layout de extracao registrado (nome) ou compilado
+                (padrao LAYOUT_PJE)
+            cursor_store: Cursores de sincronizar() (padrao: store
+                compartilhado do processo)
+            arquivar_html: Se as paginas de processo recebidas sao
+                guardadas no arquivo compartilhado (ver reprocessar_arquivo)
+            arquivo_html: Arquivo de paginas proprio (implica arquivar)
+            politica_retry: Tentativas, prazo total e backoff das requisicoes
+                (padrao: max_retries tentativas com DEFAULT_PRAZO_TOTAL)
         """
+        self.layout = obter_layout(layout) if isinstance(layout, str) else (layout or LAYOUT_PJE)
+        self.cursor_store = cursor_store
+        self.arquivo_html = arquivo_html or (obter_arquivo_html() if arquivar_html else None)
+
         # Logger
         self.logger = LogManager(
             name="pje_scraper",
@@ -1331,18 +1400,54 @@ class PJeScraper:
             enabled=cache_enabled
         )
 
-        # Rate Limiter
+        # Rate Limiters (um por TRF, para que as buscas em paralelo
+        # respeitem o limite de cada portal de forma independente)
         self.rate_limiter = RateLimiter(rate=rate_limit)
+        self.rate_limiters: Dict[str, RateLimiter] = {}
+        for trf, url in TRF_URLS.items():
+            host = urlparse(url).netloc
+            controlador = None
+            if taxa_adaptativa and rate_limit > 0:
+                controlador = obter_controlador(
+                    host, taxa_inicial=1.0 / rate_limit, taxa_maxima=taxa_maxima
+                )
+            self.rate_limiters[trf] = RateLimiter(
+                rate=rate_limit,
+                chave=host,
+                controlador=controlador
+            )
 
-        # Circuit Breakers (um por TRF)
+        # Resultado por TRF da ultima busca em varios TRFs
+        self.status_ultima_busca: Dict[str, Dict[str, Any]] = {}
+
+        # Circuit breaker e limite de concorrencia por TRF, compartilhados no processo
+        self.resiliencia: Dict[str, Resiliencia] = {
+            trf: obter_resiliencia(
+                f"pje:{trf}",
+                threshold=DEFAULT_CIRCUIT_BREAKER_THRESHOLD,
+                timeout=DEFAULT_CIRCUIT_BREAKER_TIMEOUT,
+                logger=logging.getLogger("pje_scraper")
+            )
+            for trf in TRF_URLS.keys()
+        }
         self.circuit_breakers: Dict[str, CircuitBreaker] = {
-            trf: CircuitBreaker(logger=self.logger) for trf in TRF_URLS.keys()
+            trf: protecao.circuito for trf, protecao in self.resiliencia.items()
         }
 
         # Configuracoes
         self.timeout = timeout
         self.max_retries = max_retries
+        self.politica_retry = politica_retry or PoliticaRetry(max_tentativas=max_retries)
         self.verificar_ssl = verificar_ssl
+        self.max_downloads = max_downloads
+
+        # Store de documentos compartilhado (deduplicacao por SHA-256)
+        self.document_store: Optional[DocumentStore] = None
+        if deduplicar_documentos:
+            try:
+                self.document_store = obter_document_store()
+            except (sqlite3.Error, OSError) as e:
+                self.logger.warning(f"Store de documentos indisponivel: {e}")
 
         # Certificado digital
         self.cert_manager = CertificateManager(logger=self.logger)
@@ -1354,6 +1459,9 @@ class PJeScraper:
 
         # Sessoes HTTP (uma por TRF)
         self._sessions: Dict[str, requests.Session] = {}
+        self._sessions_lock = threading.Lock()
+        # Prazo (time.monotonic) da busca em varios TRFs da thread atual
+        self._prazo_thread = threading.local()
         self._authenticated: Dict[str, bool] = {trf: False for trf in TRF_URLS.keys()}
 
         self.logger.info(
@@ -1368,17 +1476,21 @@ class PJeScraper:
         if not REQUESTS_AVAILABLE:
             raise ImportError("requests nao esta instalado")
 
+        session = self._sessions.get(trf)
+        if session is not None:
+            return session
+
+        with self._sessions_lock:
+            return self._criar_session(trf)
+
+    def _criar_session(self, trf: str) -> requests.Session:
+        """Cria a sessao do TRF se ainda nao existir (chamado sob _sessions_lock)"""
         if trf not in self._sessions:
             session = requests.Session()
             session.headers.update(DEFAULT_HEADERS)
 
-            # Configura retry
-            retry_strategy = Retry(
-                total=self.max_retries,
-                backoff_factor=0.5,
-                status_forcelist=[500, 502, 503, 504],
-            )
-            adapter = HTTPAdapter(max_retries=retry_strategy)
+            # Sem retry no adapter: as tentativas ficam com a politica_retry
+            adapter = HTTPAdapter(max_retries=0)
             session.mount("https://", adapter)
             session.mount("http://", adapter)
 
@@ -1401,6 +1513,27 @@ class PJeScraper:
 
         return self._sessions[trf]
 
+    def _prazo_restante(self) -> Optional[float]:
+        """Segundos ate o prazo da busca em varios TRFs desta thread (None = sem prazo)"""
+        limite = getattr(self._prazo_thread, "limite", None)
+        if limite is None:
+            return None
+        return limite - time.monotonic()
+
+    def _timeout_no_prazo(self, timeout: float) -> float:
+        """
+        Timeout da requisicao limitado ao prazo da busca desta thread
+
+        Raises:
+            PJePrazoEsgotadoError: Se o prazo ja acabou
+        """
+        restante = self._prazo_restante()
+        if restante is None:
+            return timeout
+        if restante <= 0:
+            raise PJePrazoEsgotadoError("Prazo da busca esgotado")
+        return max(0.1, min(timeout, restante))
+
     def _fazer_requisicao(
         self,
         trf: str,
@@ -1409,7 +1542,8 @@ class PJeScraper:
         params: Optional[Dict] = None,
         data: Optional[Dict] = None,
         headers: Optional[Dict] = None,
-        allow_redirects: bool = True
+        allow_redirects: bool = True,
+        stream: bool = False
     ) -> requests.Response:
         """
         Faz requisicao HTTP com rate limiting, retry e circuit breaker
@@ -1422,6 +1556,7 @@ class PJeScraper:
             data: Dados para POST
             headers: Headers adicionais
             allow_redirects: Se permite redirects
+            stream: Se o corpo deve ser lido sob demanda (downloads)
 
         Returns:
             Response da requisicao
@@ -1430,14 +1565,12 @@ class PJeScraper:
             PJeConnectionError: Se falhar apos todas as tentativas
             PJeCircuitBreakerOpenError: Se circuit breaker esta aberto
             PJeRateLimitError: Se bloqueado por rate limit
+            PJePrazoEsgotadoError: Se o prazo da busca em varios TRFs acabou
         """
-        # Verifica circuit breaker
-        cb = self.circuit_breakers.get(trf)
-        if cb and not cb.allow_request():
-            raise PJeCircuitBreakerOpenError(f"Circuit breaker aberto para {trf}")
+        protecao = self.resiliencia.get(trf)
+        cb = protecao.circuito if protecao else None
 
-        # Aplica rate limit
-        self.rate_limiter.wait()
+        limiter = self.rate_limiters.get(trf, self.rate_limiter)
 
         # Prepara headers
         req_headers = DEFAULT_HEADERS.copy()
@@ -1445,74 +1578,55 @@ class PJeScraper:
             req_headers.update(headers)
 
         session = self._get_session(trf)
-        tentativas = 0
+        execucao = self.politica_retry.iniciar(trf)
         ultimo_erro = None
 
-        while tentativas < self.max_retries:
-            tentativas += 1
+        while execucao.nova_tentativa():
+            # Circuito aberto: falha na hora, antes de esperar o rate limit
+            if protecao:
+                try:
+                    protecao.verificar()
+                except CircuitoAbertoError as e:
+                    raise PJeCircuitBreakerOpenError(str(e)) from e
+
+            # Aplica rate limit do TRF (a cada tentativa, inclusive retries)
+            limiter.wait()
+            timeout = self._timeout_no_prazo(execucao.timeout(self.timeout))
 
             try:
                 start_time = time.time()
 
-                if method.upper() == "GET":
-                    response = session.get(
-                        url,
-                        params=params,
-                        headers=req_headers,
-                        timeout=self.timeout,
-                        allow_redirects=allow_redirects,
-                        verify=self.verificar_ssl
-                    )
-                else:
-                    response = session.post(
-                        url,
-                        params=params,
-                        data=data,
-                        headers=req_headers,
-                        timeout=self.timeout,
-                        allow_redirects=allow_redirects,
-                        verify=self.verificar_ssl
-                    )
-
-                duration_ms = (time.time() - start_time) * 1000
-                self.logger.log_request(method, url, response.status_code, duration_ms)
-
-                # Verifica status
-                if response.status_code == 429:
-                    wait_time = self.rate_limiter.error(blocked=True)
-                    self.logger.warning(f"Rate limit detectado - aguardando {wait_time}s")
-                    time.sleep(wait_time)
-                    continue
-
-                if response.status_code >= 500:
-                    wait_time = self.rate_limiter.error()
-                    if cb:
-                        cb.record_failure()
-                    self.logger.log_retry(tentativas, self.max_retries, f"HTTP {response.status_code}", wait_time)
-                    time.sleep(wait_time)
-                    continue
-
-                # Sucesso
-                self.rate_limiter.success()
-                if cb:
-                    cb.record_success()
-                return response
+                with protecao.limite.vaga() if protecao else nullcontext():
+                    if method.upper() == "GET":
+                        response = session.get(
+                            url,
+                            params=params,
+                            headers=req_headers,
+                            timeout=timeout,
+                            allow_redirects=allow_redirects,
+                            verify=self.verificar_ssl,
+                            stream=stream
+                        )
+                    else:
+                        response = session.post(
+                            url,
+                            params=params,
+                            data=data,
+                            headers=req_headers,
+                            timeout=timeout,
+                            allow_redirects=allow_redirects,
+                            verify=self.verificar_ssl,
+                            stream=stream
+                        )
 
-            except requests.exceptions.Timeout as e:
-                wait_time = self.rate_limiter.error()
-                if cb:
-                    cb.record_failure()
-                self.logger.log_retry(tentativas, self.max_retries, f"Timeout: {e}", wait_time)
-                ultimo_erro = e
-                time.sleep(wait_time)
+            except LimiteConcorrenciaError as e:
+                raise PJeConnectionError(str(e)) from e
 
-            except requests.exceptions.ConnectionError as e:
-                wait_time = self.rate_limiter.error()
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
                 if cb:
                     cb.record_failure()
-                self.logger.log_retry(tentativas, self.max_retries, f"Connection: {e}", wait_time)
                 ultimo_erro = e
-                time.sleep(wait_time)
+                espera = execucao.espera(erro=e, retry_after=limiter.error())
 
             except Exception as e:
                 self.logger.error(f"Erro inesperado: {e}")
@@ -1521,7 +1635,44 @@ class PJeScraper:
                     cb.record_failure()
                 break
 
-        raise PJeConnectionError(f"Falha apos {tentativas} tentativas: {ultimo_erro}")
+            else:
+                duration_ms = (time.time() - start_time) * 1000
+                self.logger.log_request(method, url, response.status_code, duration_ms)
+
+                if response.status_code < 500 and response.status_code != 429:
+                    # Sucesso
+                    limiter.success(latencia_ms=duration_ms)
+                    if cb:
+                        cb.record_success()
+                    return response
+
+                response.close()
+                ultimo_erro = f"HTTP {response.status_code}"
+
+                if response.status_code == 429:
+                    wait_time = limiter.error(
+                        blocked=True,
+                        retry_after=segundos_retry_after(response.headers.get("Retry-After"))
+                    )
+                    self.logger.warning(f"Rate limit detectado - aguardando {wait_time}s")
+                else:
+                    wait_time = limiter.error()
+                    if cb:
+                        cb.record_failure()
+
+                espera = execucao.espera(status_code=response.status_code, retry_after=wait_time)
+
+            if espera is None:
+                break
+            restante = self._prazo_restante()
+            if restante is not None and espera >= restante:
+                break
+            self.logger.log_retry(execucao.tentativas, execucao.max_tentativas, str(ultimo_erro), espera)
+            time.sleep(espera)
+
+        if execucao.motivo:
+            self.logger.warning(f"Sem novo retry ({execucao.motivo}) para {url}")
+        raise PJeConnectionError(f"Falha apos {execucao.tentativas} tentativas: {ultimo_erro}")
 
     # =========================================================================
     # AUTENTICACAO
@@ -1813,31 +1964,27 @@ class PJeScraper:
             self.logger.info("Retornando resultado do cache")
             return ProcessoPJe(**cached)
 
-        # Busca no PJe
-        base_url = TRF_URLS[trf]
-        consulta_url = urljoin(base_url, PJE_ENDPOINTS["consulta_publica"])
-
-        params = {
-            'numeroProcesso': numero_formatado.replace('-', '').replace('.', ''),
-        }
-
         try:
-            response = self._fazer_requisicao(trf, consulta_url, params=params)
-            html = response.text
-
-            # Verifica segredo de justica
-            if self._detectar_segredo_justica(html):
-                raise PJeSegredoJustica(f"Processo {numero_formatado} em segredo de justica")
-
-            # Verifica se encontrou
-            if self._processo_nao_encontrado(html):
-                raise PJeProcessoNaoEncontrado(f"Processo {numero_formatado} nao encontrado")
+            # Pagina inalterada desde a ultima extracao: sem parse
+            anteriores = self.cache.get_validadores(cache_key)
+            pagina, validadores = self._obter_pagina_condicional(
+                numero_formatado, trf, anteriores
+            )
+            if pagina is None:
+                self.logger.info("Pagina inalterada - resultado anterior reaproveitado")
+                if validadores != anteriores:
+                    self.cache.set_validadores(cache_key, validadores)
+                self.cache.set(cache_key, validadores.resultado)
+                return ProcessoPJe(**validadores.resultado)
 
             # Extrai dados
-            processo = self._extrair_dados_processo(html, numero_formatado, trf)
+            processo = self._extrair_dados_processo(pagina, numero_formatado, trf)
 
             # Salva no cache
-            self.cache.set(cache_key, processo.to_dict())
+            dados = processo.to_dict()
+            validadores.resultado = dados
+            self.cache.set_validadores(cache_key, validadores)
+            self.cache.set(cache_key, dados)
 
             return processo
 
@@ -1847,17 +1994,255 @@ class PJeScraper:
             self.logger.error(f"Erro ao buscar processo: {e}")
             raise
 
+    def _obter_pagina_processo(self, numero_formatado: str, trf: str) -> PaginaHTML:
+        """
+        Baixa a pagina de consulta publica do processo (sem cache)
+
+        Raises:
+            PJeProcessoNaoEncontrado: Se processo nao encontrado
+            PJeSegredoJustica: Se processo em segredo de justica
+        """
+        pagina, _ = self._obter_pagina_condicional(numero_formatado, trf)
+        return pagina
+
+    def _obter_pagina_condicional(
+        self,
+        numero_formatado: str,
+        trf: str,
+        anteriores: Optional[ValidadoresPagina] = None
+    ) -> Tuple[Optional[PaginaHTML], ValidadoresPagina]:
+        """
+        Baixa a pagina do processo revalidando-a contra `anteriores`
+
+        Returns:
+            (pagina, validadores da resposta); pagina e None quando o
+            portal responde 304 ou o corpo normalizado nao mudou
+
+        Raises:
+            PJeProcessoNaoEncontrado: Se processo nao encontrado
+            PJeSegredoJustica: Se processo em segredo de justica
+        """
+        base_url = TRF_URLS[trf]
+        consulta_url = urljoin(base_url, PJE_ENDPOINTS["consulta_publica"])
+
+        params = {
+            'numeroProcesso': numero_formatado.replace('-', '').replace('.', ''),
+        }
+
+        response = self._fazer_requisicao(
+            trf, consulta_url, params=params, headers=cabecalhos_condicionais(anteriores)
+        )
+        pagina, validadores = avaliar_resposta(response, consulta_url, anteriores)
+        if pagina is None:
+            return None, validadores
+
+        # Verifica segredo de justica
+        if self._detectar_segredo_justica(pagina):
+            raise PJeSegredoJustica(f"Processo {numero_formatado} em segredo de justica")
+
+        # Verifica se encontrou
+        if self._processo_nao_encontrado(pagina):
+            raise PJeProcessoNaoEncontrado(f"Processo {numero_formatado} nao encontrado")
+
+        if self.arquivo_html is not None:
+            try:
+                self.arquivo_html.gravar(
+                    "pje",
+                    f"{numero_formatado}:{trf}",
+                    consulta_url,
+                    pagina.html,
+                    params=params,
+                    contexto={"trf": trf, "url_final": str(response.url)}
+                )
+            except sqlite3.Error as e:
+                self.logger.warning(f"Falha ao arquivar pagina: {e}")
+
+        return pagina, validadores
+
+    def reprocessar_arquivo(
+        self,
+        processos: Optional[List[str]] = None,
+        atualizar_cache: bool = True
+    ) -> Iterator[ProcessoPJe]:
+        """
+        Reconstroi processos a partir das paginas arquivadas, sem rede
+
+        Usado apos corrigir um extrator: a pagina mais recente de cada
+        processo no arquivo e extraida de novo com o codigo atual.
+
+        Args:
+            processos: Numeros CNJ formatados a reprocessar (None = todos)
+            atualizar_cache: Se o cache de resultados recebe os processos
+                reconstruidos
+
+        Yields:
+            ProcessoPJe reconstruido de cada pagina arquivada
+        """
+        arquivo = self.arquivo_html or obter_arquivo_html()
+        filtro = set(processos) if processos else None
+
+        for resposta in arquivo.ultimas("pje"):
+            numero_formatado, _, trf = resposta.processo.rpartition(":")
+            if filtro is not None and numero_formatado not in filtro:
+                continue
+            try:
+                processo = self._extrair_dados_processo(
+                    PaginaHTML(html=resposta.html), numero_formatado, trf
+                )
+            except Exception as e:
+                self.logger.warning(f"Falha ao reprocessar {resposta.processo}: {e}")
+                continue
+
+            if atualizar_cache:
+                self.cache.set(f"processo:{numero_formatado}:{trf}", processo.to_dict())
+            yield processo
+
+    def sincronizar(
+        self,
+        numero_processo: str,
+        trf: Optional[str] = None
+    ) -> DeltaMovimentacoes:
+        """
+        Sincroniza as movimentacoes do processo de forma incremental
+
+        Baixa a pagina do processo (ignorando o cache de resultados) e
+        monta apenas as movimentacoes posteriores ao cursor da ultima
+        sincronizacao. Na primeira chamada todas as movimentacoes sao
+        novas.
+
+        Args:
+            numero_processo: Numero do processo (formato CNJ)
+            trf: TRF especifico (opcional, auto-detecta se nao fornecido)
+
+        Returns:
+            DeltaMovimentacoes com as movimentacoes novas
+
+        Raises:
+            PJeValidationError: Se numero invalido
+            (demais excecoes iguais a buscar_por_numero)
+        """
+        if not validar_numero_cnj(numero_processo):
+            raise PJeValidationError(f"Numero de processo invalido: {numero_processo}")
+        if not trf:
+            trf = self.detectar_trf(numero_processo)
+
+        numero_formatado = formatar_numero_cnj(numero_processo)
+        pagina = self._obter_pagina_processo(numero_formatado, trf)
+
+        store = self.cursor_store or obter_cursor_store()
+        delta = store.sincronizar(
+            "pje",
+            f"{numero_formatado}:{trf}",
+            self._linhas_movimentacoes(pagina.soup),
+            self._data_movimentacao,
+            self._montar_movimentacao,
+            lambda mov: (mov['data'], mov['descricao'])
+        )
+
+        self.logger.info(
+            f"Movimentacoes sincronizadas: {numero_formatado} ({trf})",
+            novas=len(delta.novas),
+            linhas_lidas=delta.linhas_lidas
+        )
+        return delta
+
+    def _buscar_em_trfs(
+        self,
+        trfs: List[str],
+        busca: Callable[[str], List[ProcessoPJe]],
+        prazo_total: Optional[float] = None
+    ) -> List[ProcessoPJe]:
+        """
+        Executa a mesma busca em varios TRFs em paralelo
+
+        Cada TRF usa sua propria sessao, rate limiter e circuit breaker.
+        TRFs com circuit breaker aberto sao pulados, e os que nao terminam
+        dentro do prazo total sao descartados, retornando os resultados
+        parciais dos demais. O resultado por TRF fica em
+        `status_ultima_busca`.
+
+        Args:
+            trfs: TRFs a consultar
+            busca: Funcao que recebe o TRF e retorna seus processos
+            prazo_total: Prazo total em segundos (padrao DEFAULT_PRAZO_BUSCA_TRFS)
+
+        Returns:
+            Processos de todos os TRFs que responderam, na ordem de `trfs`
+        """
+        prazo = prazo_total if prazo_total is not None else DEFAULT_PRAZO_BUSCA_TRFS
+        status: Dict[str, Dict[str, Any]] = {}
+        resultados: Dict[str, List[ProcessoPJe]] = {}
+        duracoes: Dict[str, float] = {}
+
+        limite = time.monotonic() + prazo
+
+        def _executar(trf: str) -> List[ProcessoPJe]:
+            # Requisicoes desta thread param no prazo (_fazer_requisicao)
+            self._prazo_thread.limite = limite
+            inicio = time.time()
+            try:
+                return busca(trf)
+            finally:
+                self._prazo_thread.limite = None
+                duracoes[trf] = round((time.time() - inicio) * 1000, 2)
+
+        futures = {}
+        executor = ThreadPoolExecutor(
+            max_workers=max(1, len(trfs)),
+            thread_name_prefix="pje-trf"
+        )
+        try:
+            for trf in trfs:
+                cb = self.circuit_breakers.get(trf)
+                if cb and cb.state == CircuitBreakerState.OPEN:
+                    status[trf] = {"status": "circuito_aberto"}
+                    continue
+                futures[executor.submit(_executar, trf)] = trf
+
+            concluidos, pendentes = aguardar_futures(futures, timeout=prazo)
+
+            for future in concluidos:
+                trf = futures[future]
+                try:
+                    resultados[trf] = future.result()
+                    status[trf] = {"status": "ok", "processos": len(resultados[trf])}
+                except Exception as e:
+                    self.logger.warning(f"Erro ao buscar em {trf}: {e}")
+                    status[trf] = {"status": "erro", "erro": str(e)}
+                status[trf]["duracao_ms"] = duracoes.get(trf)
+
+            for future in pendentes:
+                trf = futures[future]
+                future.cancel()
+                self.logger.warning(f"Prazo de {prazo}s esgotado aguardando {trf}")
+                status[trf] = {"status": "prazo_esgotado"}
+
+        finally:
+            # Nao espera TRFs atrasados: o timeout de cada requisicao ja
+            # e limitado ao prazo, e a proxima requisicao (pagina, retry)
+            # da thread falha com PJePrazoEsgotadoError
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        self.status_ultima_busca = status
+
+        processos = []
+        for trf in trfs:
+            processos.extend(resultados.get(trf, []))
+        return processos
+
     def buscar_por_cpf(
         self,
         cpf: str,
-        trf: Optional[str] = None
+        trf: Optional[str] = None,
+        prazo_total: Optional[float] = None
     ) -> List[ProcessoPJe]:
         """
         Busca processos por CPF
 
         Args:
             cpf: CPF da parte
-            trf: TRF especifico (None busca em todos)
+            trf: TRF especifico (None busca em todos, em paralelo)
+            prazo_total: Prazo total da busca em segundos
 
         Returns:
             Lista de ProcessoPJe encontrados
@@ -1871,15 +2256,12 @@ class PJeScraper:
         cpf_limpo = re.sub(r'\D', '', cpf)
         self.logger.info(f"Buscando processos por CPF {cpf_limpo[:3]}***")
 
-        processos = []
         trfs_para_buscar = [trf] if trf else list(TRF_URLS.keys())
-
-        for trf_atual in trfs_para_buscar:
-            try:
-                processos_trf = self._buscar_por_documento(trf_atual, cpf_limpo, "CPF")
-                processos.extend(processos_trf)
-            except Exception as e:
-                self.logger.warning(f"Erro ao buscar em {trf_atual}: {e}")
+        processos = self._buscar_em_trfs(
+            trfs_para_buscar,
+            lambda trf_atual: self._buscar_por_documento(trf_atual, cpf_limpo, "CPF"),
+            prazo_total
+        )
 
         self.logger.info(f"Total de processos encontrados: {len(processos)}")
         return processos
@@ -1887,14 +2269,16 @@ class PJeScraper:
     def buscar_por_cnpj(
         self,
         cnpj: str,
-        trf: Optional[str] = None
+        trf: Optional[str] = None,
+        prazo_total: Optional[float] = None
     ) -> List[ProcessoPJe]:
         """
         Busca processos por CNPJ
 
         Args:
             cnpj: CNPJ da parte
-            trf: TRF especifico (None busca em todos)
+            trf: TRF especifico (None busca em todos, em paralelo)
+            prazo_total: Prazo total da busca em segundos
 
         Returns:
             Lista de ProcessoPJe encontrados
@@ -1905,23 +2289,19 @@ class PJeScraper:
         cnpj_limpo = re.sub(r'\D', '', cnpj)
         self.logger.info(f"Buscando processos por CNPJ {cnpj_limpo[:8]}***")
 
-        processos = []
         trfs_para_buscar = [trf] if trf else list(TRF_URLS.keys())
-
-        for trf_atual in trfs_para_buscar:
-            try:
-                processos_trf = self._buscar_por_documento(trf_atual, cnpj_limpo, "CNPJ")
-                processos.extend(processos_trf)
-            except Exception as e:
-                self.logger.warning(f"Erro ao buscar em {trf_atual}: {e}")
-
-        return processos
+        return self._buscar_em_trfs(
+            trfs_para_buscar,
+            lambda trf_atual: self._buscar_por_documento(trf_atual, cnpj_limpo, "CNPJ"),
+            prazo_total
+        )
 
     def buscar_por_oab(
         self,
         oab_numero: str,
         oab_estado: str,
-        trf: Optional[str] = None
+        trf: Optional[str] = None,
+        prazo_total: Optional[float] = None
     ) -> List[ProcessoPJe]:
         """
         Busca processos por OAB do advogado
@@ -1929,7 +2309,8 @@ class PJeScraper:
         Args:
             oab_numero: Numero da OAB
             oab_estado: Estado da OAB (UF)
-            trf: TRF especifico (None busca em todos)
+            trf: TRF especifico (None busca em todos, em paralelo)
+            prazo_total: Prazo total da busca em segundos
 
         Returns:
             Lista de ProcessoPJe encontrados
@@ -1939,27 +2320,20 @@ class PJeScraper:
 
         self.logger.info(f"Buscando processos por OAB/{oab_estado_upper} {oab_numero_limpo}")
 
-        processos = []
-        trfs_para_buscar = [trf] if trf else list(TRF_URLS.keys())
-
-        for trf_atual in trfs_para_buscar:
-            try:
-                base_url = TRF_URLS[trf_atual]
-                consulta_url = urljoin(base_url, PJE_ENDPOINTS["consulta_publica"])
+        def _buscar_oab(trf_atual: str) -> List[ProcessoPJe]:
+            base_url = TRF_URLS[trf_atual]
+            consulta_url = urljoin(base_url, PJE_ENDPOINTS["consulta_publica"])
 
-                params = {
-                    'numeroOAB': oab_numero_limpo,
-                    'ufOAB': oab_estado_upper,
-                }
+            params = {
+                'numeroOAB': oab_numero_limpo,
+                'ufOAB': oab_estado_upper,
+            }
 
-                response = self._fazer_requisicao(trf_atual, consulta_url, params=params)
-                processos_trf = self._extrair_lista_processos(response.text, trf_atual)
-                processos.extend(processos_trf)
+            response = self._fazer_requisicao(trf_atual, consulta_url, params=params)
+            return self._extrair_lista_processos(response.text, trf_atual)
 
-            except Exception as e:
-                self.logger.warning(f"Erro ao buscar em {trf_atual}: {e}")
-
-        return processos
+        trfs_para_buscar = [trf] if trf else list(TRF_URLS.keys())
+        return self._buscar_em_trfs(trfs_para_buscar, _buscar_oab, prazo_total)
 
     def _buscar_por_documento(
         self,
@@ -1985,15 +2359,17 @@ class PJeScraper:
         if not BS4_AVAILABLE:
             return processos
 
-        soup = BeautifulSoup(html, 'html.parser')
+        # So os links sao lidos
+        soup = criar_soup(html, parse_only=apenas_tags('a'))
 
         # Procura links de processos
-        links = soup.find_all('a', href=re.compile(r'processo|numero'))
+        links = self.layout.todos('link_processo', soup)
+        padrao_cnj = self.layout.padrao('numero_cnj')
 
         for link in links:
             texto = limpar_html(link.get_text())
             # Tenta extrair numero CNJ
-            match = re.search(r'\d{7}-?\d{2}\.?\d{4}\.?\d\.?\d{2}\.?\d{4}', texto)
+            match = padrao_cnj.search(texto)
             if match:
                 numero = formatar_numero_cnj(match.group())
                 try:
@@ -2011,12 +2387,18 @@ class PJeScraper:
     # EXTRACAO DE DADOS
     # =========================================================================
 
-    def _extrair_dados_processo(self, html: str, numero: str, trf: str) -> ProcessoPJe:
-        """Extrai todos os dados do processo do HTML"""
+    def _extrair_dados_processo(
+        self,
+        html: Union[str, PaginaHTML],
+        numero: str,
+        trf: str
+    ) -> ProcessoPJe:
+        """Extrai todos os dados do processo do HTML (ou PaginaHTML)"""
         if not BS4_AVAILABLE:
             return ProcessoPJe(numero_processo=numero, tribunal=trf)
 
-        soup = BeautifulSoup(html, 'html.parser')
+        pagina = como_pagina(html)
+        soup = pagina.soup
 
         processo = ProcessoPJe(
             numero_processo=numero,
@@ -2026,18 +2408,19 @@ class PJeScraper:
 
         try:
             # Dados basicos
-            processo.classe = self._extrair_campo(soup, ['classe', 'classeProcessual'])
-            processo.assunto = self._extrair_campo(soup, ['assunto', 'assuntoPrincipal'])
-            processo.orgao_julgador = self._extrair_campo(soup, ['orgaoJulgador', 'vara', 'unidade'])
-            processo.vara = self._extrair_campo(soup, ['vara', 'unidadeJudicial'])
+            campos = self.layout.campos
+            processo.classe = self._extrair_campo(pagina, campos['classe'])
+            processo.assunto = self._extrair_campo(pagina, campos['assunto'])
+            processo.orgao_julgador = self._extrair_campo(pagina, campos['orgao_julgador'])
+            processo.vara = self._extrair_campo(pagina, campos['vara'])
 
             # Datas
-            data_dist = self._extrair_campo(soup, ['dataDistribuicao', 'distribuicao'])
+            data_dist = self._extrair_campo(pagina, campos['data_distribuicao'])
             if data_dist:
                 processo.data_distribuicao = parsear_data(data_dist)
 
             # Valor da causa
-            valor_str = self._extrair_campo(soup, ['valorCausa', 'valor'])
+            valor_str = self._extrair_campo(pagina, campos['valor_causa'])
             if valor_str:
                 processo.valor_causa = parsear_valor_monetario(valor_str)
 
@@ -2054,7 +2437,7 @@ class PJeScraper:
             processo.documentos = self._extrair_documentos(soup)
 
             # Segredo de justica
-            processo.segredo_justica = self._detectar_segredo_justica(html)
+            processo.segredo_justica = self._detectar_segredo_justica(pagina)
 
         except Exception as e:
             self.logger.warning(f"Erro ao extrair dados: {e}")
@@ -2062,25 +2445,30 @@ class PJeScraper:
 
         return processo
 
-    def _extrair_campo(self, soup: BeautifulSoup, nomes: List[str]) -> Optional[str]:
+    def _extrair_campo(
+        self,
+        soup: Union[BeautifulSoup, PaginaHTML],
+        nomes: Sequence[str]
+    ) -> Optional[str]:
         """Extrai valor de um campo por possiveis nomes/IDs"""
+        pagina = como_pagina(soup)
         for nome in nomes:
             # Por ID
-            elem = soup.find(id=re.compile(nome, re.I))
+            elem = pagina.buscar_id(nome, ignorar_caixa=True)
             if elem:
                 valor = limpar_html(elem.get_text())
                 if valor:
                     return valor
 
             # Por classe
-            elem = soup.find(class_=re.compile(nome, re.I))
+            elem = pagina.buscar_classe(nome, ignorar_caixa=True)
             if elem:
                 valor = limpar_html(elem.get_text())
                 if valor:
                     return valor
 
             # Por label
-            label = soup.find(string=re.compile(nome, re.I))
+            label = pagina.buscar_texto(nome)
             if label:
                 parent = label.parent
                 if parent:
@@ -2096,56 +2484,36 @@ class PJeScraper:
         """Extrai partes do processo"""
         partes = []
 
-        # Mapeamento de tipos
-        tipo_map = {
-            'autor': TipoParte.AUTOR.value,
-            'requerente': TipoParte.REQUERENTE.value,
-            'exequente': TipoParte.EXEQUENTE.value,
-            'embargante': TipoParte.EMBARGANTE.value,
-            'reu': TipoParte.REU.value,
-            're': TipoParte.REU.value,
-            'requerido': TipoParte.REQUERIDO.value,
-            'executado': TipoParte.EXECUTADO.value,
-            'embargado': TipoParte.EMBARGADO.value,
-        }
-
         # Procura tabela de partes
-        tabela = soup.find('table', id=re.compile(r'parte|polo', re.I))
+        tabela = self.layout.primeiro('partes', soup)
         if tabela:
-            rows = tabela.find_all('tr')
-            for row in rows:
-                cols = row.find_all('td')
-                if len(cols) >= 2:
-                    tipo_text = limpar_html(cols[0].get_text()).lower()
-                    nome = limpar_html(cols[1].get_text())
-
-                    tipo = TipoParte.OUTRO.value
-                    for key, value in tipo_map.items():
-                        if key in tipo_text:
-                            tipo = value
-                            break
-
-                    if nome:
-                        # Extrai documento
-                        documento = None
-                        tipo_doc = None
-                        cpf_match = CPF_PATTERN.search(cols[1].get_text())
-                        if cpf_match:
-                            documento = formatar_cpf(cpf_match.group())
-                            tipo_doc = "CPF"
-                        else:
-                            cnpj_match = CNPJ_PATTERN.search(cols[1].get_text())
-                            if cnpj_match:
-                                documento = formatar_cnpj(cnpj_match.group())
-                                tipo_doc = "CNPJ"
-
-                        parte = Parte(
-                            tipo=tipo,
-                            nome=nome,
-                            documento=documento,
-                            tipo_documento=tipo_doc
-                        )
-                        partes.append(parte.to_dict())
+            for _, cols in linhas_tabela(tabela):
+                tipo_text = limpar_html(cols[0].get_text()).lower()
+                nome = limpar_html(cols[1].get_text())
+
+                tipo = self.layout.classificar('tipo_parte', tipo_text, TipoParte.OUTRO.value)
+
+                if nome:
+                    # Extrai documento
+                    documento = None
+                    tipo_doc = None
+                    cpf_match = CPF_PATTERN.search(cols[1].get_text())
+                    if cpf_match:
+                        documento = formatar_cpf(cpf_match.group())
+                        tipo_doc = "CPF"
+                    else:
+                        cnpj_match = CNPJ_PATTERN.search(cols[1].get_text())
+                        if cnpj_match:
+                            documento = formatar_cnpj(cnpj_match.group())
+                            tipo_doc = "CNPJ"
+
+                    parte = Parte(
+                        tipo=tipo,
+                        nome=nome,
+                        documento=documento,
+                        tipo_documento=tipo_doc
+                    )
+                    partes.append(parte.to_dict())
 
         return partes
 
@@ -2153,6 +2521,8 @@ class PJeScraper:
         """Extrai advogados do processo"""
         advogados = []
 
+        padrao_nome = self.layout.padrao('nome_antes_oab')
+
         # Procura mencoes a OAB
         for match in OAB_PATTERN.finditer(str(soup)):
             oab_estado = match.group(1).upper()
@@ -2164,7 +2534,7 @@ class PJeScraper:
             if parent:
                 texto_completo = limpar_html(parent.parent.get_text() if parent.parent else str(parent))
                 # Remove a parte da OAB para pegar so o nome
-                nome_match = re.match(r'^([^(OAB)]+)', texto_completo)
+                nome_match = padrao_nome.match(texto_completo)
                 if nome_match:
                     nome = nome_match.group(1).strip()
 
@@ -2179,84 +2549,89 @@ class PJeScraper:
 
     def _extrair_movimentacoes(self, soup: BeautifulSoup) -> List[Dict]:
         """Extrai movimentacoes do processo"""
-        movimentacoes = []
+        movimentacoes = [
+            mov for mov in map(self._montar_movimentacao, self._linhas_movimentacoes(soup))
+            if mov
+        ]
+
+        # Ordena por data (mais recente primeiro)
+        movimentacoes.sort(key=lambda x: x.get('data', ''), reverse=True)
 
-        # Procura tabela de movimentacoes
-        tabela = soup.find('table', id=re.compile(r'moviment|andamento', re.I))
+        return movimentacoes
+
+    def _linhas_movimentacoes(self, soup: BeautifulSoup) -> List[Any]:
+        """Linhas da tabela de movimentacoes (tabela, depois div)"""
+        tabela = self.layout.primeiro('movimentacoes', soup)
         if not tabela:
-            tabela = soup.find('div', id=re.compile(r'moviment|andamento', re.I))
+            return []
+        return tabela.find_all('tr') or self.layout.todos('linhas_movimentacao', tabela)
 
-        if tabela:
-            rows = tabela.find_all('tr') or tabela.find_all('div', class_=re.compile(r'linha|item', re.I))
+    @staticmethod
+    def _colunas_movimentacao(row: Any) -> List[Any]:
+        return row.find_all('td') or row.find_all('span')
 
-            for row in rows:
-                cols = row.find_all('td') or row.find_all('span')
-
-                if len(cols) >= 2:
-                    data_texto = limpar_html(cols[0].get_text())
-                    descricao = limpar_html(cols[1].get_text())
-
-                    data, hora = parsear_datetime(data_texto)
-
-                    if data and descricao:
-                        # Verifica documento vinculado
-                        doc_link = row.find('a', href=True)
-                        doc_url = None
-                        doc_id = None
-                        if doc_link:
-                            href = doc_link.get('href', '')
-                            if 'documento' in href.lower():
-                                doc_url = href
-                                doc_match = re.search(r'idDoc=(\d+)', href)
-                                if doc_match:
-                                    doc_id = doc_match.group(1)
-
-                        mov = Movimentacao(
-                            data=data,
-                            hora=hora,
-                            descricao=descricao,
-                            documento_vinculado=doc_id,
-                            documento_url=doc_url
-                        )
-                        movimentacoes.append(mov.to_dict())
+    def _data_movimentacao(self, row: Any) -> Optional[str]:
+        """Data ISO da linha de movimentacao (le apenas a primeira coluna)"""
+        cols = self._colunas_movimentacao(row)
+        if len(cols) < 2:
+            return None
+        data, _ = parsear_datetime(limpar_html(cols[0].get_text()))
+        return data if data and DATA_ISO_PATTERN.match(data) else None
 
-        # Ordena por data (mais recente primeiro)
-        movimentacoes.sort(key=lambda x: x.get('data', ''), reverse=True)
+    def _montar_movimentacao(self, row: Any) -> Optional[Dict]:
+        """Movimentacao de uma linha da tabela, ou None se incompleta"""
+        cols = self._colunas_movimentacao(row)
+        if len(cols) < 2:
+            return None
 
-        return movimentacoes
+        data_texto = limpar_html(cols[0].get_text())
+        descricao = limpar_html(cols[1].get_text())
+
+        data, hora = parsear_datetime(data_texto)
+        if not (data and descricao):
+            return None
+
+        # Verifica documento vinculado
+        doc_link = row.find('a', href=True)
+        doc_url = None
+        doc_id = None
+        if doc_link:
+            href = doc_link.get('href', '')
+            if 'documento' in href.lower():
+                doc_url = href
+                doc_match = self.layout.padrao('id_documento').search(href)
+                if doc_match:
+                    doc_id = doc_match.group(1)
+
+        mov = Movimentacao(
+            data=data,
+            hora=hora,
+            descricao=descricao,
+            documento_vinculado=doc_id,
+            documento_url=doc_url
+        )
+        return mov.to_dict()
 
     def _extrair_documentos(self, soup: BeautifulSoup) -> List[Dict]:
         """Extrai lista de documentos do processo"""
         documentos = []
 
+        padrao_id_doc = self.layout.padrao('id_documento')
+
         # Procura links de documentos
         for link in soup.find_all('a', href=True):
             href = link.get('href', '')
-            if 'documento' in href.lower() or 'download' in href.lower() or '.pdf' in href.lower():
+            href_lower = href.lower()
+            if 'documento' in href_lower or 'download' in href_lower or '.pdf' in href_lower:
                 texto = limpar_html(link.get_text())
 
                 # Identifica tipo
-                tipo = TipoDocumento.OUTRO.value
                 texto_lower = texto.lower()
-
-                tipo_map = {
-                    'peticao inicial': TipoDocumento.PETICAO_INICIAL.value,
-                    'contestacao': TipoDocumento.CONTESTACAO.value,
-                    'sentenca': TipoDocumento.SENTENCA.value,
-                    'acordao': TipoDocumento.ACORDAO.value,
-                    'despacho': TipoDocumento.DESPACHO.value,
-                    'decisao': TipoDocumento.DECISAO.value,
-                    'certidao': TipoDocumento.CERTIDAO.value,
-                }
-
-                for key, value in tipo_map.items():
-                    if key in texto_lower:
-                        tipo = value
-                        break
+                tipo = self.layout.classificar('tipo_documento', texto_lower, TipoDocumento.OUTRO.value)
 
                 # Extrai ID do documento
                 doc_id = None
-                id_match = re.search(r'idDoc=(\d+)', href)
+                id_match = padrao_id_doc.search(href)
                 if id_match:
                     doc_id = id_match.group(1)
 
@@ -2325,10 +2700,12 @@ class PJeScraper:
         if not BS4_AVAILABLE:
             return intimacoes
 
-        soup = BeautifulSoup(html, 'html.parser')
+        # So as tabelas sao lidas
+        soup = criar_soup(html, parse_only=apenas_tags('table'))
 
         # Procura tabela de intimacoes
-        tabela = soup.find('table', id=re.compile(r'intimac', re.I))
+        tabela = self.layout.primeiro('intimacoes', soup)
+        padrao_prazo = self.layout.padrao('prazo_dias')
         if tabela:
             rows = tabela.find_all('tr')[1:]  # Pula header
 
@@ -2340,17 +2717,13 @@ class PJeScraper:
                     descricao = limpar_html(cols[2].get_text())
 
                     # Identifica tipo
-                    tipo = TipoIntimacao.INTIMACAO.value
-                    if 'carga' in tipo_text:
-                        tipo = TipoIntimacao.CARGA.value
-                    elif 'vista' in tipo_text:
-                        tipo = TipoIntimacao.VISTA.value
-                    elif 'citacao' in tipo_text:
-                        tipo = TipoIntimacao.CITACAO.value
+                    tipo = self.layout.classificar(
+                        'tipo_intimacao', tipo_text, TipoIntimacao.INTIMACAO.value
+                    )
 
                     # Extrai prazo se disponivel
                     prazo = None
-                    prazo_match = re.search(r'(\d+)\s*dias?', descricao)
+                    prazo_match = padrao_prazo.search(descricao)
                     if prazo_match:
                         prazo = int(prazo_match.group(1))
 
@@ -2373,16 +2746,20 @@ class PJeScraper:
         doc_id: str,
         output_path: str,
         trf: str,
-        validar_integridade: bool = True
+        validar_integridade: bool = True,
+        numero_processo: Optional[str] = None
     ) -> bool:
         """
         Baixa documento do processo
 
+        Documentos ja presentes no store sao apenas ligados ao destino.
+
         Args:
             doc_id: ID do documento no PJe
             output_path: Caminho para salvar o arquivo
             trf: TRF do processo
             validar_integridade: Se deve calcular hashes MD5/SHA256
+            numero_processo: Processo dono do documento (chave do store)
 
         Returns:
             True se download bem-sucedido
@@ -2390,40 +2767,61 @@ class PJeScraper:
         base_url = TRF_URLS[trf]
         doc_url = urljoin(base_url, f"{PJE_ENDPOINTS['documento']}?idDoc={doc_id}")
 
-        self.logger.info(f"Baixando documento {doc_id} de {trf}")
-
-        try:
-            response = self._fazer_requisicao(trf, doc_url)
-
-            if response.status_code != 200:
-                self.logger.error(f"Erro ao baixar documento: HTTP {response.status_code}")
-                return False
-
-            # Verifica tipo de conteudo
-            content_type = response.headers.get('content-type', '')
-            if 'pdf' not in content_type.lower() and 'octet' not in content_type.lower():
-                self.logger.warning(f"Tipo de conteudo inesperado: {content_type}")
-
-            # Salva arquivo
-            output_file = Path(output_path)
-            output_file.parent.mkdir(parents=True, exist_ok=True)
+        # Sem o numero do processo o documento nao tem chave no store
+        store = self.document_store if numero_processo else None
+        processo = numero_processo or ""
 
-            with open(output_file, 'wb') as f:
-                f.write(response.content)
+        if store is not None:
+            try:
+                objeto = store.localizar(trf, processo, str(doc_id))
+                if objeto is not None:
+                    store.materializar(objeto.sha256, output_path)
+                    self.logger.info(f"Documento reutilizado do store: {output_path}")
+                    return True
+            except (sqlite3.Error, OSError) as e:
+                self.logger.warning(f"Store de documentos indisponivel: {e}")
 
-            # Valida integridade
-            if validar_integridade:
-                hash_md5 = calcular_hash_arquivo(str(output_file), "md5")
-                hash_sha256 = calcular_hash_arquivo(str(output_file), "sha256")
-                self.logger.debug(f"Documento salvo | MD5: {hash_md5} | SHA256: {hash_sha256[:16]}...")
+        self.logger.info(f"Baixando documento {doc_id} de {trf}")
 
-            self.logger.info(f"Documento salvo: {output_path}")
-            return True
+        # O store precisa do SHA-256 mesmo sem validacao de integridade
+        if validar_integridade:
+            algoritmos = ("md5", "sha256")
+        else:
+            algoritmos = ("sha256",) if store is not None else ()
 
+        try:
+            resultado = baixar_stream(
+                lambda headers: self._fazer_requisicao(trf, doc_url, headers=headers, stream=True),
+                output_path,
+                algoritmos=algoritmos
+            )
         except Exception as e:
             self.logger.error(f"Erro ao baixar documento: {e}")
             return False
 
+        if store is not None:
+            try:
+                store.armazenar(
+                    resultado.caminho, resultado.sha256, trf, processo, str(doc_id),
+                    content_type=resultado.content_type, md5=resultado.md5
+                )
+            except (sqlite3.Error, OSError) as e:
+                self.logger.warning(f"Documento nao registrado no store: {e}")
+
+        # Verifica tipo de conteudo
+        content_type = resultado.content_type
+        if 'pdf' not in content_type.lower() and 'octet' not in content_type.lower():
+            self.logger.warning(f"Tipo de conteudo inesperado: {content_type}")
+
+        # Hashes calculados durante o download
+        if validar_integridade:
+            self.logger.debug(
+                f"Documento salvo | MD5: {resultado.md5} | SHA256: {resultado.sha256[:16]}..."
+            )
+
+        self.logger.info(f"Documento salvo: {output_path}", tamanho=resultado.tamanho_bytes)
+        return True
+
     def baixar_documentos(
         self,
         processo: ProcessoPJe,
@@ -2445,12 +2843,12 @@ class PJeScraper:
             self.logger.warning("Processo em segredo de justica - nao e possivel baixar documentos")
             return []
 
-        arquivos_baixados = []
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
 
         numero_limpo = re.sub(r'\D', '', processo.numero_processo)
 
+        pendentes = []
         for doc in processo.documentos:
             # Filtra por tipo
             if tipos and doc.get('tipo') not in tipos:
@@ -2471,10 +2869,20 @@ class PJeScraper:
             nome_arquivo = f"{numero_limpo}_{tipo}_{data}_{doc_id}.pdf"
             nome_arquivo = re.sub(r'[^\w\-_\.]', '_', nome_arquivo)
 
-            caminho = output_path / nome_arquivo
+            pendentes.append((doc_id, str(output_path / nome_arquivo)))
+
+        # Varios downloads ao mesmo tempo; o rate limiter do TRF continua
+        # espacando o inicio de cada requisicao
+        with ThreadPoolExecutor(max_workers=max(1, self.max_downloads)) as executor:
+            sucessos = list(executor.map(
+                lambda item: self.baixar_documento(
+                    item[0], item[1], processo.tribunal,
+                    numero_processo=processo.numero_processo
+                ),
+                pendentes
+            ))
 
-            if self.baixar_documento(doc_id, str(caminho), processo.tribunal):
-                arquivos_baixados.append(str(caminho))
+        arquivos_baixados = [caminho for (_, caminho), ok in zip(pendentes, sucessos) if ok]
 
         self.logger.info(f"Documentos baixados: {len(arquivos_baixados)}")
         return arquivos_baixados
@@ -2483,7 +2891,7 @@ class PJeScraper:
     # DETECCAO DE ESTADOS
     # =========================================================================
 
-    def _detectar_segredo_justica(self, html: str) -> bool:
+    def _detectar_segredo_justica(self, html: Union[str, PaginaHTML]) -> bool:
         """Detecta se processo esta em segredo de justica"""
         indicadores = [
             'segredo de justica',
@@ -2493,10 +2901,9 @@ class PJeScraper:
             'identificacao necessaria',
             'login necessario para visualizar',
         ]
-        html_lower = html.lower()
-        return any(ind in html_lower for ind in indicadores)
+        return como_pagina(html).contem(indicadores, caixa_baixa=True)
 
-    def _processo_nao_encontrado(self, html: str) -> bool:
+    def _processo_nao_encontrado(self, html: Union[str, PaginaHTML]) -> bool:
         """Detecta se processo nao foi encontrado"""
         indicadores = [
             'nao encontrado',
@@ -2506,8 +2913,7 @@ class PJeScraper:
             'não existem dados',
             'nenhum resultado',
         ]
-        html_lower = html.lower()
-        return any(ind in html_lower for ind in indicadores)
+        return como_pagina(html).contem(indicadores, caixa_baixa=True)
 
     # =========================================================================
     # HEALTH CHECK
@@ -2585,6 +2991,7 @@ class PJeScraper:
                     "status_code": response.status_code,
                     "latency_ms": latency_ms,
                     "circuit_breaker": self.circuit_breakers[trf_atual].state.value,
+                    "resiliencia": self.resiliencia[trf_atual].stats,
                 }
 
             except Exception as e:
@@ -2592,6 +2999,7 @@ class PJeScraper:
                     "status": "error",
                     "error": str(e),
                     "circuit_breaker": self.circuit_breakers[trf_atual].state.value,
+                    "resiliencia": self.resiliencia[trf_atual].stats,
                 }
 
         # Status geral
@@ -2614,6 +3022,14 @@ class PJeScraper:
         self.cache.clear()
         self.logger.info("Cache limpo")
 
+    def fechar(self):
+        """Fecha as sessoes HTTP de todos os TRFs"""
+        with self._sessions_lock:
+            sessoes = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessoes:
+            session.close()
+
 
 # =============================================================================
 # FUNCAO PRINCIPAL PARA USO VIA API
@@ -2624,17 +3040,22 @@ async def extrair_processo_pje(
     trf: Optional[str] = None,
     baixar_docs: bool = False,
     output_dir: str = "./output",
-    cache_enabled: bool = True
+    cache_enabled: bool = True,
+    reutilizar: bool = True
 ) -> Dict:
     """
     Funcao principal para extracao de processo do PJe
 
+    O scraper (sessoes HTTP por TRF, cache e logger) e reaproveitado entre
+    chamadas pelo registro de scrapers do processo.
+
     Args:
         numero_processo: Numero do processo (formato CNJ)
         trf: TRF especifico (None para auto-detectar)
         baixar_docs: Se deve baixar documentos
         output_dir: Diretorio para salvar documentos
         cache_enabled: Se deve usar cache
+        reutilizar: Se False, usa um scraper proprio fechado ao final
 
     Returns:
         Dict com todos os dados do processo
@@ -2644,8 +3065,29 @@ async def extrair_processo_pje(
         PJeSegredoJustica: Se processo em segredo de justica
         PJeValidationError: Se numero invalido
     """
-    scraper = PJeScraper(cache_enabled=cache_enabled)
+    if not reutilizar:
+        scraper = PJeScraper(cache_enabled=cache_enabled)
+        try:
+            return _extrair_processo_pje(scraper, numero_processo, trf, baixar_docs, output_dir)
+        finally:
+            scraper.fechar()
+
+    with obter_registro_scrapers().emprestar(
+        ("pje", cache_enabled),
+        lambda: PJeScraper(cache_enabled=cache_enabled),
+        fechar=lambda scraper: scraper.fechar()
+    ) as scraper:
+        return _extrair_processo_pje(scraper, numero_processo, trf, baixar_docs, output_dir)
+
 
+def _extrair_processo_pje(
+    scraper: PJeScraper,
+    numero_processo: str,
+    trf: Optional[str],
+    baixar_docs: bool,
+    output_dir: str
+) -> Dict:
+    """Corpo de extrair_processo_pje com o scraper ja obtido"""
     try:
         processo = scraper.buscar_por_numero(numero_processo, trf)
 
@@ -0,0 +1,580 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Resilience - Circuit breaker e limite de concorrencia por endpoint
+
+Somente o PJe tinha circuit breaker (um por TRF, por instancia); ESAJ,
+PROJUDI e os clientes DataJud/CNJ continuavam enfileirando requisicoes
+num portal fora do ar ate cada uma estourar o timeout. Este modulo
+concentra a protecao de um endpoint:
+
+- CircuitBreaker: abre apos falhas seguidas, rejeita na hora enquanto
+  aberto e, passado o tempo de espera, deixa passar uma sonda por vez
+  (HALF_OPEN) ate fechar de novo. Usa time.monotonic, imune a ajustes
+  do relogio
+- LimiteConcorrencia (bulkhead): teto de requisicoes simultaneas no
+  endpoint; quem nao consegue vaga dentro da espera maxima e rejeitado
+  em vez de ficar na fila
+- Resiliencia: os dois juntos, um por endpoint no processo
+  (obter_resiliencia), com estatisticas de estado, rejeicoes e tempo
+  aberto (estado_resiliencia)
+- AdaptadorResiliente: HTTPAdapter do requests que aplica a protecao a
+  toda requisicao de uma Session
+
+Autor: ROM-Agent Integration System
+Data: 2026-01-12
+Versao: 1.0.0
+"""
+
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from enum import Enum
+from typing import Any, AsyncIterator, Dict, Iterator, Optional
+from urllib.parse import urlparse
+
+from retry_policy import ERROS_RETENTAVEIS
+
+# Dependencias externas
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    REQUESTS_AVAILABLE = True
+except ImportError:
+    REQUESTS_AVAILABLE = False
+    requests = None
+    HTTPAdapter = object
+
+
+# =============================================================================
+# CONSTANTES E CONFIGURACOES
+# =============================================================================
+
+DEFAULT_LIMIAR_FALHAS = 5  # falhas seguidas para abrir o circuito
+DEFAULT_TEMPO_ABERTO = 60.0  # segundos aberto antes de deixar passar uma sonda
+DEFAULT_SUCESSOS_PARA_FECHAR = 2  # sondas bem-sucedidas para fechar
+DEFAULT_MAX_CONCORRENTES = 16  # requisicoes simultaneas por endpoint
+DEFAULT_ESPERA_VAGA = 10.0  # segundos esperando vaga antes de rejeitar
+
+_INTERVALO_ESPERA_ASYNC = 0.02  # segundos entre verificacoes de vaga (asyncio)
+
+
+class CircuitBreakerState(str, Enum):
+    """Estados do circuit breaker"""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+# =============================================================================
+# EXCECOES
+# =============================================================================
+
+class ResilienciaError(Exception):
+    """Requisicao rejeitada localmente, sem chegar ao endpoint"""
+
+    def __init__(self, mensagem: str, chave: str = ""):
+        super().__init__(mensagem)
+        self.chave = chave
+
+
+class CircuitoAbertoError(ResilienciaError):
+    """Circuito aberto: o endpoint falhou seguidamente"""
+
+    def __init__(self, mensagem: str, chave: str = "", restante: float = 0.0):
+        super().__init__(mensagem, chave)
+        self.restante = restante  # segundos ate a proxima sonda
+
+
+class LimiteConcorrenciaError(ResilienciaError):
+    """Sem vaga no limite de concorrencia do endpoint"""
+
+
+if REQUESTS_AVAILABLE:
+    class RequisicaoRejeitadaError(requests.exceptions.ConnectionError):
+        """ResilienciaError como erro do requests (AdaptadorResiliente)"""
+else:
+    RequisicaoRejeitadaError = ResilienciaError
+
+
+# =============================================================================
+# CIRCUIT BREAKER
+# =============================================================================
+
+class CircuitBreaker:
+    """
+    Circuit breaker para protecao contra falhas
+
+    Estados:
+    - CLOSED: Normal, requisicoes passam
+    - OPEN: Bloqueado apos muitos erros
+    - HALF_OPEN: Tentando reabrir; uma sonda por vez
+    """
+
+    def __init__(
+        self,
+        threshold: int = DEFAULT_LIMIAR_FALHAS,
+        timeout: float = DEFAULT_TEMPO_ABERTO,
+        logger: Optional[Any] = None,
+        sucessos_para_fechar: int = DEFAULT_SUCESSOS_PARA_FECHAR,
+        nome: str = ""
+    ):
+        """
+        Inicializa o circuit breaker.
+
+        Args:
+            threshold: Falhas seguidas para abrir
+            timeout: Segundos aberto antes de deixar passar uma sonda
+            logger: Logger (opcional) para as mudancas de estado
+            sucessos_para_fechar: Sondas bem-sucedidas para fechar
+            nome: Endpoint protegido, usado nas mensagens
+        """
+        self.threshold = max(1, threshold)
+        self.timeout = timeout
+        self.logger = logger
+        self.sucessos_para_fechar = max(1, sucessos_para_fechar)
+        self.nome = nome
+        self._lock = threading.RLock()
+        self._state = CircuitBreakerState.CLOSED
+        self._failure_count = 0
+        self._success_count = 0
+        self._last_failure_time: Optional[float] = None
+        self._sonda_desde: Optional[float] = None  # sonda HALF_OPEN em andamento
+
+        # Estatisticas
+        self.aberturas = 0
+        self.rejeicoes = 0
+        self._aberto_desde: Optional[float] = None
+        self._tempo_aberto = 0.0
+
+    def _log(self, nivel: str, mensagem: str):
+        if self.logger:
+            prefixo = f"[{self.nome}] " if self.nome else ""
+            getattr(self.logger, nivel)(f"{prefixo}{mensagem}")
+
+    @property
+    def state(self) -> CircuitBreakerState:
+        """Retorna estado atual do circuit breaker"""
+        with self._lock:
+            if self._state == CircuitBreakerState.OPEN and self.restante <= 0:
+                self._state = CircuitBreakerState.HALF_OPEN
+                self._success_count = 0
+                self._sonda_desde = None
+                self._log("info", "Circuit breaker mudou para HALF_OPEN")
+            return self._state
+
+    @property
+    def restante(self) -> float:
+        """Segundos ate o circuito aberto deixar passar uma sonda"""
+        with self._lock:
+            if self._state != CircuitBreakerState.OPEN or self._last_failure_time is None:
+                return 0.0
+            return max(0.0, self.timeout - (time.monotonic() - self._last_failure_time))
+
+    def allow_request(self) -> bool:
+        """
+        Verifica se pode fazer requisicao
+
+        Em HALF_OPEN so uma sonda passa por vez; a vaga volta com
+        record_success/record_failure (ou apos `timeout`, se a sonda
+        nunca reportar o resultado).
+
+        Returns:
+            False quando a requisicao deve ser rejeitada (conta em rejeicoes)
+        """
+        with self._lock:
+            state = self.state
+            if state == CircuitBreakerState.CLOSED:
+                return True
+            if state == CircuitBreakerState.HALF_OPEN:
+                agora = time.monotonic()
+                if self._sonda_desde is None or agora - self._sonda_desde > self.timeout:
+                    self._sonda_desde = agora
+                    return True
+            self.rejeicoes += 1
+            return False
+
+    def record_success(self):
+        """Registra sucesso"""
+        with self._lock:
+            if self._state == CircuitBreakerState.HALF_OPEN:
+                self._sonda_desde = None
+                self._success_count += 1
+                if self._success_count >= self.sucessos_para_fechar:
+                    self._fechar()
+                    self._log("info", "Circuit breaker fechado")
+            else:
+                self._failure_count = 0
+
+    def record_failure(self):
+        """Registra falha"""
+        with self._lock:
+            self._failure_count += 1
+            self._last_failure_time = time.monotonic()
+            self._success_count = 0
+            self._sonda_desde = None
+
+            if self._state == CircuitBreakerState.HALF_OPEN:
+                self._abrir()
+                self._log("warning", "Circuit breaker reaberto para OPEN")
+            elif self._state == CircuitBreakerState.CLOSED and self._failure_count >= self.threshold:
+                self._abrir()
+                self._log("warning", f"Circuit breaker aberto apos {self._failure_count} falhas")
+
+    def reset(self):
+        """Reseta o circuit breaker"""
+        with self._lock:
+            self._fechar()
+            self._last_failure_time = None
+
+    def _abrir(self):
+        self._state = CircuitBreakerState.OPEN
+        self.aberturas += 1
+        if self._aberto_desde is None:
+            self._aberto_desde = time.monotonic()
+
+    def _fechar(self):
+        if self._aberto_desde is not None:
+            self._tempo_aberto += time.monotonic() - self._aberto_desde
+            self._aberto_desde = None
+        self._state = CircuitBreakerState.CLOSED
+        self._failure_count = 0
+        self._success_count = 0
+        self._sonda_desde = None
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """
+        Estado e historico do circuito
+
+        `aberto_ha` conta desde a abertura ate o fechamento, incluindo o
+        tempo em HALF_OPEN; `tempo_aberto` soma todos os periodos.
+        """
+        with self._lock:
+            state = self.state
+            aberto_ha = 0.0
+            if self._aberto_desde is not None:
+                aberto_ha = time.monotonic() - self._aberto_desde
+            return {
+                "estado": state.value,
+                "falhas_seguidas": self._failure_count,
+                "aberturas": self.aberturas,
+                "rejeicoes": self.rejeicoes,
+                "aberto_ha": round(aberto_ha, 3),
+                "tempo_aberto": round(self._tempo_aberto + aberto_ha, 3),
+                "proxima_sonda_em": round(self.restante, 3),
+            }
+
+
+# =============================================================================
+# LIMITE DE CONCORRENCIA (BULKHEAD)
+# =============================================================================
+
+class LimiteConcorrencia:
+    """
+    Teto de requisicoes simultaneas a um endpoint
+
+    Serve a threads e a corrotinas ao mesmo tempo (as vagas sao contadas
+    sob um threading.Lock); corrotinas esperam vaga com asyncio.sleep,
+    sem bloquear o loop.
+    """
+
+    def __init__(
+        self,
+        max_concorrentes: int = DEFAULT_MAX_CONCORRENTES,
+        espera_maxima: float = DEFAULT_ESPERA_VAGA,
+        nome: str = ""
+    ):
+        """
+        Inicializa o limite.
+
+        Args:
+            max_concorrentes: Requisicoes simultaneas permitidas
+            espera_maxima: Segundos esperando vaga antes de rejeitar
+                (0 = rejeita na hora)
+            nome: Endpoint protegido, usado nas mensagens
+        """
+        self.max_concorrentes = max(1, max_concorrentes)
+        self.espera_maxima = max(0.0, espera_maxima)
+        self.nome = nome
+        self._cond = threading.Condition()
+        self._ocupadas = 0
+        self.pico = 0
+        self.rejeicoes = 0
+
+    def _ocupar(self) -> bool:
+        if self._ocupadas >= self.max_concorrentes:
+            return False
+        self._ocupadas += 1
+        self.pico = max(self.pico, self._ocupadas)
+        return True
+
+    def _rejeitar(self):
+        self.rejeicoes += 1
+        raise LimiteConcorrenciaError(
+            f"{self.nome or 'endpoint'}: {self.max_concorrentes} requisicoes em andamento",
+            self.nome
+        )
+
+    def entrar(self, espera: Optional[float] = None):
+        """
+        Ocupa uma vaga, esperando no maximo `espera` segundos
+
+        Args:
+            espera: Sobrescreve espera_maxima
+
+        Raises:
+            LimiteConcorrenciaError: Sem vaga dentro da espera
+        """
+        espera = self.espera_maxima if espera is None else espera
+        with self._cond:
+            if not self._cond.wait_for(self._livre, timeout=espera) or not self._ocupar():
+                self._rejeitar()
+
+    async def entrar_async(self, espera: Optional[float] = None):
+        """
+        Ocupa uma vaga sem bloquear o loop
+
+        Args:
+            espera: Sobrescreve espera_maxima
+
+        Raises:
+            LimiteConcorrenciaError: Sem vaga dentro da espera
+        """
+        espera = self.espera_maxima if espera is None else espera
+        prazo = time.monotonic() + espera
+        while True:
+            with self._cond:
+                if self._ocupar():
+                    return
+                restante = prazo - time.monotonic()
+                if restante <= 0:
+                    self._rejeitar()
+            await asyncio.sleep(min(_INTERVALO_ESPERA_ASYNC, restante))
+
+    def sair(self):
+        """Libera a vaga"""
+        with self._cond:
+            self._ocupadas = max(0, self._ocupadas - 1)
+            self._cond.notify()
+
+    def _livre(self) -> bool:
+        return self._ocupadas < self.max_concorrentes
+
+    @contextmanager
+    def vaga(self) -> Iterator[None]:
+        """Bloco executado com uma vaga ocupada"""
+        self.entrar()
+        try:
+            yield
+        finally:
+            self.sair()
+
+    @asynccontextmanager
+    async def vaga_async(self) -> AsyncIterator[None]:
+        """Bloco assincrono executado com uma vaga ocupada"""
+        await self.entrar_async()
+        try:
+            yield
+        finally:
+            self.sair()
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Ocupacao e rejeicoes"""
+        with self._cond:
+            return {
+                "em_andamento": self._ocupadas,
+                "max_concorrentes": self.max_concorrentes,
+                "pico": self.pico,
+                "rejeicoes": self.rejeicoes,
+            }
+
+
+# =============================================================================
+# PROTECAO DE UM ENDPOINT
+# =============================================================================
+
+class Resiliencia:
+    """
+    Circuit breaker e limite de concorrencia de um endpoint
+
+    Uso no laco de requisicao, a cada tentativa:
+
+        protecao.verificar()  # CircuitoAbertoError se aberto
+        with protecao.limite.vaga():  # LimiteConcorrenciaError se lotado
+            response = session.get(url)
+        protecao.registrar(status_code=response.status_code)
+    """
+
+    def __init__(
+        self,
+        chave: str,
+        circuito: Optional[CircuitBreaker] = None,
+        limite: Optional[LimiteConcorrencia] = None
+    ):
+        """
+        Inicializa a protecao.
+
+        Args:
+            chave: Endpoint protegido (tribunal, host)
+            circuito: Circuit breaker (padrao: CircuitBreaker com valores padrao)
+            limite: Limite de concorrencia (padrao: LimiteConcorrencia com valores padrao)
+        """
+        self.chave = chave
+        self.circuito = circuito or CircuitBreaker(nome=chave)
+        self.limite = limite or LimiteConcorrencia(nome=chave)
+
+    def verificar(self):
+        """
+        Falha rapido se o circuito estiver aberto
+
+        Raises:
+            CircuitoAbertoError: Circuito aberto (ou sonda HALF_OPEN ja em andamento)
+        """
+        if not self.circuito.allow_request():
+            restante = self.circuito.restante
+            raise CircuitoAbertoError(
+                f"Circuit breaker aberto para {self.chave} (proxima sonda em {restante:.0f}s)",
+                self.chave,
+                restante
+            )
+
+    def registrar(self, status_code: Optional[int] = None, erro: Optional[BaseException] = None):
+        """
+        Registra o resultado de uma tentativa no circuito
+
+        Erros de rede/timeout e status 5xx contam como falha; 429 nao
+        conta para nenhum lado (o portal esta de pe, so limitando).
+
+        Args:
+            status_code: Status HTTP da resposta
+            erro: Excecao da tentativa
+        """
+        if erro is not None or (status_code is not None and status_code >= 500):
+            self.circuito.record_failure()
+        elif status_code != 429:
+            self.circuito.record_success()
+
+    @contextmanager
+    def chamada(self) -> Iterator[None]:
+        """Verifica o circuito e ocupa uma vaga durante o bloco"""
+        self.verificar()
+        with self.limite.vaga():
+            yield
+
+    @asynccontextmanager
+    async def chamada_async(self) -> AsyncIterator[None]:
+        """Versao assincrona de chamada()"""
+        self.verificar()
+        async with self.limite.vaga_async():
+            yield
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Estatisticas do circuito e da concorrencia"""
+        return {
+            "circuito": self.circuito.stats,
+            "concorrencia": self.limite.stats,
+        }
+
+
+_resiliencias: Dict[str, Resiliencia] = {}
+_resiliencias_lock = threading.Lock()
+
+
+def obter_resiliencia(
+    chave: str,
+    threshold: int = DEFAULT_LIMIAR_FALHAS,
+    timeout: float = DEFAULT_TEMPO_ABERTO,
+    max_concorrentes: int = DEFAULT_MAX_CONCORRENTES,
+    espera_maxima: float = DEFAULT_ESPERA_VAGA,
+    logger: Optional[Any] = None
+) -> Resiliencia:
+    """
+    Retorna a protecao do processo para o endpoint
+
+    Todos os scrapers e clientes do processo que falam com o mesmo
+    endpoint dividem o mesmo circuito e as mesmas vagas: um portal que
+    caiu para um chamador ja rejeita os demais.
+
+    Args:
+        chave: Endpoint (ex.: "pje:TRF1", "esaj:esaj.tjsp.jus.br")
+        threshold: Falhas seguidas para abrir (apenas na criacao)
+        timeout: Segundos aberto antes da sonda (apenas na criacao)
+        max_concorrentes: Requisicoes simultaneas (apenas na criacao)
+        espera_maxima: Espera por vaga (apenas na criacao)
+        logger: Logger das mudancas de estado (apenas na criacao)
+
+    Returns:
+        Resiliencia unica por chave
+    """
+    with _resiliencias_lock:
+        resiliencia = _resiliencias.get(chave)
+        if resiliencia is None:
+            resiliencia = Resiliencia(
+                chave,
+                CircuitBreaker(threshold=threshold, timeout=timeout, logger=logger, nome=chave),
+                LimiteConcorrencia(max_concorrentes, espera_maxima, nome=chave)
+            )
+            _resiliencias[chave] = resiliencia
+        return resiliencia
+
+
+def estado_resiliencia(prefixo: str = "") -> Dict[str, Dict[str, Any]]:
+    """
+    Estatisticas de todos os endpoints protegidos do processo
+
+    Args:
+        prefixo: Filtra as chaves (ex.: "pje:")
+
+    Returns:
+        Dict chave -> Resiliencia.stats
+    """
+    with _resiliencias_lock:
+        resiliencias = [r for chave, r in _resiliencias.items() if chave.startswith(prefixo)]
+    return {r.chave: r.stats for r in resiliencias}
+
+
+# =============================================================================
+# ADAPTADOR REQUESTS
+# =============================================================================
+
+class AdaptadorResiliente(HTTPAdapter):
+    """
+    HTTPAdapter que protege cada host com obter_resiliencia
+
+    Montado numa Session, toda requisicao passa pelo circuito e pelo
+    limite de concorrencia do host. Rejeicoes viram
+    RequisicaoRejeitadaError (um requests.ConnectionError), tratada pelos
+    mesmos `except` que ja tratam falha de rede.
+    """
+
+    def __init__(self, prefixo: str, **kwargs):
+        """
+        Inicializa o adaptador.
+
+        Args:
+            prefixo: Prefixo das chaves (chave = "<prefixo>:<host>")
+            **kwargs: Argumentos de HTTPAdapter
+        """
+        super().__init__(**kwargs)
+        self.prefixo = prefixo
+
+    def protecao(self, url: str) -> Resiliencia:
+        """Resiliencia do host da URL"""
+        return obter_resiliencia(f"{self.prefixo}:{urlparse(url).netloc}")
+
+    def send(self, request, **kwargs):
+        protecao = self.protecao(request.url)
+        try:
+            with protecao.chamada():
+                response = super().send(request, **kwargs)
+        except ResilienciaError as e:
+            raise RequisicaoRejeitadaError(str(e), request=request) from e
+        except ERROS_RETENTAVEIS as e:
+            protecao.registrar(erro=e)
+            raise
+        protecao.registrar(status_code=response.status_code)
+        return response
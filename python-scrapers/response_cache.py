@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Response Cache - Cache local de respostas das APIs juridicas
+
+DataJud, Certidoes CNJ e JusBrasil nao tinham cache: cada analise
+(ConsultasAutomaticas) repetia as mesmas consultas do mesmo processo e
+dos mesmos assuntos, inclusive as que nao encontravam nada. Este modulo
+guarda as respostas num SQLiteCacheStore compartilhado:
+
+- Chave pela consulta normalizada (parametros ordenados; campos de
+  texto livre sem diferenca de caixa/espacos, URLs e ids exatos) e
+  hasheada, um namespace por fonte
+- TTL por fonte; respostas "nao encontrado" (cache negativo) com TTL
+  menor, para que um processo recem-distribuido apareca logo
+- Erros transitorios (timeout, 5xx, falha de autenticacao) nunca sao
+  guardados; respostas parciais (fan-out com algum indice em erro) so
+  por DEFAULT_TTL_PARCIAL
+- Tamanho limitado (remocao das entradas mais antigas do store)
+- Contadores de hits/misses por fonte
+
+Autor: ROM-Agent Integration System
+Data: 2026-01-12
+Versao: 1.0.0
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from cache_store import RegistroPorCaminho, SQLiteCacheStore
+
+
+# =============================================================================
+# CONSTANTES E CONFIGURACOES
+# =============================================================================
+
+DEFAULT_RESPONSE_DB = os.environ.get(
+    "ROM_RESPONSE_CACHE_DB",
+    str(Path.home() / ".rom_agent" / "cache" / "respostas.db")
+)
+DEFAULT_MAX_ENTRIES = 20000
+DEFAULT_EVICTION_INTERVAL = 100  # escritas entre verificacoes de tamanho
+DEFAULT_TTL = 3600.0  # fontes sem TTL proprio (segundos)
+DEFAULT_TTL_NEGATIVO = 300.0
+DEFAULT_TTL_PARCIAL = 120.0  # teto do TTL de respostas parciais
+
+# TTL das respostas encontradas, por fonte (segundos)
+TTLS_POR_FONTE = {
+    "datajud": 6 * 3600.0,  # base atualizada pelos tribunais em lote
+    "cnj": 2 * 3600.0,  # publicacoes do DJEN saem ao longo do dia
+    "jusbrasil": 24 * 3600.0,  # jurisprudencia muda pouco
+}
+
+# TTL das respostas "nao encontrado", por fonte (segundos)
+TTLS_NEGATIVOS_POR_FONTE = {
+    "datajud": 1800.0,
+    "cnj": 900.0,
+    "jusbrasil": 3600.0,
+}
+
+# Classificacao de uma resposta (classificar_resultado)
+POSITIVO = "positivo"
+NEGATIVO = "negativo"
+PARCIAL = "parcial"  # sucesso incompleto: guardado por pouco tempo
+
+# Campos de contagem que, zerados, indicam "nao encontrado"
+_CAMPOS_TOTAL = ("total_encontrado", "total_publicacoes", "total")
+
+# Parametros de texto livre (e siglas), em que caixa e espacos nao mudam
+# a consulta; os demais (URLs, ids, datas, queries) entram na chave exatos
+CAMPOS_TEXTO_LIVRE = frozenset({"termo", "tribunal"})
+
+
+# =============================================================================
+# CHAVES E CLASSIFICACAO
+# =============================================================================
+
+def normalizar_consulta(valor: Any, texto_livre: bool = False) -> Any:
+    """
+    Forma canonica de uma consulta, para que variacoes equivalentes
+    caiam na mesma chave
+
+    Texto dos campos em CAMPOS_TEXTO_LIVRE perde espacos extras e
+    diferenca de caixa; os demais textos (URLs e ids diferenciam caixa)
+    ficam como informados. Dicts tem as chaves ordenadas (na
+    serializacao) e perdem valores None.
+
+    Args:
+        valor: Parametros da consulta (dict, lista, texto, numero...)
+        texto_livre: Se `valor` esta sob um campo de texto livre
+
+    Returns:
+        Estrutura equivalente normalizada
+    """
+    if isinstance(valor, str):
+        return " ".join(valor.split()).casefold() if texto_livre else valor
+    if isinstance(valor, dict):
+        return {
+            str(k): normalizar_consulta(v, texto_livre or str(k) in CAMPOS_TEXTO_LIVRE)
+            for k, v in valor.items() if v is not None
+        }
+    if isinstance(valor, (list, tuple)):
+        return [normalizar_consulta(v, texto_livre) for v in valor]
+    return valor
+
+
+def chave_consulta(operacao: str, params: Dict[str, Any]) -> str:
+    """
+    Chave de cache de uma consulta
+
+    Args:
+        operacao: Nome da operacao (ex: 'publicacao')
+        params: Parametros da consulta
+
+    Returns:
+        "<operacao>:<sha256 da consulta normalizada>"
+    """
+    texto = json.dumps(normalizar_consulta(params), sort_keys=True, ensure_ascii=False, default=str)
+    return f"{operacao}:{hashlib.sha256(texto.encode('utf-8')).hexdigest()[:40]}"
+
+
+def classificar_resultado(resultado: Any) -> Optional[str]:
+    """
+    Classificacao padrao de um resultado no formato dos clientes
+    ({'sucesso': ..., 'erro': ...})
+
+    Args:
+        resultado: Retorno do metodo consultado
+
+    Returns:
+        POSITIVO, NEGATIVO (sucesso com total zero, HTTP 404 ou
+        'nao_encontrado') ou None para nao guardar (erros)
+    """
+    if not isinstance(resultado, dict):
+        return None
+    if resultado.get("sucesso"):
+        for campo in _CAMPOS_TOTAL:
+            if campo in resultado:
+                return NEGATIVO if not resultado[campo] else POSITIVO
+        return POSITIVO
+    if resultado.get("nao_encontrado") or resultado.get("status_code") == 404:
+        return NEGATIVO
+    return None
+
+
+# =============================================================================
+# CACHE
+# =============================================================================
+
+class CacheRespostas:
+    """
+    Cache de respostas por fonte sobre um SQLiteCacheStore
+
+    Cada fonte ('datajud', 'cnj', 'jusbrasil') e um namespace do store,
+    com TTL proprio para respostas encontradas e para "nao encontrado".
+    """
+
+    def __init__(
+        self,
+        store: SQLiteCacheStore,
+        ttls: Optional[Dict[str, float]] = None,
+        ttls_negativos: Optional[Dict[str, float]] = None
+    ):
+        """
+        Inicializa o cache.
+
+        Args:
+            store: Store SQLite (compartilhado entre processos)
+            ttls: TTL por fonte das respostas encontradas (sobrepoe TTLS_POR_FONTE)
+            ttls_negativos: TTL por fonte do cache negativo
+                (sobrepoe TTLS_NEGATIVOS_POR_FONTE)
+        """
+        self.store = store
+        self.ttls = {**TTLS_POR_FONTE, **(ttls or {})}
+        self.ttls_negativos = {**TTLS_NEGATIVOS_POR_FONTE, **(ttls_negativos or {})}
+        self._lock = threading.Lock()
+        self._contadores: Dict[str, Dict[str, int]] = {}
+
+    def _contar(self, fonte: str, contador: str):
+        """Incrementa um contador da fonte"""
+        with self._lock:
+            contadores = self._contadores.setdefault(fonte, {
+                "hits": 0, "negative_hits": 0, "misses": 0,
+                "writes": 0, "negative_writes": 0, "partial_writes": 0, "skipped": 0,
+            })
+            contadores[contador] += 1
+
+    def ttl(self, fonte: str, negativo: bool = False) -> float:
+        """TTL da fonte (do cache negativo, se `negativo`)"""
+        if negativo:
+            return self.ttls_negativos.get(fonte, DEFAULT_TTL_NEGATIVO)
+        return self.ttls.get(fonte, DEFAULT_TTL)
+
+    def obter(self, fonte: str, operacao: str, params: Dict[str, Any]) -> Optional[Any]:
+        """
+        Resposta guardada de uma consulta
+
+        Args:
+            fonte: Fonte (namespace)
+            operacao: Nome da operacao
+            params: Parametros da consulta
+
+        Returns:
+            Resposta guardada (inclusive "nao encontrado") ou None
+        """
+        entrada = self.store.get(chave_consulta(operacao, params), fonte)
+        if not isinstance(entrada, dict) or "valor" not in entrada:
+            self._contar(fonte, "misses")
+            return None
+        self._contar(fonte, "negative_hits" if entrada.get("negativo") else "hits")
+        return entrada["valor"]
+
+    def gravar(
+        self,
+        fonte: str,
+        operacao: str,
+        params: Dict[str, Any],
+        valor: Any,
+        classificar: Callable[[Any], Optional[str]] = classificar_resultado
+    ) -> bool:
+        """
+        Guarda a resposta de uma consulta, conforme a classificacao
+
+        Args:
+            fonte: Fonte (namespace)
+            operacao: Nome da operacao
+            params: Parametros da consulta
+            valor: Resposta (serializavel em JSON)
+            classificar: POSITIVO/NEGATIVO/PARCIAL/None para a resposta
+
+        Returns:
+            True se a resposta foi guardada
+        """
+        classe = classificar(valor)
+        if classe is None:
+            self._contar(fonte, "skipped")
+            return False
+
+        negativo = classe == NEGATIVO
+        ttl = self.ttl(fonte, negativo)
+        if classe == PARCIAL:
+            ttl = min(ttl, DEFAULT_TTL_PARCIAL)
+        self.store.set(
+            chave_consulta(operacao, params),
+            {"negativo": negativo, "valor": valor},
+            ttl,
+            fonte
+        )
+        self._contar(fonte, {NEGATIVO: "negative_writes", PARCIAL: "partial_writes"}.get(classe, "writes"))
+        return True
+
+    def consultar(
+        self,
+        fonte: str,
+        operacao: str,
+        params: Dict[str, Any],
+        buscar: Callable[[], Any],
+        classificar: Callable[[Any], Optional[str]] = classificar_resultado
+    ) -> Any:
+        """
+        Resposta do cache ou, na falta, de `buscar()` (guardada em seguida)
+
+        Args:
+            fonte: Fonte (namespace)
+            operacao: Nome da operacao
+            params: Parametros da consulta
+            buscar: Faz a consulta externa
+            classificar: POSITIVO/NEGATIVO/PARCIAL/None para a resposta
+
+        Returns:
+            Resposta da consulta
+        """
+        valor = self.obter(fonte, operacao, params)
+        if valor is not None:
+            return valor
+        valor = buscar()
+        self.gravar(fonte, operacao, params, valor, classificar)
+        return valor
+
+    def invalidar(self, fonte: str, operacao: str, params: Dict[str, Any]):
+        """Remove a resposta guardada de uma consulta"""
+        self.store.delete(chave_consulta(operacao, params), fonte)
+
+    def limpar(self, fonte: Optional[str] = None):
+        """Remove as respostas de uma fonte (ou de todas)"""
+        self.store.clear(fonte)
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Contadores por fonte (com hit_rate) e tamanho do store"""
+        with self._lock:
+            fontes = {}
+            for fonte, contadores in self._contadores.items():
+                acertos = contadores["hits"] + contadores["negative_hits"]
+                consultas = acertos + contadores["misses"]
+                fontes[fonte] = {
+                    **contadores,
+                    "hit_rate": acertos / consultas if consultas else 0.0,
+                }
+        return {"fontes": fontes, "store": self.store.stats}
+
+
+def com_cache(
+    fonte: str,
+    operacao: str,
+    chave: Optional[Callable[[Any, Dict[str, Any]], Dict[str, Any]]] = None,
+    classificar: Callable[[Any], Optional[str]] = classificar_resultado
+):
+    """
+    Decorador de metodo de cliente: responde do cache quando possivel
+
+    O cliente expoe o cache na propriedade `_cache` (None = desligado).
+    Os parametros da consulta sao os argumentos do metodo (com os
+    valores padrao), transformados por `chave` se informado.
+
+    Args:
+        fonte: Fonte (namespace)
+        operacao: Nome da operacao
+        chave: (self, argumentos) -> parametros da chave
+        classificar: POSITIVO/NEGATIVO/PARCIAL/None para a resposta
+
+    Returns:
+        Decorador
+    """
+    def decorador(metodo):
+        assinatura = inspect.signature(metodo)
+
+        @functools.wraps(metodo)
+        def wrapper(self, *args, **kwargs):
+            cache = self._cache
+            if cache is None:
+                return metodo(self, *args, **kwargs)
+
+            argumentos = assinatura.bind(self, *args, **kwargs)
+            argumentos.apply_defaults()
+            params = dict(argumentos.arguments)
+            params.pop("self", None)
+            if chave is not None:
+                params = chave(self, params)
+
+            return cache.consultar(
+                fonte, operacao, params,
+                lambda: metodo(self, *args, **kwargs),
+                classificar
+            )
+
+        return wrapper
+
+    return decorador
+
+
+# =============================================================================
+# INSTANCIA COMPARTILHADA
+# =============================================================================
+
+def _criar_cache(caminho: str) -> CacheRespostas:
+    return CacheRespostas(SQLiteCacheStore(
+        caminho,
+        max_entries=DEFAULT_MAX_ENTRIES,
+        eviction_interval=DEFAULT_EVICTION_INTERVAL
+    ))
+
+
+_caches: RegistroPorCaminho[CacheRespostas] = RegistroPorCaminho(_criar_cache)
+
+
+def obter_cache_respostas(db_path: Optional[str] = None) -> CacheRespostas:
+    """
+    Retorna o cache de respostas do processo para o arquivo informado
+
+    Args:
+        db_path: Arquivo SQLite (padrao ROM_RESPONSE_CACHE_DB ou ~/.rom_agent)
+
+    Returns:
+        CacheRespostas unico por arquivo no processo
+    """
+    return _caches.obter(db_path or DEFAULT_RESPONSE_DB)
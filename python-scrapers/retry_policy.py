@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Retry Policy - Politica de retry compartilhada entre os scrapers
+
+Cada scraper repetia requisicoes a sua maneira: o ESAJ tinha um laco
+proprio e ainda montava o Retry do urllib3 no adapter (as tentativas se
+multiplicavam), o PJe dormia o backoff do rate limiter e o PROJUDI
+dormia `2 ** tentativa` sem jitter. Nenhum tinha prazo total, entao um
+portal lento prendia um worker por minutos. Este modulo concentra:
+
+- Prazo total por chamada (todas as tentativas e esperas somadas);
+  o timeout de cada tentativa e limitado ao que resta do prazo
+- Backoff exponencial com jitter decorrelacionado
+- Orcamento de retries por tribunal (token bucket compartilhado no
+  processo): retries sao no maximo uma fracao das requisicoes, de modo
+  que uma queda do portal nao vira uma tempestade de retries
+- Classificacao de erros e status HTTP que valem um retry
+
+A politica so decide se e quanto esperar; o laco de requisicao continua
+em cada scraper, o que serve tanto a camada sincrona (time.sleep) quanto
+a assincrona (asyncio.sleep).
+
+Autor: ROM-Agent Integration System
+Data: 2026-01-12
+Versao: 1.0.0
+"""
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple, Type
+
+# Dependencias externas (classificacao dos erros de cada cliente HTTP)
+try:
+    import requests
+    REQUESTS_AVAILABLE = True
+except ImportError:
+    REQUESTS_AVAILABLE = False
+    requests = None
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+    httpx = None
+
+
+# =============================================================================
+# CONSTANTES E CONFIGURACOES
+# =============================================================================
+
+DEFAULT_MAX_TENTATIVAS = 3
+DEFAULT_PRAZO_TOTAL = 120.0  # segundos por chamada, somando todas as tentativas
+DEFAULT_BACKOFF_BASE = 0.5  # espera minima entre tentativas (segundos)
+DEFAULT_BACKOFF_MAXIMO = 30.0  # teto de cada espera (segundos)
+DEFAULT_RAZAO_ORCAMENTO = 0.2  # retries creditados por requisicao
+DEFAULT_ORCAMENTO_MINIMO = 10.0  # retries disponiveis mesmo sem trafego
+
+# Status que indicam falha transitoria do portal
+STATUS_RETENTAVEIS = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+# Motivos de parada (ExecucaoRetry.motivo)
+MOTIVO_NAO_RETENTAVEL = "nao_retentavel"
+MOTIVO_TENTATIVAS = "tentativas_esgotadas"
+MOTIVO_PRAZO = "prazo_esgotado"
+MOTIVO_ORCAMENTO = "orcamento_esgotado"
+
+
+def _erros_retentaveis() -> Tuple[Type[BaseException], ...]:
+    """Excecoes de rede/timeout de cada cliente HTTP disponivel"""
+    erros = [TimeoutError, ConnectionError]
+    if REQUESTS_AVAILABLE:
+        erros += [requests.exceptions.Timeout, requests.exceptions.ConnectionError]
+    if HTTPX_AVAILABLE:
+        erros += [httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError]
+    return tuple(erros)
+
+
+def _erros_definitivos() -> Tuple[Type[BaseException], ...]:
+    """Excecoes que parecem de rede mas nao melhoram com retry"""
+    if REQUESTS_AVAILABLE:
+        return (requests.exceptions.SSLError,)
+    return ()
+
+
+ERROS_RETENTAVEIS = _erros_retentaveis()
+ERROS_DEFINITIVOS = _erros_definitivos()
+
+
+# =============================================================================
+# CLASSIFICACAO
+# =============================================================================
+
+def eh_retentavel(
+    erro: Optional[BaseException] = None,
+    status_code: Optional[int] = None,
+    extras: Tuple[Type[BaseException], ...] = ()
+) -> bool:
+    """
+    Se a falha e transitoria (vale tentar de novo)
+
+    Args:
+        erro: Excecao da tentativa
+        status_code: Status HTTP da resposta
+        extras: Excecoes adicionais tratadas como transitorias
+
+    Returns:
+        True para timeout, erro de conexao e status 408/425/429/5xx
+        transitorios; False para o resto (4xx, SSL, erros de parse...)
+    """
+    if erro is not None:
+        if isinstance(erro, ERROS_DEFINITIVOS):
+            return False
+        return isinstance(erro, ERROS_RETENTAVEIS + tuple(extras))
+    return status_code in STATUS_RETENTAVEIS
+
+
+# =============================================================================
+# ORCAMENTO DE RETRIES
+# =============================================================================
+
+class OrcamentoRetry:
+    """
+    Orcamento de retries de um tribunal
+
+    Cada requisicao credita `razao` retries (ate o teto); cada retry
+    debita um. Com o portal saudavel o saldo fica cheio; numa queda, em
+    que toda requisicao falha, os retries param quando o saldo acaba e o
+    trafego extra fica limitado a `razao` das requisicoes.
+    """
+
+    def __init__(
+        self,
+        razao: float = DEFAULT_RAZAO_ORCAMENTO,
+        minimo: float = DEFAULT_ORCAMENTO_MINIMO
+    ):
+        """
+        Inicializa o orcamento.
+
+        Args:
+            razao: Retries creditados por requisicao
+            minimo: Saldo inicial e teto do saldo
+        """
+        self.razao = max(0.0, razao)
+        self.teto = max(1.0, minimo)
+        self._saldo = self.teto
+        self._lock = threading.Lock()
+        self.retries = 0
+        self.negados = 0
+
+    def registrar_requisicao(self):
+        """Credita a fracao de retry de uma requisicao"""
+        with self._lock:
+            self._saldo = min(self.teto, self._saldo + self.razao)
+
+    def retirar(self) -> bool:
+        """
+        Debita um retry
+
+        Returns:
+            False se o saldo acabou (o retry nao deve acontecer)
+        """
+        with self._lock:
+            if self._saldo < 1.0:
+                self.negados += 1
+                return False
+            self._saldo -= 1.0
+            self.retries += 1
+            return True
+
+    @property
+    def saldo(self) -> float:
+        """Retries disponiveis no momento"""
+        with self._lock:
+            return self._saldo
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Estatisticas do orcamento"""
+        with self._lock:
+            return {
+                "saldo": round(self._saldo, 2),
+                "retries": self.retries,
+                "negados": self.negados,
+            }
+
+
+_orcamentos: Dict[str, OrcamentoRetry] = {}
+_orcamentos_lock = threading.Lock()
+
+
+def obter_orcamento_retry(chave: str, **kwargs) -> OrcamentoRetry:
+    """
+    Retorna o orcamento de retries do processo para a chave
+
+    Todos os scrapers do processo que falam com o mesmo tribunal
+    dividem o mesmo saldo.
+
+    Args:
+        chave: Tribunal ou host
+        **kwargs: Argumentos de OrcamentoRetry, usados apenas na criacao
+
+    Returns:
+        OrcamentoRetry unico por chave
+    """
+    with _orcamentos_lock:
+        orcamento = _orcamentos.get(chave)
+        if orcamento is None:
+            orcamento = OrcamentoRetry(**kwargs)
+            _orcamentos[chave] = orcamento
+        return orcamento
+
+
+# =============================================================================
+# POLITICA E EXECUCAO
+# =============================================================================
+
+@dataclass
+class PoliticaRetry:
+    """Parametros de retry e prazo de uma chamada HTTP"""
+    max_tentativas: int = DEFAULT_MAX_TENTATIVAS
+    prazo_total: Optional[float] = DEFAULT_PRAZO_TOTAL  # None = sem prazo
+    backoff_base: float = DEFAULT_BACKOFF_BASE
+    backoff_maximo: float = DEFAULT_BACKOFF_MAXIMO
+    usar_orcamento: bool = True
+    erros_extras: Tuple[Type[BaseException], ...] = ()
+
+    def iniciar(
+        self,
+        chave: Optional[str] = None,
+        max_tentativas: Optional[int] = None
+    ) -> "ExecucaoRetry":
+        """
+        Comeca uma chamada sob esta politica
+
+        Args:
+            chave: Tribunal/host do orcamento de retries (None = sem orcamento)
+            max_tentativas: Sobrescreve max_tentativas nesta chamada
+
+        Returns:
+            ExecucaoRetry da chamada
+        """
+        orcamento = obter_orcamento_retry(chave) if chave and self.usar_orcamento else None
+        return ExecucaoRetry(self, orcamento, max_tentativas or self.max_tentativas)
+
+
+class ExecucaoRetry:
+    """
+    Estado de uma chamada: tentativas feitas, prazo e ultima espera
+
+    Uso no laco de requisicao (sincrono ou assincrono):
+
+        execucao = politica.iniciar(chave)
+        while execucao.nova_tentativa():
+            try:
+                response = cliente.get(url, timeout=execucao.timeout(padrao))
+            except ERROS_RETENTAVEIS as e:
+                espera = execucao.espera(erro=e)
+            else:
+                if response.status_code not in STATUS_RETENTAVEIS:
+                    return response
+                espera = execucao.espera(status_code=response.status_code)
+            if espera is None:
+                break  # execucao.motivo diz por que
+            time.sleep(espera)  # ou await asyncio.sleep(espera)
+    """
+
+    def __init__(
+        self,
+        politica: PoliticaRetry,
+        orcamento: Optional[OrcamentoRetry] = None,
+        max_tentativas: Optional[int] = None
+    ):
+        self.politica = politica
+        self.orcamento = orcamento
+        self.max_tentativas = max(1, max_tentativas or politica.max_tentativas)
+        self.tentativas = 0
+        self.motivo: Optional[str] = None  # por que parou de repetir
+        self.inicio = time.monotonic()
+        self._ultima_espera = politica.backoff_base
+
+    @property
+    def restante(self) -> Optional[float]:
+        """Segundos que restam do prazo (None = sem prazo)"""
+        if self.politica.prazo_total is None:
+            return None
+        return max(0.0, self.politica.prazo_total - (time.monotonic() - self.inicio))
+
+    def nova_tentativa(self) -> bool:
+        """
+        Registra o inicio de uma tentativa
+
+        Returns:
+            False se as tentativas ou o prazo acabaram
+        """
+        if self.tentativas >= self.max_tentativas:
+            self.motivo = self.motivo or MOTIVO_TENTATIVAS
+            return False
+        if self.tentativas and self.restante is not None and self.restante <= 0:
+            self.motivo = MOTIVO_PRAZO
+            return False
+        self.tentativas += 1
+        if self.orcamento is not None:
+            self.orcamento.registrar_requisicao()
+        return True
+
+    def timeout(self, padrao: float) -> float:
+        """Timeout da tentativa: o padrao, limitado ao que resta do prazo"""
+        restante = self.restante
+        if restante is None:
+            return padrao
+        return max(0.1, min(padrao, restante))
+
+    def espera(
+        self,
+        erro: Optional[BaseException] = None,
+        status_code: Optional[int] = None,
+        retry_after: Optional[float] = None
+    ) -> Optional[float]:
+        """
+        Espera ate a proxima tentativa apos uma falha, ou None para parar
+
+        Com None, `motivo` diz por que a chamada nao deve ser repetida.
+
+        Args:
+            erro: Excecao da tentativa
+            status_code: Status HTTP da resposta
+            retry_after: Espera minima pedida pelo servidor (Retry-After)
+                ou pelo rate limiter do tribunal
+
+        Returns:
+            Segundos a esperar antes de repetir, ou None
+        """
+        if not eh_retentavel(erro, status_code, self.politica.erros_extras):
+            self.motivo = MOTIVO_NAO_RETENTAVEL
+            return None
+        if self.tentativas >= self.max_tentativas:
+            self.motivo = MOTIVO_TENTATIVAS
+            return None
+
+        # Jitter decorrelacionado: aleatorio entre a base e 3x a espera anterior
+        espera = min(
+            self.politica.backoff_maximo,
+            random.uniform(self.politica.backoff_base, self._ultima_espera * 3)
+        )
+        if retry_after is not None:
+            espera = max(espera, retry_after)
+
+        restante = self.restante
+        if restante is not None and espera >= restante:
+            self.motivo = MOTIVO_PRAZO
+            return None
+        if self.orcamento is not None and not self.orcamento.retirar():
+            self.motivo = MOTIVO_ORCAMENTO
+            return None
+
+        self._ultima_espera = espera
+        self.motivo = None
+        return espera
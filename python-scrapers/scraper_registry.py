@@ -0,0 +1,530 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Scraper Registry - Instancias de scraper reaproveitadas no processo
+
+As funcoes de modulo (extrair_processo_esaj, extrair_processo_pje,
+extrair_processo_projudi) criavam um scraper novo a cada chamada: novo
+LogManager (com handlers de arquivo adicionados de novo), cache aberto do
+zero, novas conexoes TCP/TLS e, no PJe/PROJUDI, novo login. Este modulo
+mantem um registro de scrapers configurados:
+
+- Uma instancia por chave (sistema, tribunal, credencial, configuracao)
+- Conexoes keep-alive, cache e sessao autenticada reaproveitados
+- Acesso concorrente seguro (threads e tarefas asyncio)
+- Instancias ociosas fechadas apos DEFAULT_IDLE_TTL segundos e limite
+  de instancias por processo (as menos usadas recentemente saem antes)
+
+Senhas nunca entram na chave: use chave_credencial().
+
+Clientes httpx ficam presos ao event loop que os criou. As funcoes
+sincronas (extrair_processo_*_sync) rodam no loop dos scrapers
+(obter_loop_scrapers), um event loop de longa duracao numa thread propria:
+chamadas sincronas de qualquer thread usam o mesmo loop e, portanto, os
+mesmos clientes, buscas compartilhadas e revalidacoes em segundo plano.
+
+Autor: ROM-Agent Integration System
+Data: 2026-01-12
+Versao: 1.0.0
+"""
+
+import asyncio
+import hashlib
+import inspect
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Coroutine, Dict, Hashable, Iterator, List, Optional
+
+
+# =============================================================================
+# CONSTANTES E CONFIGURACOES
+# =============================================================================
+
+DEFAULT_IDLE_TTL = 600.0  # segundos sem uso ate a instancia ser fechada
+DEFAULT_MAX_SCRAPERS = 32  # instancias mantidas no processo
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# ESTRUTURAS
+# =============================================================================
+
+@dataclass
+class _Entrada:
+    """Scraper registrado e seu uso"""
+    scraper: Any
+    fechar: Optional[Callable[[Any], Any]]
+    criado_em: float
+    ultimo_uso: float
+    em_uso: int = 0
+    usos: int = 0
+    loop: Optional[asyncio.AbstractEventLoop] = None  # ultimo loop que o usou
+
+
+def _loop_atual() -> Optional[asyncio.AbstractEventLoop]:
+    """Event loop em execucao nesta thread, ou None"""
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def fechar_no_loop_dono(
+    fechamento: Coroutine[Any, Any, Any],
+    dono: Optional[asyncio.AbstractEventLoop]
+) -> bool:
+    """
+    Agenda o fechamento de um recurso async no loop em que ele foi criado
+
+    Usado quando o scraper passa a outro loop: o cliente antigo nao pode
+    ser fechado (nem usado) no loop atual.
+
+    Args:
+        fechamento: Coroutine de fechamento (ex.: client.aclose())
+        dono: Loop que criou o recurso
+
+    Returns:
+        True se agendado; False se o loop dono nao esta mais rodando (a
+        coroutine e descartada e as conexoes ficam para o coletor)
+    """
+    if dono is not None and not dono.is_closed() and dono.is_running():
+        asyncio.run_coroutine_threadsafe(fechamento, dono)
+        return True
+    fechamento.close()
+    return False
+
+
+def chave_credencial(usuario: Optional[str], senha: Optional[str] = None) -> Optional[str]:
+    """
+    Identificador de credencial para compor chaves do registro
+
+    Args:
+        usuario: Login (CPF, usuario)
+        senha: Senha; trocar a senha gera outra chave
+
+    Returns:
+        Hash SHA-256 de usuario e senha, ou None sem usuario
+    """
+    if not usuario:
+        return None
+    return hashlib.sha256(f"{usuario}\x00{senha or ''}".encode("utf-8")).hexdigest()
+
+
+# =============================================================================
+# REGISTRO
+# =============================================================================
+
+class RegistroScrapers:
+    """
+    Registro de scrapers por chave
+
+    Uso:
+        registro = obter_registro_scrapers()
+        with registro.emprestar(("esaj", True), AsyncESAJScraper, fechar=...) as scraper:
+            ...
+
+    Enquanto emprestada, a instancia nao e fechada por ociosidade nem
+    pelo limite de instancias.
+    """
+
+    def __init__(
+        self,
+        idle_ttl: float = DEFAULT_IDLE_TTL,
+        max_scrapers: int = DEFAULT_MAX_SCRAPERS
+    ):
+        """
+        Inicializa o registro
+
+        Args:
+            idle_ttl: Segundos sem uso ate a instancia ser fechada
+            max_scrapers: Maximo de instancias mantidas
+        """
+        self.idle_ttl = idle_ttl
+        self.max_scrapers = max(1, max_scrapers)
+        self._entradas: Dict[Hashable, _Entrada] = {}
+        self._lock = threading.Lock()
+        self._criando: Dict[Hashable, threading.Lock] = {}  # lock por chave em criacao
+        self._criacoes = 0
+        self._reusos = 0
+        self._descartes = 0
+
+    # -------------------------------------------------------------------------
+    # Consulta
+    # -------------------------------------------------------------------------
+
+    def obter(
+        self,
+        chave: Hashable,
+        fabrica: Callable[[], Any],
+        fechar: Optional[Callable[[Any], Any]] = None
+    ) -> Any:
+        """
+        Retorna o scraper da chave, criando com `fabrica` se necessario
+
+        Args:
+            chave: Identificacao da configuracao (tupla hashable)
+            fabrica: Cria o scraper (chamada no maximo uma vez por chave
+                enquanto a instancia estiver registrada)
+            fechar: Libera recursos do scraper ao ser descartado; pode
+                devolver uma coroutine
+
+        Returns:
+            Scraper registrado
+        """
+        return self._reservar(chave, fabrica, fechar, emprestar=False)
+
+    @contextmanager
+    def emprestar(
+        self,
+        chave: Hashable,
+        fabrica: Callable[[], Any],
+        fechar: Optional[Callable[[Any], Any]] = None
+    ) -> Iterator[Any]:
+        """
+        Empresta o scraper da chave durante o bloco `with`
+
+        Args:
+            chave: Identificacao da configuracao
+            fabrica: Cria o scraper se necessario
+            fechar: Libera recursos do scraper ao ser descartado
+
+        Yields:
+            Scraper registrado
+        """
+        scraper = self._reservar(chave, fabrica, fechar, emprestar=True)
+        try:
+            yield scraper
+        finally:
+            with self._lock:
+                entrada = self._entradas.get(chave)
+                if entrada is not None and entrada.scraper is scraper:
+                    entrada.em_uso -= 1
+                    entrada.ultimo_uso = time.monotonic()
+
+    def _reservar(
+        self,
+        chave: Hashable,
+        fabrica: Callable[[], Any],
+        fechar: Optional[Callable[[Any], Any]],
+        emprestar: bool
+    ) -> Any:
+        descartadas: List[_Entrada] = []
+        try:
+            with self._lock:
+                descartadas.extend(self._remover_ociosas(time.monotonic()))
+                entrada = self._entradas.get(chave)
+                if entrada is not None:
+                    self._reusos += 1
+                    return self._usar(entrada, emprestar)
+                criacao = self._criando.setdefault(chave, threading.Lock())
+
+            # Criado fora do lock global (a fabrica abre logs, cache e pode
+            # autenticar) sem travar as outras chaves; o lock da chave
+            # garante que chamadas simultaneas nao criem dois scrapers
+            with criacao:
+                with self._lock:
+                    entrada = self._entradas.get(chave)
+                    if entrada is not None:
+                        self._reusos += 1
+                        return self._usar(entrada, emprestar)
+
+                try:
+                    scraper = fabrica()
+                except BaseException:
+                    with self._lock:
+                        if self._criando.get(chave) is criacao:
+                            del self._criando[chave]
+                    raise
+
+                agora = time.monotonic()
+                with self._lock:
+                    entrada = _Entrada(
+                        scraper=scraper,
+                        fechar=fechar,
+                        criado_em=agora,
+                        ultimo_uso=agora,
+                    )
+                    self._entradas[chave] = entrada
+                    self._criacoes += 1
+                    if self._criando.get(chave) is criacao:
+                        del self._criando[chave]
+                    descartadas.extend(self._remover_excedentes(manter=chave))
+                    return self._usar(entrada, emprestar)
+        finally:
+            for antiga in descartadas:
+                self._fechar(antiga)
+
+    @staticmethod
+    def _usar(entrada: _Entrada, emprestar: bool) -> Any:
+        """Marca o uso de uma entrada (sob o lock) e devolve o scraper"""
+        entrada.ultimo_uso = time.monotonic()
+        entrada.usos += 1
+        if emprestar:
+            entrada.em_uso += 1
+        loop = _loop_atual()
+        if loop is not None:
+            entrada.loop = loop
+        return entrada.scraper
+
+    # -------------------------------------------------------------------------
+    # Descarte
+    # -------------------------------------------------------------------------
+
+    def _remover_ociosas(self, agora: float) -> List[_Entrada]:
+        """Remove (sob o lock) entradas ociosas alem do idle_ttl"""
+        if self.idle_ttl is None or self.idle_ttl <= 0:
+            return []
+        ociosas = [
+            chave for chave, entrada in self._entradas.items()
+            if entrada.em_uso == 0 and agora - entrada.ultimo_uso > self.idle_ttl
+        ]
+        return [self._entradas.pop(chave) for chave in ociosas]
+
+    def _remover_excedentes(self, manter: Hashable) -> List[_Entrada]:
+        """Remove (sob o lock) as entradas livres menos usadas acima do limite"""
+        excedente = len(self._entradas) - self.max_scrapers
+        if excedente <= 0:
+            return []
+        livres = sorted(
+            (
+                (entrada.ultimo_uso, chave) for chave, entrada in self._entradas.items()
+                if entrada.em_uso == 0 and chave != manter
+            ),
+            key=lambda item: item[0]
+        )
+        return [self._entradas.pop(chave) for _, chave in livres[:excedente]]
+
+    def _fechar(self, entrada: _Entrada):
+        """Libera recursos de uma entrada descartada (fora do lock)"""
+        self._descartes += 1
+        if entrada.fechar is None:
+            return
+        try:
+            resultado = entrada.fechar(entrada.scraper)
+            if inspect.isawaitable(resultado):
+                self._executar_fechamento(resultado, entrada.loop)
+        except Exception as e:
+            logger.debug(f"Falha ao fechar scraper descartado: {e}")
+
+    @staticmethod
+    def _executar_fechamento(resultado: Any, dono: Optional[asyncio.AbstractEventLoop]):
+        """
+        Executa a coroutine de fechamento no loop que usou o scraper
+
+        Clientes async (httpx) so podem ser fechados no loop em que foram
+        criados. Sem loop dono vivo, a coroutine roda no loop atual ou num
+        loop proprio (os scrapers apenas descartam clientes de loops
+        encerrados).
+
+        Args:
+            resultado: Coroutine devolvida por `fechar`
+            dono: Ultimo loop em que o scraper foi usado
+        """
+        atual = _loop_atual()
+        if dono is not None and not dono.is_closed():
+            if dono is atual:
+                dono.create_task(resultado)
+                return
+            if dono.is_running():
+                asyncio.run_coroutine_threadsafe(resultado, dono)
+                return
+            if atual is None:
+                dono.run_until_complete(resultado)
+                return
+        if atual is not None:
+            atual.create_task(resultado)
+        else:
+            asyncio.run(resultado)
+
+    def remover(self, chave: Hashable) -> bool:
+        """
+        Descarta o scraper de uma chave (ex.: apos erro de autenticacao)
+
+        Args:
+            chave: Identificacao da configuracao
+
+        Returns:
+            True se havia scraper registrado
+        """
+        with self._lock:
+            entrada = self._entradas.pop(chave, None)
+        if entrada is None:
+            return False
+        self._fechar(entrada)
+        return True
+
+    def limpar_ociosos(self) -> int:
+        """
+        Fecha as instancias ociosas alem do idle_ttl
+
+        Returns:
+            Numero de instancias fechadas
+        """
+        with self._lock:
+            descartadas = self._remover_ociosas(time.monotonic())
+        for entrada in descartadas:
+            self._fechar(entrada)
+        return len(descartadas)
+
+    def fechar_todos(self):
+        """Fecha e remove todas as instancias"""
+        with self._lock:
+            descartadas = list(self._entradas.values())
+            self._entradas.clear()
+        for entrada in descartadas:
+            self._fechar(entrada)
+
+    # -------------------------------------------------------------------------
+    # Estatisticas
+    # -------------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entradas)
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Estatisticas do registro"""
+        with self._lock:
+            return {
+                "instancias": len(self._entradas),
+                "em_uso": sum(1 for e in self._entradas.values() if e.em_uso),
+                "criacoes": self._criacoes,
+                "reusos": self._reusos,
+                "descartes": self._descartes,
+            }
+
+
+# =============================================================================
+# LOOP COMPARTILHADO
+# =============================================================================
+
+class LoopScrapers:
+    """
+    Event loop de longa duracao numa thread propria
+
+    Uso:
+        resultado = obter_loop_scrapers().executar(extrair_processo_esaj(numero))
+
+    Um asyncio.run por chamada sincrona criava um loop novo a cada vez:
+    o scraper do registro descartava o cliente (preso ao loop anterior),
+    buscas simultaneas de threads diferentes nao eram compartilhadas e as
+    revalidacoes em segundo plano eram canceladas no fim de cada chamada.
+    """
+
+    def __init__(self, nome: str = "scrapers-loop"):
+        """
+        Inicializa o loop (a thread so e criada no primeiro uso)
+
+        Args:
+            nome: Nome da thread do loop
+        """
+        self.nome = nome
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Loop em execucao, iniciando a thread se necessario"""
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._rodar, args=(self._loop,), name=self.nome, daemon=True
+                )
+                self._thread.start()
+            return self._loop
+
+    @staticmethod
+    def _rodar(loop: asyncio.AbstractEventLoop):
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_forever()
+        finally:
+            # Encerrado: cancela o que ficou pendente (ex.: revalidacoes)
+            pendentes = asyncio.all_tasks(loop)
+            for tarefa in pendentes:
+                tarefa.cancel()
+            loop.run_until_complete(asyncio.gather(*pendentes, return_exceptions=True))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
+
+    def executar(self, coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        """
+        Executa a coroutine no loop e aguarda o resultado nesta thread
+
+        Args:
+            coro: Coroutine a executar
+            timeout: Segundos maximos de espera (None = sem limite)
+
+        Returns:
+            Resultado da coroutine (excecoes sao propagadas)
+
+        Raises:
+            RuntimeError: Se chamado de dentro do proprio loop (travaria)
+        """
+        loop = self.loop
+        if _loop_atual() is loop:
+            coro.close()
+            raise RuntimeError("Chamada sincrona dentro do loop dos scrapers: use a versao async")
+        futuro = asyncio.run_coroutine_threadsafe(coro, loop)
+        try:
+            return futuro.result(timeout)
+        except BaseException:
+            # Timeout ou interrupcao do chamador: nao deixa a tarefa orfa
+            futuro.cancel()
+            raise
+
+    def encerrar(self, timeout: float = 5.0):
+        """
+        Para o loop e aguarda a thread (um uso posterior cria outro loop)
+
+        Args:
+            timeout: Segundos maximos de espera pela thread
+        """
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+
+# =============================================================================
+# INSTANCIA COMPARTILHADA
+# =============================================================================
+
+_registro: Optional[RegistroScrapers] = None
+_registro_lock = threading.Lock()
+_loop_scrapers = LoopScrapers()
+
+
+def obter_registro_scrapers() -> RegistroScrapers:
+    """
+    Retorna o registro de scrapers do processo
+
+    Returns:
+        RegistroScrapers unico no processo
+    """
+    global _registro
+    with _registro_lock:
+        if _registro is None:
+            _registro = RegistroScrapers()
+        return _registro
+
+
+def obter_loop_scrapers() -> LoopScrapers:
+    """
+    Retorna o loop compartilhado das funcoes sincronas
+
+    Returns:
+        LoopScrapers unico no processo
+    """
+    return _loop_scrapers
@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sync Cursors - Sincronizacao incremental de movimentacoes
+
+Atualizar um processo significava baixar a pagina, montar todas as
+movimentacoes (milhares em processos antigos) e substituir o resultado
+inteiro, mesmo quando nada mudou. Este modulo guarda, por processo, um
+cursor com a data da movimentacao mais recente e os hashes de conteudo
+das movimentacoes dessa data:
+
+- As linhas sao percorridas da mais recente para a mais antiga; apenas
+  a data de cada linha e lida ate o cursor, e so as linhas novas sao
+  montadas por completo
+- A leitura para na primeira linha anterior ao cursor
+- Linhas da mesma data do cursor sao comparadas pelo hash do conteudo
+- Cursores persistidos em SQLite (WAL), compartilhados entre threads e
+  processos
+
+Movimentacoes lancadas com data anterior ao cursor (retificacoes
+retroativas) nao sao detectadas; remova o cursor para ressincronizar.
+
+Autor: ROM-Agent Integration System
+Data: 2026-01-12
+Versao: 1.0.0
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from cache_store import ConexoesSQLite, RegistroPorCaminho
+
+
+# =============================================================================
+# CONSTANTES E CONFIGURACOES
+# =============================================================================
+
+DEFAULT_SYNC_DB = os.environ.get(
+    "ROM_SYNC_DB",
+    str(Path.home() / ".rom_agent" / "sync" / "cursores.db")
+)
+DEFAULT_BUSY_TIMEOUT_MS = 5000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cursores (
+    sistema       TEXT NOT NULL,
+    processo      TEXT NOT NULL,
+    ultima_data   TEXT NOT NULL,
+    hashes        TEXT NOT NULL,
+    total         INTEGER NOT NULL,
+    atualizado_em REAL NOT NULL,
+    PRIMARY KEY (sistema, processo)
+);
+"""
+
+
+# =============================================================================
+# ESTRUTURAS
+# =============================================================================
+
+@dataclass
+class CursorMovimentacoes:
+    """Posicao da ultima sincronizacao de um processo"""
+    ultima_data: str
+    hashes: Tuple[str, ...] = ()
+    total: int = 0
+    atualizado_em: float = 0.0
+
+
+@dataclass
+class DeltaMovimentacoes:
+    """Resultado de uma sincronizacao"""
+    sistema: str
+    numero_processo: str
+    novas: List[Any] = field(default_factory=list)
+    cursor: Optional[CursorMovimentacoes] = None
+    primeira_sincronizacao: bool = False
+    linhas_lidas: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Converte para dicionario"""
+        return {
+            "sistema": self.sistema,
+            "numero_processo": self.numero_processo,
+            "novas": [m.to_dict() if hasattr(m, "to_dict") else m for m in self.novas],
+            "total_novas": len(self.novas),
+            "ultima_data": self.cursor.ultima_data if self.cursor else None,
+            "total_conhecidas": self.cursor.total if self.cursor else 0,
+            "primeira_sincronizacao": self.primeira_sincronizacao,
+            "linhas_lidas": self.linhas_lidas,
+        }
+
+
+def hash_movimentacao(data: str, descricao: str, ocorrencia: int = 0) -> str:
+    """
+    Hash de conteudo de uma movimentacao
+
+    Movimentacoes identicas na mesma data (ex: dois "Juntada de
+    Peticao") sao distinguidas pela ocorrencia; a primeira mantem o
+    hash sem sufixo, compativel com cursores ja gravados.
+
+    Args:
+        data: Data (ISO) da movimentacao
+        descricao: Descricao; espacos e caixa nao alteram o hash
+        ocorrencia: Quantas movimentacoes identicas a precedem na data
+
+    Returns:
+        Hash hexadecimal
+    """
+    texto = f"{data}\x00{' '.join((descricao or '').split()).lower()}"
+    if ocorrencia:
+        texto += f"\x00{ocorrencia}"
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()[:32]
+
+
+# =============================================================================
+# DELTA
+# =============================================================================
+
+def movimentacoes_novas(
+    linhas: Sequence[Any],
+    data_da_linha: Callable[[Any], Optional[str]],
+    montar: Callable[[Any], Optional[Any]],
+    assinatura: Callable[[Any], Tuple[str, str]],
+    cursor: Optional[CursorMovimentacoes]
+) -> Tuple[List[Any], int]:
+    """
+    Monta apenas as movimentacoes posteriores ao cursor
+
+    Args:
+        linhas: Linhas da tabela (ou registros) na ordem da fonte,
+            crescente ou decrescente por data
+        data_da_linha: Data ISO da linha (leitura barata) ou None
+        montar: Movimentacao completa da linha ou None
+        assinatura: (data ISO, descricao) de uma movimentacao montada
+        cursor: Cursor da ultima sincronizacao (None = todas sao novas)
+
+    Returns:
+        (movimentacoes novas da mais recente para a mais antiga,
+        linhas montadas)
+    """
+    ordem = range(len(linhas))
+    primeira = next((d for d in map(data_da_linha, linhas) if d), None)
+    ultima = next((d for d in map(data_da_linha, reversed(linhas)) if d), None)
+    if primeira and ultima and primeira < ultima:
+        ordem = reversed(ordem)
+
+    conhecidos = set(cursor.hashes) if cursor else set()
+    ocorrencias: Dict[str, int] = {}
+    novas: List[Any] = []
+    montadas = 0
+
+    for indice in ordem:
+        linha = linhas[indice]
+        data = data_da_linha(linha)
+        if not data:
+            continue
+        if cursor and data < cursor.ultima_data:
+            break
+
+        mov = montar(linha)
+        montadas += 1
+        if mov is None:
+            continue
+        if cursor and data == cursor.ultima_data:
+            # A n-esima movimentacao identica da data so e conhecida se o
+            # cursor guardou ao menos n delas
+            base = hash_movimentacao(*assinatura(mov))
+            ocorrencia = ocorrencias.get(base, 0)
+            ocorrencias[base] = ocorrencia + 1
+            if hash_movimentacao(*assinatura(mov), ocorrencia) in conhecidos:
+                continue
+        novas.append(mov)
+
+    return novas, montadas
+
+
+def avancar_cursor(
+    cursor: Optional[CursorMovimentacoes],
+    novas: List[Any],
+    assinatura: Callable[[Any], Tuple[str, str]]
+) -> Optional[CursorMovimentacoes]:
+    """
+    Cursor apos incorporar as movimentacoes novas
+
+    Args:
+        cursor: Cursor anterior
+        novas: Movimentacoes novas
+        assinatura: (data ISO, descricao) de uma movimentacao
+
+    Returns:
+        Novo cursor (None se nao houver cursor nem movimentacoes)
+    """
+    agora = time.time()
+    if not novas:
+        if cursor is None:
+            return None
+        return CursorMovimentacoes(cursor.ultima_data, cursor.hashes, cursor.total, agora)
+
+    assinaturas = [assinatura(m) for m in novas]
+    ultima_data = max(data for data, _ in assinaturas)
+    total = len(novas)
+    hashes: List[str] = []
+
+    if cursor is not None:
+        total += cursor.total
+        if cursor.ultima_data > ultima_data:
+            return CursorMovimentacoes(cursor.ultima_data, cursor.hashes, total, agora)
+        if cursor.ultima_data == ultima_data:
+            hashes = list(cursor.hashes)
+
+    # Cada movimentacao nova ocupa a primeira ocorrencia livre do seu
+    # conteudo na data
+    vistos = set(hashes)
+    for data, desc in assinaturas:
+        if data != ultima_data:
+            continue
+        ocorrencia = 0
+        while hash_movimentacao(data, desc, ocorrencia) in vistos:
+            ocorrencia += 1
+        hash_mov = hash_movimentacao(data, desc, ocorrencia)
+        vistos.add(hash_mov)
+        hashes.append(hash_mov)
+
+    return CursorMovimentacoes(ultima_data, tuple(hashes), total, agora)
+
+
+# =============================================================================
+# STORE DE CURSORES
+# =============================================================================
+
+class CursorStore:
+    """
+    Cursores de sincronizacao por (sistema, processo) em SQLite (WAL)
+
+    Cada thread usa sua propria conexao; processos diferentes
+    compartilham o mesmo arquivo.
+    """
+
+    def __init__(self, db_path: str, busy_timeout_ms: int = DEFAULT_BUSY_TIMEOUT_MS):
+        """
+        Inicializa o store
+
+        Args:
+            db_path: Caminho do arquivo SQLite
+            busy_timeout_ms: Tempo de espera por lock de outro processo
+        """
+        self.db_path = Path(db_path)
+        self.busy_timeout_ms = busy_timeout_ms
+        self._conexoes = ConexoesSQLite(self.db_path, busy_timeout_ms)
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn().executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        """Retorna conexao da thread atual, criando se necessario"""
+        return self._conexoes.obter()
+
+    def get(self, sistema: str, processo: str) -> Optional[CursorMovimentacoes]:
+        """
+        Recupera o cursor de um processo
+
+        Args:
+            sistema: Sistema/tribunal (ex.: "esaj", "datajud")
+            processo: Numero do processo (e instancia, se houver)
+
+        Returns:
+            CursorMovimentacoes ou None se nunca sincronizado
+        """
+        row = self._conn().execute(
+            "SELECT ultima_data, hashes, total, atualizado_em FROM cursores "
+            "WHERE sistema = ? AND processo = ?",
+            (sistema, processo)
+        ).fetchone()
+        if row is None:
+            return None
+        ultima_data, hashes, total, atualizado_em = row
+        return CursorMovimentacoes(ultima_data, tuple(json.loads(hashes)), total, atualizado_em)
+
+    def set(self, sistema: str, processo: str, cursor: CursorMovimentacoes):
+        """Grava o cursor de um processo"""
+        self._conn().execute(
+            "INSERT OR REPLACE INTO cursores "
+            "(sistema, processo, ultima_data, hashes, total, atualizado_em) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                sistema, processo, cursor.ultima_data, json.dumps(list(cursor.hashes)),
+                cursor.total, cursor.atualizado_em or time.time()
+            )
+        )
+
+    def delete(self, sistema: str, processo: str):
+        """Remove o cursor (a proxima sincronizacao traz tudo de novo)"""
+        self._conn().execute(
+            "DELETE FROM cursores WHERE sistema = ? AND processo = ?",
+            (sistema, processo)
+        )
+
+    def count(self, sistema: Optional[str] = None) -> int:
+        """Numero de processos com cursor"""
+        if sistema is None:
+            row = self._conn().execute("SELECT COUNT(*) FROM cursores").fetchone()
+        else:
+            row = self._conn().execute(
+                "SELECT COUNT(*) FROM cursores WHERE sistema = ?", (sistema,)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def sincronizar(
+        self,
+        sistema: str,
+        processo: str,
+        linhas: Sequence[Any],
+        data_da_linha: Callable[[Any], Optional[str]],
+        montar: Callable[[Any], Optional[Any]],
+        assinatura: Callable[[Any], Tuple[str, str]]
+    ) -> DeltaMovimentacoes:
+        """
+        Calcula o delta de um processo e avanca seu cursor
+
+        Args:
+            sistema: Sistema/tribunal
+            processo: Numero do processo (e instancia, se houver)
+            linhas: Linhas/registros de movimentacao da fonte
+            data_da_linha: Data ISO da linha ou None
+            montar: Movimentacao completa da linha ou None
+            assinatura: (data ISO, descricao) de uma movimentacao
+
+        Returns:
+            DeltaMovimentacoes com as movimentacoes novas
+        """
+        cursor = self.get(sistema, processo)
+        novas, montadas = movimentacoes_novas(linhas, data_da_linha, montar, assinatura, cursor)
+        novo_cursor = avancar_cursor(cursor, novas, assinatura)
+        if novo_cursor is not None:
+            self.set(sistema, processo, novo_cursor)
+
+        return DeltaMovimentacoes(
+            sistema=sistema,
+            numero_processo=processo,
+            novas=novas,
+            cursor=novo_cursor,
+            primeira_sincronizacao=cursor is None,
+            linhas_lidas=montadas,
+        )
+
+    def close(self):
+        """Fecha a conexao da thread atual"""
+        self._conexoes.fechar()
+
+
+# =============================================================================
+# INSTANCIA COMPARTILHADA
+# =============================================================================
+
+_stores: RegistroPorCaminho[CursorStore] = RegistroPorCaminho(CursorStore)
+
+
+def obter_cursor_store(db_path: Optional[str] = None) -> CursorStore:
+    """
+    Retorna o store de cursores do processo para o arquivo informado
+
+    Args:
+        db_path: Arquivo SQLite (padrao ROM_SYNC_DB ou ~/.rom_agent)
+
+    Returns:
+        CursorStore unico por arquivo no processo
+    """
+    return _stores.obter(db_path or DEFAULT_SYNC_DB)
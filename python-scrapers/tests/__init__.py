@@ -2,3 +2,19 @@
 """
 Testes para os scrapers Python do ROM-Agent
 """
+
+import atexit
+import os
+import shutil
+import tempfile
+
+# Estado compartilhado entre execucoes (rate limit, taxa AIMD, documentos,
+# respostas de API, cursores, arquivo HTML) num diretorio temporario, para que os testes nao leiam
+# nem gravem o do usuario
+_TEMP_DIR = tempfile.mkdtemp(prefix="rom_agent_testes_")
+atexit.register(shutil.rmtree, _TEMP_DIR, ignore_errors=True)
+os.environ["ROM_RATE_LIMIT_DB"] = os.path.join(_TEMP_DIR, "rate_limit.db")
+os.environ["ROM_DOCUMENT_STORE"] = os.path.join(_TEMP_DIR, "documentos")
+os.environ["ROM_RESPONSE_CACHE_DB"] = os.path.join(_TEMP_DIR, "respostas.db")
+os.environ["ROM_SYNC_DB"] = os.path.join(_TEMP_DIR, "sync.db")
+os.environ["ROM_ARQUIVO_HTML"] = os.path.join(_TEMP_DIR, "arquivo_html")
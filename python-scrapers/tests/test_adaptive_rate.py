@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes Unitarios para controle AIMD de taxa
+
+Autor: ROM-Agent Integration System
+Data: 2026-01-12
+"""
+
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Adiciona diretorio pai ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import adaptive_rate
+from adaptive_rate import AdaptiveRateController, segundos_retry_after
+
+
+class TestAdaptiveRateController(unittest.TestCase):
+    """Testes do controlador AIMD"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = str(Path(self.temp_dir) / "rate.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _controlador(self, **kwargs) -> AdaptiveRateController:
+        return AdaptiveRateController("tribunal", taxa_inicial=1.0, db_path=self.db_path, **kwargs)
+
+    def test_aumento_aditivo(self):
+        """Testa aumento gradual com respostas saudaveis"""
+        controlador = self._controlador(incremento=0.1, taxa_maxima=3.0)
+        for _ in range(10):
+            controlador.registrar_sucesso(200)
+        self.assertGreater(controlador.taxa, 1.5)
+        self.assertLess(controlador.taxa, 2.0)
+
+    def test_reducao_multiplicativa(self):
+        """Testa corte pela metade em erro"""
+        controlador = self._controlador()
+        controlador.registrar_erro()
+        self.assertAlmostEqual(controlador.taxa, 0.5)
+
+    def test_reducao_limitada_por_intervalo(self):
+        """Testa que erros em rajada cortam a taxa uma unica vez"""
+        controlador = self._controlador()
+        for _ in range(5):
+            controlador.registrar_erro()
+        self.assertAlmostEqual(controlador.taxa, 0.5)
+
+    def test_limites(self):
+        """Testa taxa minima e maxima"""
+        controlador = self._controlador(taxa_minima=0.4, taxa_maxima=1.2, incremento=1.0)
+        for _ in range(20):
+            controlador.registrar_sucesso()
+        self.assertEqual(controlador.taxa, 1.2)
+
+        with patch.object(adaptive_rate, "DEFAULT_INTERVALO_REDUCAO", 0):
+            for _ in range(10):
+                controlador.registrar_erro()
+        self.assertEqual(controlador.taxa, 0.4)
+
+    def test_teto_padrao_acima_da_taxa_configurada(self):
+        """Testa que, sem taxa_maxima explicita, o AIMD passa da taxa inicial ate o multiplo padrao"""
+        controlador = self._controlador(incremento=1.0)
+        self.assertEqual(controlador.taxa_maxima, adaptive_rate.DEFAULT_FATOR_MAXIMO)
+        for _ in range(50):
+            controlador.registrar_sucesso(200)
+        self.assertGreater(controlador.taxa, 1.0)
+        self.assertEqual(controlador.taxa, controlador.taxa_maxima)
+
+    def test_taxa_persistida_por_configuracao(self):
+        """Testa que controladores com limites diferentes nao sobrescrevem a taxa um do outro"""
+        with patch.object(adaptive_rate, "DEFAULT_INTERVALO_REDUCAO", 0):
+            rapido = self._controlador(taxa_maxima=3.0, incremento=1.0)
+            for _ in range(20):
+                rapido.registrar_sucesso()
+            rapido.close()
+
+            lento = self._controlador(taxa_maxima=1.0)
+            self.assertEqual(lento.taxa, 1.0)
+            lento.registrar_erro()
+            lento.close()
+
+        for teto, taxa in ((3.0, 3.0), (1.0, 0.5)):
+            restaurado = self._controlador(taxa_maxima=teto)
+            self.assertAlmostEqual(restaurado.taxa, taxa)
+            restaurado.close()
+
+    def test_controlador_por_taxa_configurada(self):
+        """Testa que outro rate_limit no mesmo host nao reaproveita os limites antigos"""
+        with patch.object(adaptive_rate, "_controladores", {}):
+            lento = adaptive_rate.obter_controlador("tribunal", 1.0, db_path=None)
+            rapido = adaptive_rate.obter_controlador("tribunal", 2.0, db_path=None)
+            self.assertIs(adaptive_rate.obter_controlador("tribunal", 1.0, db_path=None), lento)
+            self.assertIs(
+                adaptive_rate.obter_controlador("tribunal", 1.0, taxa_maxima=None, db_path=None), lento
+            )
+            teto = adaptive_rate.obter_controlador("tribunal", 1.0, taxa_maxima=5.0, db_path=None)
+        self.assertIsNot(lento, rapido)
+        self.assertIsNot(lento, teto)
+        fator = adaptive_rate.DEFAULT_FATOR_MAXIMO
+        self.assertEqual((lento.taxa_maxima, rapido.taxa_maxima, teto.taxa_maxima), (fator, 2.0 * fator, 5.0))
+
+    def test_pico_de_latencia(self):
+        """Testa que pico de latencia reduz a taxa"""
+        controlador = self._controlador(incremento=0.0001)
+        for _ in range(adaptive_rate.AMOSTRAS_AQUECIMENTO):
+            controlador.registrar_sucesso(100)
+        taxa_antes = controlador.taxa
+        controlador.registrar_sucesso(1000)
+        self.assertLess(controlador.taxa, taxa_antes)
+
+    def test_persistencia_entre_reinicios(self):
+        """Testa que a taxa aprendida e restaurada"""
+        controlador = self._controlador()
+        controlador.registrar_erro()
+        controlador.close()
+
+        novo = self._controlador()
+        self.assertAlmostEqual(novo.taxa, 0.5)
+        novo.close()
+
+    def test_retry_after(self):
+        """Testa conversao do header Retry-After"""
+        self.assertEqual(segundos_retry_after("30"), 30.0)
+        self.assertIsNone(segundos_retry_after(None))
+        self.assertIsNone(segundos_retry_after("invalido"))
+        self.assertEqual(segundos_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
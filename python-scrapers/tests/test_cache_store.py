@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes Unitarios para Cache Store (SQLite WAL)
+
+Autor: ROM-Agent Integration System
+Data: 2026-01-12
+"""
+
+import multiprocessing
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+# Adiciona diretorio pai ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cache_store import ConexoesSQLite, RegistroPorCaminho, SQLiteCacheStore
+
+
+def _escrever_em_processo(db_path: str, inicio: int, total: int):
+    """Worker de processo separado gravando no mesmo arquivo"""
+    store = SQLiteCacheStore(db_path)
+    for i in range(inicio, inicio + total):
+        store.set(f"chave_{i}", {"i": i}, ttl=60)
+    store.close()
+
+
+class TestSQLiteCacheStore(unittest.TestCase):
+    """Testes do store SQLite"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = str(Path(self.temp_dir) / "cache.db")
+        self.store = SQLiteCacheStore(self.db_path)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_set_get(self):
+        """Testa armazenamento e recuperacao"""
+        self.store.set("chave", {"valor": "teste", "lista": [1, 2]}, ttl=60)
+        self.assertEqual(self.store.get("chave"), {"valor": "teste", "lista": [1, 2]})
+
+    def test_get_inexistente(self):
+        """Testa chave inexistente"""
+        self.assertIsNone(self.store.get("nao_existe"))
+
+    def test_ttl_por_entrada(self):
+        """Testa que cada entrada expira com seu proprio TTL"""
+        self.store.set("curta", {"v": 1}, ttl=0.2)
+        self.store.set("longa", {"v": 2}, ttl=60)
+        time.sleep(0.3)
+        self.assertIsNone(self.store.get("curta"))
+        self.assertEqual(self.store.get("longa"), {"v": 2})
+        self.assertEqual(self.store.count(), 1)
+
+    def test_namespaces(self):
+        """Testa isolamento entre namespaces"""
+        self.store.set("chave", {"v": "a"}, ttl=60, namespace="a")
+        self.store.set("chave", {"v": "b"}, ttl=60, namespace="b")
+        self.assertEqual(self.store.get("chave", "a"), {"v": "a"})
+        self.assertEqual(self.store.get("chave", "b"), {"v": "b"})
+
+        self.store.clear("a")
+        self.assertIsNone(self.store.get("chave", "a"))
+        self.assertEqual(self.store.count("b"), 1)
+
+    def test_delete(self):
+        """Testa remocao de entrada"""
+        self.store.set("chave", {"v": 1}, ttl=60)
+        self.store.delete("chave")
+        self.assertIsNone(self.store.get("chave"))
+
+    def test_limite_de_entradas(self):
+        """Testa remocao das entradas mais antigas ao exceder o limite"""
+        store = SQLiteCacheStore(
+            str(Path(self.temp_dir) / "limitado.db"),
+            max_entries=10,
+            eviction_interval=1
+        )
+        for i in range(25):
+            store.set(f"chave_{i}", {"i": i}, ttl=60)
+
+        self.assertEqual(store.count(), 10)
+        self.assertIsNone(store.get("chave_0"))
+        self.assertEqual(store.get("chave_24"), {"i": 24})
+        store.close()
+
+    def test_persistencia(self):
+        """Testa leitura por outra instancia do mesmo arquivo"""
+        self.store.set("chave", {"v": 1}, ttl=60)
+        outro = SQLiteCacheStore(self.db_path)
+        self.assertEqual(outro.get("chave"), {"v": 1})
+        outro.close()
+
+    def test_escrita_concorrente_threads(self):
+        """Testa escrita concorrente por varias threads"""
+        def escrever(inicio):
+            for i in range(inicio, inicio + 50):
+                self.store.set(f"chave_{i}", {"i": i}, ttl=60)
+
+        threads = [threading.Thread(target=escrever, args=(n * 50,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(self.store.count(), 200)
+
+    def test_escrita_concorrente_processos(self):
+        """Testa escrita concorrente por varios processos no mesmo arquivo"""
+        processos = [
+            multiprocessing.Process(
+                target=_escrever_em_processo, args=(self.db_path, n * 100, 100)
+            )
+            for n in range(3)
+        ]
+        for p in processos:
+            p.start()
+        for p in processos:
+            p.join(timeout=30)
+            self.assertEqual(p.exitcode, 0)
+
+        self.assertEqual(self.store.count(), 300)
+        self.assertEqual(self.store.get("chave_250"), {"i": 250})
+
+
+
+class TestConexoesERegistro(unittest.TestCase):
+    """Testes da conexao por thread e da instancia por caminho"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_conexao_por_thread(self):
+        conexoes = ConexoesSQLite(str(Path(self.temp_dir) / "c.db"))
+        principal = conexoes.obter()
+        self.assertIs(conexoes.obter(), principal)
+        self.assertEqual(principal.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+
+        outras = []
+        thread = threading.Thread(target=lambda: outras.append(conexoes.obter()))
+        thread.start()
+        thread.join()
+        self.assertIsNot(outras[0], principal)
+
+        conexoes.fechar()
+        self.assertIsNot(conexoes.obter(), principal)
+        conexoes.fechar()
+
+    def test_instancia_unica_por_caminho(self):
+        registro = RegistroPorCaminho(lambda caminho: object())
+        relativo = str(Path(self.temp_dir) / "x" / ".." / "a.db")
+        self.assertIs(registro.obter(relativo), registro.obter(str(Path(self.temp_dir) / "a.db")))
+        self.assertIsNot(registro.obter(relativo), registro.obter(str(Path(self.temp_dir) / "b.db")))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
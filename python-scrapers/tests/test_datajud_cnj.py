@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes Unitarios para o cliente DataJud (sessao keep-alive e lotes _msearch)
+
+Autor: ROM-Agent Integration System
+Data: 2026-01-12
+"""
+
+import json
+import sys
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import requests
+
+# Adiciona diretorio pai ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from datajud_cnj import CODIGOS_TRIBUNAIS, DATAJUD_CONFIG, DataJudCNJ, DataJudError, tribunal_do_numero
+
+
+def _hit(numero):
+    return {"_source": {"numeroProcesso": numero, "siglaTribunal": "TJSP", "classe": {"nome": "Procedimento"}}}
+
+
+class TestMsearch(unittest.TestCase):
+    """Busca em lote por numero"""
+
+    def setUp(self):
+        self.cliente = DataJudCNJ(api_key="chave", cache_enabled=False)
+        self.corpos = []
+        self.lock = threading.Lock()
+
+    def _post(self, url, data=None, headers=None, timeout=None, **kwargs):
+        """Responde cada query do NDJSON: encontra, nao encontra ou falha"""
+        linhas = data.decode("utf-8").splitlines()
+        with self.lock:
+            self.corpos.append(linhas)
+        respostas = []
+        for corpo in map(json.loads, linhas[1::2]):
+            numero = corpo["query"]["match"]["numeroProcesso"]
+            if numero.endswith("9"):
+                respostas.append({"status": 400, "error": {"type": "search_phase_execution_exception",
+                                                           "reason": "consulta invalida"}})
+            elif numero.endswith("0"):
+                respostas.append({"hits": {"total": {"value": 0}, "hits": []}})
+            else:
+                respostas.append({"hits": {"total": {"value": 1}, "hits": [_hit(numero)]}})
+        response = Mock()
+        response.raise_for_status = Mock()
+        response.json = Mock(return_value={"responses": respostas})
+        return response
+
+    def test_lotes_e_erros_por_item(self):
+        numeros = [f"{i:07d}-00.2024.8.26.010{i % 10}" for i in range(25)]
+        with patch.object(self.cliente.session, "post", side_effect=self._post) as post:
+            resultados = self.cliente.buscar_processos(numeros, tamanho_lote=10, lotes_paralelos=2)
+
+        self.assertEqual(post.call_count, 3)
+        self.assertTrue(post.call_args.args[0].endswith("/_msearch"))
+        self.assertEqual(post.call_args.kwargs["headers"]["Content-Type"], "application/x-ndjson")
+        self.assertEqual(sorted(len(c) for c in self.corpos), [10, 20, 20])
+
+        self.assertEqual(list(resultados), numeros)
+        for numero, resultado in resultados.items():
+            digitos = "".join(filter(str.isdigit, numero))
+            if numero.endswith("9"):
+                self.assertFalse(resultado["sucesso"])
+                self.assertIn("consulta invalida", resultado["erro"])
+            elif numero.endswith("0"):
+                self.assertEqual((resultado["total_encontrado"], resultado["processos"]), (0, []))
+            else:
+                self.assertEqual(resultado["processos"][0]["numero"], digitos)
+
+    def test_numeros_repetidos_consultados_uma_vez(self):
+        numeros = ["1000001-00.2024.8.26.0101", "10000010020248260101"]
+        with patch.object(self.cliente.session, "post", side_effect=self._post):
+            resultados = self.cliente.buscar_processos(numeros)
+
+        self.assertEqual(len(self.corpos[0]), 2)
+        self.assertEqual(resultados[numeros[0]], resultados[numeros[1]])
+
+    def test_falha_do_lote_em_cada_item(self):
+        numeros = ["1000001-00.2024.8.26.0101", "1000002-00.2024.8.26.0102"]
+        with patch.object(self.cliente.session, "post",
+                          side_effect=requests.exceptions.ReadTimeout("lento")):
+            resultados = self.cliente.buscar_processos(numeros)
+
+        for resultado in resultados.values():
+            self.assertEqual(resultado["erro"], "Timeout na requisição à API DataJud")
+
+    def test_sessao_keep_alive(self):
+        adaptador = self.cliente.session.get_adapter(self.cliente.base_url)
+        self.assertGreater(adaptador._pool_maxsize, 1)
+        self.assertEqual(self.cliente.session.headers["Authorization"], "APIKey chave")
+
+
+class TestSearchAfter(unittest.TestCase):
+    """Iteracao pelo resultado inteiro com cursores search_after"""
+
+    TOTAL = 23
+
+    def setUp(self):
+        self.cliente = DataJudCNJ(api_key="chave", cache_enabled=False)
+        self.consultas = []
+
+    def _pagina(self, corpo, indice=None):
+        """Pagina ordenada por @timestamp a partir do cursor recebido"""
+        self.consultas.append(corpo)
+        inicio = corpo.get("search_after", [-1])[0] + 1
+        fim = min(self.TOTAL, inicio + corpo["size"])
+        return {"hits": {"hits": [
+            {"_source": {"numeroProcesso": str(i)}, "sort": [i]} for i in range(inicio, fim)
+        ]}}
+
+    def test_percorre_tudo_sob_demanda(self):
+        with patch.object(self.cliente, "_make_request", side_effect=self._pagina):
+            processos = self.cliente.iterar_por_parte(
+                "Banco", "TJSP", campos=["numeroProcesso"], tamanho_pagina=10
+            )
+            primeiro = next(processos)
+            self.assertEqual(len(self.consultas), 1)  # so a primeira pagina
+            numeros = [primeiro["numero"]] + [p["numero"] for p in processos]
+
+        self.assertEqual(numeros, [str(i) for i in range(self.TOTAL)])
+        self.assertEqual(len(self.consultas), 3)
+        self.assertEqual(self.consultas[0]["_source"], ["numeroProcesso"])
+        self.assertEqual(self.consultas[0]["sort"], DATAJUD_CONFIG["ordenacao"])
+        self.assertNotIn("search_after", self.consultas[0])
+        self.assertEqual(self.consultas[2]["search_after"], [19])
+
+    def test_max_resultados(self):
+        with patch.object(self.cliente, "_make_request", side_effect=self._pagina):
+            processos = list(self.cliente.iterar_por_documento(
+                "00.000.000/0001-91", "TJGO", tamanho_pagina=10, max_resultados=12
+            ))
+
+        self.assertEqual(len(processos), 12)
+        self.assertEqual([c["size"] for c in self.consultas], [10, 2])
+        self.assertEqual(
+            self.consultas[0]["query"]["bool"]["must"][0], {"match": {"partes.documento": "00000000000191"}}
+        )
+
+    def test_erro_de_pagina(self):
+        respostas = [self._pagina({"size": 10}), {"erro": "Timeout na requisição à API DataJud", "sucesso": False}]
+        with patch.object(self.cliente, "_make_request", side_effect=respostas):
+            processos = self.cliente.iterar_por_classe("Execucao Fiscal", "TRF1", tamanho_pagina=10)
+            self.assertEqual(len([next(processos) for _ in range(10)]), 10)
+            with self.assertRaises(DataJudError):
+                next(processos)
+
+    def test_sem_tribunal_percorre_indices(self):
+        with patch.object(self.cliente, "_make_request", side_effect=self._pagina) as request:
+            processos = list(self.cliente.iterar_por_parte("Banco", tamanho_pagina=10, max_resultados=50))
+
+        # 23 hits do primeiro indice, 23 do segundo e 4 do terceiro
+        self.assertEqual(len(processos), 50)
+        indices = [c.args[1] for c in request.call_args_list]
+        self.assertEqual(len(set(indices)), 3)
+        self.assertNotIn("search_after", self.consultas[3])  # cursor recomeca no novo indice
+
+
+    def test_empate_na_fronteira_da_pagina(self):
+        """Hits com o mesmo @timestamp dos dois lados da pagina nao se perdem"""
+        documentos = [
+            {"@timestamp": f"2026-01-0{1 + i // 4}T00:00:00Z", "id": f"TJSP_G1_{i:04d}"}
+            for i in range(self.TOTAL)
+        ]
+
+        def pagina(corpo, indice=None):
+            campos = [next(iter(criterio)) for criterio in corpo["sort"]]
+            chaves = sorted((tuple(doc[c] for c in campos), doc["id"]) for doc in documentos)
+            cursor = tuple(corpo.get("search_after", ()))
+            seguintes = [(chave, id_) for chave, id_ in chaves if not cursor or chave > cursor]
+            return {"hits": {"hits": [
+                {"_source": {"numeroProcesso": id_}, "sort": list(chave)}
+                for chave, id_ in seguintes[:corpo["size"]]
+            ]}}
+
+        with patch.object(self.cliente, "_make_request", side_effect=pagina):
+            numeros = [p["numero"] for p in self.cliente.iterar_por_parte("Banco", "TJSP", tamanho_pagina=10)]
+
+        # Paginas de 10 cortam os grupos de 4 hits com o mesmo @timestamp
+        self.assertEqual(numeros, [doc["id"] for doc in documentos])
+
+
+class TestRoteamentoIndices(unittest.TestCase):
+    """Indice do tribunal derivado do numero CNJ"""
+
+    def setUp(self):
+        self.cliente = DataJudCNJ(api_key="chave", cache_enabled=False)
+
+    def test_tribunal_do_numero(self):
+        self.assertEqual(tribunal_do_numero("1000000-00.2024.8.26.0100"), "TJSP")
+        self.assertEqual(tribunal_do_numero("0000001-00.2024.8.07.0001"), "TJDFT")
+        self.assertEqual(tribunal_do_numero("00000010020244010000"), "TRF1")
+        self.assertEqual(tribunal_do_numero("0000001-00.2024.5.02.0001"), "TRT2")
+        self.assertEqual(tribunal_do_numero("0000001-00.2024.3.00.0000"), "STJ")
+        self.assertIsNone(tribunal_do_numero("0000001-00.2024.6.26.0001"))  # TRE nao mapeado
+        self.assertIsNone(tribunal_do_numero("123"))
+
+    def test_busca_vai_ao_indice_do_tribunal(self):
+        with patch.object(self.cliente.session, "post") as post:
+            post.return_value.json.return_value = {"hits": {"total": {"value": 1}, "hits": [_hit("x")]}}
+            resultado = self.cliente.buscar_processo("1000000-00.2024.8.09.0100")
+
+        self.assertTrue(resultado["sucesso"])
+        self.assertEqual(post.call_count, 1)
+        self.assertTrue(post.call_args.args[0].endswith("/api_publica_tjgo/_search"))
+        self.assertEqual(post.call_args.kwargs["json"]["query"], {"match": {"numeroProcesso": "10000000020248090100"}})
+
+    def test_lotes_agrupados_por_indice(self):
+        numeros = ["1000001-00.2024.8.26.0100", "1000002-00.2024.4.01.0000", "1000003-00.2024.8.26.0100"]
+        chamadas = []
+
+        def msearch(queries, indice=None):
+            chamadas.append((indice, len(queries)))
+            return [{"hits": {"total": {"value": 1}, "hits": [_hit(indice)]}} for _ in queries]
+
+        with patch.object(self.cliente, "_make_msearch", side_effect=msearch):
+            resultados = self.cliente.buscar_processos(numeros)
+
+        self.assertEqual(sorted(chamadas), [("api_publica_tjsp", 2), ("api_publica_trf1", 1)])
+        self.assertEqual(resultados[numeros[1]]["processos"][0]["numero"], "api_publica_trf1")
+
+    def test_numero_desconhecido_em_todos_os_indices(self):
+        indices = self.cliente._indices_todos()
+
+        def msearch(queries, indice=None):
+            if indice == "api_publica_trt3":
+                return [{"hits": {"total": {"value": 1}, "hits": [dict(_hit("achado"), _score=2.0)]}}]
+            if indice == "api_publica_tjsp":
+                return [{"erro": "Timeout na requisição à API DataJud", "sucesso": False}]
+            return [{"hits": {"total": {"value": 0}, "hits": []}}]
+
+        with patch.object(self.cliente, "_make_msearch", side_effect=msearch) as mock:
+            resultado = self.cliente.buscar_processos(["processo-sem-numero-cnj"])["processo-sem-numero-cnj"]
+
+        self.assertEqual(mock.call_count, len(indices))
+        self.assertEqual(resultado["total_encontrado"], 1)
+        self.assertEqual(resultado["processos"][0]["numero"], "achado")
+
+    def test_fan_out_so_com_indices_cnj(self):
+        indices = self.cliente._indices_todos()
+        self.assertNotIn("api_publica_stf", indices)
+        self.assertIn("api_publica_stj", indices)
+        self.assertEqual(len(indices), len(set(CODIGOS_TRIBUNAIS.values())))
+        # Informado explicitamente, o STF continua consultavel
+        self.assertEqual(self.cliente._indices_consulta("STF"), ["api_publica_stf"])
+
+    def test_indice_com_falha_fica_em_quarentena(self):
+        def make_request(query, indice=None):
+            if indice == "api_publica_tjsp":
+                return {"erro": "Erro HTTP 502", "sucesso": False}
+            return {"hits": {"total": {"value": 0}, "hits": []}}
+
+        with patch.object(self.cliente, "_make_request", side_effect=make_request) as request:
+            self.cliente.buscar_por_parte("Banco")
+            primeira = request.call_count
+            resultado = self.cliente.buscar_por_parte("Banco")
+
+        consultados = [c.args[1] for c in request.call_args_list[primeira:]]
+        self.assertEqual(primeira, len(self.cliente._indices_todos()))
+        self.assertNotIn("api_publica_tjsp", consultados)
+        self.assertEqual(len(consultados), primeira - 1)
+        self.assertTrue(resultado["sucesso"])
+
+    def test_fan_out_todos_falham(self):
+        with patch.object(self.cliente, "_make_request",
+                          return_value={"erro": "Timeout na requisição à API DataJud", "sucesso": False}) as request:
+            resultado = self.cliente.buscar_por_parte("Banco")
+
+        self.assertEqual(request.call_count, len(self.cliente._indices_todos()))
+        self.assertFalse(resultado["sucesso"])
+
+
+class TestAgregacoes(unittest.TestCase):
+    """Contagens por dimensao com size 0"""
+
+    def setUp(self):
+        self.cliente = DataJudCNJ(api_key="chave", cache_enabled=False)
+
+    @staticmethod
+    def _resposta(total, classes, anos, outros=0):
+        return {"hits": {"total": {"value": total}, "hits": []}, "aggregations": {
+            "classe": {"sum_other_doc_count": outros,
+                       "buckets": [{"key": k, "doc_count": n} for k, n in classes]},
+            "ano_ajuizamento": {"buckets": [{"key": 0, "key_as_string": a, "doc_count": n} for a, n in anos]},
+        }}
+
+    def test_corpo_sem_hits(self):
+        with patch.object(self.cliente, "_make_request",
+                          return_value=self._resposta(7, [("Execucao Fiscal", 7)], [("2023", 7)])) as request:
+            resultado = self.cliente.agregar_por_documento(
+                "00.000.000/0001-91", "TJSP", dimensoes=["classe", "ano_ajuizamento"], tamanho=5
+            )
+
+        corpo, indice = request.call_args.args
+        self.assertEqual(indice, "api_publica_tjsp")
+        self.assertEqual(corpo["size"], 0)
+        self.assertEqual(corpo["aggs"]["classe"], {"terms": {"field": "classe.nome", "size": 5}})
+        self.assertEqual(corpo["aggs"]["ano_ajuizamento"]["date_histogram"]["calendar_interval"], "year")
+        self.assertEqual(resultado["total"], 7)
+        self.assertEqual(resultado["documento"], "00.000.000/0001-91")
+        self.assertEqual(resultado["agregacoes"]["classe"]["valores"], [{"chave": "Execucao Fiscal", "total": 7}])
+
+    def test_soma_entre_indices(self):
+        respostas = {
+            "api_publica_tjsp": self._resposta(5, [("Monitoria", 3), ("Cobranca", 2)], [("2024", 5)]),
+            "api_publica_tjgo": self._resposta(4, [("Cobranca", 4)], [("2022", 1), ("2024", 3)], outros=1),
+            "api_publica_trf1": {"erro": "Timeout na requisição à API DataJud", "sucesso": False},
+        }
+        with patch.object(self.cliente, "_indices_todos", return_value=list(respostas)), \
+                patch.object(self.cliente, "_make_request", side_effect=lambda corpo, indice: respostas[indice]):
+            resultado = self.cliente.agregar_por_parte("Banco", dimensoes=["classe", "ano_ajuizamento"], tamanho=1)
+
+        self.assertEqual(resultado["total"], 9)
+        classe = resultado["agregacoes"]["classe"]
+        self.assertEqual(classe["valores"], [{"chave": "Cobranca", "total": 6}])
+        self.assertEqual(classe["outros"], 4)  # 3 de Monitoria + 1 do tjgo
+        self.assertEqual([v["chave"] for v in resultado["agregacoes"]["ano_ajuizamento"]["valores"]], ["2022", "2024"])
+        self.assertEqual(resultado["indices_com_erro"], ["api_publica_trf1"])
+
+    def test_dimensao_desconhecida(self):
+        with self.assertRaises(ValueError):
+            self.cliente.agregar_por_classe("Execucao Fiscal", "TRF1", dimensoes=["comarca"])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
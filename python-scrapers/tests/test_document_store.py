@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes Unitarios para o store de documentos enderecado por conteudo
+
+Autor: ROM-Agent Integration System
+Data: 2026-01-12
+"""
+
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Adiciona diretorio pai ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from document_store import DocumentStore
+
+
+CONTEUDO = b"%PDF-1.4 peticao inicial"
+SHA256 = hashlib.sha256(CONTEUDO).hexdigest()
+
+
+class TestDocumentStore(unittest.TestCase):
+    """Testes do store de documentos"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = DocumentStore(str(Path(self.temp_dir) / "store"))
+        self.saida = Path(self.temp_dir) / "saida"
+        self.saida.mkdir()
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _baixar(self, nome: str) -> str:
+        caminho = self.saida / nome
+        caminho.write_bytes(CONTEUDO)
+        return str(caminho)
+
+    def test_armazenar_e_localizar(self):
+        arquivo = self._baixar("doc.pdf")
+        self.store.armazenar(arquivo, SHA256, "TJSP", "100", "url-1", "application/pdf")
+
+        objeto = self.store.localizar("TJSP", "100", "url-1")
+        self.assertIsNotNone(objeto)
+        self.assertEqual(objeto.sha256, SHA256)
+        self.assertEqual(objeto.tamanho_bytes, len(CONTEUDO))
+        self.assertEqual(Path(objeto.caminho).read_bytes(), CONTEUDO)
+        self.assertIsNone(self.store.localizar("TJSP", "100", "url-2"))
+
+    def test_saida_e_hard_link_do_objeto(self):
+        arquivo = self._baixar("doc.pdf")
+        objeto = self.store.armazenar(arquivo, SHA256, "TJSP", "100", "url-1")
+
+        self.assertTrue(os.path.samefile(arquivo, objeto.caminho))
+
+    def test_objeto_e_saidas_somente_leitura(self):
+        arquivo = self._baixar("doc.pdf")
+        objeto = self.store.armazenar(arquivo, SHA256, "TJSP", "100", "url-1")
+        destino = Path(self.temp_dir) / "outra" / "copia.pdf"
+        self.store.materializar(SHA256, str(destino))
+
+        # Editar uma saida alteraria o objeto compartilhado (mesmo inode)
+        for caminho in (objeto.caminho, arquivo, destino):
+            self.assertEqual(os.stat(caminho).st_mode & 0o777, 0o444)
+
+    def test_conteudo_repetido_guardado_uma_vez(self):
+        self.store.armazenar(self._baixar("a.pdf"), SHA256, "TJSP", "100", "url-1")
+        self.store.armazenar(self._baixar("b.pdf"), SHA256, "TJSP", "200", "url-9")
+
+        self.assertEqual(self.store.stats["objetos"], 1)
+        self.assertEqual(self.store.stats["documentos"], 2)
+        self.assertTrue(os.path.samefile(self.saida / "a.pdf", self.saida / "b.pdf"))
+
+    def test_mesmo_documento_em_outro_processo(self):
+        self.store.armazenar(self._baixar("a.pdf"), SHA256, "TRF1", "100", "42")
+
+        objeto = self.store.localizar("TRF1", "300", "42")
+        self.assertIsNotNone(objeto)
+        self.assertEqual(self.store.stats["documentos"], 2)
+        self.assertIsNone(self.store.localizar("TRF2", "300", "42"))
+
+    def test_materializar(self):
+        self.store.armazenar(self._baixar("a.pdf"), SHA256, "TJSP", "100", "url-1")
+        destino = Path(self.temp_dir) / "outra" / "copia.pdf"
+
+        self.store.materializar(SHA256, str(destino))
+        self.assertEqual(destino.read_bytes(), CONTEUDO)
+
+        # Sobrescreve destino existente
+        self.store.materializar(SHA256, str(destino))
+        self.assertEqual(destino.read_bytes(), CONTEUDO)
+
+    def test_objeto_removido_do_disco_exige_novo_download(self):
+        objeto = self.store.armazenar(self._baixar("a.pdf"), SHA256, "TJSP", "100", "url-1")
+        os.unlink(objeto.caminho)
+
+        self.assertIsNone(self.store.localizar("TJSP", "100", "url-1"))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes Unitarios para o download de documentos em streaming
+
+Autor: ROM-Agent Integration System
+Data: 2026-01-12
+"""
+
+import asyncio
+import hashlib
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Adiciona diretorio pai ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from downloads import (
+    SUFIXO_PARCIAL,
+    baixar_stream,
+    baixar_stream_async,
+    eh_conteudo_binario,
+    hashes_arquivo,
+)
+
+
+CONTEUDO = b"%PDF-1.4 " + bytes(range(256)) * 100
+
+
+class _RespostaFalsa:
+    """Resposta minima compativel com requests/httpx em modo stream"""
+
+    def __init__(self, corpo: bytes, status_code: int = 200, headers=None):
+        self.corpo = corpo
+        self.status_code = status_code
+        self.headers = {"content-type": "application/pdf", **(headers or {})}
+        self.fechada = False
+
+    def iter_content(self, chunk_size: int):
+        for i in range(0, len(self.corpo), chunk_size):
+            yield self.corpo[i:i + chunk_size]
+
+    async def aiter_bytes(self, chunk_size: int):
+        for chunk in self.iter_content(chunk_size):
+            yield chunk
+
+    def close(self):
+        self.fechada = True
+
+    async def aclose(self):
+        self.fechada = True
+
+
+def _servidor(respeita_range: bool = True, desvio: int = 0):
+    """Cria funcao `requisitar` que responde Range como um servidor HTTP
+
+    `desvio` desloca o inicio do 206 em relacao ao byte pedido, simulando
+    servidor/proxy que responde Content-Range de outra faixa.
+    """
+    pedidos = []
+
+    def requisitar(headers):
+        pedidos.append(dict(headers))
+        faixa = headers.get("Range")
+        if faixa and respeita_range:
+            inicio = int(faixa.split("=")[1].rstrip("-")) + desvio
+            if inicio >= len(CONTEUDO):
+                return _RespostaFalsa(
+                    b"", status_code=416,
+                    headers={"content-type": "text/html", "content-range": f"bytes */{len(CONTEUDO)}"}
+                )
+            return _RespostaFalsa(
+                CONTEUDO[inicio:],
+                status_code=206,
+                headers={"content-range": f"bytes {inicio}-{len(CONTEUDO) - 1}/{len(CONTEUDO)}"}
+            )
+        return _RespostaFalsa(CONTEUDO)
+
+    return requisitar, pedidos
+
+
+class TestDownloadStream(unittest.TestCase):
+    """Testes do download sincrono"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.destino = str(Path(self.temp_dir) / "docs" / "doc.pdf")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_grava_e_calcula_hashes_na_mesma_passada(self):
+        requisitar, _ = _servidor()
+        resultado = baixar_stream(requisitar, self.destino, chunk_size=1000)
+
+        self.assertEqual(Path(self.destino).read_bytes(), CONTEUDO)
+        self.assertEqual(resultado.tamanho_bytes, len(CONTEUDO))
+        self.assertEqual(resultado.md5, hashlib.md5(CONTEUDO).hexdigest())
+        self.assertEqual(resultado.sha256, hashlib.sha256(CONTEUDO).hexdigest())
+        self.assertFalse(resultado.retomado)
+        self.assertFalse(Path(self.destino + SUFIXO_PARCIAL).exists())
+
+    def test_retoma_arquivo_parcial_com_range(self):
+        Path(self.destino).parent.mkdir(parents=True)
+        Path(self.destino + SUFIXO_PARCIAL).write_bytes(CONTEUDO[:5000])
+
+        requisitar, pedidos = _servidor()
+        resultado = baixar_stream(requisitar, self.destino)
+
+        self.assertEqual(pedidos[0]["Range"], "bytes=5000-")
+        self.assertTrue(resultado.retomado)
+        self.assertEqual(Path(self.destino).read_bytes(), CONTEUDO)
+        self.assertEqual(resultado.sha256, hashlib.sha256(CONTEUDO).hexdigest())
+
+    def test_recomeca_quando_servidor_ignora_range(self):
+        Path(self.destino).parent.mkdir(parents=True)
+        Path(self.destino + SUFIXO_PARCIAL).write_bytes(b"lixo")
+
+        requisitar, _ = _servidor(respeita_range=False)
+        resultado = baixar_stream(requisitar, self.destino)
+
+        self.assertFalse(resultado.retomado)
+        self.assertEqual(Path(self.destino).read_bytes(), CONTEUDO)
+        self.assertEqual(resultado.md5, hashlib.md5(CONTEUDO).hexdigest())
+
+    def test_416_com_parcial_completo_finaliza(self):
+        Path(self.destino).parent.mkdir(parents=True)
+        Path(self.destino + SUFIXO_PARCIAL).write_bytes(CONTEUDO)
+
+        requisitar, pedidos = _servidor()
+        resultado = baixar_stream(requisitar, self.destino)
+
+        self.assertEqual(len(pedidos), 1)
+        self.assertTrue(resultado.retomado)
+        self.assertEqual(resultado.tamanho_bytes, len(CONTEUDO))
+        self.assertEqual(resultado.sha256, hashlib.sha256(CONTEUDO).hexdigest())
+        self.assertEqual(Path(self.destino).read_bytes(), CONTEUDO)
+        self.assertFalse(Path(self.destino + SUFIXO_PARCIAL).exists())
+
+    def test_416_com_parcial_invalido_recomeca(self):
+        Path(self.destino).parent.mkdir(parents=True)
+        Path(self.destino + SUFIXO_PARCIAL).write_bytes(CONTEUDO + b"lixo")
+
+        requisitar, pedidos = _servidor()
+        resultado = baixar_stream(requisitar, self.destino)
+
+        self.assertEqual(len(pedidos), 2)
+        self.assertNotIn("Range", pedidos[1])
+        self.assertFalse(resultado.retomado)
+        self.assertEqual(Path(self.destino).read_bytes(), CONTEUDO)
+        self.assertEqual(resultado.md5, hashlib.md5(CONTEUDO).hexdigest())
+
+    def test_206_de_outro_byte_baixa_inteiro(self):
+        Path(self.destino).parent.mkdir(parents=True)
+        Path(self.destino + SUFIXO_PARCIAL).write_bytes(CONTEUDO[:5000])
+
+        requisitar, pedidos = _servidor(desvio=1000)
+        resultado = baixar_stream(requisitar, self.destino)
+
+        self.assertEqual(len(pedidos), 2)
+        self.assertNotIn("Range", pedidos[1])
+        self.assertFalse(resultado.retomado)
+        self.assertEqual(Path(self.destino).read_bytes(), CONTEUDO)
+        self.assertEqual(resultado.sha256, hashlib.sha256(CONTEUDO).hexdigest())
+
+    def test_206_sem_range_pedido_falha(self):
+        resposta = _RespostaFalsa(CONTEUDO[10:], status_code=206, headers={
+            "content-range": f"bytes 10-{len(CONTEUDO) - 1}/{len(CONTEUDO)}"
+        })
+        with self.assertRaises(IOError):
+            baixar_stream(lambda headers: resposta, self.destino)
+        self.assertFalse(Path(self.destino).exists())
+
+    def test_status_de_erro_mantem_parcial(self):
+        with self.assertRaises(IOError):
+            baixar_stream(lambda headers: _RespostaFalsa(b"", status_code=404), self.destino)
+        self.assertFalse(Path(self.destino).exists())
+
+    def test_nomear_a_partir_da_resposta(self):
+        requisitar, _ = _servidor()
+        resultado = baixar_stream(
+            requisitar, self.destino, nomear=lambda response: "../peticao.pdf"
+        )
+
+        self.assertEqual(Path(resultado.caminho).name, "peticao.pdf")
+        self.assertEqual(Path(resultado.caminho).parent, Path(self.destino).parent)
+        self.assertEqual(hashes_arquivo(resultado.caminho)["md5"], resultado.md5)
+
+    def test_async(self):
+        Path(self.destino).parent.mkdir(parents=True)
+        Path(self.destino + SUFIXO_PARCIAL).write_bytes(CONTEUDO[:100])
+        requisitar, pedidos = _servidor()
+
+        async def requisitar_async(headers):
+            return requisitar(headers)
+
+        resultado = asyncio.run(baixar_stream_async(requisitar_async, self.destino))
+
+        self.assertTrue(resultado.retomado)
+        self.assertEqual(pedidos[0]["Accept-Encoding"], "identity")
+        self.assertEqual(Path(self.destino).read_bytes(), CONTEUDO)
+
+    def test_async_416_com_parcial_completo(self):
+        Path(self.destino).parent.mkdir(parents=True)
+        Path(self.destino + SUFIXO_PARCIAL).write_bytes(CONTEUDO)
+        requisitar, pedidos = _servidor()
+
+        async def requisitar_async(headers):
+            return requisitar(headers)
+
+        resultado = asyncio.run(baixar_stream_async(requisitar_async, self.destino))
+
+        self.assertEqual(len(pedidos), 1)
+        self.assertEqual(resultado.sha256, hashlib.sha256(CONTEUDO).hexdigest())
+        self.assertEqual(Path(self.destino).read_bytes(), CONTEUDO)
+
+
+    def test_async_206_de_outro_byte_baixa_inteiro(self):
+        Path(self.destino).parent.mkdir(parents=True)
+        Path(self.destino + SUFIXO_PARCIAL).write_bytes(CONTEUDO[:100])
+        requisitar, pedidos = _servidor(desvio=-50)
+
+        async def requisitar_async(headers):
+            return requisitar(headers)
+
+        resultado = asyncio.run(baixar_stream_async(requisitar_async, self.destino))
+
+        self.assertEqual(len(pedidos), 2)
+        self.assertNotIn("Range", pedidos[1])
+        self.assertFalse(resultado.retomado)
+        self.assertEqual(Path(self.destino).read_bytes(), CONTEUDO)
+
+
+class TestConteudoBinario(unittest.TestCase):
+    """Testes da deteccao de content-type binario"""
+
+    def test_tipos(self):
+        self.assertTrue(eh_conteudo_binario("application/pdf"))
+        self.assertTrue(eh_conteudo_binario("Application/PDF; charset=binary"))
+        self.assertTrue(eh_conteudo_binario("image/png"))
+        self.assertFalse(eh_conteudo_binario("text/html; charset=utf-8"))
+        self.assertFalse(eh_conteudo_binario(None))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
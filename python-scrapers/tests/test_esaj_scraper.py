@@ -13,10 +13,12 @@ Autor: ROM-Agent Integration System
 Data: 2026-01-12
 """
 
+import asyncio
 import json
 import os
 import sys
 import tempfile
+import threading
 import time
 import unittest
 from datetime import datetime
@@ -30,12 +32,14 @@ from esaj_scraper import (
     # Classes principais
     ESAJScraper,
     ProcessoESAJ,
+    ResumoProcessoESAJ,
     Parte,
     Movimentacao,
     Documento,
     Audiencia,
 
     # Componentes
+    AsyncESAJScraper,
     CacheManager,
     LogManager,
     RateLimiter,
@@ -570,6 +574,14 @@ class TestCacheManager(unittest.TestCase):
 
         self.assertIsNone(resultado)
 
+    def test_falha_do_banco_nao_propaga(self):
+        """Testa invalidacao e limpeza com o banco travado"""
+        import sqlite3
+        with patch.object(self.cache._store, "delete", side_effect=sqlite3.OperationalError("locked")), \
+                patch.object(self.cache._store, "clear", side_effect=sqlite3.OperationalError("locked")):
+            self.cache.invalidate("key")
+            self.cache.clear()
+
 
 # =============================================================================
 # TESTES UNITARIOS - RATE LIMITER
@@ -600,6 +612,28 @@ class TestRateLimiter(unittest.TestCase):
 
         self.assertGreater(backoff_apos_erro, backoff_inicial)
 
+    def test_limite_compartilhado_por_chave(self):
+        """Testa que limiters com a mesma chave dividem o token bucket"""
+        from token_bucket import TokenBucketLimiter
+
+        temp_dir = tempfile.mkdtemp()
+        try:
+            bucket = TokenBucketLimiter(f"{temp_dir}/rate.db")
+            limiter_a = RateLimiter(rate=0.1, chave="esaj.tjsp.jus.br", bucket=bucket)
+            limiter_b = RateLimiter(rate=0.1, chave="esaj.tjsp.jus.br", bucket=bucket)
+
+            inicio = time.time()
+            limiter_a.wait()
+            limiter_b.wait()
+            duracao = time.time() - inicio
+
+            self.assertGreaterEqual(duracao, 0.09)
+            self.assertGreater(limiter_a.tempo_espera, 0)
+            bucket.close()
+        finally:
+            import shutil
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
     def test_reset_backoff_em_sucesso(self):
         """Testa reset do backoff em sucesso"""
         limiter = RateLimiter(rate=0.1)
@@ -630,7 +664,13 @@ class TestCaptchaHandler(unittest.TestCase):
 
     def setUp(self):
         """Prepara ambiente de teste"""
-        self.handler = CaptchaHandler()
+        self.temp_dir = tempfile.mkdtemp()
+        self.handler = CaptchaHandler(logger=LogManager(log_dir=self.temp_dir, console_output=False))
+
+    def tearDown(self):
+        """Limpa ambiente de teste"""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
 
     def test_detectar_captcha_presente(self):
         """Testa deteccao de CAPTCHA presente"""
@@ -712,6 +752,29 @@ class TestESAJScraperMock(unittest.TestCase):
         movs = scraper._extrair_movimentacoes(soup)
         self.assertIsInstance(movs, list)
 
+    def test_teto_da_taxa_adaptativa(self):
+        """Testa que o teto do AIMD passa da taxa configurada e aceita taxa_maxima"""
+        import adaptive_rate
+        with patch.object(adaptive_rate, "_controladores", {}):
+            padrao = ESAJScraper(
+                cache_dir=f"{self.temp_dir}/cache",
+                log_dir=f"{self.temp_dir}/logs",
+                cache_enabled=False,
+                rate_limit=2.0
+            )
+            configurado = ESAJScraper(
+                cache_dir=f"{self.temp_dir}/cache",
+                log_dir=f"{self.temp_dir}/logs",
+                cache_enabled=False,
+                rate_limit=2.0,
+                taxa_maxima=4.0
+            )
+        self.assertEqual(
+            padrao.rate_limiter.controlador.taxa_maxima,
+            0.5 * adaptive_rate.DEFAULT_FATOR_MAXIMO
+        )
+        self.assertEqual(configurado.rate_limiter.controlador.taxa_maxima, 4.0)
+
     def test_detectar_segredo_justica(self):
         """Testa deteccao de segredo de justica"""
         scraper = ESAJScraper(
@@ -758,6 +821,344 @@ class TestESAJScraperMock(unittest.TestCase):
         with self.assertRaises(ESAJValidationError):
             scraper._parsear_numero_processo("123456")
 
+    def test_nomes_duplicados_estaveis(self):
+        """Testa que o nome de documentos homonimos nao depende dos filtros"""
+        scraper = ESAJScraper(
+            cache_dir=f"{self.temp_dir}/cache",
+            log_dir=f"{self.temp_dir}/logs",
+            cache_enabled=False
+        )
+        processo = ProcessoESAJ(numero_processo="1000000-00.2024.8.26.0100")
+        processo.documentos = [
+            {"tipo": "peticao", "data": "20240110", "url": "https://esaj/doc/1"},
+            {"tipo": "decisao", "data": "20240110", "url": "https://esaj/doc/2"},
+            {"tipo": "decisao", "data": "20240110", "url": "https://esaj/doc/3"},
+            {"tipo": "decisao", "data": "20240110", "url": "https://esaj/doc/3"},
+        ]
+
+        def nomes(tipos=None):
+            with patch.object(scraper, "_baixar_documento",
+                              side_effect=lambda doc, caminho, proc: caminho.name):
+                return scraper.baixar_documentos(processo, f"{self.temp_dir}/docs", tipos)
+
+        todos = nomes()
+        self.assertEqual(len(todos), 3)
+        self.assertEqual(nomes(tipos=["decisao"]), todos[1:])
+
+
+class TestAsyncESAJScraper(unittest.TestCase):
+    """Testes da variante assincrona e da extracao em lote"""
+
+    def setUp(self):
+        """Prepara ambiente de teste"""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Limpa ambiente de teste"""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _criar_scraper(self, handler, **kwargs):
+        import httpx
+        scraper = AsyncESAJScraper(
+            cache_dir=f"{self.temp_dir}/cache",
+            log_dir=f"{self.temp_dir}/logs",
+            cache_enabled=False,
+            **kwargs
+        )
+        scraper._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return scraper
+
+    def test_extrair_lote_mock(self):
+        """Testa lote com sucesso, processo inexistente e numero invalido"""
+        import httpx
+
+        def handler(request):
+            if "0200000" in str(request.url):
+                return httpx.Response(200, text="<html>Nao existem informacoes</html>")
+            return httpx.Response(200, text=MOCK_HTML_PROCESSO_1G)
+
+        scraper = self._criar_scraper(handler)
+        scraper.rate_limiter = RateLimiter(rate=0.0)
+
+        async def executar():
+            async with scraper:
+                return [item async for item in scraper.extrair_lote([
+                    "1000000-00.2024.8.26.0100",
+                    "0200000-00.2024.8.26.0100",
+                    "123",
+                ])]
+
+        resultados = {r["numero_processo"]: r for r in asyncio.run(executar())}
+
+        self.assertEqual(len(resultados), 3)
+        self.assertTrue(resultados["1000000-00.2024.8.26.0100"]["sucesso"])
+        self.assertEqual(
+            resultados["1000000-00.2024.8.26.0100"]["processo"]["instancia"], "1"
+        )
+        self.assertEqual(
+            resultados["0200000-00.2024.8.26.0100"]["tipo_erro"],
+            "ESAJProcessoNaoEncontrado"
+        )
+        self.assertEqual(resultados["123"]["tipo_erro"], "ESAJValidationError")
+
+    def test_mesmo_resultado_que_versao_sincrona(self):
+        """Testa que o parsing assincrono gera o mesmo processo"""
+        import httpx
+
+        scraper = self._criar_scraper(
+            lambda request: httpx.Response(200, text=MOCK_HTML_PROCESSO_1G)
+        )
+        scraper.rate_limiter = RateLimiter(rate=0.0)
+
+        async def executar():
+            async with scraper:
+                return await scraper.extrair_1g_async("1000000-00.2024.8.26.0100")
+
+        processo_async = asyncio.run(executar())
+
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.text = MOCK_HTML_PROCESSO_1G
+        mock_response.url = processo_async.url_consulta
+        scraper._session = Mock()
+        scraper._session.get.return_value = mock_response
+        processo_sync = scraper.extrair_1g("1000000-00.2024.8.26.0100")
+
+        dados_async = processo_async.to_dict()
+        dados_sync = processo_sync.to_dict()
+        dados_async.pop("timestamp_extracao", None)
+        dados_sync.pop("timestamp_extracao", None)
+        self.assertEqual(dados_async, dados_sync)
+
+    def test_rate_limiter_compartilhado_por_host(self):
+        """Testa que instancias diferentes dividem o orcamento do host"""
+        import httpx
+
+        handler = lambda request: httpx.Response(200, text="")
+        scraper_a = self._criar_scraper(handler)
+        scraper_b = self._criar_scraper(handler)
+        self.assertIs(scraper_a.rate_limiter, scraper_b.rate_limiter)
+
+    def test_rate_limit_assincrono(self):
+        """Testa espacamento entre requisicoes concorrentes"""
+        limiter = RateLimiter(rate=0.05)
+
+        async def executar():
+            inicio = time.time()
+            await asyncio.gather(*(limiter.wait_async() for _ in range(4)))
+            return time.time() - inicio
+
+        # 4 requisicoes: 3 intervalos de 50ms
+        self.assertGreaterEqual(asyncio.run(executar()), 0.14)
+
+
+class TestFamiliaProcessual(unittest.TestCase):
+    """Testes do crawler de processos relacionados"""
+
+    A = "1000000-00.2024.8.26.0100"
+    B = "1000001-00.2024.8.26.0100"
+    C = "1000002-00.2024.8.26.0100"
+    D = "2000000-00.2024.8.26.0000"
+    E = "3000000-00.2024.8.26.0100"
+
+    def setUp(self):
+        """Prepara ambiente de teste"""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Limpa ambiente de teste"""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    @staticmethod
+    def _pagina(origem=None, dependentes=()):
+        extra = ""
+        if origem:
+            extra += f'<div id="dadosDaOrigem">Foro Central / 1a Vara / {origem}</div>'
+        if dependentes:
+            linhas = "".join(
+                f'<tr><td><a href="show.do?processo.codigo=X">{n}</a></td><td>Apelacao</td></tr>'
+                for n in dependentes
+            )
+            extra += f'<table id="incidentes">{linhas}</table>'
+        return MOCK_HTML_PROCESSO_1G.replace("</body>", f"{extra}</body>")
+
+    def test_extrair_familia_bfs_limitada(self):
+        """Testa BFS nas duas instancias com dedup, limite e concorrencia"""
+        import httpx
+
+        paginas = {
+            (self.A, "1"): self._pagina(dependentes=[self.B, self.C]),
+            (self.A, "2"): self._pagina(origem=self.A, dependentes=[self.D, self.B]),
+            (self.B, "1"): self._pagina(origem=self.A),
+            (self.D, "2"): self._pagina(dependentes=[self.E]),
+        }
+        requisicoes = []
+        em_andamento = [0, 0]  # atual, maximo
+
+        async def handler(request):
+            params = request.url.params
+            instancia = "2" if "dePesquisaNuUnificado" in params else "1"
+            numero = params.get("dePesquisaNuUnificado") or params.get("dadosConsulta.valorConsulta")
+            requisicoes.append((numero, instancia))
+            em_andamento[0] += 1
+            em_andamento[1] = max(em_andamento)
+            await asyncio.sleep(0.01)
+            em_andamento[0] -= 1
+            html = paginas.get((numero, instancia), "<html>Nao existem informacoes</html>")
+            return httpx.Response(200, text=html)
+
+        scraper = AsyncESAJScraper(
+            cache_dir=f"{self.temp_dir}/cache",
+            log_dir=f"{self.temp_dir}/logs",
+            cache_enabled=False,
+            deduplicar_documentos=False
+        )
+        scraper._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        scraper.rate_limiter = RateLimiter(rate=0.0)
+
+        async def executar():
+            async with scraper:
+                return await scraper.extrair_familia(self.A, profundidade=1, max_concorrencia=2)
+
+        familia = asyncio.run(executar())
+
+        self.assertEqual(set(familia.processos), {self.A, self.B, self.D})
+        self.assertEqual(set(familia.processos[self.A]), {"1", "2"})
+        self.assertEqual(familia.processos[self.B]["1"].processo_origem, self.A)
+        self.assertIn({"de": self.A, "para": self.B, "tipo": "dependente"}, familia.vinculos)
+        self.assertIn({"de": self.B, "para": self.A, "tipo": "origem"}, familia.vinculos)
+        self.assertIn({"de": self.D, "para": self.E, "tipo": "dependente"}, familia.vinculos)
+
+        # E esta alem da profundidade; cada (numero, instancia) consultado uma vez
+        self.assertTrue(familia.truncada)
+        self.assertNotIn(self.E, [numero for numero, _ in requisicoes])
+        self.assertEqual(len(requisicoes), len(set(requisicoes)))
+        self.assertEqual(len(requisicoes), 8)
+        self.assertEqual(em_andamento[1], 2)
+        self.assertEqual(familia.erros, [])
+
+
+class TestBuscaPaginada(unittest.TestCase):
+    """Testes da busca por documento com prefetch de paginas"""
+
+    CPF = "12345678909"
+
+    def setUp(self):
+        """Prepara ambiente de teste"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.scraper = ESAJScraper(
+            cache_dir=f"{self.temp_dir}/cache",
+            log_dir=f"{self.temp_dir}/logs",
+            cache_enabled=False,
+            deduplicar_documentos=False
+        )
+        self.scraper.rate_limiter = RateLimiter(rate=0.0)
+        self.eventos = []
+
+    def tearDown(self):
+        """Limpa ambiente de teste"""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    @staticmethod
+    def _numero(pagina, indice):
+        return f"{pagina:03d}{indice:04d}-00.2024.8.26.0100"
+
+    def _pagina(self, pagina, por_pagina=10, total_paginas=3):
+        itens = "".join(
+            f'''<li><div class="row">
+                <a class="linkProcesso" href="/cpopg/show.do?processo.codigo={pagina}X{i}">
+                    {self._numero(pagina, i)}</a>
+                <div class="classeProcesso">Procedimento Comum Civel</div>
+                <div class="assuntoPrincipalProcesso">Indenizacao</div>
+                <div class="dataLocalDistribuicaoProcesso">10/01/2024 - Foro Central</div>
+            </div></li>'''
+            for i in range(por_pagina)
+        )
+        proxima = '<a href="#">>></a>' if pagina < total_paginas else ""
+        return f"<html><body><ul>{itens}</ul>{proxima}</body></html>"
+
+    def _requisicao(self, atraso=0.05, **kwargs):
+        def requisitar(url, method="GET", params=None, **_):
+            pagina = int(params["paginaConsulta"])
+            self.eventos.append(("inicio", pagina))
+            time.sleep(atraso)
+            self.eventos.append(("fim", pagina))
+            response = Mock()
+            response.status_code = 200
+            response.text = self._pagina(pagina, **kwargs)
+            return response
+        return requisitar
+
+    def test_resumos_e_prefetch(self):
+        """Testa resumos na ordem e download da proxima pagina antecipado"""
+        with patch.object(self.scraper, "_fazer_requisicao", side_effect=self._requisicao()):
+            resumos = list(self.scraper.iterar_busca_documento(self.CPF, "CPF", max_resultados=25))
+
+        self.assertEqual(len(resumos), 25)
+        self.assertIsInstance(resumos[0], ResumoProcessoESAJ)
+        self.assertEqual(resumos[0].numero_processo, self._numero(1, 0))
+        self.assertEqual(resumos[-1].numero_processo, self._numero(3, 4))
+        self.assertEqual(resumos[0].classe, "Procedimento Comum Civel")
+        self.assertEqual(resumos[0].distribuicao, "10/01/2024 - Foro Central")
+        self.assertTrue(resumos[0].url.endswith("/cpopg/show.do?processo.codigo=1X0"))
+
+        # Limite atingido na pagina 3: nenhuma requisicao alem da especulativa
+        self.assertLessEqual(max(p for _, p in self.eventos), 4)
+
+    def test_pagina_unica_uma_requisicao(self):
+        """Testa que sem link para a proxima pagina nada e pedido especulativamente"""
+        with patch.object(self.scraper, "_fazer_requisicao",
+                          side_effect=self._requisicao(0.0, total_paginas=1)) as requisicao:
+            resumos = list(self.scraper.iterar_busca_documento(self.CPF, "CPF"))
+
+        self.assertEqual(len(resumos), 10)
+        self.assertEqual(requisicao.call_count, 1)
+
+    def test_primeiro_resultado_sem_esperar_proximas_paginas(self):
+        """Testa que o primeiro resumo chega antes das demais paginas"""
+        with patch.object(self.scraper, "_fazer_requisicao", side_effect=self._requisicao(0.2)):
+            inicio = time.time()
+            resumos = self.scraper.iterar_busca_documento(self.CPF, "CPF")
+            primeiro = next(resumos)
+            decorrido = time.time() - inicio
+
+            # Com o consumidor parado, a pagina 2 ja esta sendo baixada
+            time.sleep(0.05)
+            self.assertIn(("inicio", 2), self.eventos)
+            resumos.close()
+
+        self.assertEqual(primeiro.numero_processo, self._numero(1, 0))
+        self.assertLess(decorrido, 0.35)
+
+    def test_detalhes_em_paralelo_na_ordem(self):
+        """Testa extracao dos processos em paralelo preservando a ordem"""
+        em_andamento = [0, 0]  # atual, maximo
+        trava = threading.Lock()
+
+        def extrair(numero):
+            with trava:
+                em_andamento[0] += 1
+                em_andamento[1] = max(em_andamento)
+            time.sleep(0.02)
+            with trava:
+                em_andamento[0] -= 1
+            if numero == self._numero(1, 3):
+                raise ESAJProcessoNaoEncontrado(numero)
+            return ProcessoESAJ(numero_processo=numero, tribunal="TJSP", sistema="ESAJ", instancia="1")
+
+        with patch.object(self.scraper, "_fazer_requisicao",
+                          side_effect=self._requisicao(0.0, total_paginas=2)), \
+                patch.object(self.scraper, "extrair_1g", side_effect=extrair):
+            processos = self.scraper.buscar_por_cpf(self.CPF, max_resultados=15, max_concorrencia=3)
+
+        esperados = [self._numero(1, i) for i in range(10) if i != 3] + \
+                    [self._numero(2, i) for i in range(5)]
+        self.assertEqual([p.numero_processo for p in processos], esperados)
+        self.assertEqual(em_andamento[1], 3)
+
 
 # =============================================================================
 # TESTES DE EXCECOES
@@ -948,6 +1349,9 @@ def run_tests():
     suite.addTests(loader.loadTestsFromTestCase(TestRateLimiter))
     suite.addTests(loader.loadTestsFromTestCase(TestCaptchaHandler))
     suite.addTests(loader.loadTestsFromTestCase(TestESAJScraperMock))
+    suite.addTests(loader.loadTestsFromTestCase(TestAsyncESAJScraper))
+    suite.addTests(loader.loadTestsFromTestCase(TestFamiliaProcessual))
+    suite.addTests(loader.loadTestsFromTestCase(TestBuscaPaginada))
     suite.addTests(loader.loadTestsFromTestCase(TestExcecoes))
     suite.addTests(loader.loadTestsFromTestCase(TestPerformance))
     suite.addTests(loader.loadTestsFromTestCase(TestFormatoSaida))
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes Unitarios para o arquivo de paginas HTML e o reprocessamento offline
+
+Autor: ROM-Agent Integration System
+Data: 2026-01-12
+"""
+
+import asyncio
+import logging
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import httpx
+
+# Adiciona diretorio pai ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from html_archive import TIPO_CONSULTA, ArquivoHTML, chave_requisicao
+from esaj_scraper import AsyncESAJScraper, RateLimiter
+from tests.test_esaj_scraper import MOCK_HTML_PROCESSO_1G
+
+
+NUMERO = "1000000-00.2024.8.26.0100"
+
+
+class TestArquivoHTML(unittest.TestCase):
+    """Testes do armazenamento comprimido"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.arquivo = ArquivoHTML(self.temp_dir)
+
+    def tearDown(self):
+        self.arquivo.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_ida_e_volta_comprimida(self):
+        html = "<html><body>" + "<p>Movimentacao</p>" * 500 + "</body></html>"
+        self.arquivo.gravar("esaj", "N:1", "https://tj/show.do", html, params={"a": "1"})
+
+        resposta = self.arquivo.buscar("GET", "https://tj/show.do", {"a": "1"})
+        self.assertEqual(resposta.html, html)
+        self.assertLess(len(resposta.corpo), len(html) / 10)
+        self.assertGreater(self.arquivo.stats["taxa_compressao"], 10)
+
+    def test_query_string_equivale_a_params(self):
+        self.assertEqual(
+            chave_requisicao("GET", "https://tj/show.do?b=2&a=1"),
+            chave_requisicao("get", "https://tj/show.do", {"a": "1", "b": 2})
+        )
+        self.assertNotEqual(
+            chave_requisicao("GET", "https://tj/show.do", {"a": "1"}),
+            chave_requisicao("POST", "https://tj/show.do", {"a": "1"})
+        )
+
+    def test_ultimas_por_processo(self):
+        self.arquivo.gravar("esaj", "A:1", "https://tj/a", "<p>antiga</p>")
+        self.arquivo.gravar("esaj", "A:1", "https://tj/a", "<p>nova</p>")
+        self.arquivo.gravar("esaj", "B:1", "https://tj/b", "<p>b</p>")
+        self.arquivo.gravar("esaj", "B:1", "https://tj/busca", "<p>lista</p>", tipo=TIPO_CONSULTA)
+        self.arquivo.gravar("pje", "C:TRF1", "https://trf/c", "<p>c</p>")
+
+        ultimas = {r.processo: r.html for r in self.arquivo.ultimas("esaj")}
+        self.assertEqual(ultimas, {"A:1": "<p>nova</p>", "B:1": "<p>b</p>"})
+
+    def test_transporte_replay(self):
+        self.arquivo.gravar("projudi", "N", "https://projudi/BuscaProcesso", "<p>ok</p>",
+                            params={"numeroProcesso": "N"}, metodo="POST")
+
+        with httpx.Client(transport=self.arquivo.transporte_replay()) as client:
+            resposta = client.post("https://projudi/BuscaProcesso", data={"numeroProcesso": "N"})
+            ausente = client.get("https://projudi/outra")
+
+        self.assertEqual(resposta.text, "<p>ok</p>")
+        self.assertEqual(ausente.status_code, 404)
+
+
+class TestReprocessamentoESAJ(unittest.TestCase):
+    """Captura, replay e reprocessamento no ESAJ"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.arquivo = ArquivoHTML(f"{self.temp_dir}/arquivo")
+
+    def tearDown(self):
+        self.arquivo.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _extrair(self, transporte, subdir):
+        scraper = AsyncESAJScraper(
+            cache_dir=f"{self.temp_dir}/{subdir}",
+            log_dir=f"{self.temp_dir}/logs",
+            log_level=logging.ERROR,
+            cache_enabled=False,
+            deduplicar_documentos=False,
+            arquivo_html=self.arquivo
+        )
+        scraper.rate_limiter = RateLimiter(rate=0.0)
+        scraper._client = httpx.AsyncClient(transport=transporte)
+
+        async def executar():
+            async with scraper:
+                return await scraper.extrair_1g_async(NUMERO)
+
+        return scraper, asyncio.run(executar())
+
+    @staticmethod
+    def _sem_timestamp(processo):
+        dados = processo.to_dict()
+        dados.pop("timestamp_extracao", None)
+        return dados
+
+    def test_replay_e_reprocessamento_sem_rede(self):
+        scraper, original = self._extrair(
+            httpx.MockTransport(lambda request: httpx.Response(200, text=MOCK_HTML_PROCESSO_1G)),
+            "captura"
+        )
+        self.assertEqual(self.arquivo.count("esaj"), 1)
+
+        def sem_rede(request):
+            raise AssertionError(f"requisicao inesperada: {request.url}")
+
+        # Replay: o mesmo fluxo HTTP servido pelo arquivo
+        _, repetido = self._extrair(self.arquivo.transporte_replay(), "replay")
+        self.assertEqual(self._sem_timestamp(repetido), self._sem_timestamp(original))
+
+        # Reprocessamento: extracao direta das paginas arquivadas
+        scraper._client = httpx.AsyncClient(transport=httpx.MockTransport(sem_rede))
+        reprocessados = list(scraper.reprocessar_arquivo())
+        self.assertEqual(len(reprocessados), 1)
+        self.assertEqual(self._sem_timestamp(reprocessados[0]), self._sem_timestamp(original))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes Unitarios para o backend de parse HTML
+
+Autor: ROM-Agent Integration System
+Data: 2026-01-12
+"""
+
+import logging
+import os
+import re
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Adiciona diretorio pai ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from html_backend import (
+    DEFAULT_PARSER,
+    LXML_AVAILABLE,
+    PARSER_LXML,
+    PARSER_PYTHON,
+    PaginaHTML,
+    apenas_tags,
+    como_pagina,
+    criar_soup,
+    pagina_da_resposta,
+    textos_links,
+)
+from esaj_scraper import ESAJScraper
+from tests.test_esaj_scraper import MOCK_HTML_PROCESSO_1G, MOCK_HTML_PROCESSO_2G
+
+
+class TestHtmlBackend(unittest.TestCase):
+    """Testes de criacao da arvore"""
+
+    @unittest.skipIf(os.environ.get("ROM_HTML_PARSER"), "backend definido no ambiente")
+    def test_parser_padrao(self):
+        esperado = PARSER_LXML if LXML_AVAILABLE else PARSER_PYTHON
+        self.assertEqual(DEFAULT_PARSER, esperado)
+
+    def test_parse_parcial_mantem_somente_tags_pedidas(self):
+        html = """
+        <html><body>
+            <div><p>Cabecalho</p><img src="/captcha.png" id="captchaImg"/></div>
+            <table><tr><td><a href="/show.do?processo.codigo=1">1</a></td></tr></table>
+        </body></html>
+        """
+        soup = criar_soup(html, parse_only=apenas_tags('a'))
+
+        self.assertEqual(len(soup.find_all('a')), 1)
+        self.assertIsNone(soup.find('img'))
+        self.assertIsNone(soup.find('table'))
+
+    def test_textos_links_sem_parse(self):
+        html = '<p>&gt;&gt;</p><a href="#">1</a> <A class="p"><span>Proxima</span> &gt;</a>'
+        self.assertEqual(list(textos_links(html)), ["1", "Proxima >"])
+
+
+HTML_CAMPOS = """
+<html><body>
+    <div class="cabecalho Processo">Cabecalho</div>
+    <table>
+        <tr><td>Comarca</td><td id="campoComarca">Goiania</td></tr>
+        <tr><th>Valor da causa</th><td class="valorCausa">R$ 1.000,00</td></tr>
+    </table>
+    <label>Juiz</label><span>Fulano</span>
+    <span id="ClasseProcesso">Procedimento Comum</span>
+</body></html>
+"""
+
+
+class TestPaginaHTML(unittest.TestCase):
+    """As buscas indexadas devem devolver o mesmo elemento que o bs4"""
+
+    def setUp(self):
+        self.pagina = PaginaHTML(html=HTML_CAMPOS)
+        self.soup = criar_soup(HTML_CAMPOS)
+
+    def test_buscar_id_equivale_a_find_e_select(self):
+        for nome in ("comarca", "Comarca", "classe", "inexistente"):
+            self.assertEqual(
+                self.pagina.buscar_id(nome, ignorar_caixa=True),
+                self.soup.find(id=re.compile(nome, re.I))
+            )
+            self.assertEqual(
+                self.pagina.buscar_id(nome),
+                self.soup.select_one(f'[id*="{nome}"]')
+            )
+
+    def test_buscar_classe_equivale_a_find_e_select(self):
+        for nome in ("valor", "Processo", "cabecalho Processo", "inexistente"):
+            self.assertEqual(
+                self.pagina.buscar_classe(nome, ignorar_caixa=True),
+                self.soup.find(class_=re.compile(nome, re.I))
+            )
+            self.assertEqual(
+                self.pagina.buscar_classe(nome),
+                self.soup.select_one(f'[class*="{nome}"]')
+            )
+
+    def test_buscar_texto_label_e_celulas(self):
+        self.assertEqual(
+            self.pagina.buscar_texto("valor"),
+            self.soup.find(string=re.compile("valor", re.I))
+        )
+        self.assertEqual(
+            self.pagina.buscar_texto("juiz", inicio=True),
+            self.soup.find(string=re.compile("^juiz", re.I))
+        )
+        self.assertEqual(
+            self.pagina.buscar_label("JUIZ"),
+            self.soup.find('label', string=re.compile("JUIZ", re.I))
+        )
+        self.assertEqual(
+            list(self.pagina.celulas_com("causa")),
+            [c for c in self.soup.find_all(['td', 'th']) if "causa" in c.text.lower()]
+        )
+
+    def test_deteccao_sem_parse(self):
+        self.assertTrue(self.pagina.contem(["goiania"], caixa_baixa=True))
+        self.assertFalse(self.pagina.contem(["goiania"]))
+        self.assertIsNone(self.pagina._soup)
+
+    def test_como_pagina(self):
+        self.assertIs(como_pagina(self.pagina), self.pagina)
+        self.assertIs(como_pagina(self.soup).soup, self.soup)
+        self.assertEqual(como_pagina(HTML_CAMPOS).html, HTML_CAMPOS)
+
+    def test_pagina_da_resposta_reutilizada(self):
+        class Resposta:
+            text = HTML_CAMPOS
+
+        resposta = Resposta()
+        pagina = pagina_da_resposta(resposta)
+        self.assertIs(pagina_da_resposta(resposta), pagina)
+        self.assertIsNot(pagina_da_resposta(Resposta()), pagina)
+
+
+@unittest.skipUnless(LXML_AVAILABLE, "lxml nao instalado")
+class TestParidadeBackends(unittest.TestCase):
+    """A extracao deve ser identica com html.parser e lxml"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.scraper = ESAJScraper(
+            cache_dir=f"{self.temp_dir}/cache",
+            log_dir=f"{self.temp_dir}/logs",
+            log_level=logging.ERROR,
+            deduplicar_documentos=False
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _extrair(self, html: str, instancia: str, parser: str) -> dict:
+        soup = criar_soup(html, parser=parser)
+        dados = self.scraper._montar_processo(soup, "N", instancia, "").to_dict()
+        dados.pop("timestamp_extracao", None)
+        return dados
+
+    def test_processo_1g(self):
+        self.assertEqual(
+            self._extrair(MOCK_HTML_PROCESSO_1G, "1", PARSER_PYTHON),
+            self._extrair(MOCK_HTML_PROCESSO_1G, "1", PARSER_LXML)
+        )
+
+    def test_processo_2g(self):
+        self.assertEqual(
+            self._extrair(MOCK_HTML_PROCESSO_2G, "2", PARSER_PYTHON),
+            self._extrair(MOCK_HTML_PROCESSO_2G, "2", PARSER_LXML)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
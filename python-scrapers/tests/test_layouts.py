@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes Unitarios para os layouts declarativos de extracao
+
+Autor: ROM-Agent Integration System
+Data: 2026-01-12
+"""
+
+import dataclasses
+import logging
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Adiciona diretorio pai ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from html_backend import criar_soup
+from layouts import (
+    LayoutSpec,
+    compilar_layout,
+    extrair_rotulados,
+    linhas_tabela,
+    obter_layout,
+    registrar_layout,
+)
+from esaj_scraper import ESAJ_LAYOUT_SPEC, LAYOUT_ESAJ, ESAJScraper
+
+
+HTML = """
+<html><body>
+    <table id="tabelaUltimas"><tr><td>01/02/2024</td><td>Ultima</td></tr></table>
+    <table id="tabelaTodas">
+        <tr><th>Data</th><th>Movimento</th></tr>
+        <tr><td>01/02/2024</td><td>Conclusos</td></tr>
+        <tr><td>so uma coluna</td></tr>
+    </table>
+    <div><span>Classe</span></div><div>Procedimento Comum</div>
+    <span id="valorCausaX">R$ 10,00</span>
+</body></html>
+"""
+
+SPEC = LayoutSpec(
+    sistema="teste",
+    rotulos=(("Classe", "classe"), ("Valor", "valorcausa")),
+    seletores={
+        "movimentacoes": ("table#tabelaTodas", "table#tabelaUltimas"),
+        "inexistente": ("table#nada",),
+    },
+    padroes={"data": r'(\d{2})/(\d{2})/(\d{4})'},
+    classificacoes={"tipo": (("autor", "A"), ("reu", "R"))},
+)
+
+
+class TestLayoutCompilado(unittest.TestCase):
+    """Testes do layout compilado"""
+
+    def setUp(self):
+        self.layout = compilar_layout(SPEC)
+        self.soup = criar_soup(HTML)
+
+    def test_primeiro_respeita_ordem_das_alternativas(self):
+        tabela = self.layout.primeiro("movimentacoes", self.soup)
+        self.assertEqual(tabela["id"], "tabelaTodas")
+        self.assertIsNone(self.layout.primeiro("inexistente", self.soup))
+
+    def test_cada_devolve_primeiro_de_cada_alternativa(self):
+        ids = [t["id"] for t in self.layout.cada("movimentacoes", self.soup)]
+        self.assertEqual(ids, ["tabelaTodas", "tabelaUltimas"])
+
+    def test_padrao_compilado_uma_vez(self):
+        self.assertIs(self.layout.padrao("data"), self.layout.padrao("data"))
+        self.assertEqual(self.layout.padrao("data").search("em 01/02/2024").group(3), "2024")
+
+    def test_classificar(self):
+        self.assertEqual(self.layout.classificar("tipo", "autora"), "A")
+        self.assertEqual(self.layout.classificar("tipo", "reu"), "R")
+        self.assertEqual(self.layout.classificar("tipo", "perito", "O"), "O")
+
+    def test_linhas_tabela_ignora_linhas_curtas(self):
+        tabela = self.layout.primeiro("movimentacoes", self.soup)
+        linhas = [[c.get_text() for c in cols] for _, cols in linhas_tabela(tabela)]
+        self.assertEqual(linhas, [["01/02/2024", "Conclusos"]])
+
+    def test_extrair_rotulados(self):
+        dados = extrair_rotulados(self.soup, self.layout)
+        self.assertEqual(dados["classe"], "Procedimento Comum")
+        self.assertEqual(dados["valorcausa"], "R$ 10,00")
+
+
+class TestRegistroLayouts(unittest.TestCase):
+    """Testes do registro de layouts"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_layouts_dos_scrapers_registrados(self):
+        self.assertIs(obter_layout("esaj"), LAYOUT_ESAJ)
+        with self.assertRaises(KeyError):
+            obter_layout("sistema-inexistente")
+
+    def test_tribunal_derivado_usado_pelo_scraper(self):
+        seletores = dict(ESAJ_LAYOUT_SPEC.seletores)
+        seletores["movimentacoes"] = ("table#movimentosTJXX",)
+        registrar_layout(dataclasses.replace(
+            ESAJ_LAYOUT_SPEC, sistema="esaj-tjxx", seletores=seletores
+        ))
+
+        scraper = ESAJScraper(
+            cache_dir=f"{self.temp_dir}/cache",
+            log_dir=f"{self.temp_dir}/logs",
+            log_level=logging.ERROR,
+            deduplicar_documentos=False,
+            layout="esaj-tjxx"
+        )
+        soup = criar_soup(
+            '<table id="movimentosTJXX"><tr><td>01/02/2024</td><td>Conclusos</td></tr></table>'
+        )
+
+        movimentacoes = scraper._extrair_movimentacoes(soup)
+        self.assertEqual(len(movimentacoes), 1)
+        self.assertEqual(movimentacoes[0]["descricao"], "Conclusos")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
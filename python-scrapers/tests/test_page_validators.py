@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes Unitarios para o GET condicional e o hash de paginas inalteradas
+
+Autor: ROM-Agent Integration System
+Data: 2026-01-12
+"""
+
+import asyncio
+import logging
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import httpx
+
+# Adiciona diretorio pai ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from page_validators import ValidadoresPagina, cabecalhos_condicionais, hash_corpo, validadores_da_url
+from esaj_scraper import AsyncESAJScraper, RateLimiter
+from projudi_scraper import ProjudiScraper
+from tests.test_esaj_scraper import MOCK_HTML_PROCESSO_1G
+
+
+NUMERO = "1000000-00.2024.8.26.0100"
+
+
+class TestHashCorpo(unittest.TestCase):
+    """Testes da impressao digital do corpo"""
+
+    def test_ignora_trechos_volateis(self):
+        base = '<form><input type="hidden" name="javax.faces.ViewState" value="1"/></form>' \
+               '<a href="/show.do;jsessionid=ABC.1">Processo</a><p>Conclusos</p>'
+        variante = '<form><input name="javax.faces.ViewState" type="hidden" value="2"/></form>' \
+                   '<script>var t = 123;</script>\n<a href="/show.do;jsessionid=XYZ.2">Processo</a>' \
+                   '\n  <p>Conclusos</p>'
+        self.assertEqual(hash_corpo(base), hash_corpo(variante))
+
+    def test_detecta_mudanca_de_conteudo(self):
+        self.assertNotEqual(hash_corpo("<p>Conclusos</p>"), hash_corpo("<p>Sentenca</p>"))
+
+    def test_cabecalhos_condicionais(self):
+        validadores = ValidadoresPagina(url="u", etag='"v1"', last_modified="Mon, 01 Jan 2024")
+        self.assertEqual(cabecalhos_condicionais(validadores), {})
+
+        validadores.resultado = {"numero_processo": NUMERO}
+        self.assertEqual(cabecalhos_condicionais(validadores), {
+            "If-None-Match": '"v1"',
+            "If-Modified-Since": "Mon, 01 Jan 2024",
+        })
+        self.assertIs(validadores_da_url(validadores, "u"), validadores)
+        self.assertIsNone(validadores_da_url(validadores, "outra"))
+
+
+class TestESAJCondicional(unittest.TestCase):
+    """Revalidacao da pagina do processo no ESAJ"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.requisicoes = []
+        self.scraper = AsyncESAJScraper(
+            cache_dir=f"{self.temp_dir}/cache",
+            log_dir=f"{self.temp_dir}/logs",
+            log_level=logging.ERROR,
+            cache_ttl=0,  # resultado sempre vencido: cada extracao vai ao portal
+            deduplicar_documentos=False
+        )
+        self.scraper.rate_limiter = RateLimiter(rate=0.0)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _extrair(self, handler):
+        def registrar(request):
+            self.requisicoes.append(request)
+            return handler(request)
+
+        self.scraper._client = httpx.AsyncClient(transport=httpx.MockTransport(registrar))
+        with patch.object(
+            self.scraper, "_montar_processo", wraps=self.scraper._montar_processo
+        ) as montar:
+            async def executar():
+                async with self.scraper:
+                    return await self.scraper.extrair_1g_async(NUMERO)
+            processo = asyncio.run(executar())
+        return processo, montar.call_count
+
+    def test_304_reaproveita_resultado(self):
+        def handler(request):
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304, headers={"ETag": '"v1"'})
+            return httpx.Response(200, text=MOCK_HTML_PROCESSO_1G, headers={"ETag": '"v1"'})
+
+        primeiro, parses = self._extrair(handler)
+        self.assertEqual(parses, 1)
+
+        segundo, parses = self._extrair(handler)
+        self.assertEqual(parses, 0)
+        self.assertEqual(self.requisicoes[-1].headers["If-None-Match"], '"v1"')
+        self.assertEqual(segundo.to_dict(), primeiro.to_dict())
+
+    def test_condicional_so_na_pagina_dos_validadores(self):
+        selecao = '<html><body><a href="/cpopg/show.do?processo.codigo=1">1</a></body></html>'
+
+        def handler(request):
+            if request.url.path.endswith("/search.do"):
+                return httpx.Response(200, text=selecao, headers={"ETag": '"busca"'})
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304, headers={"ETag": '"v1"'})
+            return httpx.Response(200, text=MOCK_HTML_PROCESSO_1G, headers={"ETag": '"v1"'})
+
+        primeiro, _ = self._extrair(handler)
+        segundo, parses = self._extrair(handler)
+
+        busca, processo = self.requisicoes[-2:]
+        self.assertNotIn("If-None-Match", busca.headers)
+        self.assertEqual(processo.headers["If-None-Match"], '"v1"')
+        self.assertEqual(parses, 0)
+        self.assertEqual(segundo.to_dict(), primeiro.to_dict())
+
+    def test_hash_do_corpo_sem_validadores_http(self):
+        def pagina(token, extra=""):
+            html = MOCK_HTML_PROCESSO_1G.replace(
+                "</body>", f'<input type="hidden" name="token" value="{token}"/>{extra}</body>'
+            )
+            return lambda request: httpx.Response(200, text=html)
+
+        primeiro, _ = self._extrair(pagina("a"))
+        segundo, parses = self._extrair(pagina("b"))
+        self.assertEqual(parses, 0)
+        self.assertEqual(segundo.movimentacoes, primeiro.movimentacoes)
+        self.assertNotIn("If-None-Match", self.requisicoes[-1].headers)
+
+        movimento = "<table><tr><td>01/02/2024</td><td>Conclusos</td></tr></table>"
+        _, parses = self._extrair(pagina("c", movimento))
+        self.assertEqual(parses, 1)
+
+
+class TestProjudiCondicional(unittest.IsolatedAsyncioTestCase):
+    """Revalidacao por hash no PROJUDI (busca via POST)"""
+
+    NUMERO = "0123456-78.2024.8.09.0001"
+
+    async def asyncSetUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.scraper = ProjudiScraper(
+            cache_dir=self.temp_dir, taxa_adaptativa=False, deduplicar_documentos=False
+        )
+        self.html = "<html><div id='comarca'>Goiania</div></html>"
+
+        async def requisitar(method, url, **kwargs):
+            response = MagicMock()
+            response.text = self.html
+            response.url = url
+            return response
+
+        self.scraper._request_with_retry = requisitar
+
+    async def asyncTearDown(self):
+        await self.scraper._close_client()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _vencer(self):
+        cache = self.scraper.result_cache
+        dados, salvo_em = cache._entradas[self.NUMERO]
+        cache._entradas[self.NUMERO] = (dados, salvo_em - cache.ttl - cache.stale_ttl - 1)
+
+    async def test_pagina_inalterada_nao_e_parseada(self):
+        await self.scraper.buscar_processo(self.NUMERO)
+        self._vencer()
+
+        with patch.object(
+            self.scraper, "_extrair_dados_processo", wraps=self.scraper._extrair_dados_processo
+        ) as extrair:
+            await self.scraper.buscar_processo(self.NUMERO)
+            self.assertEqual(extrair.call_count, 0)
+
+            self._vencer()
+            self.html = "<html><div id='comarca'>Anapolis</div></html>"
+            await self.scraper.buscar_processo(self.NUMERO)
+            self.assertEqual(extrair.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
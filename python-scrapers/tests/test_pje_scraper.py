@@ -58,6 +58,7 @@ from pje_scraper import (
     PJeRateLimitError,
     PJeValidationError,
     PJeCircuitBreakerOpenError,
+    PJePrazoEsgotadoError,
 
     # Enums
     TRF,
@@ -94,6 +95,7 @@ from pje_scraper import (
     extrair_processo_pje,
     extrair_processo_pje_sync,
 )
+from downloads import ResultadoDownload
 
 
 # =============================================================================
@@ -957,6 +959,27 @@ class TestPJeScraperMock(unittest.TestCase):
         docs = scraper._extrair_documentos(soup)
         self.assertIsInstance(docs, list)
 
+    def test_documento_sem_processo_fora_do_store(self):
+        """Testa que documento sem numero de processo nao e indexado no store"""
+        scraper = PJeScraper(
+            cache_dir=f"{self.temp_dir}/cache",
+            log_dir=f"{self.temp_dir}/logs",
+            cache_enabled=False
+        )
+        self.assertIsNone(scraper.document_store)  # deduplicacao e opt-in
+
+        scraper.document_store = Mock()
+        resultado = ResultadoDownload(
+            caminho=f"{self.temp_dir}/doc.pdf", tamanho_bytes=3,
+            hashes={"sha256": "ab"}, content_type="application/pdf"
+        )
+        with patch("pje_scraper.baixar_stream", return_value=resultado):
+            ok = scraper.baixar_documento("123", f"{self.temp_dir}/doc.pdf", "TRF1")
+
+        self.assertTrue(ok)
+        scraper.document_store.localizar.assert_not_called()
+        scraper.document_store.armazenar.assert_not_called()
+
     def test_detectar_segredo_justica(self):
         """Testa deteccao de segredo de justica"""
         scraper = PJeScraper(
@@ -1022,6 +1045,95 @@ class TestPJeScraperMock(unittest.TestCase):
         self.assertIn("tipo", primeira)
         self.assertIn("descricao", primeira)
 
+    def test_busca_paralela_trfs(self):
+        """Testa busca em todos os TRFs em paralelo com resultado parcial"""
+        scraper = PJeScraper(
+            cache_dir=f"{self.temp_dir}/cache",
+            log_dir=f"{self.temp_dir}/logs",
+            cache_enabled=False
+        )
+        # Circuito compartilhado no processo: fecha de novo para os demais testes
+        self.addCleanup(scraper.circuit_breakers["TRF5"].reset)
+        for _ in range(scraper.circuit_breakers["TRF5"].threshold):
+            scraper.circuit_breakers["TRF5"].record_failure()
+
+        def buscar(trf, documento, tipo_doc):
+            time.sleep(0.3)
+            if trf == "TRF3":
+                raise PJeConnectionError("portal fora do ar")
+            return [ProcessoPJe(numero_processo=f"0000001-00.2024.4.0{trf[-1]}.0000", tribunal=trf)]
+
+        with patch.object(scraper, "_buscar_por_documento", side_effect=buscar):
+            inicio = time.time()
+            processos = scraper.buscar_por_cpf("529.982.247-25")
+            duracao = time.time() - inicio
+
+        # Quatro TRFs de 0.3s em paralelo: bem menos que a soma (1.2s)
+        self.assertLess(duracao, 0.9)
+        self.assertEqual([p.tribunal for p in processos], ["TRF1", "TRF2", "TRF4"])
+        self.assertEqual(scraper.status_ultima_busca["TRF3"]["status"], "erro")
+        self.assertEqual(scraper.status_ultima_busca["TRF5"]["status"], "circuito_aberto")
+
+    def test_busca_paralela_prazo_total(self):
+        """Testa descarte de TRF que nao responde dentro do prazo"""
+        scraper = PJeScraper(
+            cache_dir=f"{self.temp_dir}/cache",
+            log_dir=f"{self.temp_dir}/logs",
+            cache_enabled=False
+        )
+
+        def buscar(trf, documento, tipo_doc):
+            time.sleep(1.5 if trf == "TRF2" else 0.05)
+            return [ProcessoPJe(numero_processo="0000001-00.2024.4.01.0000", tribunal=trf)]
+
+        with patch.object(scraper, "_buscar_por_documento", side_effect=buscar):
+            inicio = time.time()
+            processos = scraper.buscar_por_cpf("529.982.247-25", prazo_total=0.5)
+            duracao = time.time() - inicio
+
+        self.assertLess(duracao, 1.0)
+        self.assertEqual(len(processos), 4)
+        self.assertEqual(scraper.status_ultima_busca["TRF2"]["status"], "prazo_esgotado")
+
+    def test_trf_atrasado_para_de_requisitar(self):
+        """Testa que a thread de um TRF descartado nao faz requisicoes apos o prazo"""
+        scraper = PJeScraper(
+            cache_dir=f"{self.temp_dir}/cache",
+            log_dir=f"{self.temp_dir}/logs",
+            cache_enabled=False
+        )
+        scraper.rate_limiters = {}
+        scraper.rate_limiter = RateLimiter(rate=0.0)
+        requisicoes = []
+        erros = []
+
+        def get(url, **kwargs):
+            requisicoes.append(time.monotonic())
+            time.sleep(0.2)
+            resposta = Mock(status_code=200, headers={})
+            return resposta
+
+        def buscar(trf, documento, tipo_doc):
+            if trf != "TRF2":
+                return []
+            try:
+                for pagina in range(20):  # paginacao longa
+                    scraper._fazer_requisicao("TRF2", f"https://pje2g.trf2.jus.br/busca?p={pagina}")
+            except PJePrazoEsgotadoError as e:
+                erros.append(e)
+                raise
+            return []
+
+        with patch.object(scraper._get_session("TRF2"), "get", side_effect=get), \
+                patch.object(scraper, "_buscar_por_documento", side_effect=buscar):
+            inicio = time.monotonic()
+            scraper.buscar_por_cpf("529.982.247-25", prazo_total=0.5)
+            time.sleep(0.6)  # tempo para a thread atrasada terminar
+
+        self.assertEqual(scraper.status_ultima_busca["TRF2"]["status"], "prazo_esgotado")
+        self.assertEqual(len(erros), 1)
+        self.assertTrue(all(t < inicio + 0.5 for t in requisicoes))
+
 
 # =============================================================================
 # TESTES DE EXCECOES
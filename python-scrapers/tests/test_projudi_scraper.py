@@ -12,13 +12,18 @@ Data: 2026-01-12
 import asyncio
 import json
 import os
+import shutil
 import sys
 import tempfile
+import threading
+import time
 import unittest
 from datetime import datetime, timedelta
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
+
 # Adiciona diretorio pai ao path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
@@ -27,6 +32,7 @@ from projudi_scraper import (
     ProjudiScraper,
     ProxyManager,
     ProjudiLogger,
+    ResultCache,
 
     # Dataclasses
     DadosProcesso,
@@ -62,6 +68,8 @@ from projudi_scraper import (
     extrair_processo_projudi,
     extrair_processo_projudi_sync
 )
+import projudi_scraper
+from scraper_registry import LoopScrapers, RegistroScrapers
 
 
 class TestNormalizarNumeroProcesso(unittest.TestCase):
@@ -413,6 +421,131 @@ class TestProxyManager(unittest.TestCase):
         self.assertEqual(stats["http://proxy1:8080"]["failures"], 1)
 
 
+class TestProxyPool(unittest.TestCase):
+    """Escolha ponderada, ejecao e prova de proxies"""
+
+    A = "http://proxy-a:8080"
+    B = "http://proxy-b:8080"
+
+    def test_ponderado_pela_latencia(self):
+        pm = ProxyManager(proxies=[self.A, self.B])
+        pm.report_success(self.A, 100.0)
+        pm.report_success(self.B, 400.0)
+
+        escolhas = [pm.get_proxy() for _ in range(100)]
+
+        self.assertEqual(escolhas.count(self.A), 80)
+        self.assertGreater(pm.get_stats()[self.A]["peso"], pm.get_stats()[self.B]["peso"])
+
+    def test_ejecao_e_prova(self):
+        pm = ProxyManager(proxies=[self.A, self.B], max_falhas=2, tempo_ejecao=30.0)
+        pm.report_failure(self.A, "timeout")
+        self.assertIn(self.A, {pm.get_proxy() for _ in range(4)})
+
+        pm.report_failure(self.A, "timeout")
+        stats = pm.get_stats()[self.A]
+        self.assertTrue(stats["ejetado"])
+        self.assertEqual({pm.get_proxy() for _ in range(4)}, {self.B})
+
+        # Volta em prova: uma falha ejeta de novo, pelo dobro do tempo
+        pm.stats[self.A]["ejetado_ate"] = 0.0
+        self.assertIn(self.A, {pm.get_proxy() for _ in range(4)})
+        antes = time.time()
+        pm.report_failure(self.A, "timeout")
+        self.assertGreaterEqual(pm.stats[self.A]["ejetado_ate"], antes + 60.0)
+
+        # Sucesso encerra a prova
+        pm.stats[self.A]["ejetado_ate"] = 0.0
+        pm.report_success(self.A, 50.0)
+        self.assertEqual(pm.stats[self.A]["falhas_seguidas"], 0)
+        self.assertEqual(pm.stats[self.A]["ejecoes"], 0)
+
+    def test_todos_ejetados(self):
+        pm = ProxyManager(proxies=[self.A, self.B], max_falhas=1)
+        pm.report_failure(self.B, "timeout")
+        pm.report_failure(self.A, "timeout")
+        self.assertEqual(pm.get_proxy(), self.B)
+
+
+class TestProxyPorRequisicao(unittest.IsolatedAsyncioTestCase):
+    """Um cliente por proxy, escolhido a cada requisicao"""
+
+    BOM = "http://bom:8080"
+    RUIM = "http://ruim:8080"
+
+    async def asyncSetUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.proxies = ProxyManager(proxies=[self.RUIM, self.BOM], max_falhas=1)
+        self.scraper = ProjudiScraper(
+            cache_dir=self.temp_dir, rate_limit=0, taxa_adaptativa=False,
+            deduplicar_documentos=False, proxy_manager=self.proxies
+        )
+        self.usados = []
+        self.falha_ruim = httpx.ConnectError
+
+        def novo_cliente(proxy=None, cookies=None):
+            def handler(request):
+                self.usados.append(proxy)
+                if proxy == self.RUIM:
+                    if isinstance(self.falha_ruim, int):
+                        return httpx.Response(self.falha_ruim, text="gateway")
+                    raise self.falha_ruim("recusado", request=request)
+                return httpx.Response(200, text="ok", headers={"Set-Cookie": "JSESSIONID=abc"})
+            return httpx.AsyncClient(transport=httpx.MockTransport(handler), cookies=cookies)
+
+        self.scraper._novo_cliente = novo_cliente
+
+    async def asyncTearDown(self):
+        await self.scraper._close_client()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    async def test_falha_ejeta_e_retry_usa_outro_proxy(self):
+        with patch("projudi_scraper.asyncio.sleep", AsyncMock()):
+            for _ in range(3):
+                response = await self.scraper._request_with_retry("GET", "https://projudi/x")
+                self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(self.usados, [self.RUIM, self.BOM, self.BOM, self.BOM])
+        self.assertEqual(set(self.scraper._clients_proxy), {self.RUIM, self.BOM})
+        # Cookie recebido por um proxy vale para a sessao inteira
+        self.assertEqual(self.scraper._client.cookies.get("JSESSIONID"), "abc")
+
+        stats = self.proxies.get_stats()
+        self.assertTrue(stats[self.RUIM]["ejetado"])
+        self.assertEqual(stats[self.BOM]["successes"], 3)
+        self.assertIsNotNone(stats[self.BOM]["latencia_ms"])
+
+    async def test_5xx_e_erro_de_transporte_ejetam_proxy(self):
+        for falha in (502, httpx.ProxyError, httpx.RemoteProtocolError):
+            with self.subTest(falha=falha):
+                self.proxies = ProxyManager(proxies=[self.RUIM, self.BOM], max_falhas=1)
+                self.scraper.proxy_manager = self.proxies
+                self.falha_ruim = falha
+                self.usados = []
+
+                with patch("projudi_scraper.asyncio.sleep", AsyncMock()):
+                    try:
+                        await self.scraper._request_with_retry("GET", "https://projudi/x")
+                    except NetworkError:
+                        # Erro de proxy nao e retentavel pela politica
+                        pass
+                    response = await self.scraper._request_with_retry("GET", "https://projudi/x")
+
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(self.usados[0], self.RUIM)
+                self.assertNotIn(self.RUIM, self.usados[1:])
+                self.assertTrue(self.proxies.get_stats()[self.RUIM]["ejetado"])
+
+    async def test_cliente_recriado_fecha_clientes_proxy(self):
+        antigo = await self.scraper._get_client(self.BOM)
+
+        await self.scraper._client.aclose()
+        await self.scraper._get_client()
+
+        self.assertTrue(antigo.is_closed)
+        self.assertEqual(self.scraper._clients_proxy, {})
+
+
 class TestProjudiLogger(unittest.TestCase):
     """Testes para ProjudiLogger"""
 
@@ -706,6 +839,306 @@ class TestIntegracaoMock(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(processo.numero_processo, "0123456-78.2024.8.09.0001")
 
 
+class TestResultCache(unittest.TestCase):
+    """Testes do cache de resultados"""
+
+    def test_fresco_vencido_e_expirado(self):
+        cache = ResultCache(ttl=60, stale_ttl=60)
+        dados = DadosProcesso(numero_processo="N")
+        cache.set("N", dados)
+
+        self.assertEqual(cache.get("N"), (dados, True))
+
+        # Envelhece a entrada sem esperar
+        cache._entradas["N"] = (dados, cache._entradas["N"][1] - 90)
+        self.assertEqual(cache.get("N"), (dados, False))
+
+        cache._entradas["N"] = (dados, cache._entradas["N"][1] - 60)
+        self.assertIsNone(cache.get("N"))
+
+        stats = cache.stats
+        self.assertEqual((stats["hits"], stats["stale_hits"], stats["misses"]), (1, 1, 1))
+
+    def test_limite_de_entradas(self):
+        cache = ResultCache(max_entries=2)
+        for numero in ("A", "B"):
+            cache.set(numero, DadosProcesso(numero_processo=numero))
+        cache.get("A")
+        cache.set("C", DadosProcesso(numero_processo="C"))
+
+        self.assertIsNone(cache.get("B"))
+        self.assertIsNotNone(cache.get("A"))
+        self.assertEqual(len(cache), 2)
+
+
+class TestBuscaProcessoCache(unittest.IsolatedAsyncioTestCase):
+    """Cache, revalidacao e coalescencia de buscar_processo"""
+
+    NUMERO = "0123456-78.2024.8.09.0001"
+
+    async def asyncSetUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.scraper = ProjudiScraper(
+            cache_dir=self.temp_dir, taxa_adaptativa=False, deduplicar_documentos=False
+        )
+        self.requisicoes = 0
+
+        async def requisitar(method, url, **kwargs):
+            self.requisicoes += 1
+            await asyncio.sleep(0.01)
+            response = MagicMock()
+            response.text = "<html><div id='comarca'>Goiania</div></html>"
+            response.url = url
+            return response
+
+        self.scraper._request_with_retry = requisitar
+
+    async def asyncTearDown(self):
+        await self.scraper._close_client()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    async def test_segunda_busca_vem_do_cache(self):
+        primeiro = await self.scraper.buscar_processo(self.NUMERO)
+        primeiro.status = StatusProcesso.ARQUIVADO
+        segundo = await self.scraper.buscar_processo(self.NUMERO)
+
+        self.assertEqual(self.requisicoes, 1)
+        # O chamador recebe uma copia: alteracoes nao vazam para o cache
+        self.assertEqual(segundo.status, StatusProcesso.DESCONHECIDO)
+        self.assertEqual(self.scraper.result_cache.stats["hits"], 1)
+
+    async def test_buscas_simultaneas_coalescidas(self):
+        resultados = await asyncio.gather(*[
+            self.scraper.buscar_processo(self.NUMERO) for _ in range(5)
+        ])
+
+        self.assertEqual(self.requisicoes, 1)
+        self.assertEqual(len({id(r) for r in resultados}), 5)
+        self.assertEqual(self.scraper.result_cache.stats["coalesced"], 4)
+
+    async def test_vencido_servido_e_revalidado(self):
+        await self.scraper.buscar_processo(self.NUMERO)
+        cache = self.scraper.result_cache
+        dados, salvo_em = cache._entradas[self.NUMERO]
+        cache._entradas[self.NUMERO] = (dados, salvo_em - cache.ttl - 1)
+
+        vencido = await self.scraper.buscar_processo(self.NUMERO)
+        self.assertEqual(vencido.numero_processo, self.NUMERO)
+        self.assertEqual(self.requisicoes, 1)
+
+        await asyncio.gather(*self.scraper._revalidacoes)
+        self.assertEqual(self.requisicoes, 2)
+        self.assertTrue(cache.get(self.NUMERO)[1])
+
+    async def test_sem_cache(self):
+        await self.scraper.buscar_processo(self.NUMERO)
+        await self.scraper.buscar_processo(self.NUMERO, usar_cache=False)
+        self.assertEqual(self.requisicoes, 2)
+
+
+class TestFuncaoSincrona(unittest.TestCase):
+    """extrair_processo_projudi_sync no loop compartilhado dos scrapers"""
+
+    NUMERO = "0123456-78.2024.8.09.0001"
+    PROXY = "http://proxy:8080"
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        temp_dir = self.temp_dir
+
+        class Scraper(ProjudiScraper):
+            """Scraper com cache no diretorio temporario"""
+
+            def __init__(self, **kwargs):
+                super().__init__(
+                    cache_dir=temp_dir, rate_limit=0, taxa_adaptativa=False,
+                    deduplicar_documentos=False, **kwargs
+                )
+
+        self.registro = RegistroScrapers()
+        self.loop_scrapers = LoopScrapers()
+        for nome, valor in (
+            ("ProjudiScraper", Scraper),
+            ("obter_registro_scrapers", lambda: self.registro),
+            ("obter_loop_scrapers", lambda: self.loop_scrapers),
+        ):
+            patcher = patch.object(projudi_scraper, nome, valor)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.registro.fechar_todos()
+        self.loop_scrapers.encerrar()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    @staticmethod
+    def _aguardar(condicao, limite: float = 5.0) -> bool:
+        fim = time.monotonic() + limite
+        while not condicao() and time.monotonic() < fim:
+            time.sleep(0.01)
+        return condicao()
+
+    def test_chamadas_reutilizam_cliente(self):
+        clientes = []
+
+        async def buscar(scraper, numero, usar_cache=True):
+            clientes.append(await scraper._get_client())
+            return DadosProcesso(numero_processo=numero)
+
+        with patch.object(ProjudiScraper, "buscar_processo", buscar):
+            extrair_processo_projudi_sync(self.NUMERO)
+            extrair_processo_projudi_sync(self.NUMERO)
+
+        self.assertEqual(self.registro.stats["criacoes"], 1)
+        self.assertIs(clientes[0], clientes[1])
+        self.assertFalse(clientes[0].is_closed)
+
+    def _contar_requisicoes(self, espera: float = 0.0):
+        """Troca o POST ao portal por uma resposta local e conta as chamadas"""
+        self.requisicoes = 0
+
+        async def requisitar(scraper, method, url, **kwargs):
+            self.requisicoes += 1
+            await asyncio.sleep(espera)
+            response = MagicMock()
+            response.text = "<html><div id='comarca'>Goiania</div></html>"
+            response.url = url
+            return response
+
+        patcher = patch.object(ProjudiScraper, "_request_with_retry", requisitar)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_chamadores_sincronos_simultaneos_coalescidos(self):
+        self._contar_requisicoes(espera=0.2)
+        largada = threading.Barrier(4)
+        resultados = []
+
+        def chamar():
+            largada.wait()
+            resultados.append(extrair_processo_projudi_sync(self.NUMERO))
+
+        threads = [threading.Thread(target=chamar) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(resultados), 4)
+        self.assertEqual(self.requisicoes, 1)
+        self.assertTrue(all(r["numero_processo"] == self.NUMERO for r in resultados))
+
+    def test_revalidacao_continua_apos_retorno(self):
+        self._contar_requisicoes(espera=0.05)
+        extrair_processo_projudi_sync(self.NUMERO)
+
+        scraper = next(iter(self.registro._entradas.values())).scraper
+        cache = scraper.result_cache
+        dados, salvo_em = cache._entradas[self.NUMERO]
+        cache._entradas[self.NUMERO] = (dados, salvo_em - cache.ttl - 1)
+
+        # Devolve o vencido na hora; a revalidacao segue no loop compartilhado
+        extrair_processo_projudi_sync(self.NUMERO)
+        self.assertTrue(self._aguardar(lambda: cache.get(self.NUMERO)[1]))
+        self.assertEqual(self.requisicoes, 2)
+
+    def test_clientes_de_outro_loop_fechados_no_dono(self):
+        scraper = projudi_scraper.ProjudiScraper()
+        principal = self.loop_scrapers.executar(scraper._get_client())
+        do_proxy = self.loop_scrapers.executar(scraper._get_client(self.PROXY))
+
+        async def usar_em_outro_loop():
+            client = await scraper._get_client()
+            await scraper._close_client()
+            return client
+
+        novo = asyncio.run(usar_em_outro_loop())
+
+        self.assertIsNot(novo, principal)
+        self.assertTrue(self._aguardar(lambda: principal.is_closed and do_proxy.is_closed))
+        self.assertEqual(scraper._clients_proxy, {})
+
+
+class TestBuscaPartesPaginada(unittest.IsolatedAsyncioTestCase):
+    """Busca por parte com prefetch da proxima pagina"""
+
+    async def asyncSetUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.scraper = ProjudiScraper(
+            cache_dir=self.temp_dir, taxa_adaptativa=False, deduplicar_documentos=False
+        )
+        self.eventos = []
+        self.total_paginas = 3
+        self.atraso = 0.02
+
+        async def requisitar(method, url, data=None, **kwargs):
+            pagina = int(data['PaginaAtual'])
+            self.eventos.append(("inicio", pagina))
+            await asyncio.sleep(self.atraso)
+            self.eventos.append(("fim", pagina))
+            response = MagicMock()
+            response.text = self._pagina(pagina)
+            response.url = url
+            return response
+
+        self.scraper._request_with_retry = requisitar
+
+    async def asyncTearDown(self):
+        await self.scraper._close_client()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    @staticmethod
+    def _numero(pagina, indice):
+        return f"{pagina:03d}{indice:04d}-78.2024.8.09.0001"
+
+    def _pagina(self, pagina):
+        linhas = "".join(
+            f"<tr><td>{self._numero(pagina, i)}</td><td>1a Vara Civel</td><td>Procedimento Comum</td></tr>"
+            for i in range(10)
+        )
+        proxima = '<div class="paginacao"><a href="#">Proxima</a></div>' \
+            if pagina < self.total_paginas else ""
+        return f"<html><table class='resultados'><tr><th>Processo</th></tr>{linhas}</table>{proxima}</html>"
+
+    async def test_resumos_na_ordem_com_limite(self):
+        processos = await self.scraper.buscar_por_nome("Fulano de Tal", max_resultados=25)
+
+        self.assertEqual(len(processos), 25)
+        self.assertEqual(processos[0].numero_processo, self._numero(1, 0))
+        self.assertEqual(processos[-1].numero_processo, self._numero(3, 4))
+        self.assertEqual(processos[0].classe, "Procedimento Comum")
+
+    async def test_proxima_pagina_baixada_antes_do_consumo(self):
+        resumos = self.scraper.iterar_busca_partes({'documento': "12345678909"})
+        primeiro = await resumos.__anext__()
+
+        # Consumidor parado na pagina 1: a pagina 2 ja esta em andamento
+        await asyncio.sleep(0)
+        self.assertEqual(primeiro.numero_processo, self._numero(1, 0))
+        self.assertIn(("inicio", 2), self.eventos)
+        await resumos.aclose()
+
+    async def test_pagina_unica_uma_requisicao(self):
+        self.total_paginas = 1
+        processos = await self.scraper.buscar_por_cpf("123.456.789-09")
+        await asyncio.sleep(0.05)
+
+        self.assertEqual(len(processos), 10)
+        # Sem link para a proxima pagina, nada e pedido especulativamente
+        self.assertEqual(self.eventos, [("inicio", 1), ("fim", 1)])
+
+    async def test_pagina_especulativa_cancelada(self):
+        self.atraso = 0.1
+        resumos = self.scraper.iterar_busca_partes({'documento': "12345678909"}, max_resultados=15)
+        processos = [processo async for processo in resumos]
+        await asyncio.sleep(0.15)
+
+        self.assertEqual(len(processos), 15)
+        # A pagina 3 foi pedida especulativamente e cancelada antes de terminar
+        self.assertIn(("inicio", 3), self.eventos)
+        self.assertNotIn(("fim", 3), self.eventos)
+
+
 def run_tests():
     """Executa todos os testes"""
     loader = unittest.TestLoader()
@@ -723,11 +1156,17 @@ def run_tests():
     suite.addTests(loader.loadTestsFromTestCase(TestAdvogado))
     suite.addTests(loader.loadTestsFromTestCase(TestSessionCache))
     suite.addTests(loader.loadTestsFromTestCase(TestProxyManager))
+    suite.addTests(loader.loadTestsFromTestCase(TestProxyPool))
+    suite.addTests(loader.loadTestsFromTestCase(TestProxyPorRequisicao))
     suite.addTests(loader.loadTestsFromTestCase(TestProjudiLogger))
     suite.addTests(loader.loadTestsFromTestCase(TestExcecoes))
     suite.addTests(loader.loadTestsFromTestCase(TestProjudiScraperUnit))
     suite.addTests(loader.loadTestsFromTestCase(TestProjudiScraperAsync))
     suite.addTests(loader.loadTestsFromTestCase(TestIntegracaoMock))
+    suite.addTests(loader.loadTestsFromTestCase(TestResultCache))
+    suite.addTests(loader.loadTestsFromTestCase(TestBuscaProcessoCache))
+    suite.addTests(loader.loadTestsFromTestCase(TestFuncaoSincrona))
+    suite.addTests(loader.loadTestsFromTestCase(TestBuscaPartesPaginada))
 
     # Executa
     runner = unittest.TextTestRunner(verbosity=2)
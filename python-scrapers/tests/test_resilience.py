@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes Unitarios para o circuit breaker e o limite de concorrencia compartilhados
+
+Autor: ROM-Agent Integration System
+Data: 2026-01-12
+"""
+
+import asyncio
+import logging
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+# Adiciona diretorio pai ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from resilience import (
+    AdaptadorResiliente,
+    CircuitBreaker,
+    CircuitBreakerState,
+    CircuitoAbertoError,
+    LimiteConcorrencia,
+    LimiteConcorrenciaError,
+    RequisicaoRejeitadaError,
+    Resiliencia,
+    estado_resiliencia,
+    obter_resiliencia,
+)
+from retry_policy import PoliticaRetry
+from datajud_cnj import DataJudCNJ
+from esaj_scraper import ESAJCircuitBreakerOpenError, ESAJScraper, RateLimiter
+from projudi_scraper import CircuitBreakerOpenError, ProjudiScraper
+
+
+def _resposta(status):
+    response = Mock()
+    response.status_code = status
+    response.headers = {}
+    return response
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Estados, sonda unica e estatisticas"""
+
+    def test_rejeicoes_e_tempo_aberto(self):
+        cb = CircuitBreaker(threshold=2, timeout=60)
+        cb.record_failure()
+        cb.record_failure()
+
+        self.assertFalse(cb.allow_request())
+        self.assertFalse(cb.allow_request())
+        stats = cb.stats
+        self.assertEqual(stats["estado"], "open")
+        self.assertEqual(stats["aberturas"], 1)
+        self.assertEqual(stats["rejeicoes"], 2)
+        self.assertGreater(stats["proxima_sonda_em"], 59)
+
+        cb.reset()
+        self.assertEqual(cb.stats["aberto_ha"], 0.0)
+        self.assertGreaterEqual(cb.stats["tempo_aberto"], 0.0)
+
+    def test_uma_sonda_por_vez_em_half_open(self):
+        cb = CircuitBreaker(threshold=1, timeout=0.05, sucessos_para_fechar=2)
+        cb.record_failure()
+        time.sleep(0.06)
+
+        self.assertTrue(cb.allow_request())
+        self.assertFalse(cb.allow_request())  # sonda em andamento
+        cb.record_success()
+        self.assertEqual(cb.state, CircuitBreakerState.HALF_OPEN)
+        self.assertTrue(cb.allow_request())
+        cb.record_success()
+        self.assertEqual(cb.state, CircuitBreakerState.CLOSED)
+
+    def test_sonda_com_falha_reabre(self):
+        cb = CircuitBreaker(threshold=1, timeout=0.05)
+        cb.record_failure()
+        time.sleep(0.06)
+        self.assertTrue(cb.allow_request())
+        cb.record_failure()
+
+        self.assertEqual(cb.state, CircuitBreakerState.OPEN)
+        stats = cb.stats
+        self.assertEqual(stats["aberturas"], 2)
+        self.assertGreaterEqual(stats["aberto_ha"], 0.05)  # desde a primeira abertura
+
+    def test_relogio_monotonico(self):
+        cb = CircuitBreaker(threshold=1, timeout=60)
+        cb.record_failure()
+        # Relogio de parede adiantado um dia nao fecha o circuito
+        with patch("time.time", return_value=time.time() + 86400):
+            self.assertEqual(cb.state, CircuitBreakerState.OPEN)
+
+
+class TestLimiteConcorrencia(unittest.TestCase):
+    """Vagas para threads e corrotinas"""
+
+    def test_rejeita_sem_vaga(self):
+        limite = LimiteConcorrencia(max_concorrentes=1, espera_maxima=0)
+        with limite.vaga():
+            with self.assertRaises(LimiteConcorrenciaError):
+                limite.entrar()
+        limite.entrar()
+        limite.sair()
+        self.assertEqual(limite.stats["rejeicoes"], 1)
+        self.assertEqual(limite.stats["em_andamento"], 0)
+
+    def test_espera_vaga_liberada(self):
+        limite = LimiteConcorrencia(max_concorrentes=1, espera_maxima=2.0)
+        limite.entrar()
+        threading.Timer(0.05, limite.sair).start()
+
+        inicio = time.monotonic()
+        with limite.vaga():
+            pass
+        self.assertLess(time.monotonic() - inicio, 1.0)
+
+    def test_async_nao_bloqueia_loop(self):
+        limite = LimiteConcorrencia(max_concorrentes=2, espera_maxima=0.05)
+        picos = []
+
+        async def tarefa():
+            async with limite.vaga_async():
+                picos.append(limite.stats["em_andamento"])
+                await asyncio.sleep(0.1)
+
+        async def executar():
+            return await asyncio.gather(*(tarefa() for _ in range(3)), return_exceptions=True)
+
+        resultados = asyncio.run(executar())
+        self.assertEqual(sum(isinstance(r, LimiteConcorrenciaError) for r in resultados), 1)
+        self.assertLessEqual(max(picos), 2)
+
+
+class TestRegistro(unittest.TestCase):
+    """Protecao por endpoint compartilhada no processo"""
+
+    def test_singleton_e_estado(self):
+        protecao = obter_resiliencia("teste:registro", threshold=1)
+        self.addCleanup(protecao.circuito.reset)
+        self.assertIs(obter_resiliencia("teste:registro"), protecao)
+
+        protecao.registrar(status_code=503)
+        with self.assertRaises(CircuitoAbertoError) as ctx:
+            protecao.verificar()
+        self.assertEqual(ctx.exception.chave, "teste:registro")
+
+        estado = estado_resiliencia("teste:")
+        self.assertEqual(estado["teste:registro"]["circuito"]["estado"], "open")
+        self.assertEqual(estado["teste:registro"]["circuito"]["rejeicoes"], 1)
+
+    def test_429_nao_conta(self):
+        protecao = Resiliencia("teste:429", CircuitBreaker(threshold=1))
+        protecao.registrar(status_code=429)
+        protecao.registrar(status_code=404)
+        self.assertEqual(protecao.circuito.state, CircuitBreakerState.CLOSED)
+
+
+class TestAdaptadorResiliente(unittest.TestCase):
+    """Session do requests protegida por host"""
+
+    def test_circuito_aberto_nao_chega_ao_host(self):
+        protecao = obter_resiliencia("teste-adaptador:api.exemplo.jus.br", threshold=2)
+        self.addCleanup(protecao.circuito.reset)
+        session = requests.Session()
+        session.mount("https://", AdaptadorResiliente("teste-adaptador"))
+
+        resposta = requests.Response()
+        resposta.status_code = 503
+        with patch.object(HTTPAdapter, "send", return_value=resposta) as send:
+            for _ in range(2):
+                session.get("https://api.exemplo.jus.br/x")
+            with self.assertRaises(requests.exceptions.ConnectionError) as ctx:
+                session.get("https://api.exemplo.jus.br/x")
+
+        self.assertIsInstance(ctx.exception, RequisicaoRejeitadaError)
+        self.assertEqual(send.call_count, 2)
+
+    def test_datajud(self):
+        cliente = DataJudCNJ(api_key="chave")
+        protecao = cliente.session.get_adapter(cliente.base_url).protecao(cliente.base_url)
+        self.addCleanup(protecao.circuito.reset)
+        for _ in range(protecao.circuito.threshold):
+            protecao.circuito.record_failure()
+
+        with patch.object(HTTPAdapter, "send") as send:
+            resultado = cliente._make_request({"query": {"match_all": {}}})
+
+        self.assertFalse(resultado["sucesso"])
+        self.assertIn("indisponível", resultado["erro"])
+        send.assert_not_called()
+
+
+class TestResilienciaScrapers(unittest.TestCase):
+    """ESAJ e PROJUDI falham rapido com o circuito aberto"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_esaj(self):
+        scraper = ESAJScraper(
+            cache_dir=f"{self.temp_dir}/cache",
+            log_dir=f"{self.temp_dir}/logs",
+            log_level=logging.ERROR,
+            cache_enabled=False,
+            deduplicar_documentos=False,
+            politica_retry=PoliticaRetry(max_tentativas=1, usar_orcamento=False)
+        )
+        scraper.rate_limiter = RateLimiter(rate=0.0)
+        url = "https://esaj.teste-circuito.jus.br/cpopg/open.do"
+        protecao = scraper._protecao(url)
+        self.addCleanup(protecao.circuito.reset)
+
+        with patch.object(scraper._session, "get", return_value=_resposta(503)) as get:
+            for _ in range(protecao.circuito.threshold):
+                with self.assertRaises(Exception):
+                    scraper._fazer_requisicao(url)
+            with self.assertRaises(ESAJCircuitBreakerOpenError):
+                scraper._fazer_requisicao(url)
+
+        self.assertEqual(get.call_count, protecao.circuito.threshold)
+
+    def test_projudi(self):
+        async def executar():
+            scraper = ProjudiScraper(
+                cache_dir=self.temp_dir, rate_limit=0, taxa_adaptativa=False,
+                deduplicar_documentos=False,
+                politica_retry=PoliticaRetry(max_tentativas=1, usar_orcamento=False)
+            )
+            scraper.resiliencia = Resiliencia("teste:projudi", CircuitBreaker(threshold=1))
+            chamadas = []
+
+            def handler(request):
+                chamadas.append(request)
+                raise httpx.ConnectError("recusado")
+
+            scraper._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            try:
+                with self.assertRaises(Exception):
+                    await scraper._request_with_retry("GET", "https://projudi/x")
+                with self.assertRaises(CircuitBreakerOpenError):
+                    await scraper._request_with_retry("GET", "https://projudi/x")
+            finally:
+                await scraper._close_client()
+            return chamadas
+
+        self.assertEqual(len(asyncio.run(executar())), 1)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes Unitarios para o cache de respostas de DataJud, CNJ e JusBrasil
+
+Autor: ROM-Agent Integration System
+Data: 2026-01-12
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Adiciona diretorio pai ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import response_cache
+from cache_store import SQLiteCacheStore
+from cnj_certidoes_api import CNJCertidoesAPI
+from datajud_cnj import DataJudCNJ
+from jusbrasil_api import JusBrasilAPI
+from response_cache import CacheRespostas, chave_consulta
+
+try:
+    from consultas_automaticas import ConsultasAutomaticas
+    CONSULTAS_AVAILABLE = True
+except ImportError:  # python-dateutil ausente
+    CONSULTAS_AVAILABLE = False
+
+
+def _hit(numero):
+    return {"_source": {"numeroProcesso": numero, "siglaTribunal": "TJSP"}}
+
+
+class _CacheTemporario(unittest.TestCase):
+    """Cache de respostas num arquivo temporario"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = SQLiteCacheStore(str(Path(self.temp_dir) / "respostas.db"), eviction_interval=1)
+        self.cache = CacheRespostas(self.store)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+
+class TestCacheRespostas(_CacheTemporario):
+    """Chaves, TTL negativo, erros e metricas"""
+
+    def test_chave_normalizada(self):
+        self.assertEqual(
+            chave_consulta("jurisprudencia", {"termo": "Prisao  Preventiva ", "tribunal": "stf", "pagina": 1}),
+            chave_consulta("jurisprudencia", {"pagina": 1, "tribunal": "STF", "termo": "prisao preventiva"})
+        )
+        self.assertEqual(
+            chave_consulta("jurisprudencia", {"termo": "x", "tribunal": None}),
+            chave_consulta("jurisprudencia", {"termo": "x"})
+        )
+        self.assertNotEqual(
+            chave_consulta("jurisprudencia", {"termo": "x", "pagina": 1}),
+            chave_consulta("jurisprudencia", {"termo": "x", "pagina": 2})
+        )
+
+    def test_urls_e_ids_exatos(self):
+        self.assertNotEqual(
+            chave_consulta("inteiro_teor", {"url": "https://www.jusbrasil.com.br/x/AbC"}),
+            chave_consulta("inteiro_teor", {"url": "https://www.jusbrasil.com.br/x/abc"})
+        )
+        self.assertNotEqual(
+            chave_consulta("comunicacao", {"id_comunicacao": "aB12"}),
+            chave_consulta("comunicacao", {"id_comunicacao": "Ab12"})
+        )
+        self.assertNotEqual(
+            chave_consulta("comunicacao", {"id_comunicacao": "a b"}),
+            chave_consulta("comunicacao", {"id_comunicacao": "a  b"})
+        )
+
+    def test_negativo_expira_antes(self):
+        cache = CacheRespostas(self.store, ttls={"cnj": 60}, ttls_negativos={"cnj": 0.05})
+        cache.gravar("cnj", "publicacao", {"n": 1}, {"sucesso": True, "total_publicacoes": 3})
+        cache.gravar("cnj", "publicacao", {"n": 2}, {"sucesso": True, "total_publicacoes": 0})
+        cache.gravar("cnj", "publicacao", {"n": 3}, {"sucesso": False, "erro": "Erro HTTP 404", "status_code": 404})
+
+        self.assertEqual(cache.obter("cnj", "publicacao", {"n": 2})["total_publicacoes"], 0)
+        time.sleep(0.06)
+        self.assertIsNotNone(cache.obter("cnj", "publicacao", {"n": 1}))
+        self.assertIsNone(cache.obter("cnj", "publicacao", {"n": 2}))
+        self.assertIsNone(cache.obter("cnj", "publicacao", {"n": 3}))
+
+        stats = cache.stats["fontes"]["cnj"]
+        self.assertEqual((stats["hits"], stats["negative_hits"], stats["misses"]), (1, 1, 2))
+        self.assertEqual((stats["writes"], stats["negative_writes"]), (1, 2))
+
+    def test_erro_nao_guardado(self):
+        buscar = Mock(return_value={"sucesso": False, "erro": "Timeout"})
+        for _ in range(2):
+            self.cache.consultar("datajud", "search", {"q": 1}, buscar)
+
+        self.assertEqual(buscar.call_count, 2)
+        self.assertEqual(self.cache.stats["fontes"]["datajud"]["skipped"], 2)
+
+    def test_tamanho_limitado(self):
+        store = SQLiteCacheStore(str(Path(self.temp_dir) / "pequeno.db"), max_entries=3, eviction_interval=1)
+        self.addCleanup(store.close)
+        cache = CacheRespostas(store)
+        for i in range(5):
+            cache.gravar("jusbrasil", "jurisprudencia", {"termo": str(i)}, {"sucesso": True})
+
+        self.assertEqual(store.count("jusbrasil"), 3)
+        self.assertIsNone(cache.obter("jusbrasil", "jurisprudencia", {"termo": "0"}))
+        self.assertIsNotNone(cache.obter("jusbrasil", "jurisprudencia", {"termo": "4"}))
+
+
+class TestClientesComCache(_CacheTemporario):
+    """Consultas repetidas nao saem do processo"""
+
+    def test_datajud_numero_e_lote(self):
+        cliente = DataJudCNJ(api_key="chave", cache_respostas=self.cache)
+        resposta = Mock()
+        resposta.json.return_value = {"hits": {"total": {"value": 1}, "hits": [_hit("10000010020248260100")]}}
+        with patch.object(cliente.session, "post", return_value=resposta) as post:
+            primeiro = cliente.buscar_processo("1000001-00.2024.8.26.0100")
+            segundo = cliente.buscar_processo("10000010020248260100")
+        self.assertEqual(post.call_count, 1)
+        self.assertEqual(primeiro, segundo)
+
+        # No lote, so o numero fora do cache vai ao _msearch
+        with patch.object(cliente, "_make_msearch",
+                          return_value=[{"hits": {"total": {"value": 0}, "hits": []}}]) as msearch:
+            resultados = cliente.buscar_processos(["1000001-00.2024.8.26.0100", "1000002-00.2024.8.26.0100"])
+            cliente.buscar_processo("1000002-00.2024.8.26.0100")  # sem hits: cache negativo
+
+        self.assertEqual(msearch.call_count, 1)
+        self.assertEqual(len(msearch.call_args.args[0]), 1)
+        self.assertEqual(resultados["1000001-00.2024.8.26.0100"], primeiro)
+        self.assertEqual(self.cache.stats["fontes"]["datajud"]["negative_hits"], 1)
+
+    def test_datajud_fan_out_parcial_guardado_por_pouco_tempo(self):
+        cliente = DataJudCNJ(api_key="chave", cache_respostas=self.cache)
+        erro = {"erro": "Timeout na requisição à API DataJud", "sucesso": False}
+        vazia = {"hits": {"total": {"value": 0}, "hits": []}}
+
+        def make_request(query, indice=None):
+            return erro if indice == "api_publica_a" else vazia
+
+        with patch.object(cliente, "_indices_todos", return_value=["api_publica_a", "api_publica_b"]), \
+                patch.object(cliente, "_make_request", side_effect=make_request) as request, \
+                patch.object(response_cache, "DEFAULT_TTL_PARCIAL", 0.05):
+            cliente.buscar_por_parte("Banco")
+            cliente.buscar_por_parte("Banco")
+            self.assertEqual(request.call_count, 2)  # parcial servido do cache
+            time.sleep(0.06)
+            cliente.buscar_por_parte("Banco")
+
+        # O indice que falhou fica em quarentena: so o outro e consultado
+        self.assertEqual(request.call_count, 3)
+        self.assertEqual(request.call_args.args[1], "api_publica_b")
+        self.assertEqual(self.cache.stats["fontes"]["datajud"]["partial_writes"], 2)
+
+    def test_cnj_sem_autenticar_no_acerto(self):
+        cliente = CNJCertidoesAPI(usuario="u", senha="s", cache_respostas=self.cache)
+        cliente.token = "t"
+        resposta = Mock()
+        resposta.json.return_value = [{"data_publicacao": "2026-01-05"}]
+        with patch.object(cliente.session, "get", return_value=resposta) as get:
+            cliente.buscar_publicacao("1000001-00.2024.8.26.0100", "2026-01-01", "2026-01-31")
+
+        outro = CNJCertidoesAPI(usuario="u", senha="s", cache_respostas=self.cache)
+        with patch.object(outro, "autenticar") as autenticar, patch.object(outro.session, "get") as get_outro:
+            resultado = outro.buscar_publicacao("10000010020248260100", "2026-01-01", "2026-01-31")
+
+        self.assertEqual(get.call_count, 1)
+        autenticar.assert_not_called()
+        get_outro.assert_not_called()
+        self.assertEqual(resultado["total_publicacoes"], 1)
+
+        producao = CNJCertidoesAPI(usuario="u", senha="s", ambiente="producao", cache_respostas=self.cache)
+        producao.token = "t"
+        with patch.object(producao.session, "get", return_value=resposta) as get_producao:
+            producao.buscar_publicacao("10000010020248260100", "2026-01-01", "2026-01-31")
+        self.assertEqual(get_producao.call_count, 1)  # ambiente faz parte da chave
+
+    def test_jusbrasil(self):
+        cliente = JusBrasilAPI(cache_respostas=self.cache)
+        resposta = Mock(status_code=200, url="https://www.jusbrasil.com.br/jurisprudencia/busca?q=x")
+        with patch.object(cliente.session, "get", return_value=resposta) as get:
+            cliente.pesquisar_jurisprudencia("Prisão preventiva", "stf")
+            resultado = cliente.pesquisar_jurisprudencia("prisão  preventiva", tribunal="STF")
+
+        self.assertEqual(get.call_count, 1)
+        self.assertTrue(resultado["sucesso"])
+
+
+@unittest.skipUnless(CONSULTAS_AVAILABLE, "python-dateutil nao instalado")
+class TestConsultasAutomaticas(unittest.TestCase):
+    """Segunda analise do mesmo processo sem chamadas externas"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.chamadas = []
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _send(self, request, **kwargs):
+        self.chamadas.append(request.url)
+        if "/auth" in request.url:
+            corpo = {"token": "t"}
+        elif "datajud" in request.url:
+            corpo = {"hits": {"total": {"value": 1}, "hits": [_hit("10000010020248260100")]}}
+        elif "comunicacao" in request.url:
+            corpo = []
+        else:
+            corpo = {}
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps(corpo).encode("utf-8")
+        response.url = request.url
+        response.request = request
+        return response
+
+    def test_segunda_analise_sem_chamadas(self):
+        processo = {
+            "numero_processo": "1000001-00.2024.8.26.0100",
+            "assuntos": ["Cobranca", "Juros"],
+            "classe": "Procedimento Comum",
+            "tribunal": "TJSP",
+        }
+        with patch.object(response_cache, "DEFAULT_RESPONSE_DB", str(Path(self.temp_dir) / "r.db")), \
+                patch.dict(os.environ, {"CNJ_USUARIO": "u", "CNJ_SENHA": "s"}), \
+                patch.object(HTTPAdapter, "send", side_effect=self._send), \
+                patch("builtins.print"):
+            ConsultasAutomaticas(processo).executar_consultas_completas()
+            primeira = len(self.chamadas)
+            ConsultasAutomaticas(processo).executar_consultas_completas()
+
+        self.assertGreater(primeira, 0)
+        self.assertEqual(len(self.chamadas), primeira)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes Unitarios para a politica de retry compartilhada
+
+Autor: ROM-Agent Integration System
+Data: 2026-01-12
+"""
+
+import logging
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock, patch
+
+import httpx
+import requests
+
+# Adiciona diretorio pai ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from retry_policy import (
+    MOTIVO_NAO_RETENTAVEL,
+    MOTIVO_ORCAMENTO,
+    MOTIVO_PRAZO,
+    MOTIVO_TENTATIVAS,
+    ExecucaoRetry,
+    OrcamentoRetry,
+    PoliticaRetry,
+    eh_retentavel,
+)
+from esaj_scraper import ESAJConnectionError, ESAJScraper, RateLimiter
+from projudi_scraper import NetworkError, ProjudiScraper
+
+
+RAPIDA = dict(backoff_base=0.001, backoff_maximo=0.002)
+
+
+class TestClassificacao(unittest.TestCase):
+    """Erros e status que valem retry"""
+
+    def test_erros(self):
+        self.assertTrue(eh_retentavel(requests.exceptions.ConnectTimeout()))
+        self.assertTrue(eh_retentavel(httpx.ReadTimeout("lento")))
+        self.assertTrue(eh_retentavel(httpx.ConnectError("recusado")))
+        self.assertFalse(eh_retentavel(requests.exceptions.SSLError()))
+        self.assertFalse(eh_retentavel(ValueError("parse")))
+        self.assertTrue(eh_retentavel(ValueError("parse"), extras=(ValueError,)))
+
+    def test_status(self):
+        for status in (429, 500, 502, 503, 504):
+            self.assertTrue(eh_retentavel(status_code=status))
+        for status in (400, 403, 404, 501):
+            self.assertFalse(eh_retentavel(status_code=status))
+
+
+class TestExecucaoRetry(unittest.TestCase):
+    """Tentativas, jitter, prazo e orcamento"""
+
+    def test_jitter_decorrelacionado(self):
+        politica = PoliticaRetry(max_tentativas=50, prazo_total=None, backoff_base=1.0, backoff_maximo=8.0)
+        execucao = politica.iniciar()
+        esperas = []
+        while execucao.nova_tentativa():
+            espera = execucao.espera(status_code=503)
+            if espera is None:
+                break
+            anterior = esperas[-1] if esperas else 1.0
+            self.assertGreaterEqual(espera, 1.0)
+            self.assertLessEqual(espera, min(8.0, anterior * 3))
+            esperas.append(espera)
+
+        self.assertEqual(len(esperas), 49)
+        self.assertEqual(execucao.motivo, MOTIVO_TENTATIVAS)
+        self.assertGreater(len(set(esperas)), 10)  # jitter: esperas diferentes
+
+    def test_nao_retentavel(self):
+        execucao = PoliticaRetry().iniciar()
+        execucao.nova_tentativa()
+        self.assertIsNone(execucao.espera(status_code=404))
+        self.assertEqual(execucao.motivo, MOTIVO_NAO_RETENTAVEL)
+
+    def test_retry_after_e_prazo(self):
+        execucao = PoliticaRetry(prazo_total=10.0, **RAPIDA).iniciar()
+        execucao.nova_tentativa()
+        self.assertEqual(execucao.espera(status_code=429, retry_after=2.0), 2.0)
+        self.assertLessEqual(execucao.timeout(30.0), 10.0)
+
+        # Espera alem do prazo: desiste em vez de dormir
+        self.assertIsNone(execucao.espera(status_code=429, retry_after=60.0))
+        self.assertEqual(execucao.motivo, MOTIVO_PRAZO)
+
+    def test_orcamento_limita_retries(self):
+        orcamento = OrcamentoRetry(razao=0.1, minimo=2.0)
+        politica = PoliticaRetry(max_tentativas=5, **RAPIDA)
+        retries = 0
+        for _ in range(10):
+            execucao = ExecucaoRetry(politica, orcamento)
+            while execucao.nova_tentativa():
+                if execucao.espera(status_code=503) is None:
+                    break
+                retries += 1
+
+        # 2 do saldo inicial + 0.1 por requisicao; nunca 4 por chamada
+        self.assertLessEqual(retries, 5)
+        self.assertEqual(execucao.motivo, MOTIVO_ORCAMENTO)
+        self.assertGreater(orcamento.stats["negados"], 0)
+
+
+class TestRetryESAJ(unittest.TestCase):
+    """Laco de requisicao do ESAJ sob a politica"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _scraper(self, politica):
+        scraper = ESAJScraper(
+            cache_dir=f"{self.temp_dir}/cache",
+            log_dir=f"{self.temp_dir}/logs",
+            log_level=logging.ERROR,
+            cache_enabled=False,
+            deduplicar_documentos=False,
+            politica_retry=politica
+        )
+        scraper.rate_limiter = RateLimiter(rate=0.0)
+        return scraper
+
+    @staticmethod
+    def _resposta(status):
+        response = Mock()
+        response.status_code = status
+        response.headers = {}
+        return response
+
+    def test_repete_5xx_sem_retry_no_adapter(self):
+        scraper = self._scraper(PoliticaRetry(max_tentativas=3, usar_orcamento=False, **RAPIDA))
+        self.assertEqual(scraper._session.get_adapter("https://esaj.tjsp.jus.br").max_retries.total, 0)
+
+        respostas = [self._resposta(503), self._resposta(200)]
+        with patch.object(scraper._session, "get", side_effect=respostas) as get:
+            response = scraper._fazer_requisicao("https://esaj.tjsp.jus.br/cpopg/open.do")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(get.call_count, 2)
+
+    def test_prazo_total(self):
+        scraper = self._scraper(PoliticaRetry(max_tentativas=10, prazo_total=0.5, backoff_base=0.2,
+                                              backoff_maximo=0.2, usar_orcamento=False))
+        with patch.object(scraper._session, "get",
+                          side_effect=requests.exceptions.ConnectTimeout("lento")) as get:
+            with self.assertRaises(ESAJConnectionError):
+                scraper._fazer_requisicao("https://esaj.tjsp.jus.br/cpopg/open.do")
+
+        self.assertLess(get.call_count, 4)
+        # Timeout de cada tentativa limitado ao prazo restante
+        self.assertLessEqual(get.call_args.kwargs["timeout"], 0.5)
+
+
+class TestRetryProjudi(unittest.IsolatedAsyncioTestCase):
+    """Laco de requisicao do PROJUDI sob a politica"""
+
+    async def asyncSetUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.scraper = ProjudiScraper(
+            cache_dir=self.temp_dir, rate_limit=0, taxa_adaptativa=False,
+            deduplicar_documentos=False,
+            politica_retry=PoliticaRetry(max_tentativas=3, usar_orcamento=False, **RAPIDA)
+        )
+        self.status = []
+
+        def handler(request):
+            return httpx.Response(self.status.pop(0), text="<html>ok</html>")
+
+        self.scraper._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def asyncTearDown(self):
+        await self.scraper._close_client()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    async def test_5xx_repetido_com_jitter(self):
+        self.status = [502, 200]
+        with patch("projudi_scraper.asyncio.sleep", AsyncMock()) as dormir:
+            response = await self.scraper._request_with_retry("GET", "https://projudi/x")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(dormir.await_count, 1)
+        self.assertLess(dormir.await_args.args[0], 1.0)  # nao mais 2 ** tentativa
+
+    async def test_erro_nao_retentavel_nao_repete(self):
+        self.status = [200, 200]
+        with patch.object(self.scraper, "_check_response_errors", side_effect=ValueError("parse")):
+            with self.assertRaises(NetworkError):
+                await self.scraper._request_with_retry("GET", "https://projudi/x")
+
+        self.assertEqual(len(self.status), 1)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
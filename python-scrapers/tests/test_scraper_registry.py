@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes Unitarios para o registro de scrapers
+
+Autor: ROM-Agent Integration System
+Data: 2026-01-12
+"""
+
+import asyncio
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Adiciona diretorio pai ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scraper_registry import (
+    LoopScrapers, RegistroScrapers, chave_credencial, fechar_no_loop_dono
+)
+import esaj_scraper
+
+
+class Recurso:
+    """Scraper falso que registra o fechamento"""
+
+    def __init__(self):
+        self.fechado = False
+
+    def fechar(self):
+        self.fechado = True
+
+
+class TestRegistroScrapers(unittest.TestCase):
+    """Testes do registro"""
+
+    def setUp(self):
+        self.registro = RegistroScrapers()
+
+    def tearDown(self):
+        self.registro.fechar_todos()
+
+    def test_mesma_chave_mesma_instancia(self):
+        a = self.registro.obter(("esaj", True), Recurso)
+        b = self.registro.obter(("esaj", True), Recurso)
+        c = self.registro.obter(("esaj", False), Recurso)
+
+        self.assertIs(a, b)
+        self.assertIsNot(a, c)
+        self.assertEqual(self.registro.stats["criacoes"], 2)
+        self.assertEqual(self.registro.stats["reusos"], 1)
+
+    def test_ociosos_fechados(self):
+        self.registro.idle_ttl = 0.01
+        recurso = self.registro.obter("k", Recurso, fechar=Recurso.fechar)
+        time.sleep(0.02)
+
+        self.assertEqual(self.registro.limpar_ociosos(), 1)
+        self.assertTrue(recurso.fechado)
+        self.assertEqual(len(self.registro), 0)
+
+    def test_emprestado_nao_e_descartado(self):
+        self.registro.idle_ttl = 0.01
+        self.registro.max_scrapers = 1
+
+        with self.registro.emprestar("a", Recurso, fechar=Recurso.fechar) as a:
+            time.sleep(0.02)
+            self.assertEqual(self.registro.limpar_ociosos(), 0)
+            b = self.registro.obter("b", Recurso, fechar=Recurso.fechar)
+            self.assertFalse(a.fechado)
+            self.assertFalse(b.fechado)
+
+        # Fora do emprestimo o limite volta a valer (sai o menos recente)
+        self.registro.idle_ttl = 0
+        self.registro.obter("c", Recurso, fechar=Recurso.fechar)
+        self.assertTrue(b.fechado)
+        self.assertEqual(len(self.registro), 1)
+
+    def test_fechar_assincrono(self):
+        fechados = []
+
+        async def fechar(recurso):
+            fechados.append(recurso)
+
+        recurso = self.registro.obter("k", Recurso, fechar=fechar)
+        self.registro.fechar_todos()
+        self.assertEqual(fechados, [recurso])
+
+    def test_criacao_unica_com_threads(self):
+        criados = []
+
+        def fabrica():
+            time.sleep(0.01)
+            criados.append(Recurso())
+            return criados[-1]
+
+        threads = [
+            threading.Thread(target=self.registro.obter, args=("k", fabrica))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(criados), 1)
+
+    def test_criacao_lenta_nao_trava_outras_chaves(self):
+        liberar = threading.Event()
+
+        def fabrica_lenta():
+            liberar.wait(5)
+            return Recurso()
+
+        lenta = threading.Thread(target=self.registro.obter, args=("lenta", fabrica_lenta))
+        lenta.start()
+        try:
+            time.sleep(0.02)
+            inicio = time.monotonic()
+            self.registro.obter("rapida", Recurso)
+            self.assertLess(time.monotonic() - inicio, 1)
+        finally:
+            liberar.set()
+            lenta.join()
+        self.assertEqual(self.registro.stats["criacoes"], 2)
+
+    def test_fabrica_com_erro_tenta_de_novo(self):
+        def fabrica_com_erro():
+            raise RuntimeError("falha ao autenticar")
+
+        with self.assertRaises(RuntimeError):
+            self.registro.obter("k", fabrica_com_erro)
+        self.assertIsInstance(self.registro.obter("k", Recurso), Recurso)
+
+    def test_fechar_assincrono_no_loop_dono(self):
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever)
+        thread.start()
+        self.addCleanup(loop.close)
+        self.addCleanup(thread.join)
+        self.addCleanup(loop.call_soon_threadsafe, loop.stop)
+
+        fechado_em = []
+        fechou = threading.Event()
+
+        async def fechar(recurso):
+            fechado_em.append(asyncio.get_running_loop())
+            fechou.set()
+
+        async def usar():
+            return self.registro.obter("k", Recurso, fechar=fechar)
+
+        asyncio.run_coroutine_threadsafe(usar(), loop).result(5)
+        self.registro.fechar_todos()
+
+        self.assertTrue(fechou.wait(5))
+        self.assertEqual(fechado_em, [loop])
+
+    def test_fechar_no_loop_dono(self):
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever)
+        thread.start()
+        self.addCleanup(loop.close)
+        self.addCleanup(thread.join)
+        self.addCleanup(loop.call_soon_threadsafe, loop.stop)
+
+        fechado_em = []
+        fechou = threading.Event()
+
+        async def fechar():
+            fechado_em.append(asyncio.get_running_loop())
+            fechou.set()
+
+        self.assertTrue(fechar_no_loop_dono(fechar(), loop))
+        self.assertTrue(fechou.wait(5))
+        self.assertEqual(fechado_em, [loop])
+
+        # Loop dono encerrado: a coroutine e descartada sem erro
+        encerrado = asyncio.new_event_loop()
+        encerrado.close()
+        self.assertFalse(fechar_no_loop_dono(fechar(), encerrado))
+
+    def test_chave_credencial(self):
+        chave = chave_credencial("usuario", "segredo")
+        self.assertNotIn("segredo", chave)
+        self.assertEqual(chave, chave_credencial("usuario", "segredo"))
+        self.assertNotEqual(chave, chave_credencial("usuario", "outra"))
+        self.assertIsNone(chave_credencial(None))
+
+
+class TestLoopScrapers(unittest.TestCase):
+    """Testes do loop compartilhado das funcoes sincronas"""
+
+    def setUp(self):
+        self.loop_scrapers = LoopScrapers()
+        self.addCleanup(self.loop_scrapers.encerrar)
+
+    def test_chamadas_de_threads_diferentes_no_mesmo_loop(self):
+        loops = []
+
+        async def loop_atual():
+            return asyncio.get_running_loop()
+
+        threads = [
+            threading.Thread(target=lambda: loops.append(self.loop_scrapers.executar(loop_atual())))
+            for _ in range(4)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(loops), 4)
+        self.assertEqual(set(loops), {self.loop_scrapers.loop})
+        self.assertTrue(self.loop_scrapers.loop.is_running())
+
+    def test_excecao_propagada(self):
+        async def falhar():
+            raise ValueError("numero invalido")
+
+        with self.assertRaises(ValueError):
+            self.loop_scrapers.executar(falhar())
+
+    def test_tarefa_em_segundo_plano_sobrevive_a_chamada(self):
+        terminou = threading.Event()
+
+        async def segundo_plano():
+            await asyncio.sleep(0.05)
+            terminou.set()
+
+        async def disparar():
+            asyncio.get_running_loop().create_task(segundo_plano())
+
+        self.loop_scrapers.executar(disparar())
+        self.assertTrue(terminou.wait(5))
+
+    def test_chamada_de_dentro_do_loop_falha(self):
+        async def aninhada():
+            async def nada():
+                return None
+            self.loop_scrapers.executar(nada())
+
+        with self.assertRaises(RuntimeError):
+            self.loop_scrapers.executar(aninhada())
+
+    def test_encerrar_e_recriar(self):
+        async def loop_atual():
+            return asyncio.get_running_loop()
+
+        primeiro = self.loop_scrapers.executar(loop_atual())
+        self.loop_scrapers.encerrar()
+        segundo = self.loop_scrapers.executar(loop_atual())
+
+        self.assertTrue(primeiro.is_closed())
+        self.assertIsNot(primeiro, segundo)
+
+
+class TestReusoNasFuncoesDeModulo(unittest.TestCase):
+    """As funcoes de modulo devem reaproveitar o scraper entre chamadas"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        temp_dir = self.temp_dir
+
+        class Scraper(esaj_scraper.AsyncESAJScraper):
+            """Scraper com logs no diretorio temporario"""
+
+            def __init__(self, **kwargs):
+                super().__init__(log_dir=temp_dir, **kwargs)
+
+        patcher = patch.object(esaj_scraper, "AsyncESAJScraper", Scraper)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.loop_scrapers = LoopScrapers()
+        self.addCleanup(self.loop_scrapers.encerrar)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_esaj_sync_reutiliza_scraper_e_cliente(self):
+        registro = RegistroScrapers()
+        instancias = []
+        clientes = []
+
+        async def buscar(scraper, numero, instancia="1"):
+            instancias.append(scraper)
+            clientes.append(await scraper._get_client())
+            return esaj_scraper.ProcessoESAJ(
+                numero_processo=numero, tribunal="TJSP", instancia=instancia
+            )
+
+        with patch.object(esaj_scraper, "obter_registro_scrapers", return_value=registro), \
+                patch.object(esaj_scraper, "obter_loop_scrapers", return_value=self.loop_scrapers), \
+                patch.object(esaj_scraper.AsyncESAJScraper, "buscar_por_numero_async", buscar):
+            esaj_scraper.extrair_processo_esaj_sync("1", cache_enabled=False)
+            esaj_scraper.extrair_processo_esaj_sync("2", cache_enabled=False)
+
+        self.assertEqual(len(instancias), 2)
+        self.assertIs(instancias[0], instancias[1])
+        self.assertEqual(registro.stats["criacoes"], 1)
+        # Mesmo loop nas duas chamadas: o cliente (e suas conexoes) e reusado
+        self.assertIs(clientes[0], clientes[1])
+        self.assertFalse(clientes[0].is_closed)
+
+        # Fechamento do registro roda no loop dono do cliente
+        registro.fechar_todos()
+        limite = time.monotonic() + 5
+        while not clientes[0].is_closed and time.monotonic() < limite:
+            time.sleep(0.01)
+        self.assertTrue(clientes[0].is_closed)
+
+    def test_esaj_cliente_de_outro_loop_fechado_no_dono(self):
+        scraper = esaj_scraper.AsyncESAJScraper(cache_enabled=False)
+
+        async def cliente():
+            return await scraper._get_client()
+
+        antigo = self.loop_scrapers.executar(cliente())
+        novo = asyncio.run(cliente())
+
+        self.assertIsNot(antigo, novo)
+        # Fechamento agendado no loop dono do cliente antigo
+        limite = time.monotonic() + 5
+        while not antigo.is_closed and time.monotonic() < limite:
+            time.sleep(0.01)
+        self.assertTrue(antigo.is_closed)
+        asyncio.run(novo.aclose())
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
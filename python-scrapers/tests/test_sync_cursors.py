@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes Unitarios para a sincronizacao incremental de movimentacoes
+
+Autor: ROM-Agent Integration System
+Data: 2026-01-12
+"""
+
+import asyncio
+import logging
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+# Adiciona diretorio pai ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sync_cursors import CursorStore, movimentacoes_novas
+from html_backend import PaginaHTML
+from esaj_scraper import ESAJScraper
+from pje_scraper import PJeScraper
+from projudi_scraper import ProjudiScraper
+from datajud_cnj import DataJudCNJ
+
+
+montados = []
+
+
+def assinatura(mov):
+    return mov["data"], mov["descricao"]
+
+
+def montar(mov):
+    montados.append(mov)
+    return mov
+
+
+class TestMovimentacoesNovas(unittest.TestCase):
+    """Testes do calculo de delta"""
+
+    LINHAS = [
+        {"data": "2024-03-01", "descricao": "Sentenca"},
+        {"data": "2024-02-01", "descricao": "Conclusos"},
+        {"data": "2024-01-01", "descricao": "Distribuido"},
+    ]
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = CursorStore(f"{self.temp_dir}/cursores.db")
+        montados.clear()
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _sincronizar(self, linhas):
+        return self.store.sincronizar(
+            "teste", "N", linhas, lambda m: m["data"], montar, assinatura
+        )
+
+    def test_primeira_sincronizacao_traz_tudo(self):
+        delta = self._sincronizar(self.LINHAS)
+
+        self.assertTrue(delta.primeira_sincronizacao)
+        self.assertEqual(len(delta.novas), 3)
+        self.assertEqual(delta.cursor.ultima_data, "2024-03-01")
+        self.assertEqual(self.store.get("teste", "N").total, 3)
+
+    def test_para_no_cursor_sem_montar_linhas_antigas(self):
+        self._sincronizar(self.LINHAS)
+        montados.clear()
+
+        nova = {"data": "2024-04-01", "descricao": "Transitado em julgado"}
+        delta = self._sincronizar([nova] + self.LINHAS)
+
+        self.assertEqual(delta.novas, [nova])
+        # Monta a nova e a do cursor (mesma data); para na primeira anterior
+        self.assertEqual(montados, [nova, self.LINHAS[0]])
+        self.assertEqual(delta.cursor.total, 4)
+
+    def test_ordem_crescente(self):
+        self._sincronizar(list(reversed(self.LINHAS)))
+        nova = {"data": "2024-04-01", "descricao": "Arquivado"}
+
+        delta = self._sincronizar(list(reversed(self.LINHAS)) + [nova])
+        self.assertEqual(delta.novas, [nova])
+
+    def test_mesma_data_comparada_pelo_conteudo(self):
+        self._sincronizar(self.LINHAS)
+        mesma_data = {"data": "2024-03-01", "descricao": "Intimacao expedida"}
+
+        delta = self._sincronizar([mesma_data] + self.LINHAS)
+        self.assertEqual(delta.novas, [mesma_data])
+
+        delta = self._sincronizar([mesma_data] + self.LINHAS)
+        self.assertEqual(delta.novas, [])
+        self.assertEqual(len(delta.cursor.hashes), 2)
+
+    def test_movimentacoes_identicas_na_mesma_data(self):
+        juntada = {"data": "2024-03-01", "descricao": "Juntada de Peticao"}
+        delta = self._sincronizar([juntada, dict(juntada)] + self.LINHAS)
+        self.assertEqual(len(delta.novas), 5)
+        self.assertEqual(len(set(delta.cursor.hashes)), 3)
+
+        delta = self._sincronizar([juntada, dict(juntada)] + self.LINHAS)
+        self.assertEqual(delta.novas, [])
+
+        # Terceira juntada igual no mesmo dia: so ela e nova
+        delta = self._sincronizar([juntada, dict(juntada), dict(juntada)] + self.LINHAS)
+        self.assertEqual(delta.novas, [juntada])
+        self.assertEqual(delta.cursor.total, 6)
+
+        delta = self._sincronizar([juntada, dict(juntada), dict(juntada)] + self.LINHAS)
+        self.assertEqual(delta.novas, [])
+
+    def test_sem_cursor(self):
+        novas, montadas = movimentacoes_novas(
+            self.LINHAS, lambda m: m["data"], montar, assinatura, None
+        )
+        self.assertEqual((len(novas), montadas), (3, 3))
+
+
+class TestSincronizarScrapers(unittest.TestCase):
+    """sincronizar() dos scrapers e do DataJud"""
+
+    HTML = """
+    <html><body><table id="tabelaTodasMovimentacoes" class="movimentacoes">
+        {linhas}
+        <tr><td>20/01/2024</td><td>Despacho proferido</td></tr>
+        <tr><td>15/01/2024</td><td>Distribuido por sorteio</td></tr>
+    </table></body></html>
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = CursorStore(f"{self.temp_dir}/cursores.db")
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_esaj(self):
+        scraper = ESAJScraper(
+            cache_dir=f"{self.temp_dir}/cache",
+            log_dir=f"{self.temp_dir}/logs",
+            log_level=logging.ERROR,
+            deduplicar_documentos=False,
+            cursor_store=self.store
+        )
+        numero = "1000000-00.2024.8.26.0100"
+
+        def sincronizar(linhas=""):
+            pagina = PaginaHTML(html=self.HTML.format(linhas=linhas))
+            with patch.object(scraper, "_obter_pagina_processo", return_value=(pagina, "")):
+                return scraper.sincronizar(numero)
+
+        self.assertEqual(len(sincronizar().novas), 2)
+        self.assertEqual(sincronizar().novas, [])
+
+        delta = sincronizar("<tr><td>01/02/2024</td><td>Conclusos para decisao</td></tr>")
+        self.assertEqual([m["descricao"] for m in delta.novas], ["Conclusos para decisao"])
+        self.assertEqual(delta.novas[0]["data"], "2024-02-01")
+
+    def test_pje(self):
+        scraper = PJeScraper(
+            cache_dir=f"{self.temp_dir}/cache",
+            log_dir=f"{self.temp_dir}/logs",
+            cache_enabled=False,
+            cursor_store=self.store
+        )
+        numero = "1000000-00.2024.4.01.3400"
+
+        def sincronizar(linhas=""):
+            pagina = PaginaHTML(html=self.HTML.format(linhas=linhas))
+            with patch.object(scraper, "_obter_pagina_processo", return_value=pagina):
+                return scraper.sincronizar(numero, trf="TRF1")
+
+        self.assertEqual(len(sincronizar().novas), 2)
+        self.assertEqual(sincronizar().novas, [])
+
+        juntada = "<tr><td>01/02/2024</td><td>Juntada de peticao</td></tr>"
+        delta = sincronizar(juntada * 2)
+        self.assertEqual([m["descricao"] for m in delta.novas], ["Juntada de peticao"] * 2)
+        self.assertEqual(sincronizar(juntada * 2).novas, [])
+        self.assertEqual(len(sincronizar(juntada * 3).novas), 1)
+
+    def test_projudi(self):
+        scraper = ProjudiScraper(
+            cache_dir=f"{self.temp_dir}/cache",
+            log_level=logging.ERROR,
+            taxa_adaptativa=False,
+            cursor_store=self.store
+        )
+        numero = "5000000-00.2024.8.09.0051"
+
+        def sincronizar(linhas=""):
+            pagina = PaginaHTML(html=self.HTML.format(linhas=linhas))
+            with patch.object(scraper, "_obter_pagina_processo", AsyncMock(return_value=(pagina, ""))):
+                return asyncio.run(scraper.sincronizar(numero))
+
+        self.assertEqual(len(sincronizar().novas), 2)
+        self.assertEqual(sincronizar().novas, [])
+
+        juntada = "<tr><td>01/02/2024</td><td>Juntada de peticao</td></tr>"
+        delta = sincronizar(juntada * 2)
+        self.assertEqual([m.descricao for m in delta.novas], ["Juntada de peticao"] * 2)
+        self.assertEqual(sincronizar(juntada * 2).novas, [])
+        self.assertEqual(len(sincronizar(juntada * 3).novas), 1)
+
+    def test_datajud(self):
+        cliente = DataJudCNJ(api_key="chave", cursor_store=self.store)
+        movimentos = [
+            {"codigo": 26, "nome": "Distribuicao", "dataHora": "2024-01-15T10:00:00.000Z"},
+            {"codigo": 11010, "nome": "Despacho", "dataHora": "2024-01-20T09:00:00.000Z"},
+        ]
+
+        def resposta():
+            return {"hits": {"hits": [{"_source": {
+                "numeroProcesso": "10000000020248260100", "movimentos": list(movimentos)
+            }}]}}
+
+        with patch.object(cliente, "_make_request", side_effect=lambda q, indice=None: resposta()):
+            primeira = cliente.sincronizar_movimentacoes("1000000-00.2024.8.26.0100")
+            movimentos.append(
+                {"codigo": 51, "nome": "Conclusao", "dataHora": "2024-02-01T08:00:00.000Z"}
+            )
+            segunda = cliente.sincronizar_movimentacoes("1000000-00.2024.8.26.0100")
+
+        self.assertEqual(primeira["total_novas"], 2)
+        self.assertEqual([m["nome"] for m in segunda["novas"]], ["Conclusao"])
+        self.assertEqual(segunda["total_conhecidas"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
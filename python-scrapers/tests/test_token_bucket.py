@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes Unitarios para Token Bucket compartilhado
+
+Autor: ROM-Agent Integration System
+Data: 2026-01-12
+"""
+
+import asyncio
+import multiprocessing
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+# Adiciona diretorio pai ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from token_bucket import TokenBucketLimiter
+
+
+def _consumir_em_processo(db_path: str, chave: str, total: int, fila):
+    """Worker de processo separado consumindo do mesmo bucket"""
+    limiter = TokenBucketLimiter(db_path)
+    for _ in range(total):
+        limiter.acquire(chave, taxa=20.0, burst=1)
+        fila.put(time.time())
+    limiter.close()
+
+
+class TestTokenBucketLimiter(unittest.TestCase):
+    """Testes do token bucket"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = str(Path(self.temp_dir) / "rate.db")
+        self.limiter = TokenBucketLimiter(self.db_path)
+
+    def tearDown(self):
+        self.limiter.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_burst(self):
+        """Testa que a capacidade de burst libera requisicoes sem espera"""
+        esperas = [self.limiter.reservar("host", taxa=1.0, burst=3) for _ in range(4)]
+        self.assertEqual(esperas[:3], [0.0, 0.0, 0.0])
+        self.assertAlmostEqual(esperas[3], 1.0, delta=0.05)
+
+    def test_reservas_sucessivas(self):
+        """Testa que cada reserva sem token recebe o proximo horario livre"""
+        esperas = [self.limiter.reservar("host", taxa=10.0, burst=1) for _ in range(3)]
+        self.assertAlmostEqual(esperas[1], 0.1, delta=0.02)
+        self.assertAlmostEqual(esperas[2], 0.2, delta=0.02)
+
+    def test_tempo_espera_nao_consome(self):
+        """Testa consulta da espera atual sem consumir token"""
+        self.assertEqual(self.limiter.tempo_espera("host", taxa=1.0), 0.0)
+        self.assertEqual(self.limiter.tempo_espera("host", taxa=1.0), 0.0)
+        self.limiter.reservar("host", taxa=1.0)
+        self.assertGreater(self.limiter.tempo_espera("host", taxa=1.0), 0.9)
+
+    def test_chaves_independentes(self):
+        """Testa buckets separados por host"""
+        self.limiter.reservar("a", taxa=1.0)
+        self.assertEqual(self.limiter.reservar("b", taxa=1.0), 0.0)
+
+    def test_bloquear(self):
+        """Testa bloqueio compartilhado apos rate limit"""
+        self.limiter.bloquear("host", 0.5)
+        outro = TokenBucketLimiter(self.db_path)
+        self.assertGreater(outro.tempo_espera("host", taxa=100.0), 0.4)
+        outro.close()
+
+    def test_acquire_async(self):
+        """Testa uso assincrono"""
+        async def executar():
+            inicio = time.time()
+            for _ in range(3):
+                await self.limiter.acquire_async("host", taxa=20.0)
+            return time.time() - inicio
+
+        self.assertGreaterEqual(asyncio.run(executar()), 0.09)
+
+    def test_compartilhado_entre_processos(self):
+        """Testa que dois processos dividem a mesma taxa"""
+        fila = multiprocessing.Queue()
+        processos = [
+            multiprocessing.Process(
+                target=_consumir_em_processo, args=(self.db_path, "host", 3, fila)
+            )
+            for _ in range(2)
+        ]
+        for p in processos:
+            p.start()
+        for p in processos:
+            p.join(timeout=30)
+            self.assertEqual(p.exitcode, 0)
+
+        horarios = sorted(fila.get() for _ in range(6))
+        # 6 requisicoes a 20/s com burst 1: pelo menos 5 intervalos de 50ms
+        self.assertGreaterEqual(horarios[-1] - horarios[0], 0.24)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Token Bucket - Rate limiter compartilhado entre threads e processos
+
+Cada scraper criava seu proprio RateLimiter, entao com varios workers
+(gunicorn -w 4) ou varias instancias por requisicao da API a taxa real
+contra um tribunal era N vezes o limite configurado, gerando 429 e
+bloqueios temporarios.
+
+Este modulo mantem um token bucket por chave (normalmente o host do
+tribunal) em um arquivo SQLite local. Todos os processos da maquina que
+usam o mesmo arquivo dividem o mesmo orcamento:
+- Capacidade de burst configuravel
+- Reserva atomica de tokens (BEGIN IMMEDIATE) entre processos
+- Bloqueio compartilhado apos 429 (um worker bloqueado pausa todos)
+- Consulta da espera atual sem consumir token
+- Uso sincrono (acquire) e assincrono (acquire_async)
+
+Autor: ROM-Agent Integration System
+Data: 2026-01-12
+Versao: 1.0.0
+"""
+
+import asyncio
+import os
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+from cache_store import ConexoesSQLite, RegistroPorCaminho
+
+
+# =============================================================================
+# CONSTANTES E CONFIGURACOES
+# =============================================================================
+
+DEFAULT_DB_PATH = os.environ.get(
+    "ROM_RATE_LIMIT_DB",
+    str(Path(tempfile.gettempdir()) / "rom_agent_rate_limit.db")
+)
+DEFAULT_BURST = 1
+DEFAULT_BUSY_TIMEOUT_MS = 5000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS token_buckets (
+    chave         TEXT PRIMARY KEY,
+    tokens        REAL NOT NULL,
+    atualizado_em REAL NOT NULL,
+    bloqueado_ate REAL NOT NULL DEFAULT 0
+);
+"""
+
+
+# =============================================================================
+# TOKEN BUCKET
+# =============================================================================
+
+class TokenBucketLimiter:
+    """
+    Token bucket por chave persistido em SQLite (modo WAL)
+
+    A taxa e a capacidade sao informadas a cada chamada, de modo que o
+    mesmo arquivo atende tribunais com limites diferentes. Quando nao ha
+    token disponivel o saldo fica negativo: cada chamada reserva o proximo
+    horario livre e recebe quanto tempo deve esperar, sem disputa entre
+    os processos que aguardam.
+    """
+
+    def __init__(
+        self,
+        db_path: str = DEFAULT_DB_PATH,
+        busy_timeout_ms: int = DEFAULT_BUSY_TIMEOUT_MS
+    ):
+        """
+        Inicializa o limiter
+
+        Args:
+            db_path: Arquivo SQLite compartilhado
+            busy_timeout_ms: Tempo de espera por lock de outro processo
+        """
+        self.db_path = Path(db_path)
+        self.busy_timeout_ms = busy_timeout_ms
+        self._conexoes = ConexoesSQLite(self.db_path, busy_timeout_ms)
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn().executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        """Retorna conexao da thread atual, criando se necessario"""
+        return self._conexoes.obter()
+
+    def _reservar(self, chave: str, taxa: float, burst: int, consumir: bool) -> float:
+        """
+        Atualiza o bucket e retorna a espera ate o proximo token
+
+        Args:
+            chave: Chave do bucket (host do tribunal)
+            taxa: Tokens por segundo
+            burst: Capacidade maxima do bucket
+            consumir: Se deve reservar o token (False apenas consulta)
+
+        Returns:
+            Segundos ate o token estar disponivel
+        """
+        taxa = max(taxa, 1e-6)
+        burst = max(1, burst)
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            agora = time.time()
+            row = conn.execute(
+                "SELECT tokens, atualizado_em, bloqueado_ate FROM token_buckets WHERE chave = ?",
+                (chave,)
+            ).fetchone()
+
+            if row is None:
+                tokens, bloqueado_ate = float(burst), 0.0
+            else:
+                tokens_salvos, atualizado_em, bloqueado_ate = row
+                tokens = min(float(burst), tokens_salvos + (agora - atualizado_em) * taxa)
+
+            # Saldo negativo = reservas ja feitas por outros chamadores
+            espera = max(0.0, bloqueado_ate - agora)
+            if tokens < 1:
+                espera += (1 - tokens) / taxa
+
+            if consumir:
+                conn.execute(
+                    "INSERT OR REPLACE INTO token_buckets "
+                    "(chave, tokens, atualizado_em, bloqueado_ate) VALUES (?, ?, ?, ?)",
+                    (chave, tokens - 1, agora, bloqueado_ate)
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        return espera
+
+    def acquire(self, chave: str, taxa: float, burst: int = DEFAULT_BURST) -> float:
+        """
+        Reserva um token e aguarda (bloqueante) ate poder usa-lo
+
+        Returns:
+            Tempo aguardado em segundos
+        """
+        espera = self._reservar(chave, taxa, burst, consumir=True)
+        if espera > 0:
+            time.sleep(espera)
+        return espera
+
+    async def acquire_async(self, chave: str, taxa: float, burst: int = DEFAULT_BURST) -> float:
+        """
+        Versao assincrona de acquire (nao bloqueia o event loop)
+
+        Returns:
+            Tempo aguardado em segundos
+        """
+        espera = self._reservar(chave, taxa, burst, consumir=True)
+        if espera > 0:
+            await asyncio.sleep(espera)
+        return espera
+
+    def reservar(self, chave: str, taxa: float, burst: int = DEFAULT_BURST) -> float:
+        """
+        Reserva um token sem aguardar
+
+        Returns:
+            Segundos que o chamador deve esperar antes de usar o token
+        """
+        return self._reservar(chave, taxa, burst, consumir=True)
+
+    def tempo_espera(self, chave: str, taxa: float, burst: int = DEFAULT_BURST) -> float:
+        """Retorna a espera atual para a chave sem consumir token"""
+        return self._reservar(chave, taxa, burst, consumir=False)
+
+    def bloquear(self, chave: str, segundos: float):
+        """
+        Bloqueia a chave para todos os processos (ex.: apos HTTP 429)
+
+        Args:
+            chave: Chave do bucket
+            segundos: Duracao do bloqueio
+        """
+        ate = time.time() + segundos
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            updated = conn.execute(
+                "UPDATE token_buckets SET bloqueado_ate = MAX(bloqueado_ate, ?) WHERE chave = ?",
+                (ate, chave)
+            ).rowcount
+            if not updated:
+                conn.execute(
+                    "INSERT INTO token_buckets (chave, tokens, atualizado_em, bloqueado_ate) "
+                    "VALUES (?, 0, ?, ?)",
+                    (chave, time.time(), ate)
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def bloqueado_ate(self, chave: str) -> float:
+        """Retorna timestamp ate quando a chave esta bloqueada (0 se livre)"""
+        row = self._conn().execute(
+            "SELECT bloqueado_ate FROM token_buckets WHERE chave = ?", (chave,)
+        ).fetchone()
+        return row[0] if row else 0.0
+
+    def resetar(self, chave: Optional[str] = None):
+        """Remove o estado de uma chave (ou de todas)"""
+        if chave is None:
+            self._conn().execute("DELETE FROM token_buckets")
+        else:
+            self._conn().execute("DELETE FROM token_buckets WHERE chave = ?", (chave,))
+
+    def close(self):
+        """Fecha a conexao da thread atual"""
+        self._conexoes.fechar()
+
+
+# =============================================================================
+# INSTANCIA COMPARTILHADA
+# =============================================================================
+
+_limiters: RegistroPorCaminho[TokenBucketLimiter] = RegistroPorCaminho(TokenBucketLimiter)
+
+
+def obter_token_bucket(db_path: Optional[str] = None) -> TokenBucketLimiter:
+    """
+    Retorna o limiter do processo para o arquivo informado
+
+    Args:
+        db_path: Arquivo SQLite (padrao ROM_RATE_LIMIT_DB ou pasta temporaria)
+
+    Returns:
+        TokenBucketLimiter unico por arquivo no processo
+    """
+    return _limiters.obter(db_path or DEFAULT_DB_PATH)
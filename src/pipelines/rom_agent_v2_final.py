@@ -35,6 +35,8 @@ USO BÁSICO:
 
 import re
 import json
+import time
+import asyncio
 import logging
 from enum import Enum
 from typing import Dict, List, Optional, Any, Tuple
@@ -1192,47 +1194,143 @@ class CircuitState(Enum):
 
 @dataclass
 class CircuitBreaker:
-    """Circuit breaker para proteção de chamadas"""
+    """
+    Circuit breaker para proteção de chamadas
+    
+    Mesma semântica do breaker dos scrapers (python-scrapers/resilience.py):
+    abre após falhas seguidas, rejeita na hora enquanto aberto e, passado
+    recovery_timeout, deixa passar uma sonda por vez (HALF_OPEN). Os tempos
+    usam time.monotonic (timedelta.seconds ignorava os dias e voltava a zero).
+    """
     failure_threshold: int = 5
-    recovery_timeout: int = 60
+    recovery_timeout: float = 60.0
     
     state: CircuitState = CircuitState.CLOSED
     failures: int = 0
     last_failure: Optional[datetime] = None
     
+    # Estatísticas
+    openings: int = 0
+    rejections: int = 0
+    open_seconds: float = 0.0
+    
+    _last_failure_at: float = field(default=0.0, repr=False)
+    _opened_at: Optional[float] = field(default=None, repr=False)
+    _probe_in_flight: bool = field(default=False, repr=False)
+    
     def can_execute(self) -> bool:
-        if self.state == CircuitState.CLOSED:
-            return True
         if self.state == CircuitState.OPEN:
-            if self.last_failure and (datetime.now() - self.last_failure).seconds >= self.recovery_timeout:
+            if time.monotonic() - self._last_failure_at >= self.recovery_timeout:
                 self.state = CircuitState.HALF_OPEN
-                return True
-            return False
-        return True
+                self._probe_in_flight = False
+        if self.state == CircuitState.CLOSED:
+            return True
+        if self.state == CircuitState.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        self.rejections += 1
+        return False
+    
+    def cancel(self):
+        """Devolve a sonda HALF_OPEN de uma chamada que não chegou a acontecer"""
+        self._probe_in_flight = False
     
     def record_success(self):
+        if self._opened_at is not None:
+            self.open_seconds += time.monotonic() - self._opened_at
+            self._opened_at = None
         self.state = CircuitState.CLOSED
         self.failures = 0
+        self._probe_in_flight = False
     
     def record_failure(self):
         self.failures += 1
         self.last_failure = datetime.now()
-        if self.failures >= self.failure_threshold:
+        self._last_failure_at = time.monotonic()
+        self._probe_in_flight = False
+        if self.state == CircuitState.HALF_OPEN or (
+            self.state == CircuitState.CLOSED and self.failures >= self.failure_threshold
+        ):
             self.state = CircuitState.OPEN
+            self.openings += 1
+            if self._opened_at is None:
+                self._opened_at = self._last_failure_at
+    
+    def status(self) -> Dict[str, Any]:
+        """Estado, rejeições e tempo aberto"""
+        open_for = time.monotonic() - self._opened_at if self._opened_at is not None else 0.0
+        return {
+            "state": self.state.value,
+            "failures": self.failures,
+            "openings": self.openings,
+            "rejections": self.rejections,
+            "open_for_seconds": round(open_for, 3),
+            "total_open_seconds": round(self.open_seconds + open_for, 3),
+        }
 
 
 class ModelExecutor:
-    """Executor de modelos com circuit breaker e fallback"""
+    """
+    Executor de modelos com circuit breaker, limite de concorrência e fallback
     
-    def __init__(self, bedrock_client=None):
+    Cada modelo tem um breaker e um teto de chamadas simultâneas. Sem vaga
+    em acquire_timeout segundos, a chamada vai direto ao fallback em vez de
+    ficar na fila de um modelo lento ou fora do ar.
+    """
+    
+    def __init__(
+        self,
+        bedrock_client=None,
+        max_concurrent: int = 8,
+        acquire_timeout: float = 5.0
+    ):
         self.client = bedrock_client
+        self.max_concurrent = max_concurrent
+        self.acquire_timeout = acquire_timeout
         self.breakers: Dict[str, CircuitBreaker] = {}
+        self.slots: Dict[str, asyncio.Semaphore] = {}
+        self.in_flight: Dict[str, int] = {}
+        self.slot_rejections: Dict[str, int] = {}
     
     def _get_breaker(self, model_id: str) -> CircuitBreaker:
         if model_id not in self.breakers:
             self.breakers[model_id] = CircuitBreaker()
         return self.breakers[model_id]
     
+    def _get_slots(self, model_id: str) -> asyncio.Semaphore:
+        if model_id not in self.slots:
+            self.slots[model_id] = asyncio.Semaphore(self.max_concurrent)
+        return self.slots[model_id]
+    
+    async def _protected_invoke(self, model_id: str, *args) -> Optional[Dict]:
+        """Invoca o modelo sob breaker e limite de concorrência (None = rejeitado ou falhou)"""
+        breaker = self._get_breaker(model_id)
+        if not breaker.can_execute():
+            return None
+        
+        slots = self._get_slots(model_id)
+        try:
+            await asyncio.wait_for(slots.acquire(), timeout=self.acquire_timeout)
+        except asyncio.TimeoutError:
+            self.slot_rejections[model_id] = self.slot_rejections.get(model_id, 0) + 1
+            breaker.cancel()
+            logger.warning(f"Sem vaga para {model_id} ({self.max_concurrent} chamadas em andamento)")
+            return None
+        
+        self.in_flight[model_id] = self.in_flight.get(model_id, 0) + 1
+        try:
+            response = await self._invoke(model_id, *args)
+        except Exception as e:
+            logger.error(f"Erro em {model_id}: {e}")
+            breaker.record_failure()
+            return None
+        finally:
+            self.in_flight[model_id] -= 1
+            slots.release()
+        
+        breaker.record_success()
+        return response
+    
     async def execute(
         self,
         decision: RoutingDecision,
@@ -1244,49 +1342,47 @@ class ModelExecutor:
         """Executa chamada com proteções"""
         
         # Tentar modelo primário
-        breaker = self._get_breaker(decision.model_id)
+        response = await self._protected_invoke(
+            decision.model_id, messages, system_prompt,
+            decision.max_tokens, decision.temperature,
+            tools, stream, decision.use_extended_thinking
+        )
+        if response is not None:
+            return {
+                "success": True,
+                "model_used": decision.model_name,
+                "response": response,
+                "fallback": False
+            }
         
-        if breaker.can_execute():
-            try:
-                response = await self._invoke(
-                    decision.model_id, messages, system_prompt,
-                    decision.max_tokens, decision.temperature,
-                    tools, stream, decision.use_extended_thinking
-                )
-                breaker.record_success()
+        # Tentar fallback
+        if decision.fallback_model_id:
+            response = await self._protected_invoke(
+                decision.fallback_model_id, messages, system_prompt,
+                decision.max_tokens, decision.temperature,
+                tools, stream, False
+            )
+            if response is not None:
                 return {
                     "success": True,
-                    "model_used": decision.model_name,
+                    "model_used": decision.fallback_model_name,
                     "response": response,
-                    "fallback": False
+                    "fallback": True
                 }
-            except Exception as e:
-                logger.error(f"Erro em {decision.model_id}: {e}")
-                breaker.record_failure()
-        
-        # Tentar fallback
-        if decision.fallback_model_id:
-            fb_breaker = self._get_breaker(decision.fallback_model_id)
-            if fb_breaker.can_execute():
-                try:
-                    response = await self._invoke(
-                        decision.fallback_model_id, messages, system_prompt,
-                        decision.max_tokens, decision.temperature,
-                        tools, stream, False
-                    )
-                    fb_breaker.record_success()
-                    return {
-                        "success": True,
-                        "model_used": decision.fallback_model_name,
-                        "response": response,
-                        "fallback": True
-                    }
-                except Exception as e:
-                    logger.error(f"Erro em fallback: {e}")
-                    fb_breaker.record_failure()
         
         return {"success": False, "error": "Todos os modelos falharam"}
     
+    def get_status(self) -> Dict[str, Dict[str, Any]]:
+        """Estado do breaker e da concorrência de cada modelo já chamado"""
+        status = {}
+        for model_id, breaker in self.breakers.items():
+            status[model_id] = {
+                **breaker.status(),
+                "in_flight": self.in_flight.get(model_id, 0),
+                "slot_rejections": self.slot_rejections.get(model_id, 0),
+            }
+        return status
+    
     async def _invoke(
         self, model_id: str, messages: List, system: str,
         max_tokens: int, temperature: float, tools: List,
@@ -1420,6 +1516,10 @@ class ROMAgent:
     # UTILITÁRIOS
     # ═══════════════════════════════════════════════════════════════════════════════════════
     
+    def get_executor_status(self) -> Dict[str, Dict[str, Any]]:
+        """Circuit breaker e concorrência por modelo"""
+        return self.executor.get_status()
+    
     def get_available_models(self) -> List[Dict]:
         """Lista modelos disponíveis"""
         return [